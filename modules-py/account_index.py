@@ -0,0 +1,270 @@
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+
+from config_stanzas import split_stanzas
+
+# File lưu chỉ mục tài khoản giữa các lần chạy
+ACCOUNT_INDEX_FILE = "account_index.json"
+INDEX_VERSION = 1
+# Kiểu lưu mật khẩu của tài khoản local: mã -> mô tả
+SECRET_TYPES = {
+    "0": "Cleartext",
+    "5": "MD5",
+    "7": "Type 7 (giải mã được)",
+    "8": "PBKDF2-SHA256",
+    "9": "Scrypt",
+    "none": "Không mật khẩu",
+}
+# 'username ... secret' không ghi kiểu: kiểu theo algorithm-type (mặc định IOS băm MD5)
+ALGORITHM_TYPES = {"md5": "5", "sha256": "8", "scrypt": "9"}
+DEFAULT_PRIVILEGE = 1
+_SECRET_CODES = tuple(SECRET_TYPES) + (None,)
+
+USERNAME_LINE_PATTERN = re.compile(r"^username\s+(\S+)(.*)$", re.IGNORECASE)
+
+
+def parse_username_line(line):
+    """
+    Phân tích một dòng 'username'. Chỉ giữ kiểu mật khẩu, không giữ mật khẩu.
+    Args:
+        line (str): Dòng cấu hình, ví dụ "username admin privilege 15 secret 9 $9$...".
+
+    Returns:
+        tuple | None: (username, {"privilege": int, "secret_type": mã trong SECRET_TYPES hoặc None}),
+            None nếu không phải dòng username.
+    """
+    match = USERNAME_LINE_PATTERN.match(line.strip())
+    if not match:
+        return None
+    words = match.group(2).split()
+    account = {"privilege": DEFAULT_PRIVILEGE, "secret_type": None}
+    algorithm = None
+    position = 0
+    while position < len(words):
+        word = words[position].lower()
+        following = words[position + 1] if position + 1 < len(words) else None
+        if word == "privilege" and following and following.isdigit():
+            account["privilege"] = int(following)
+            position += 1
+        elif word == "algorithm-type" and following:
+            algorithm = ALGORITHM_TYPES.get(following.lower())
+            position += 1
+        elif word == "nopassword":
+            account["secret_type"] = "none"
+        elif word in ("secret", "password"):
+            # Phần còn lại của dòng là [kiểu] <mật khẩu>
+            if following in SECRET_TYPES and position + 2 < len(words):
+                account["secret_type"] = following
+            else:
+                account["secret_type"] = (algorithm or "5") if word == "secret" else "0"
+            break
+        position += 1
+    return match.group(1), account
+
+
+def parse_accounts(config_data):
+    """
+    Liệt kê tài khoản local trong running-config (bản chụp đầu tiên trong log).
+    Args:
+        config_data (str): Nội dung log đã chuẩn hoá.
+
+    Returns:
+        dict: Username -> {"privilege", "secret_type"} (dòng sau ghi đè dòng trước của cùng username).
+    """
+    accounts = {}
+    for key in split_stanzas(config_data):
+        if key[:9].lower() != "username ":
+            continue
+        parsed = parse_username_line(key)
+        if parsed:
+            accounts[sys.intern(parsed[0])] = parsed[1]
+    return accounts
+
+
+class AccountIndex:
+    """
+    Chỉ mục ngược tài khoản local trên toàn fleet: username -> thiết bị -> (privilege, kiểu mật khẩu).
+    Username và tên thiết bị được intern, mỗi cặp (tài khoản, thiết bị) chỉ là một số nguyên
+    (privilege << 4 | mã kiểu mật khẩu), nên truy vấn toàn fleet là tra dict, không đọc lại cấu hình.
+    """
+
+    def __init__(self):
+        self.devices = []
+        self._device_ids = {}
+        self.accounts = {}
+        self._device_accounts = {}
+
+    def __len__(self):
+        return len(self.accounts)
+
+    def _device_id(self, device):
+        device_id = self._device_ids.get(device)
+        if device_id is None:
+            device_id = self._device_ids[sys.intern(device)] = len(self.devices)
+            self.devices.append(device)
+        return device_id
+
+    @staticmethod
+    def _pack(account):
+        return account["privilege"] << 4 | _SECRET_CODES.index(account["secret_type"])
+
+    @staticmethod
+    def _unpack(packed):
+        return {"privilege": packed >> 4, "secret_type": _SECRET_CODES[packed & 0xF]}
+
+    def add_device(self, device, accounts):
+        """
+        Thêm (hoặc thay thế) danh sách tài khoản của một thiết bị.
+        Args:
+            device (str): Tên thiết bị.
+            accounts (dict): Kết quả từ parse_accounts.
+        """
+        device_id = self._device_id(device)
+        for username in self._device_accounts.pop(device_id, ()):
+            postings = self.accounts[username]
+            del postings[device_id]
+            if not postings:
+                del self.accounts[username]
+        for username, account in accounts.items():
+            username = sys.intern(username)
+            self.accounts.setdefault(username, {})[device_id] = self._pack(account)
+        self._device_accounts[device_id] = list(map(sys.intern, accounts))
+
+    def devices_with_account(self, username):
+        """
+        Các thiết bị còn tài khoản local này.
+        Args:
+            username (str): Username.
+
+        Returns:
+            dict: Tên thiết bị -> {"privilege", "secret_type"}.
+        """
+        return {self.devices[device_id]: self._unpack(packed)
+                for device_id, packed in self.accounts.get(username, {}).items()}
+
+    def device_accounts(self, device):
+        device_id = self._device_ids.get(device)
+        if device_id is None:
+            return {}
+        return {username: self._unpack(self.accounts[username][device_id])
+                for username in self._device_accounts.get(device_id, ())}
+
+    def query(self, min_devices=1, privilege=None, secret_types=None):
+        """
+        Tìm tài khoản theo điều kiện trên toàn fleet.
+        Args:
+            min_devices (int): Chỉ lấy tài khoản có trên ít nhất số thiết bị này (tính theo thiết bị thoả điều kiện).
+            privilege (int | None): Chỉ tính thiết bị mà tài khoản có privilege này.
+            secret_types (iterable | None): Chỉ tính thiết bị mà mật khẩu có kiểu thuộc danh sách này.
+
+        Returns:
+            list: Các cặp (username, số thiết bị), nhiều thiết bị nhất trước.
+        """
+        codes = {_SECRET_CODES.index(secret_type) for secret_type in secret_types} if secret_types else None
+        matches = []
+        for username, postings in self.accounts.items():
+            count = sum(1 for packed in postings.values()
+                        if (privilege is None or packed >> 4 == privilege)
+                        and (codes is None or packed & 0xF in codes))
+            if count and count >= min_devices:
+                matches.append((username, count))
+        matches.sort(key=lambda item: (-item[1], item[0]))
+        return matches
+
+    def save(self, path=ACCOUNT_INDEX_FILE):
+        """
+        Ghi chỉ mục ra file JSON (ghi file tạm rồi đổi tên).
+        Args:
+            path (str): Đường dẫn file chỉ mục.
+        """
+        data = {
+            "version": INDEX_VERSION,
+            "devices": self.devices,
+            "accounts": {username: [[device_id, packed] for device_id, packed in postings.items()]
+                         for username, postings in self.accounts.items()},
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".account-index-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(data, file, ensure_ascii=False, separators=(",", ":"))
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path=ACCOUNT_INDEX_FILE):
+        """
+        Nạp chỉ mục từ file (chỉ mục rỗng nếu chưa có file, file hỏng hoặc khác phiên bản).
+        Args:
+            path (str): Đường dẫn file chỉ mục.
+
+        Returns:
+            AccountIndex: Chỉ mục đã nạp.
+        """
+        index = cls()
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return index
+        if data.get("version") != INDEX_VERSION:
+            return index
+        for device in data["devices"]:
+            index._device_id(device)
+        for username, postings in data["accounts"].items():
+            username = sys.intern(username)
+            index.accounts[username] = {device_id: packed for device_id, packed in postings}
+            for device_id, _ in postings:
+                index._device_accounts.setdefault(device_id, []).append(username)
+        return index
+
+
+def display_account_query(matches, title):
+    print(f"\033[1m{title}: {len(matches)} tài khoản\033[0m")
+    for username, count in matches:
+        print(f"  - {username}: {count} thiết bị")
+
+
+def display_account_devices(username, devices):
+    print(f"\033[1mTài khoản '{username}' có trên {len(devices)} thiết bị:\033[0m")
+    for device, account in sorted(devices.items()):
+        print(f"  - {device}: privilege {account['privilege']}, "
+              f"mật khẩu {SECRET_TYPES.get(account['secret_type'], 'không rõ')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Truy vấn chỉ mục tài khoản local toàn fleet (tạo bởi fleet_runner --account-index).")
+    parser.add_argument("--index", type=str, default=ACCOUNT_INDEX_FILE, help="File chỉ mục tài khoản.")
+    parser.add_argument("--user", type=str, help="Liệt kê các thiết bị còn tài khoản này.")
+    parser.add_argument("--device", type=str, help="Liệt kê tài khoản trên thiết bị này.")
+    parser.add_argument("--min-devices", type=int, default=1, help="Chỉ lấy tài khoản có trên ít nhất số thiết bị này.")
+    parser.add_argument("--privilege", type=int, help="Chỉ tính thiết bị mà tài khoản có privilege này.")
+    parser.add_argument("--secret-type", action="append", choices=sorted(SECRET_TYPES),
+                        help="Chỉ tính thiết bị mà mật khẩu có kiểu này (có thể lặp lại).")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.index):
+        print(f"Lỗi: Không tìm thấy file chỉ mục '{args.index}'.")
+        return
+    index = AccountIndex.load(args.index)
+    if args.user:
+        display_account_devices(args.user, index.devices_with_account(args.user))
+    elif args.device:
+        accounts = index.device_accounts(args.device)
+        print(f"\033[1mThiết bị '{args.device}': {len(accounts)} tài khoản\033[0m")
+        for username, account in sorted(accounts.items()):
+            print(f"  - {username}: privilege {account['privilege']}, "
+                  f"mật khẩu {SECRET_TYPES.get(account['secret_type'], 'không rõ')}")
+    else:
+        display_account_query(index.query(args.min_devices, args.privilege, args.secret_type),
+                              f"Tài khoản trên ít nhất {args.min_devices} thiết bị")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+import gzip
+import os
+import tarfile
+import zipfile
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from itertools import groupby
+
+from log_normalizer import normalize_log_bytes
+from log_scanner import compile_bytes_pattern, open_log_buffer, present_patterns
+
+try:
+    import zstandard  # Tuỳ chọn: chỉ cần khi có bundle .zst
+except ImportError:
+    zstandard = None
+
+LOG_EXTENSIONS = (".log", ".txt")
+TAR_EXTENSIONS = (".tar", ".tar.gz", ".tgz", ".tar.zst")
+
+# Kích thước mỗi lần đọc khi giải nén và giới hạn dung lượng sau giải nén của một member
+CHUNK_SIZE = 1 << 20
+MAX_MEMBER_SIZE = 1 << 30
+# Số member được đọc song song (và số member tối đa đang chờ trong bộ nhớ)
+MAX_WORKERS = 4
+
+# kind: "file", "gzip", "zstd", "zip", "tar" hoặc "unreadable" (archive tar không liệt kê được member, xem
+# unreadable_archive); member: tên member trong archive (None với file thường)
+LogSource = namedtuple("LogSource", ["name", "path", "member", "kind", "size"])
+
+# Lỗi của luồng tar hỏng hoặc bị cắt cụt (gzip báo EOFError, zstd báo ZstdError): không đọc tiếp được member nào
+TAR_STREAM_ERRORS = (tarfile.TarError, EOFError, OSError) + ((zstandard.ZstdError,) if zstandard is not None else ())
+
+
+class LoadedLog:
+    """
+    Một file log (hoặc member trong archive) đã được đọc và chuẩn hoá.
+    Lỗi khi đọc được giữ lại và chỉ ném ra khi truy cập `text`, để vòng lặp xử lý từng file
+    vẫn bắt lỗi theo từng file như trước. `markers` là tên các mẫu (xem iter_logs) có mặt
+    trong dữ liệu thô, được quét trước khi giải mã.
+    """
+
+    __slots__ = ("source", "digest", "matched", "markers", "_text", "_error")
+
+    def __init__(self, source, digest=None, text=None, matched=True, error=None, markers=frozenset()):
+        self.source = source
+        self.digest = digest
+        self.matched = matched
+        self.markers = markers
+        self._text = text
+        self._error = error
+
+    @property
+    def name(self):
+        return self.source.name
+
+    @property
+    def text(self):
+        if self._error is not None:
+            raise self._error
+        return self._text
+
+
+def _is_log_name(name):
+    return name.lower().endswith(LOG_EXTENSIONS)
+
+
+def _strip_suffix(name, suffix):
+    return name[: -len(suffix)] if name.lower().endswith(suffix) else name
+
+
+def _read_bounded(stream, limit=MAX_MEMBER_SIZE):
+    """
+    Đọc một luồng đã giải nén theo từng khối CHUNK_SIZE, dừng nếu vượt quá giới hạn.
+    Args:
+        stream: Đối tượng file nhị phân.
+        limit (int): Dung lượng tối đa sau giải nén (chống archive bom).
+
+    Returns:
+        bytes: Nội dung của luồng.
+    """
+    data = bytearray()
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            return bytes(data)
+        data += chunk
+        if len(data) > limit:
+            raise ValueError(f"Member vượt quá giới hạn {limit} byte sau khi giải nén.")
+
+
+def _open_zstd(path):
+    if zstandard is None:
+        raise RuntimeError("Cần cài đặt gói 'zstandard' để đọc file .zst.")
+    return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+
+
+@contextmanager
+def _open_tar_stream(path):
+    # tarfile.open(fileobj=...) không đóng fileobj truyền vào: luồng zstd phải được đóng riêng
+    if path.lower().endswith(".tar.zst"):
+        with _open_zstd(path) as raw, tarfile.open(fileobj=raw, mode="r|") as archive:
+            yield archive
+    else:
+        with tarfile.open(path, mode="r|*") as archive:
+            yield archive
+
+
+def list_log_sources(folder_path):
+    """
+    Liệt kê các nguồn log trong thư mục: file .log/.txt thường, file .gz/.zst đơn lẻ
+    và các member .log/.txt bên trong .zip, .tar, .tar.gz/.tgz, .tar.zst.
+    Args:
+        folder_path (str): Đường dẫn tới thư mục chứa file log hoặc bundle nén.
+
+    Returns:
+        list: Danh sách LogSource (chưa đọc nội dung).
+    """
+    sources = []
+    for file_name in sorted(os.listdir(folder_path)):
+        path = os.path.join(folder_path, file_name)
+        if not os.path.isfile(path):
+            continue
+        lower_name = file_name.lower()
+        size = os.path.getsize(path)
+
+        if _is_log_name(lower_name):
+            sources.append(LogSource(path, path, None, "file", size))
+        elif lower_name.endswith(TAR_EXTENSIONS):
+            # Với tar chỉ ghi nhận archive; member được liệt kê khi đọc tuần tự (xem iter_logs)
+            # hoặc qua list_tar_members khi cần tên từng member
+            sources.append(LogSource(path, path, None, "tar", size))
+        elif lower_name.endswith(".zip"):
+            try:
+                with zipfile.ZipFile(path) as archive:
+                    members = [info for info in archive.infolist() if not info.is_dir() and _is_log_name(info.filename)]
+            except (zipfile.BadZipFile, OSError):
+                # Archive không đọc được: vẫn ghi nhận cả archive, lỗi được báo khi đọc (xem LoadedLog)
+                sources.append(LogSource(path, path, None, "zip", size))
+                continue
+            for info in members:
+                sources.append(LogSource(f"{path}!{info.filename}", path, info.filename, "zip", info.file_size))
+        elif lower_name.endswith(".gz") and _is_log_name(_strip_suffix(lower_name, ".gz")):
+            sources.append(LogSource(_strip_suffix(path, ".gz"), path, None, "gzip", size))
+        elif lower_name.endswith(".zst") and _is_log_name(_strip_suffix(lower_name, ".zst")):
+            sources.append(LogSource(_strip_suffix(path, ".zst"), path, None, "zstd", size))
+    return sources
+
+
+def list_tar_members(source):
+    """
+    Liệt kê các member .log/.txt của một archive tar (cần giải nén một lượt nếu tar có nén).
+    Args:
+        source (LogSource): Nguồn tar do list_log_sources trả về.
+
+    Returns:
+        list: Danh sách LogSource, mỗi phần tử ứng với một member.
+    """
+    with _open_tar_stream(source.path) as archive:
+        return [
+            LogSource(f"{source.path}!{member.name}", source.path, member.name, "tar", member.size)
+            for member in archive
+            if member.isfile() and _is_log_name(member.name)
+        ]
+
+
+def unreadable_archive(source):
+    """
+    Ghi nhận một archive tar không liệt kê được member như một nguồn duy nhất; đọc nguồn này
+    (read_log_source, iter_logs) luôn báo lại lỗi của archive, tương tự archive zip hỏng.
+    Args:
+        source (LogSource): Nguồn tar do list_log_sources trả về.
+
+    Returns:
+        LogSource: Nguồn kiểu "unreadable".
+    """
+    return source._replace(member=None, kind="unreadable")
+
+
+def read_log_head(source, size=4096):
+    """
+    Đọc phần đầu của một nguồn log (ví dụ để lấy dấu nhắc lệnh) mà không đọc cả file.
+    Args:
+        source (LogSource): Nguồn log (member trong tar không được hỗ trợ).
+        size (int): Số byte cần đọc.
+
+    Returns:
+        bytes | None: Phần đầu nội dung hoặc None nếu không đọc được.
+    """
+    try:
+        if source.kind == "file":
+            with open(source.path, "rb") as stream:
+                return stream.read(size)
+        if source.kind == "zip":
+            with zipfile.ZipFile(source.path) as archive, archive.open(source.member) as stream:
+                return stream.read(size)
+        if source.kind == "gzip":
+            with gzip.open(source.path, "rb") as stream:
+                return stream.read(size)
+        if source.kind == "zstd":
+            with _open_zstd(source.path) as stream:
+                return stream.read(size)
+    except Exception:
+        return None
+    return None
+
+
+def read_log_source(source):
+    """
+    Đọc nội dung thô (bytes) của một nguồn log không phải tar (nguồn "unreadable" luôn báo lỗi của archive).
+    Args:
+        source (LogSource): Nguồn log.
+
+    Returns:
+        bytes: Nội dung đã giải nén.
+    """
+    if source.kind == "unreadable":
+        # Liệt kê lại để báo đúng lỗi của archive
+        list_tar_members(source)
+        raise tarfile.ReadError(f"Không đọc được danh sách member của archive: {source.path}")
+    if source.kind == "zip":
+        # Mỗi lần đọc mở ZipFile riêng để các luồng đọc song song không dùng chung con trỏ file
+        with zipfile.ZipFile(source.path) as archive:
+            if source.member is None:
+                raise zipfile.BadZipFile(f"Không đọc được danh sách member của archive: {source.path}")
+            with archive.open(source.member) as stream:
+                return _read_bounded(stream)
+    if source.kind == "gzip":
+        with gzip.open(source.path, "rb") as stream:
+            return _read_bounded(stream)
+    if source.kind == "zstd":
+        with _open_zstd(source.path) as stream:
+            return _read_bounded(stream)
+    with open(source.path, "rb") as stream:
+        return _read_bounded(stream)
+
+
+def _load_buffer(source, buffer, require=None, markers=None):
+    # Các mẫu lọc trước chạy trên dữ liệu thô; chỉ giải mã khi nguồn khớp `require`
+    found = present_patterns(buffer, markers) if markers else frozenset()
+    if require is not None and not require.search(buffer):
+        return LoadedLog(source, matched=False, markers=found)
+    digest, text = normalize_log_bytes(buffer)
+    return LoadedLog(source, digest, text, markers=found)
+
+
+def _load_source(source, require=None, markers=None):
+    try:
+        if source.kind == "file":
+            # File thường: quét và băm trực tiếp trên buffer mmap
+            with open_log_buffer(source.path) as buffer:
+                return _load_buffer(source, buffer, require, markers)
+        return _load_buffer(source, read_log_source(source), require, markers)
+    except Exception as e:
+        return LoadedLog(source, error=e)
+
+
+def _iter_tar_members(source, require=None, members=None, markers=None):
+    # Đọc tuần tự (chế độ stream) để không phải giải nén lại archive cho từng member;
+    # members (nếu có) giới hạn các member cần đọc, các member khác chỉ bị bỏ qua
+    remaining = set(members) if members is not None else None
+    with ExitStack() as stack:
+        try:
+            archive = stack.enter_context(_open_tar_stream(source.path))
+        except Exception as e:
+            yield LoadedLog(source, error=e)
+            return
+
+        try:
+            for member in archive:
+                if not member.isfile() or not _is_log_name(member.name):
+                    continue
+                if remaining is not None:
+                    if member.name not in remaining:
+                        continue
+                    remaining.discard(member.name)
+                member_source = LogSource(f"{source.path}!{member.name}", source.path, member.name, "tar", member.size)
+                try:
+                    raw = _read_bounded(archive.extractfile(member))
+                except TAR_STREAM_ERRORS:
+                    if remaining is not None:
+                        remaining.add(member.name)
+                    raise
+                except Exception as e:
+                    yield LoadedLog(member_source, error=e)
+                    continue
+                yield _load_buffer(member_source, raw, require, markers)
+        except TAR_STREAM_ERRORS as e:
+            # Archive hỏng giữa chừng: báo lỗi một lần cho archive, hoặc cho từng member được yêu cầu chưa đọc được
+            if remaining is None:
+                yield LoadedLog(source, error=e)
+                return
+            for name in sorted(remaining):
+                yield LoadedLog(LogSource(f"{source.path}!{name}", source.path, name, "tar", None), error=e)
+
+
+def iter_logs(sources, require=None, max_workers=MAX_WORKERS, markers=None):
+    """
+    Đọc, giải nén và chuẩn hoá các nguồn log, song song giữa các file/member.
+    Kết quả được trả theo đúng thứ tự nguồn; số nguồn đang đọc dở bị giới hạn bởi max_workers
+    nên bộ nhớ không tăng theo kích thước bundle.
+    Args:
+        sources (list | str): Danh sách LogSource hoặc đường dẫn thư mục.
+        require (str | bytes | re.Pattern | None): Mẫu regex kiểm tra trên dữ liệu thô trước khi giải mã;
+            nguồn không khớp được trả về với matched=False và không được giải mã.
+        max_workers (int): Số luồng đọc song song.
+        markers (dict | None): Tên -> mẫu regex bytes; tên các mẫu có mặt trong dữ liệu thô được ghi vào
+            LoadedLog.markers (quét trên buffer mmap, không cần giải mã).
+
+    Yields:
+        LoadedLog: Log đã đọc (truy cập `.text` sẽ ném lại lỗi đọc nếu có).
+    """
+    if isinstance(sources, str):
+        sources = list_log_sources(sources)
+    if isinstance(require, (str, bytes)):
+        require = compile_bytes_pattern(require)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        # Gom các nguồn tar liên tiếp của cùng một archive để chỉ đọc archive đó một lượt
+        for (_, is_tar), group in groupby(sources, key=lambda s: (s.path, s.kind == "tar")):
+            if is_tar:
+                # Trả hết các nguồn đang đọc trước đó để giữ thứ tự
+                while pending:
+                    yield pending.popleft().result()
+                group = list(group)
+                members = None if any(s.member is None for s in group) else {s.member for s in group}
+                yield from _iter_tar_members(group[0], require, members, markers)
+                continue
+
+            for source in group:
+                pending.append(executor.submit(_load_source, source, require, markers))
+                if len(pending) >= max_workers:
+                    yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
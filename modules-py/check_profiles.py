@@ -0,0 +1,98 @@
+import re
+
+from fleet_inventory import infer_role_from_hostname
+from log_normalizer import find_hostname
+
+# Các mục kiểm tra áp dụng cho mọi thiết bị (firmware, quản trị, tài khoản, NTP/Logging/SNMP)
+COMMON_CHECKS = (
+    "1.1", "5.1", "5.2.1", "5.2.2", "5.2.4", "5.2.5",
+    "5.3.1", "5.3.2", "5.3.3", "5.3.4", "5.3.5", "6.1",
+)
+# Các mục kiểm tra chỉ có ý nghĩa trên switch (port, VLAN, STP, DHCP snooping)
+SWITCHING_CHECKS = ("2.1", "3.1", "3.2.1", "3.2.2", "3.2.3", "3.3")
+# Các mục kiểm tra chỉ có ý nghĩa trên thiết bị định tuyến (FHRP, IGP, BGP, VRF)
+ROUTING_CHECKS = (
+    "4.1.1", "4.1.2", "4.1.3", "4.1.4", "4.1.5",
+    "4.2.1", "4.2.2", "4.2.3", "4.2.4", "4.3",
+)
+ALL_CHECKS = COMMON_CHECKS + SWITCHING_CHECKS + ROUTING_CHECKS
+
+# Vai trò thiết bị -> các mục kiểm tra cần chạy.
+# Switch phân phối/lõi thường chạy cả định tuyến nên áp dụng toàn bộ;
+# vai trò không xác định cũng chạy toàn bộ để không bỏ sót.
+ROLE_PROFILES = {
+    "access_switch": COMMON_CHECKS + SWITCHING_CHECKS,
+    "switch": COMMON_CHECKS + SWITCHING_CHECKS,
+    "distribution_switch": ALL_CHECKS,
+    "core_switch": ALL_CHECKS,
+    "router": COMMON_CHECKS + ROUTING_CHECKS,
+    "firewall": COMMON_CHECKS + ROUTING_CHECKS,
+    "unknown": ALL_CHECKS,
+}
+
+# Dấu hiệu cấu hình dùng để suy ra vai trò khi hostname không có token vai trò
+ROUTING_FEATURE_PATTERN = re.compile(r"^(?:router (?:bgp|ospf|eigrp|rip|isis)\b|ip routing\s*$)", re.MULTILINE | re.IGNORECASE)
+SWITCHING_FEATURE_PATTERN = re.compile(r"^(?:\s*switchport\b|Switchport: Enabled|spanning-tree mode\b)", re.MULTILINE | re.IGNORECASE)
+
+
+def infer_role_from_config(config_data):
+    """
+    Suy ra vai trò thiết bị từ các tính năng được cấu hình.
+    Args:
+        config_data (str): Nội dung file log.
+
+    Returns:
+        str: "router", "switch", "distribution_switch" (switch lớp 3) hoặc "unknown".
+    """
+    has_routing = bool(ROUTING_FEATURE_PATTERN.search(config_data))
+    has_switching = bool(SWITCHING_FEATURE_PATTERN.search(config_data))
+    if has_routing and has_switching:
+        return "distribution_switch"
+    if has_routing:
+        return "router"
+    if has_switching:
+        return "switch"
+    return "unknown"
+
+
+def infer_device_role(hostname=None, config_data=None):
+    """
+    Xác định vai trò thiết bị: ưu tiên token trong hostname, sau đó đến tính năng trong cấu hình.
+    Args:
+        hostname (str | None): Hostname (lấy từ tên file hoặc dấu nhắc lệnh).
+        config_data (str | None): Nội dung file log.
+
+    Returns:
+        str: Vai trò thiết bị (khóa của ROLE_PROFILES).
+    """
+    if hostname is None and config_data:
+        hostname = find_hostname(config_data)
+    role = infer_role_from_hostname(hostname)
+    if role == "unknown" and config_data:
+        role = infer_role_from_config(config_data)
+    return role
+
+
+def applicable_checks(role):
+    """
+    Lấy danh sách mục kiểm tra áp dụng cho một vai trò.
+    Args:
+        role (str): Vai trò thiết bị.
+
+    Returns:
+        tuple: Mã các mục kiểm tra (vai trò lạ được coi như "unknown").
+    """
+    return ROLE_PROFILES.get(role, ROLE_PROFILES["unknown"])
+
+
+def is_applicable(check_id, role):
+    """
+    Kiểm tra một mục kiểm tra có áp dụng cho vai trò thiết bị hay không.
+    Args:
+        check_id (str): Mã mục kiểm tra, ví dụ "4.2.2".
+        role (str): Vai trò thiết bị.
+
+    Returns:
+        bool: True nếu cần chạy mục kiểm tra.
+    """
+    return check_id in applicable_checks(role)
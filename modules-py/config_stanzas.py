@@ -0,0 +1,112 @@
+import hashlib
+import re
+from collections import namedtuple
+
+from fleet_scheduler import RUNNING_CONFIG, split_command_sections
+
+# key: dòng đầu của stanza (lệnh show được đánh dấu bằng SHOW_KEY_PREFIX); text: nội dung dùng để tính digest
+Stanza = namedtuple("Stanza", ["key", "text", "digest"])
+
+# Khoá của stanza lấy từ output lệnh show (không phải running-config), ví dụ "#show version"
+SHOW_KEY_PREFIX = "#"
+# Dòng thay đổi theo thời gian dù cấu hình không đổi: bỏ qua khi so sánh hai bản chụp
+VOLATILE_LINE_PATTERN = re.compile(
+    r"^(?:.*\buptime is\b|System returned to ROM|Building configuration|Current configuration\s*:"
+    r"|!\s*(?:Last configuration change|NVRAM config last updated)|ntp clock-period\b)",
+    re.IGNORECASE,
+)
+
+
+def _digest(lines):
+    return hashlib.sha1("\n".join(lines).encode("utf-8")).hexdigest()
+
+
+def _add_stanza(stanzas, key, lines):
+    # Khoá trùng (ví dụ dòng banner lặp lại) được đánh số thứ tự để không ghi đè stanza trước
+    unique_key = key
+    occurrence = 1
+    while unique_key in stanzas:
+        occurrence += 1
+        unique_key = f"{key} #{occurrence}"
+    stanzas[unique_key] = Stanza(unique_key, "\n".join(lines), _digest(lines))
+
+
+def split_config_stanzas(config_text, stanzas=None):
+    """
+    Tách running-config thành các stanza: mỗi dòng không thụt lề mở một stanza mới,
+    các dòng thụt lề theo sau thuộc stanza đó; dòng '!' kết thúc stanza.
+    Args:
+        config_text (str): Nội dung running-config.
+        stanzas (dict | None): Dict để thêm stanza vào (None để tạo mới).
+
+    Returns:
+        dict: Khoá stanza -> Stanza, theo thứ tự xuất hiện.
+    """
+    stanzas = {} if stanzas is None else stanzas
+    key, lines = None, []
+    for raw_line in config_text.splitlines():
+        line = raw_line.rstrip()
+        if not line.strip() or VOLATILE_LINE_PATTERN.match(line):
+            continue
+        if line.lstrip().startswith("!"):
+            if key is not None:
+                _add_stanza(stanzas, key, lines)
+            key, lines = None, []
+            continue
+        if line[0] in " \t" and key is not None:
+            lines.append(line)
+            continue
+        if key is not None:
+            _add_stanza(stanzas, key, lines)
+        key, lines = line.strip(), [line.strip()]
+    if key is not None:
+        _add_stanza(stanzas, key, lines)
+    return stanzas
+
+
+def split_stanzas(config_data):
+    """
+    Tách log của một thiết bị thành các stanza để so sánh giữa hai bản chụp.
+    Phần running-config được tách theo stanza cấu hình; output của mỗi lệnh show khác (kể cả
+    'show run | include ...') là một stanza với khoá "#<lệnh>". Log không có dấu nhắc lệnh được coi là running-config.
+    Args:
+        config_data (str): Nội dung log đã chuẩn hoá.
+
+    Returns:
+        dict: Khoá stanza -> Stanza.
+    """
+    stanzas = {}
+    has_running_config = False
+    for command, text in split_command_sections(config_data):
+        if not command:
+            split_config_stanzas(text, stanzas)
+            continue
+        if command.startswith(RUNNING_CONFIG) and "|" not in command:
+            # Log thường chụp running-config nhiều lần (show run, show run view full): chỉ tách bản đầu tiên.
+            # Dòng lệnh (dòng đầu) được bỏ để dấu nhắc không thành một stanza.
+            if not has_running_config:
+                split_config_stanzas(text.split("\n", 1)[-1], stanzas)
+                has_running_config = True
+            continue
+        lines = [line.rstrip() for line in text.splitlines()[1:]
+                 if line.strip() and not VOLATILE_LINE_PATTERN.match(line)]
+        _add_stanza(stanzas, SHOW_KEY_PREFIX + command, lines)
+    return stanzas
+
+
+def diff_stanzas(old_stanzas, new_stanzas):
+    """
+    So sánh hai tập stanza theo khoá và mã băm nội dung.
+    Args:
+        old_stanzas (dict): Stanza của bản chụp cũ.
+        new_stanzas (dict): Stanza của bản chụp mới.
+
+    Returns:
+        dict: {"added": [...], "removed": [...], "changed": [...]} (danh sách khoá stanza).
+    """
+    return {
+        "added": [key for key in new_stanzas if key not in old_stanzas],
+        "removed": [key for key in old_stanzas if key not in new_stanzas],
+        "changed": [key for key, stanza in new_stanzas.items()
+                    if key in old_stanzas and old_stanzas[key].digest != stanza.digest],
+    }
@@ -0,0 +1,227 @@
+import argparse
+import os
+import re
+from datetime import date, datetime
+
+from archive_reader import TAR_STREAM_ERRORS, list_log_sources, list_tar_members, read_log_head, unreadable_archive
+from log_normalizer import find_hostname
+from log_scanner import decode_evidence
+
+# Tên file theo dạng <ip>-<hostname>[-<yyyymmdd>].log, ví dụ:
+#   10.22.203.102-HN-22HV-SW-ACCESS-02-20250106.log
+#   10.22.122.10HN-22HV-ROUTER-WIFI.log (thiếu dấu '-' sau IP, không có ngày)
+FILENAME_PATTERN = re.compile(
+    r"^(?P<ip>\d{1,3}(?:\.\d{1,3}){3})[-_]?(?P<hostname>.*?)(?:[-_](?P<date>\d{8}))?\.(?:log|txt)$",
+    re.IGNORECASE,
+)
+
+# Token trong hostname -> vai trò thiết bị (xét theo thứ tự, token cụ thể đứng trước)
+ROLE_TOKENS = [
+    ("SW-ACCESS", "access_switch"),
+    ("SW-ACC", "access_switch"),
+    ("SW-DIST", "distribution_switch"),
+    ("SW-CORE", "core_switch"),
+    ("ROUTER", "router"),
+    ("RT", "router"),
+    ("FW", "firewall"),
+    ("SW", "switch"),
+]
+
+
+def infer_role_from_hostname(hostname):
+    """
+    Suy ra vai trò thiết bị từ các token trong hostname (SW-ACCESS, ROUTER, ...).
+    Args:
+        hostname (str | None): Hostname của thiết bị.
+
+    Returns:
+        str: Vai trò ("access_switch", "router", ...) hoặc "unknown".
+    """
+    if not hostname:
+        return "unknown"
+    tokens = hostname.upper().split("-")
+    for token, role in ROLE_TOKENS:
+        parts = token.split("-")
+        # Khớp theo token nguyên vẹn để "RT" không khớp nhầm với "PORT"
+        for i in range(len(tokens) - len(parts) + 1):
+            if tokens[i:i + len(parts)] == parts:
+                return role
+    return "unknown"
+
+
+def parse_capture_filename(file_name):
+    """
+    Phân tích tên file log để lấy IP, hostname, site, vai trò và ngày chụp cấu hình.
+    Args:
+        file_name (str): Tên file (hoặc tên member trong archive).
+
+    Returns:
+        dict | None: Thông tin thiết bị hoặc None nếu tên file không theo quy ước.
+    """
+    match = FILENAME_PATTERN.match(os.path.basename(file_name))
+    if not match or not match.group("hostname"):
+        return None
+
+    hostname = match.group("hostname").strip("-_")
+    snapshot_date = None
+    if match.group("date"):
+        try:
+            snapshot_date = datetime.strptime(match.group("date"), "%Y%m%d").date()
+        except ValueError:
+            snapshot_date = None
+
+    return {
+        "ip": match.group("ip"),
+        "hostname": hostname,
+        "site": hostname.split("-")[0].upper(),
+        "role": infer_role_from_hostname(hostname),
+        "date": snapshot_date,
+    }
+
+
+def build_inventory(folder_path, verify_hostnames=False):
+    """
+    Quét thư mục một lần để lập danh mục thiết bị từ tên file (không đọc nội dung file).
+    Chỉ đọc phần đầu file để lấy hostname từ dấu nhắc khi tên file không theo quy ước
+    hoặc khi verify_hostnames=True.
+    Args:
+        folder_path (str): Đường dẫn tới thư mục chứa file log hoặc bundle nén.
+        verify_hostnames (bool): Luôn lấy hostname từ dấu nhắc lệnh đầu tiên.
+
+    Returns:
+        list: Danh sách dict {ip, hostname, site, role, date, source}.
+    """
+    sources = []
+    for source in list_log_sources(folder_path):
+        if source.kind == "tar" and source.member is None:
+            try:
+                sources.extend(list_tar_members(source))
+            except TAR_STREAM_ERRORS:
+                # Bundle hỏng: vẫn ghi nhận cả archive, lỗi được báo khi đọc (xem LoadedLog)
+                sources.append(unreadable_archive(source))
+        else:
+            sources.append(source)
+
+    inventory = []
+    for source in sources:
+        entry = parse_capture_filename(source.member or source.path)
+        if entry is None:
+            entry = {"ip": None, "hostname": None, "site": None, "role": "unknown", "date": None}
+
+        if entry["hostname"] is None or verify_hostnames:
+            head = read_log_head(source)
+            prompt_hostname = find_hostname(decode_evidence(head)) if head else None
+            if prompt_hostname:
+                entry["hostname"] = prompt_hostname
+                entry["site"] = prompt_hostname.split("-")[0].upper()
+                entry["role"] = infer_role_from_hostname(prompt_hostname)
+
+        entry["source"] = source
+        inventory.append(entry)
+    return inventory
+
+
+def filter_inventory(inventory, site=None, role=None, since=None, until=None, hostname=None):
+    """
+    Lọc danh mục thiết bị theo site, vai trò, khoảng ngày và hostname.
+    Args:
+        inventory (list): Danh mục do build_inventory trả về.
+        site (str | None): Mã site (không phân biệt hoa thường), ví dụ "HN".
+        role (str | list | None): Một hoặc nhiều vai trò, ví dụ "access_switch".
+        since (date | None): Chỉ lấy bản chụp từ ngày này (bản chụp không có ngày bị loại).
+        until (date | None): Chỉ lấy bản chụp đến ngày này (bản chụp không có ngày bị loại).
+        hostname (str | None): Chuỗi con cần có trong hostname (không phân biệt hoa thường).
+
+    Returns:
+        list: Các phần tử thoả mãn điều kiện.
+    """
+    roles = {role} if isinstance(role, str) else set(role or ())
+    results = []
+    for entry in inventory:
+        if site and (entry["site"] or "").upper() != site.upper():
+            continue
+        if roles and entry["role"] not in roles:
+            continue
+        if since and (entry["date"] is None or entry["date"] < since):
+            continue
+        if until and (entry["date"] is None or entry["date"] > until):
+            continue
+        if hostname and hostname.upper() not in (entry["hostname"] or "").upper():
+            continue
+        results.append(entry)
+    return results
+
+
+def latest_snapshots(inventory):
+    """
+    Chọn bản chụp mới nhất cho mỗi thiết bị (theo IP, hoặc hostname nếu không có IP).
+    Args:
+        inventory (list): Danh mục thiết bị.
+
+    Returns:
+        list: Mỗi thiết bị một phần tử (bản chụp không có ngày được coi là cũ nhất).
+    """
+    latest = {}
+    for entry in inventory:
+        device_key = entry["ip"] or entry["hostname"] or entry["source"].name
+        current = latest.get(device_key)
+        if current is None or (entry["date"] or date.min, entry["source"].name) > (current["date"] or date.min, current["source"].name):
+            latest[device_key] = entry
+    return sorted(latest.values(), key=lambda entry: entry["source"].name)
+
+
+def select_sources(folder_path, site=None, role=None, since=None, until=None, latest=False):
+    """
+    Chọn các nguồn log cần kiểm tra dựa trên danh mục, để truyền vào archive_reader.iter_logs.
+    Args:
+        folder_path (str): Đường dẫn tới thư mục chứa file log.
+        site, role, since, until: Điều kiện lọc (xem filter_inventory).
+        latest (bool): Chỉ lấy bản chụp mới nhất của mỗi thiết bị.
+
+    Returns:
+        list: Danh sách LogSource.
+    """
+    entries = filter_inventory(build_inventory(folder_path), site=site, role=role, since=since, until=until)
+    if latest:
+        entries = latest_snapshots(entries)
+    return [entry["source"] for entry in entries]
+
+
+def display_inventory(inventory):
+    """
+    Hiển thị danh mục thiết bị.
+    Args:
+        inventory (list): Danh mục thiết bị.
+    """
+    print(f"{'IP':<16} {'Hostname':<28} {'Site':<6} {'Vai trò':<20} {'Ngày':<10} File")
+    for entry in inventory:
+        snapshot_date = entry["date"].isoformat() if entry["date"] else "-"
+        print(f"{entry['ip'] or '-':<16} {entry['hostname'] or '-':<28} {entry['site'] or '-':<6} "
+              f"{entry['role']:<20} {snapshot_date:<10} {entry['source'].name}")
+    print(f"\033[1mTổng số bản chụp: {len(inventory)}\033[0m")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lập danh mục thiết bị từ tên file log và dấu nhắc lệnh.")
+    parser.add_argument("folder", type=str, help="Đường dẫn tới thư mục chứa file log.")
+    parser.add_argument("--site", type=str, help="Lọc theo site (ví dụ HN).")
+    parser.add_argument("--role", type=str, action="append", help="Lọc theo vai trò (ví dụ access_switch), có thể lặp lại.")
+    parser.add_argument("--since", type=date.fromisoformat, help="Từ ngày (YYYY-MM-DD).")
+    parser.add_argument("--until", type=date.fromisoformat, help="Đến ngày (YYYY-MM-DD).")
+    parser.add_argument("--latest", action="store_true", help="Chỉ lấy bản chụp mới nhất của mỗi thiết bị.")
+    parser.add_argument("--verify-hostnames", action="store_true", help="Lấy hostname từ dấu nhắc lệnh trong file.")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.folder):
+        print(f"Lỗi: Không tìm thấy thư mục '{args.folder}'.")
+        return
+
+    inventory = build_inventory(args.folder, verify_hostnames=args.verify_hostnames)
+    inventory = filter_inventory(inventory, site=args.site, role=args.role, since=args.since, until=args.until)
+    if args.latest:
+        inventory = latest_snapshots(inventory)
+    display_inventory(inventory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,947 @@
+import argparse
+import io
+import os
+import time
+from contextlib import redirect_stdout
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+
+from archive_reader import iter_logs
+from check_profiles import ALL_CHECKS, applicable_checks, infer_device_role
+from fleet_inventory import build_inventory, filter_inventory, latest_snapshots
+from fleet_scheduler import (
+    SPLIT_THRESHOLD, WEIGHTS_FILE, estimate_cost, load_check_weights, run_largest_first,
+    save_check_weights, sections_for_check, split_command_sections, update_check_weights,
+)
+from account_index import AccountIndex
+from results_store import (
+    RESULTS_DB, STATUS_COMPLIANT, STATUS_ERROR, STATUS_MANUAL_REVIEW, STATUS_NON_COMPLIANT, STATUS_NOT_APPLICABLE,
+    STATUS_UNKNOWN, ResultsStore,
+)
+from run_journal import RUNS_DIR, RunJournal, new_run_id
+from stanza_cache import STANZA_CACHE
+
+import Module_5_3_2
+import module_1_1_check_firmware_version
+import module_2_1_shutdown_unused_ports
+import module_3_1_switchport_analysis
+import module_3_2_1_layer2_protection
+import module_3_2_2_bpdu_guard_and_portfast
+import module_3_2_3_user_isolation
+import module_3_3_dhcp_snooping
+import module_4_1_1_gateway_authentication
+import module_4_1_2_igp_authentication
+import module_4_1_3_bgp_authentication
+import module_4_1_4_encryption_analysis
+import module_4_1_5_route_filter
+import module_4_2_1_invalid_ip_filter
+import module_4_2_2_bgp_prefix_limit
+import module_4_2_3_private_as_filter
+import module_4_2_4_tcp_filter
+import module_4_3_vrf_and_interfaces_analysis
+import module_5_1_backup_analysis
+import module_5_2_1_aaa_and_usernames_analysis
+import module_5_2_2_non_admin_accounts
+import module_5_2_4
+import module_5_2_5_account_lockout
+import module_5_3_1
+import module_5_3_3
+import module_5_3_4
+import module_5_3_5
+import module_6_1
+
+
+def _analyze_and_display(analyze, display):
+    # Ghép hàm phân tích và hàm hiển thị của một module thành một bước kiểm tra
+    def run(config_data, file_name):
+        results = analyze(config_data)
+        display(results)
+        return results
+    return run
+
+
+def _run_2_1(config_data, file_name):
+    unused_ports = module_2_1_shutdown_unused_ports.extract_interface_brief(config_data)
+    results = module_2_1_shutdown_unused_ports.analyze_unused_ports(config_data)
+    if results["has_data"]:
+        module_2_1_shutdown_unused_ports.display_unused_ports(results)
+    return {"down_ports": unused_ports, "usage": results if results["has_data"] else None}
+
+
+def _run_3_1(config_data, file_name):
+    interface_configs = module_3_1_switchport_analysis.parse_switchports(config_data)
+    violations = module_3_1_switchport_analysis.vlan1_violations(interface_configs)
+    module_3_1_switchport_analysis.display_switchport_results(violations)
+    return {"violations": violations, "switchports": len(interface_configs)}
+
+
+def _run_3_3(config_data, file_name):
+    dhcp_snooping_status = module_3_3_dhcp_snooping.analyze_show_dhcp_snooping(config_data)
+    module_3_3_dhcp_snooping.display_dhcp_snooping_results(dhcp_snooping_status)
+    coverage = module_3_3_dhcp_snooping.analyze_dhcp_snooping_coverage(config_data, dhcp_snooping_status)
+    if coverage["has_data"]:
+        module_3_3_dhcp_snooping.display_dhcp_snooping_coverage(coverage)
+    return dict(dhcp_snooping_status, coverage=coverage if coverage["has_data"] else None)
+
+
+def _run_4_1_1(config_data, file_name):
+    auth_status = module_4_1_1_gateway_authentication.analyze_gateway_authentication(config_data)
+    module_4_1_1_gateway_authentication.display_gateway_authentication_results(auth_status)
+    # Nhóm gateway theo từng SVI: phát hiện cả nhóm không có dòng authentication nào
+    groups = module_4_1_1_gateway_authentication.parse_fhrp_groups(config_data)
+    unauthenticated = [group for group in groups if group["auth_mode"] is None]
+    if unauthenticated:
+        print("\033[31mNhóm gateway không cấu hình xác thực:\033[0m "
+              + ", ".join(f"{group['protocol']} {group['group']} ({group['interface']})" for group in unauthenticated))
+    return dict(auth_status, groups=groups)
+
+
+def _run_4_1_3(config_data, file_name):
+    bgp_status = module_4_1_3_bgp_authentication.analyze_bgp_authentication(config_data)
+    module_4_1_3_bgp_authentication.display_bgp_authentication_results(bgp_status)
+    # Neighbor và địa chỉ interface (chỉ dấu vân tay mật khẩu) để ghép phiên BGP toàn fleet sau lần chạy
+    bgp = module_4_1_3_bgp_authentication.parse_bgp_config(config_data) if bgp_status["configured"] else None
+    return dict(bgp_status, bgp=bgp)
+
+
+def _run_4_3(config_data, file_name):
+    results = module_4_3_vrf_and_interfaces_analysis.parse_interfaces_and_vrf(config_data)
+    module_4_3_vrf_and_interfaces_analysis.display_vrf_and_interfaces_results(results)
+    # Địa chỉ interface để tìm địa chỉ trùng/subnet chồng lấn toàn fleet sau lần chạy
+    return dict(results, prefixes=module_4_3_vrf_and_interfaces_analysis.collect_interface_prefixes(config_data))
+
+
+def _run_5_3_1(config_data, file_name):
+    mgmt_blocks, _ = module_5_3_1.check_5_3_1_mgmt_blocks(config_data)
+    module_5_3_1.display_mgmt_blocks(mgmt_blocks)
+    return mgmt_blocks
+
+
+def _run_5_3_2(config_data, file_name):
+    versions = Module_5_3_2.check_firmware_version(config_data)
+    access_methods = Module_5_3_2.check_management_access(config_data)
+    Module_5_3_2.display_results(Path(file_name), versions, access_methods)
+    return access_methods
+
+
+def _run_6_1(config_data, file_name):
+    results, snmp_configured = module_6_1.run_module_6_checks(config_data)
+    module_6_1.display_results(results, Path(file_name), snmp_configured)
+    return results
+
+
+def _run_4_1_5(config_data, file_name):
+    results = module_4_1_5_route_filter.analyze_route_filters(config_data)
+    module_4_1_5_route_filter.display_route_filter_results(results, os.path.basename(file_name))
+    return results
+
+
+def _names(items, limit=10):
+    # Liệt kê ngắn gọn cho dòng bằng chứng (bỏ trùng, giữ thứ tự)
+    items = list(dict.fromkeys(str(item) for item in items))
+    more = f" (+{len(items) - limit})" if len(items) > limit else ""
+    return ", ".join(items[:limit]) + more
+
+
+def _assess_1_1(result):
+    versions = {platform: version for platform, version in result.items() if platform != "Firmware Version"}
+    if not versions:
+        return STATUS_UNKNOWN, "Không tìm thấy phiên bản firmware."
+    # Lỗ hổng CVE của phiên bản không có trong log: cần đối chiếu thủ công
+    return STATUS_MANUAL_REVIEW, "; ".join(f"{platform} {version}" for platform, version in versions.items())
+
+
+def _assess_2_1(result):
+    usage = result["usage"]
+    if usage is not None:
+        unused = [name for name, port in usage["ports"].items() if port["verdict"] == "unused"]
+        if unused:
+            return STATUS_NON_COMPLIANT, f"Port không sử dụng chưa shutdown: {_names(unused)}"
+        return STATUS_COMPLIANT, "Không có port không sử dụng nào chưa shutdown."
+    if result["down_ports"] is None:
+        return STATUS_UNKNOWN, "Không có dữ liệu 'show ip interface brief'."
+    if result["down_ports"]:
+        return STATUS_NON_COMPLIANT, f"Port down chưa shutdown: {_names(result['down_ports'])}"
+    return STATUS_COMPLIANT, "Tất cả các port không sử dụng đã được shutdown."
+
+
+def _assess_3_1(result):
+    if not result["switchports"]:
+        return STATUS_NOT_APPLICABLE, "Không có dữ liệu 'show interfaces switchport'."
+    if result["violations"]:
+        return STATUS_NON_COMPLIANT, f"Interface dùng VLAN 1: {_names(result['violations'])}"
+    return STATUS_COMPLIANT, "Không có interface nào dùng VLAN 1."
+
+
+def _assess_3_2_1(result):
+    protections = []
+    if result["static_mapping"]:
+        protections.append(f"{len(result['static_mapping'])} static mapping IP-MAC")
+    if result["arp_inspection"]:
+        protections.append(f"DAI trên VLAN {result['arp_inspection']}")
+    if result["port_security"]:
+        protections.append(f"port-security trên {len(result['port_security'])} interface")
+    if result["dot1x"]:
+        protections.append("802.1X")
+    if protections:
+        return STATUS_COMPLIANT, "; ".join(protections)
+    return STATUS_NON_COMPLIANT, "Không cấu hình static mapping, DAI, port-security hay 802.1X."
+
+
+def _assess_3_2_2(result):
+    if result["stp_disabled_vlans"]:
+        return STATUS_NON_COMPLIANT, f"VLAN bị tắt STP: {result['stp_disabled_vlans']}"
+    if result["bpdu_guard_default"] == "enabled":
+        return STATUS_COMPLIANT, "BPDU Guard mặc định được bật cho các cổng PortFast."
+    unguarded = [interface for interface, status in result["portfast_interfaces"].items()
+                 if status["bpdu_guard"] != "enabled"]
+    if unguarded:
+        return STATUS_NON_COMPLIANT, f"Cổng PortFast chưa bật BPDU Guard: {_names(unguarded)}"
+    if result["portfast_interfaces"]:
+        return STATUS_COMPLIANT, "Tất cả các cổng PortFast đã bật BPDU Guard."
+    return STATUS_NOT_APPLICABLE, "Không tìm thấy cổng PortFast nào."
+
+
+def _assess_3_2_3(result):
+    if result["not_isolated"]:
+        return STATUS_NON_COMPLIANT, f"Cổng không được cấu hình isolate: {_names(result['not_isolated'])}"
+    if result["isolated"]:
+        return STATUS_COMPLIANT, f"Cổng được cấu hình isolate: {_names(result['isolated'])}"
+    return STATUS_NOT_APPLICABLE, "Không tìm thấy cổng người dùng."
+
+
+def _assess_3_3(result):
+    if not result["enabled"]:
+        return STATUS_NON_COMPLIANT, "DHCP Snooping chưa được bật."
+    coverage = result["coverage"]
+    if coverage is not None:
+        violations = [port for port, info in coverage["ports"].items()
+                      if info["verdict"] in module_3_3_dhcp_snooping.COVERAGE_VIOLATIONS]
+        if violations:
+            return STATUS_NON_COMPLIANT, f"Port chưa được DHCP Snooping bảo vệ đúng: {_names(violations)}"
+    if result["invalid_vlan_lists"] and not result["configured_vlans"]:
+        return STATUS_UNKNOWN, f"Không phân tích được danh sách VLAN: {'; '.join(result['invalid_vlan_lists'])}"
+    if not result["configured_vlans"]:
+        return STATUS_NON_COMPLIANT, "DHCP Snooping được bật nhưng không có VLAN nào được cấu hình."
+    return STATUS_COMPLIANT, f"DHCP Snooping trên VLAN {result['configured_vlans']}"
+
+
+def _assess_4_1_1(result):
+    if not result["groups"] and not result["configured_protocols"]:
+        return STATUS_NOT_APPLICABLE, "Không phát hiện giao thức dự phòng gateway nào."
+    unauthenticated = [f"{group['protocol']} {group['group']} ({group['interface']})"
+                       for group in result["groups"] if group["auth_mode"] is None]
+    if unauthenticated:
+        return STATUS_NON_COMPLIANT, f"Nhóm gateway không xác thực: {_names(unauthenticated)}"
+    return STATUS_COMPLIANT, f"Các nhóm gateway đều có xác thực ({len(result['groups'])} nhóm)."
+
+
+def _assess_4_1_2(result):
+    configured = {protocol: info for protocol, info in result.items() if info["configured"]}
+    if not configured:
+        return STATUS_NOT_APPLICABLE, "Thiết bị không chạy IGP."
+    unauthenticated = [protocol for protocol, info in configured.items() if not info["authenticated"]]
+    if unauthenticated:
+        return STATUS_NON_COMPLIANT, f"IGP không cấu hình xác thực: {', '.join(unauthenticated)}"
+    return STATUS_COMPLIANT, f"IGP có xác thực: {', '.join(configured)}"
+
+
+def _assess_4_1_3(result):
+    if not result["configured"]:
+        return STATUS_NOT_APPLICABLE, "Thiết bị không cấu hình BGP."
+    if result["non_authenticated_peers"]:
+        return STATUS_NON_COMPLIANT, f"BGP peer không xác thực: {_names(result['non_authenticated_peers'])}"
+    if not result["peers"]:
+        return STATUS_NOT_APPLICABLE, "BGP không có neighbor nào."
+    return STATUS_COMPLIANT, f"Tất cả {len(result['peers'])} BGP peer đều có xác thực."
+
+
+def _assess_4_1_4(result):
+    findings = []
+    strong = []
+    for protocol, info in result.items():
+        for level, label in (("cleartext", "cleartext"), ("missing_key", "thiếu khoá"), ("weak", "mã hoá yếu")):
+            if info[level]:
+                findings.append(f"{protocol} {label}: {_names(info[level], 3)}")
+        strong.extend(f"{protocol} {entry}" for entry in info["strong"])
+    if findings:
+        return STATUS_NON_COMPLIANT, "; ".join(findings)
+    if strong:
+        return STATUS_COMPLIANT, f"Xác thực định tuyến dùng mã hoá mạnh: {_names(strong, 3)}"
+    return STATUS_NOT_APPLICABLE, "Không tìm thấy cấu hình xác thực định tuyến."
+
+
+def _assess_4_1_5(result):
+    if not result["has_routing"]:
+        return STATUS_NOT_APPLICABLE, "Thiết bị không chạy giao thức định tuyến."
+    unfiltered = [f"{entry['interface']} ({entry['protocol']})" for entry in result["filter_status"]["non_compliant"]]
+    if unfiltered:
+        return STATUS_NON_COMPLIANT, f"Port end-user chưa lọc route: {_names(unfiltered)}"
+    filtered = [f"{entry['interface']} ({entry['protocol']})" for entry in result["filter_status"]["compliant"]]
+    if filtered:
+        return STATUS_COMPLIANT, f"Port end-user đã lọc route: {_names(filtered)}"
+    return STATUS_COMPLIANT, "Không có port end-user tham gia định tuyến."
+
+
+def _assess_bgp_filter(assess):
+    # Các mục 4.2.x chỉ áp dụng cho thiết bị chạy BGP
+    def run(result):
+        if not result["bgp_configured"]:
+            return STATUS_NOT_APPLICABLE, "Thiết bị không cấu hình BGP."
+        return assess(result)
+    return run
+
+
+def _assess_4_2_1(result):
+    if result["missing_filters"]:
+        # missing_filters là các mẫu regex: bỏ ký tự escape khi làm bằng chứng
+        ranges = [pattern.replace("\\", "") for pattern in result["missing_filters"]]
+        return STATUS_NON_COMPLIANT, f"Dải IP chưa được chặn: {', '.join(ranges)}"
+    return STATUS_COMPLIANT, "Đã chặn các dải IP không hợp lệ."
+
+
+def _assess_4_2_2(result):
+    if result["over_limit"]:
+        return STATUS_NON_COMPLIANT, f"maximum-prefix vượt giới hạn: {_names(result['over_limit'])}"
+    if not result["limits"]:
+        return STATUS_NON_COMPLIANT, "Không cấu hình neighbor ... maximum-prefix."
+    return STATUS_COMPLIANT, f"maximum-prefix: {_names(result['limits'])}"
+
+
+def _assess_4_2_3(result):
+    if result["remove_private_as"]:
+        return STATUS_COMPLIANT, "Đã cấu hình remove-private-as."
+    if result["private_as"]:
+        return STATUS_NON_COMPLIANT, f"Quảng bá private AS: {_names(result['private_as'])}"
+    return STATUS_NON_COMPLIANT, "Không cấu hình remove-private-as."
+
+
+def _assess_4_2_4(result):
+    if result["filters"]:
+        return STATUS_COMPLIANT, "Đã cấu hình filter cho TCP port 179."
+    return STATUS_NON_COMPLIANT, "Không cấu hình filter cho TCP port 179."
+
+
+def _assess_4_3(result):
+    if not result["public_interfaces"] and not result["mgmt_interfaces"]:
+        return STATUS_NOT_APPLICABLE, "Không có interface public hoặc MGMT."
+    issue = module_4_3_vrf_and_interfaces_analysis.vrf_separation_issue(result)
+    if issue:
+        return STATUS_NON_COMPLIANT, issue
+    return STATUS_COMPLIANT, f"VRF: {_names(result['vrf_definitions'])}"
+
+
+def _assess_issues(result):
+    # Các module trả về danh sách "issues": có vấn đề là Không Tuân Thủ
+    if result["issues"]:
+        return STATUS_NON_COMPLIANT, "; ".join(sorted(result["issues"]))
+    return STATUS_COMPLIANT, None
+
+
+def _assess_5_2_2(result):
+    if result["admin_accounts"]:
+        return STATUS_NON_COMPLIANT, f"Tài khoản quản trị dùng chung: {_names(result['admin_accounts'])}"
+    if not result["accounts"]:
+        return STATUS_NOT_APPLICABLE, "Không có tài khoản local."
+    return STATUS_COMPLIANT, f"Tài khoản cá nhân: {_names(result['non_admin_accounts'])}"
+
+
+def _assess_5_2_4(result):
+    credentials = result["credentials"]
+    if credentials["weak"]:
+        return STATUS_NON_COMPLIANT, f"{credentials['weak']} dòng lưu thông tin xác thực dạng cleartext hoặc type 7."
+    if not result["policy_enabled"]:
+        return STATUS_NON_COMPLIANT, "; ".join(result["issues"])
+    return STATUS_COMPLIANT, "; ".join(result["policies"])
+
+
+def _assess_5_2_5(result):
+    if result["lockout_found"] and not result["issues"]:
+        return STATUS_COMPLIANT, f"Khoá sau {result['attempts_limit']} lần sai trong {result['lockout_duration']} giây."
+    return STATUS_NON_COMPLIANT, "; ".join(result["issues"])
+
+
+def _assess_5_3_1(result):
+    if result:
+        return STATUS_COMPLIANT, "; ".join(block.splitlines()[0] for block in result)
+    return STATUS_NON_COMPLIANT, "Không tìm thấy interface mgmt nào."
+
+
+def _assess_5_3_2(result):
+    if result["Telnet"]["Configured"]:
+        return STATUS_NON_COMPLIANT, f"Telnet được cho phép: {result['Telnet']['Evidence']}"
+    return STATUS_COMPLIANT, result["SSHv2"]["Evidence"] if result["SSHv2"]["Configured"] else None
+
+
+def _assess_5_3_3(result):
+    enabled = [f"{protocol}: {result[key]['Evidence']}" for protocol, key in (("Telnet", "Disable Telnet"), ("HTTP", "Disable HTTP"))
+               if not result[key]["Disabled"]]
+    if enabled:
+        return STATUS_NON_COMPLIANT, "; ".join(enabled)
+    return STATUS_COMPLIANT, result["Disable Telnet"]["Evidence"]
+
+
+def _assess_5_3_4(result):
+    timeout = result["Session Timeout"]
+    return (STATUS_COMPLIANT if timeout["Configured"] else STATUS_NON_COMPLIANT), timeout["Evidence"]
+
+
+def _assess_5_3_5(result):
+    restriction = result["Management IP Restriction"]
+    return (STATUS_COMPLIANT if restriction["Configured"] else STATUS_NON_COMPLIANT), restriction["Evidence"]
+
+
+def _assess_6_1(result):
+    sections = {name: info for name, info in result.items() if isinstance(info, dict)}
+    if not any(name.startswith("SNMP") for name in sections):
+        sections["SNMP"] = {"Configured": False, "Evidence": "SNMP không được sử dụng."}
+    failed = [f"{name}: {info['Evidence']}" for name, info in sections.items() if not info["Configured"]]
+    if failed:
+        return STATUS_NON_COMPLIANT, "; ".join(failed)
+    return STATUS_COMPLIANT, "NTP, Logging và SNMP đã được cấu hình đúng."
+
+
+# Mã mục kiểm tra -> (tiêu đề, hàm chạy(config_data, file_name), hàm đánh giá(kết quả) -> (trạng thái, bằng chứng))
+CHECKS = {
+    "1.1": ("Phiên bản firmware",
+            lambda config_data, file_name: module_1_1_check_firmware_version.check_firmware_version(config_data),
+            _assess_1_1),
+    "2.1": ("Shutdown port không sử dụng", _run_2_1, _assess_2_1),
+    "3.1": ("Cấu hình VLAN trên switchport", _run_3_1, _assess_3_1),
+    "3.2.1": ("Bảo vệ lớp 2",
+              _analyze_and_display(module_3_2_1_layer2_protection.analyze_layer2_protection,
+                                   module_3_2_1_layer2_protection.display_layer2_protection_results),
+              _assess_3_2_1),
+    "3.2.2": ("BPDU Guard và PortFast",
+              _analyze_and_display(module_3_2_2_bpdu_guard_and_portfast.analyze_bpdu_guard_and_portfast,
+                                   module_3_2_2_bpdu_guard_and_portfast.display_stp_results),
+              _assess_3_2_2),
+    "3.2.3": ("Cách ly người dùng",
+              _analyze_and_display(module_3_2_3_user_isolation.analyze_user_isolation,
+                                   module_3_2_3_user_isolation.display_user_isolation_results),
+              _assess_3_2_3),
+    "3.3": ("DHCP Snooping", _run_3_3, _assess_3_3),
+    "4.1.1": ("Xác thực giao thức dự phòng gateway", _run_4_1_1, _assess_4_1_1),
+    "4.1.2": ("Xác thực IGP",
+              _analyze_and_display(module_4_1_2_igp_authentication.analyze_igp_authentication,
+                                   module_4_1_2_igp_authentication.display_igp_authentication_results),
+              _assess_4_1_2),
+    "4.1.3": ("Xác thực BGP", _run_4_1_3, _assess_4_1_3),
+    "4.1.4": ("Độ mạnh mã hóa xác thực định tuyến",
+              _analyze_and_display(module_4_1_4_encryption_analysis.analyze_encryption_strength,
+                                   module_4_1_4_encryption_analysis.display_encryption_results),
+              _assess_4_1_4),
+    "4.1.5": ("Lọc route trên port end-user", _run_4_1_5, _assess_4_1_5),
+    "4.2.1": ("Chặn dải IP không hợp lệ (BGP)",
+              lambda config_data, file_name: module_4_2_1_invalid_ip_filter.check_invalid_ip_ranges(config_data),
+              _assess_bgp_filter(_assess_4_2_1)),
+    "4.2.2": ("Giới hạn BGP prefix",
+              lambda config_data, file_name: module_4_2_2_bgp_prefix_limit.check_bgp_prefix_limit(config_data),
+              _assess_bgp_filter(_assess_4_2_2)),
+    "4.2.3": ("Lọc private AS",
+              lambda config_data, file_name: module_4_2_3_private_as_filter.check_private_as_numbers(config_data),
+              _assess_bgp_filter(_assess_4_2_3)),
+    "4.2.4": ("Lọc TCP port 179",
+              lambda config_data, file_name: module_4_2_4_tcp_filter.check_tcp_port_filter(config_data),
+              _assess_bgp_filter(_assess_4_2_4)),
+    "4.3": ("Tách VRF cho interface public/MGMT", _run_4_3, _assess_4_3),
+    "5.1": ("Sao lưu cấu hình",
+            _analyze_and_display(module_5_1_backup_analysis.analyze_backup_configuration,
+                                 module_5_1_backup_analysis.display_backup_results),
+            _assess_issues),
+    "5.2.1": ("AAA và username",
+              _analyze_and_display(module_5_2_1_aaa_and_usernames_analysis.analyze_aaa_and_usernames,
+                                   module_5_2_1_aaa_and_usernames_analysis.display_aaa_and_usernames_results),
+              _assess_issues),
+    "5.2.2": ("Tài khoản không phải admin",
+              _analyze_and_display(module_5_2_2_non_admin_accounts.analyze_non_admin_usernames,
+                                   module_5_2_2_non_admin_accounts.display_non_admin_usernames_results),
+              _assess_5_2_2),
+    "5.2.4": ("Chính sách mật khẩu",
+              _analyze_and_display(module_5_2_4.analyze_password_policies,
+                                   module_5_2_4.display_password_policy_results),
+              _assess_5_2_4),
+    "5.2.5": ("Khóa tài khoản",
+              _analyze_and_display(module_5_2_5_account_lockout.analyze_account_lockout,
+                                   module_5_2_5_account_lockout.display_account_lockout_results),
+              _assess_5_2_5),
+    "5.3.1": ("Interface quản trị", _run_5_3_1, _assess_5_3_1),
+    "5.3.2": ("Phương thức quản trị", _run_5_3_2, _assess_5_3_2),
+    "5.3.3": ("Vô hiệu hóa giao thức không an toàn",
+              _analyze_and_display(module_5_3_3.check_disable_insecure_protocols, module_5_3_3.display_results),
+              _assess_5_3_3),
+    "5.3.4": ("Thời gian timeout phiên",
+              _analyze_and_display(module_5_3_4.check_session_timeout, module_5_3_4.display_results),
+              _assess_5_3_4),
+    "5.3.5": ("Giới hạn IP quản trị",
+              _analyze_and_display(module_5_3_5.check_management_ip_restriction, module_5_3_5.display_results),
+              _assess_5_3_5),
+    "6.1": ("NTP, Logging và SNMP", _run_6_1, _assess_6_1),
+}
+
+
+# Mục kiểm tra chỉ áp dụng khi log có cấu hình tương ứng: mẫu được quét trên dữ liệu thô (buffer mmap)
+# khi đọc log, thiết bị không có mẫu được ghi nhận "Không Áp Dụng" mà không chạy mục kiểm tra
+PREFILTER_PATTERNS = {"bgp": module_4_2_1_invalid_ip_filter.BGP_PRESENCE_PATTERN}
+PREFILTER_REASONS = {"bgp": "Thiết bị không cấu hình BGP"}
+CHECK_PREFILTERS = {"4.1.3": "bgp", "4.2.1": "bgp", "4.2.2": "bgp", "4.2.3": "bgp", "4.2.4": "bgp"}
+
+
+def run_check(check_id, config_data, file_name):
+    """
+    Chạy một mục kiểm tra, đo thời gian chạy và đánh giá trạng thái tuân thủ từ kết quả của mục.
+    Args:
+        check_id (str): Mã mục kiểm tra.
+        config_data (str): Nội dung log (hoặc các phần log mà mục kiểm tra cần).
+        file_name (str): Tên file log.
+
+    Returns:
+        dict: {"status": "done" | "error", "result": ..., "seconds": float,
+               "compliance": trạng thái tuân thủ (results_store.STATUS_*), "evidence": bằng chứng ngắn gọn}.
+    """
+    title, run, assess = CHECKS[check_id]
+    print(f"\n\033[1m[{check_id}] {title}\033[0m")
+    started = time.perf_counter()
+    try:
+        result = run(config_data, file_name)
+        compliance, evidence = assess(result)
+        outcome = {"status": "done", "result": result, "compliance": compliance, "evidence": evidence}
+    except Exception as e:
+        print(f"\033[31mLỗi khi chạy mục {check_id}: {e}\033[0m")
+        outcome = {"status": "error", "result": str(e), "compliance": STATUS_ERROR, "evidence": str(e)}
+    outcome["seconds"] = time.perf_counter() - started
+    return outcome
+
+
+def display_skipped_checks(role, device_results):
+    """
+    In một dòng liệt kê các mục kiểm tra bị bỏ qua do không áp dụng cho vai trò thiết bị.
+    Args:
+        role (str): Vai trò thiết bị.
+        device_results (dict): Kết quả của run_device_checks.
+    """
+    skipped = [check_id for check_id, outcome in device_results.items()
+               if outcome["status"] == "not_applicable" and not outcome.get("evidence")]
+    if skipped:
+        print(f"\n\033[33mKhông Áp Dụng\033[0m (vai trò {role}): {', '.join(skipped)}")
+    # Mục bị loại bởi mẫu lọc trước: gom theo lý do
+    prefiltered = {}
+    for check_id, outcome in device_results.items():
+        if outcome["status"] == "not_applicable" and outcome.get("evidence"):
+            prefiltered.setdefault(outcome["evidence"], []).append(check_id)
+    for reason, check_ids in prefiltered.items():
+        print(f"\033[33mKhông Áp Dụng\033[0m ({reason}): {', '.join(check_ids)}")
+
+
+def _selected_checks(checks):
+    return [check_id for check_id in ALL_CHECKS if checks is None or check_id in checks]
+
+
+def _previous_outcome(previous, check_id, input_hash):
+    # Kết quả từ lần chạy bị ngắt chỉ được dùng lại khi nội dung log không đổi; mục bị lỗi được chạy lại
+    prior = (previous or {}).get(check_id)
+    if prior is None or prior[0] != input_hash or prior[1]["status"] == STATUS_ERROR:
+        return None
+    return dict(prior[1], resumed=True)
+
+
+def _prefiltered_outcome(check_id, markers):
+    # None nếu mục không có mẫu lọc trước hoặc log có chứa mẫu đó
+    prefilter = CHECK_PREFILTERS.get(check_id)
+    if markers is None or prefilter is None or prefilter in markers:
+        return None
+    return {"status": "not_applicable", "result": None, "seconds": 0.0,
+            "compliance": STATUS_NOT_APPLICABLE, "evidence": PREFILTER_REASONS[prefilter]}
+
+
+def run_device_checks(file_name, config_data, role, checks=None, previous=None, input_hash=None, markers=None):
+    """
+    Chạy các mục kiểm tra áp dụng cho vai trò thiết bị trên một file log;
+    các mục còn lại được bỏ qua và ghi nhận là "Không Áp Dụng".
+    Args:
+        file_name (str): Tên file log (hoặc member trong archive).
+        config_data (str): Nội dung file log đã chuẩn hoá.
+        role (str): Vai trò thiết bị.
+        checks (list | None): Chỉ chạy các mục này (None để chạy tất cả).
+        previous (dict | None): Kết quả đã có từ nhật ký: mã mục -> (input_hash, outcome).
+        input_hash (str | None): Mã băm nội dung log, so với input_hash trong nhật ký.
+        markers (frozenset | None): Tên các mẫu PREFILTER_PATTERNS có trong log (LoadedLog.markers);
+            None để chạy mọi mục mà không lọc trước.
+
+    Returns:
+        dict: Mã mục kiểm tra -> {"status": "done" | "not_applicable" | "error", "result": ..., "seconds": ...}.
+    """
+    profile = applicable_checks(role)
+    device_results = {}
+    resumed = []
+    for check_id in _selected_checks(checks):
+        outcome = _previous_outcome(previous, check_id, input_hash)
+        if outcome is not None:
+            device_results[check_id] = outcome
+            resumed.append(check_id)
+        elif check_id not in profile:
+            device_results[check_id] = {"status": "not_applicable", "result": None, "seconds": 0.0}
+        else:
+            device_results[check_id] = (_prefiltered_outcome(check_id, markers)
+                                        or run_check(check_id, config_data, file_name))
+
+    if resumed:
+        print(f"\n\033[36mĐã hoàn thành ở lần chạy trước:\033[0m {', '.join(resumed)}")
+    display_skipped_checks(role, device_results)
+    return device_results
+
+
+def _check_timings(device_results):
+    return {
+        check_id: outcome["seconds"] for check_id, outcome in device_results.items()
+        if outcome["status"] == "done" and not outcome.get("resumed")
+    }
+
+
+def _device_recorder(run_id, journal, store):
+    # Ghi kết quả của một thiết bị vào nhật ký (chỉ các mục vừa chạy) và vào kho kết quả (tất cả các mục)
+    def record(entry, device_role, input_hash, device_results):
+        file_name = entry["source"].name
+        if journal is not None:
+            journal.record(file_name, input_hash,
+                           {check_id: outcome for check_id, outcome in device_results.items() if not outcome.get("resumed")})
+        if store is not None:
+            store.add_device_results(run_id, entry["hostname"] or os.path.basename(file_name), device_results,
+                                     site=entry["site"], role=device_role, snapshot_date=entry["date"],
+                                     source=file_name, input_hash=input_hash)
+    return record
+
+
+def _run_device_batch(batch):
+    # Chạy trong tiến trình con: đọc các nguồn (các member cùng một tar được đọc trong một lượt)
+    # và chạy toàn bộ mục kiểm tra; output được thu lại để in liền khối theo từng thiết bị
+    devices, checks = batch
+    entries = {entry["source"].name: entry for entry in devices}
+    outputs = []
+    for log in iter_logs([entry["source"] for entry in devices], max_workers=1, markers=PREFILTER_PATTERNS):
+        entry = entries[log.name]
+        output = io.StringIO()
+        with redirect_stdout(output):
+            try:
+                config_data = log.text
+            except Exception as e:
+                print(f"Lỗi khi đọc file {log.name}: {e}")
+                outputs.append((log.name, None, None, output.getvalue(), None))
+                continue
+            device_role = entry["role"]
+            if device_role == "unknown":
+                device_role = infer_device_role(entry["hostname"], config_data)
+            print(f"Vai trò thiết bị: \033[1m{device_role}\033[0m")
+            device_results = run_device_checks(log.name, config_data, device_role, checks,
+                                               entry.get("previous"), log.digest, log.markers)
+        outputs.append((log.name, device_role, device_results, output.getvalue(), log.digest))
+    return outputs
+
+
+@lru_cache(maxsize=2)
+def _load_sections(source):
+    # Mỗi tiến trình con chỉ đọc và tách một file lớn một lần cho tất cả các mục kiểm tra nó nhận
+    log = next(iter_logs([source], max_workers=1, markers=PREFILTER_PATTERNS))
+    return log.digest, log.text, split_command_sections(log.text), log.markers
+
+
+def _run_section_task(task):
+    # Chạy trong tiến trình con: một mục kiểm tra trên các phần log cần thiết của một file lớn
+    entry, check_id = task
+    output = io.StringIO()
+    with redirect_stdout(output):
+        try:
+            digest, config_data, sections, markers = _load_sections(entry["source"])
+        except Exception as e:
+            print(f"Lỗi khi đọc file {entry['source'].name}: {e}")
+            return None, {"status": "error", "result": str(e), "seconds": 0.0}, output.getvalue(), None
+        device_role = entry["role"]
+        if device_role == "unknown":
+            device_role = infer_device_role(entry["hostname"], config_data)
+        outcome = _previous_outcome(entry.get("previous"), check_id, digest)
+        if outcome is not None:
+            return device_role, outcome, "", digest
+        if check_id not in applicable_checks(device_role):
+            return device_role, {"status": "not_applicable", "result": None, "seconds": 0.0}, "", digest
+        outcome = _prefiltered_outcome(check_id, markers)
+        if outcome is not None:
+            return device_role, outcome, "", digest
+        section_data = sections_for_check(check_id, sections) or config_data
+        outcome = run_check(check_id, section_data, entry["source"].name)
+    return device_role, outcome, output.getvalue(), digest
+
+
+def _print_device(file_name, output):
+    print(f"\n{'=' * 50}\nĐang kiểm tra file: {file_name}")
+    print(output, end="")
+
+
+def _run_fleet_sequential(inventory, checks, weights, record):
+    entries = {entry["source"].name: entry for entry in inventory}
+    fleet_results = {}
+    for log in iter_logs([entry["source"] for entry in inventory], markers=PREFILTER_PATTERNS):
+        entry = entries[log.name]
+        print(f"\n{'=' * 50}\nĐang kiểm tra file: {log.name}")
+        try:
+            config_data = log.text
+        except Exception as e:
+            print(f"Lỗi khi đọc file {log.name}: {e}")
+            continue
+
+        device_role = entry["role"]
+        if device_role == "unknown":
+            device_role = infer_device_role(entry["hostname"], config_data)
+        print(f"Vai trò thiết bị: \033[1m{device_role}\033[0m")
+        fleet_results[log.name] = run_device_checks(log.name, config_data, device_role, checks,
+                                                    entry.get("previous"), log.digest, log.markers)
+        record(entry, device_role, log.digest, fleet_results[log.name])
+        update_check_weights(weights, _check_timings(fleet_results[log.name]), entry["source"].size)
+    return fleet_results
+
+
+def _run_fleet_parallel(inventory, checks, weights, max_workers, record):
+    selected = _selected_checks(checks)
+    entries = {entry["source"].name: entry for entry in inventory}
+    tasks = []
+    split_devices = {}
+    tar_batches = {}
+    fleet_results = {}
+    for entry in inventory:
+        source = entry["source"]
+        device_checks = [check_id for check_id in selected if check_id in applicable_checks(entry["role"])]
+        if source.kind == "tar":
+            # Member trong tar chỉ đọc được tuần tự: gom theo archive để không giải nén lại nhiều lần
+            tar_batches.setdefault(source.path, []).append((entry, device_checks))
+        elif source.size > SPLIT_THRESHOLD and not device_checks:
+            # File lớn không có mục nào áp dụng cho vai trò: ghi nhận ngay, không cần đọc file
+            device_results = {check_id: {"status": "not_applicable", "result": None, "seconds": 0.0}
+                              for check_id in selected}
+            _print_device(source.name, f"Vai trò thiết bị: \033[1m{entry['role']}\033[0m\n")
+            display_skipped_checks(entry["role"], device_results)
+            fleet_results[source.name] = device_results
+            record(entry, entry["role"], None, device_results)
+        elif source.size > SPLIT_THRESHOLD:
+            # File quá lớn: mỗi mục kiểm tra là một tác vụ riêng, chạy trên phần log nó cần
+            split_devices[source.name] = {"entry": entry, "pending": len(device_checks), "results": {}, "outputs": {}}
+            for check_id in device_checks:
+                cost = estimate_cost(source.size, (check_id,), weights)
+                tasks.append((cost, ("check", (entry, check_id))))
+        else:
+            tasks.append((estimate_cost(source.size, device_checks, weights), ("batch", ([entry], checks))))
+    for batch in tar_batches.values():
+        cost = sum(estimate_cost(entry["source"].size, device_checks, weights) for entry, device_checks in batch)
+        tasks.append((cost, ("batch", ([entry for entry, _ in batch], checks))))
+
+    for (kind, args), result in run_largest_first(tasks, _run_fleet_task, max_workers):
+        if kind == "batch":
+            sizes = {entry["source"].name: entry["source"].size for entry in args[0]}
+            for file_name, device_role, device_results, output, digest in result:
+                _print_device(file_name, output)
+                if device_results is not None:
+                    fleet_results[file_name] = device_results
+                    record(entries[file_name], device_role, digest, device_results)
+                    update_check_weights(weights, _check_timings(device_results), sizes[file_name])
+            continue
+
+        entry, check_id = args
+        device = split_devices[entry["source"].name]
+        device_role, outcome, output, digest = result
+        device["role"] = device_role or entry["role"]
+        device["digest"] = digest or device.get("digest")
+        device["results"][check_id] = outcome
+        device["outputs"][check_id] = output
+        device["pending"] -= 1
+        if device["pending"] == 0:
+            # Đủ kết quả của file lớn: in theo thứ tự mục kiểm tra
+            device_results = {
+                check_id: device["results"].get(check_id, {"status": "not_applicable", "result": None, "seconds": 0.0})
+                for check_id in selected
+            }
+            output = f"Vai trò thiết bị: \033[1m{device['role']}\033[0m\n"
+            output += "".join(device["outputs"].get(check_id, "") for check_id in selected)
+            _print_device(entry["source"].name, output)
+            resumed = [check_id for check_id, outcome in device_results.items() if outcome.get("resumed")]
+            if resumed:
+                print(f"\n\033[36mĐã hoàn thành ở lần chạy trước:\033[0m {', '.join(resumed)}")
+            display_skipped_checks(device["role"], device_results)
+            fleet_results[entry["source"].name] = device_results
+            if device["digest"] is not None:
+                record(entry, device["role"], device["digest"], device_results)
+            update_check_weights(weights, _check_timings(device_results), entry["source"].size)
+    return fleet_results
+
+
+def _run_fleet_task(task):
+    kind, args = task
+    if kind == "batch":
+        return _run_device_batch(args)
+    return _run_section_task(args)
+
+
+def _update_account_index(path, inventory, fleet_results):
+    # Tài khoản đã được 5.2.1/5.2.2 phân tích trong lần chạy, không đọc lại cấu hình
+    index = AccountIndex.load(path)
+    devices = {entry["source"].name: entry["hostname"] or os.path.basename(entry["source"].name) for entry in inventory}
+    updated = 0
+    for file_name, device_results in fleet_results.items():
+        for check_id in ("5.2.1", "5.2.2"):
+            outcome = device_results.get(check_id, {})
+            if outcome.get("status") == "done" and isinstance(outcome.get("result"), dict) and "accounts" in outcome["result"]:
+                index.add_device(devices.get(file_name, file_name), outcome["result"]["accounts"])
+                updated += 1
+                break
+    index.save(path)
+    print(f"Chỉ mục tài khoản: cập nhật {updated} thiết bị, {len(index)} tài khoản trên {len(index.devices)} thiết bị.")
+
+
+def _fleet_check_results(inventory, fleet_results, check_id, key):
+    # Thiết bị -> result[key] của mục kiểm tra đã chạy xong; bản chụp sau của cùng thiết bị ghi đè bản trước
+    devices = {}
+    for entry in sorted(inventory, key=lambda entry: entry["date"] or date.min):
+        outcome = fleet_results.get(entry["source"].name, {}).get(check_id, {})
+        if outcome.get("status") == "done" and isinstance(outcome.get("result"), dict) and outcome["result"].get(key):
+            devices[entry["hostname"] or os.path.basename(entry["source"].name)] = outcome["result"][key]
+    return devices
+
+
+def _display_fleet_rollups(inventory, fleet_results):
+    # Đối chiếu giữa các thiết bị từ kết quả đã có của 4.1.1, 4.1.3 và 4.3, không đọc lại cấu hình
+    fhrp_groups = _fleet_check_results(inventory, fleet_results, "4.1.1", "groups")
+    if fhrp_groups:
+        module_4_1_1_gateway_authentication.display_fhrp_consistency(
+            module_4_1_1_gateway_authentication.check_fhrp_consistency(fhrp_groups))
+    bgp_devices = _fleet_check_results(inventory, fleet_results, "4.1.3", "bgp")
+    if bgp_devices:
+        module_4_1_3_bgp_authentication.display_bgp_session_pairing(
+            module_4_1_3_bgp_authentication.pair_bgp_sessions(bgp_devices))
+    prefixes = _fleet_check_results(inventory, fleet_results, "4.3", "prefixes")
+    if prefixes:
+        module_4_3_vrf_and_interfaces_analysis.display_address_conflicts(
+            module_4_3_vrf_and_interfaces_analysis.find_address_conflicts(prefixes))
+
+
+def run_fleet(folder_path, site=None, role=None, since=None, until=None, latest=False, checks=None,
+              workers=1, weights_path=WEIGHTS_FILE, journal=None, store=None, stanza_cache_path=None,
+              account_index_path=None):
+    """
+    Chạy kiểm tra theo profile vai trò cho các thiết bị trong thư mục.
+    Với workers > 1, thiết bị được chia cho các tiến trình theo chi phí ước lượng giảm dần
+    (kích thước log x trọng số các mục kiểm tra đo được ở lần chạy trước).
+    Sau lần chạy, nhóm gateway (4.1.1), phiên BGP (4.1.3) và địa chỉ interface (4.3) được đối chiếu giữa các thiết bị.
+    Args:
+        folder_path (str): Đường dẫn tới thư mục chứa file log hoặc bundle nén.
+        site, role, since, until: Điều kiện lọc danh mục (xem fleet_inventory.filter_inventory).
+        latest (bool): Chỉ kiểm tra bản chụp mới nhất của mỗi thiết bị.
+        checks (list | None): Chỉ chạy các mục này.
+        workers (int): Số tiến trình chạy song song.
+        weights_path (str | None): File lưu trọng số các mục kiểm tra (None để không đọc/ghi).
+        journal (RunJournal | None): Nhật ký lần chạy; mục đã ghi trong nhật ký (với cùng nội dung log)
+            không chạy lại, mục mới chạy xong được ghi thêm vào nhật ký.
+        store (ResultsStore | None): Kho kết quả để lưu trạng thái từng mục kiểm tra của lần chạy.
+        stanza_cache_path (str | None): File lưu cache kết quả theo stanza giữa các lần chạy (None để không dùng).
+            Tiến trình con nhận bản cache đã nạp nhưng chỉ cache của tiến trình chính được ghi lại.
+        account_index_path (str | None): File chỉ mục tài khoản local toàn fleet, cập nhật từ kết quả 5.2.1/5.2.2
+            (None để không dùng).
+
+    Returns:
+        dict: Tên file -> kết quả của run_device_checks.
+    """
+    inventory = filter_inventory(build_inventory(folder_path), site=site, role=role, since=since, until=until)
+    if latest:
+        inventory = latest_snapshots(inventory)
+    if not inventory:
+        print(f"Không tìm thấy file .log/.txt hoặc bundle nén nào phù hợp trong thư mục: {folder_path}")
+        return {}
+
+    if journal is not None:
+        for entry in inventory:
+            entry["previous"] = journal.previous_outcomes(entry["source"].name)
+
+    run_id = journal.run_id if journal is not None else new_run_id()
+    if store is not None:
+        store.start_run(run_id, folder_path)
+    record = _device_recorder(run_id, journal, store)
+
+    weights = load_check_weights(weights_path) if weights_path else {}
+    if stanza_cache_path:
+        STANZA_CACHE.load(stanza_cache_path)
+    if workers > 1:
+        fleet_results = _run_fleet_parallel(inventory, checks, weights, workers, record)
+    else:
+        fleet_results = _run_fleet_sequential(inventory, checks, weights, record)
+    if store is not None:
+        store.finish_run(run_id)
+    if weights_path:
+        save_check_weights(weights, weights_path)
+    if stanza_cache_path:
+        STANZA_CACHE.save(stanza_cache_path)
+    if account_index_path:
+        _update_account_index(account_index_path, inventory, fleet_results)
+    _display_fleet_rollups(inventory, fleet_results)
+
+    executed = sum(outcome["status"] != "not_applicable" for results in fleet_results.values() for outcome in results.values())
+    skipped = sum(outcome["status"] == "not_applicable" for results in fleet_results.values() for outcome in results.values())
+    resumed = sum(bool(outcome.get("resumed")) for results in fleet_results.values() for outcome in results.values())
+    print(f"\n\033[1mĐã kiểm tra {len(fleet_results)} thiết bị: {executed} mục đã chạy, {skipped} mục Không Áp Dụng"
+          f" ({resumed} mục dùng lại từ lần chạy trước).\033[0m")
+    if STANZA_CACHE.hits or STANZA_CACHE.misses:
+        print(f"Cache stanza: {STANZA_CACHE.hits} lần dùng lại, {STANZA_CACHE.misses} lần đánh giá.")
+    return fleet_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chạy các mục kiểm tra theo vai trò thiết bị trên toàn bộ thư mục log.")
+    parser.add_argument("folder", type=str, nargs="?", help="Đường dẫn tới thư mục chứa file log (không cần khi --resume).")
+    parser.add_argument("--site", type=str, help="Lọc theo site (ví dụ HN).")
+    parser.add_argument("--role", type=str, action="append", help="Lọc theo vai trò (ví dụ access_switch), có thể lặp lại.")
+    parser.add_argument("--since", type=date.fromisoformat, help="Từ ngày (YYYY-MM-DD).")
+    parser.add_argument("--until", type=date.fromisoformat, help="Đến ngày (YYYY-MM-DD).")
+    parser.add_argument("--latest", action="store_true", help="Chỉ kiểm tra bản chụp mới nhất của mỗi thiết bị.")
+    parser.add_argument("--check", type=str, action="append", choices=ALL_CHECKS, help="Chỉ chạy mục kiểm tra này, có thể lặp lại.")
+    parser.add_argument("--workers", type=int, default=1, help="Số tiến trình chạy song song (mặc định 1).")
+    parser.add_argument("--weights", type=str,
+                        help=f"File lưu trọng số các mục kiểm tra giữa các lần chạy (mặc định {WEIGHTS_FILE} trong --runs-dir).")
+    parser.add_argument("--runs-dir", type=str, default=RUNS_DIR, help="Thư mục lưu nhật ký các lần chạy.")
+    parser.add_argument("--resume", type=str, metavar="RUN_ID", help="Tiếp tục lần chạy bị ngắt với run-id này.")
+    parser.add_argument("--stanza-cache", type=str, help="File lưu cache kết quả theo stanza giữa các lần chạy.")
+    parser.add_argument("--db", type=str, default=RESULTS_DB, help="File SQLite lưu kết quả các lần chạy.")
+    parser.add_argument("--account-index", type=str,
+                        help="File chỉ mục tài khoản local toàn fleet (xem account_index.py), cập nhật sau lần chạy.")
+    args = parser.parse_args()
+
+    if args.resume:
+        try:
+            journal = RunJournal.resume(args.resume, args.runs_dir)
+        except FileNotFoundError as e:
+            print(f"Lỗi: {e}")
+            return
+        # Dùng lại tham số của lần chạy gốc để kết quả tiếp tục khớp với phần đã chạy
+        params = journal.params
+    else:
+        if not args.folder:
+            parser.error("Cần chỉ định thư mục log hoặc --resume RUN_ID.")
+        params = {
+            "folder": args.folder, "site": args.site, "role": args.role,
+            "since": args.since.isoformat() if args.since else None,
+            "until": args.until.isoformat() if args.until else None,
+            "latest": args.latest, "checks": args.check,
+        }
+        if not os.path.isdir(args.folder):
+            print(f"Lỗi: Không tìm thấy thư mục '{args.folder}'.")
+            return
+        journal = RunJournal.create(params, args.runs_dir)
+
+    print(f"Run-id: \033[1m{journal.run_id}\033[0m (dùng --resume {journal.run_id} để tiếp tục nếu bị ngắt)")
+    with journal, ResultsStore(args.db) as store:
+        run_fleet(params["folder"], site=params["site"], role=params["role"],
+                  since=date.fromisoformat(params["since"]) if params["since"] else None,
+                  until=date.fromisoformat(params["until"]) if params["until"] else None,
+                  latest=params["latest"], checks=params["checks"],
+                  workers=args.workers, weights_path=args.weights or os.path.join(args.runs_dir, WEIGHTS_FILE),
+                  journal=journal, store=store,
+                  stanza_cache_path=args.stanza_cache, account_index_path=args.account_index)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+import json
+import os
+import re
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from log_normalizer import find_hostname
+
+# Trọng số mặc định (giây xử lý cho mỗi MB log) của mục kiểm tra chưa có số liệu từ lần chạy trước
+DEFAULT_CHECK_WEIGHT = 0.05
+# Hệ số làm mượt khi cập nhật trọng số: trọng số mới = a * đo được + (1 - a) * trọng số cũ
+WEIGHT_SMOOTHING = 0.5
+# File lưu trọng số giữa các lần chạy (fleet_runner đặt file này trong thư mục --runs-dir)
+WEIGHTS_FILE = "check_weights.json"
+# File lớn hơn ngưỡng này được tách thành các phần theo lệnh để các mục kiểm tra chạy song song
+SPLIT_THRESHOLD = 64 << 20
+
+# Mục kiểm tra -> tiền tố các lệnh 'show' chứa dữ liệu cần phân tích.
+# Mục không có trong bảng (hoặc không tìm thấy lệnh tương ứng) nhận toàn bộ nội dung log.
+RUNNING_CONFIG = ("show run",)
+CHECK_SECTIONS = {
+    "1.1": ("show version",),
+    "2.1": ("show ip interface brief", "show interface") + RUNNING_CONFIG,
+    "3.1": ("show interface switchport", "show interfaces switchport"),
+    "3.2.2": ("show spanning-tree summary",) + RUNNING_CONFIG,
+    "3.2.3": RUNNING_CONFIG,
+    "3.3": ("show ip dhcp snooping", "show interface switchport", "show interfaces switchport"),
+    "4.1.1": RUNNING_CONFIG,
+    "4.1.2": RUNNING_CONFIG,
+    "4.1.3": RUNNING_CONFIG,
+    "4.1.4": RUNNING_CONFIG,
+    "4.1.5": RUNNING_CONFIG,
+    "4.2.1": RUNNING_CONFIG,
+    "4.2.2": RUNNING_CONFIG,
+    "4.2.3": RUNNING_CONFIG,
+    "4.2.4": RUNNING_CONFIG,
+    "4.3": RUNNING_CONFIG,
+    "5.1": RUNNING_CONFIG,
+    "5.2.1": RUNNING_CONFIG,
+    "5.2.2": RUNNING_CONFIG,
+    "5.2.5": RUNNING_CONFIG,
+    "5.3.1": RUNNING_CONFIG,
+    "5.3.2": ("show version",) + RUNNING_CONFIG,
+    "5.3.3": RUNNING_CONFIG,
+    "5.3.4": RUNNING_CONFIG,
+    "5.3.5": RUNNING_CONFIG,
+    "6.1": RUNNING_CONFIG,
+}
+
+
+def load_check_weights(path=WEIGHTS_FILE):
+    """
+    Đọc trọng số các mục kiểm tra (giây/MB) đã ghi nhận từ các lần chạy trước.
+    Args:
+        path (str): Đường dẫn file trọng số.
+
+    Returns:
+        dict: Mã mục kiểm tra -> trọng số (rỗng nếu chưa có file hoặc file hỏng).
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            weights = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return {check_id: float(weight) for check_id, weight in weights.items()}
+
+
+def save_check_weights(weights, path=WEIGHTS_FILE):
+    """
+    Ghi trọng số ra file (ghi file tạm rồi đổi tên để không làm hỏng file cũ nếu bị ngắt).
+    Args:
+        weights (dict): Mã mục kiểm tra -> trọng số.
+        path (str): Đường dẫn file trọng số.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".weights-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(weights, file, indent=2, sort_keys=True)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def update_check_weights(weights, timings, size):
+    """
+    Cập nhật trọng số từ thời gian chạy đo được trên một thiết bị.
+    Args:
+        weights (dict): Trọng số hiện tại (được cập nhật tại chỗ).
+        timings (dict): Mã mục kiểm tra -> số giây đã chạy.
+        size (int): Kích thước log (byte) của thiết bị.
+
+    Returns:
+        dict: Trọng số sau khi cập nhật.
+    """
+    megabytes = max(size, 1) / (1 << 20)
+    for check_id, seconds in timings.items():
+        measured = seconds / megabytes
+        previous = weights.get(check_id)
+        weights[check_id] = measured if previous is None else WEIGHT_SMOOTHING * measured + (1 - WEIGHT_SMOOTHING) * previous
+    return weights
+
+
+def estimate_cost(size, checks, weights):
+    """
+    Ước lượng thời gian xử lý một thiết bị: kích thước log x tổng trọng số các mục sẽ chạy.
+    Args:
+        size (int): Kích thước log (byte).
+        checks (iterable): Các mục kiểm tra sẽ chạy.
+        weights (dict): Trọng số các mục kiểm tra.
+
+    Returns:
+        float: Chi phí ước lượng (giây).
+    """
+    return size / (1 << 20) * sum(weights.get(check_id, DEFAULT_CHECK_WEIGHT) for check_id in checks)
+
+
+def split_command_sections(config_data):
+    """
+    Tách log thành các phần theo dòng lệnh '<hostname>#<lệnh>'.
+    Args:
+        config_data (str): Nội dung log đã chuẩn hoá.
+
+    Returns:
+        list: Danh sách (lệnh viết thường, nội dung gồm cả dòng lệnh); phần trước lệnh đầu tiên có lệnh "".
+    """
+    hostname = find_hostname(config_data)
+    if not hostname:
+        return [("", config_data)]
+
+    prompt_pattern = re.compile(rf"^{re.escape(hostname)}[#>][ \t]*(.*)$", re.MULTILINE)
+    sections = []
+    previous_start, previous_command = 0, ""
+    for match in prompt_pattern.finditer(config_data):
+        if match.start() > previous_start:
+            sections.append((previous_command, config_data[previous_start:match.start()]))
+        previous_start, previous_command = match.start(), match.group(1).lower()
+    sections.append((previous_command, config_data[previous_start:]))
+    return sections
+
+
+def sections_for_check(check_id, sections):
+    """
+    Ghép các phần log mà một mục kiểm tra cần.
+    Args:
+        check_id (str): Mã mục kiểm tra.
+        sections (list): Kết quả của split_command_sections.
+
+    Returns:
+        str | None: Nội dung cần cho mục kiểm tra, hoặc None nếu mục cần toàn bộ log.
+    """
+    prefixes = CHECK_SECTIONS.get(check_id)
+    if not prefixes:
+        return None
+    selected = [text for command, text in sections if command.startswith(prefixes)]
+    return "".join(selected) if selected else None
+
+
+def run_largest_first(tasks, worker, max_workers):
+    """
+    Chạy các tác vụ trên pool tiến trình theo thứ tự chi phí giảm dần (LPT).
+    Mỗi tiến trình rảnh nhận ngay tác vụ lớn nhất còn lại, nên file lớn không bị dồn về cuối.
+    Args:
+        tasks (list): Danh sách (chi phí, tham số truyền cho worker).
+        worker (callable): Hàm cấp module (để pickle được) nhận tham số của tác vụ.
+        max_workers (int): Số tiến trình.
+
+    Yields:
+        tuple: (tham số của tác vụ, kết quả của worker) theo thứ tự hoàn thành.
+    """
+    queue = sorted(tasks, key=lambda task: task[0], reverse=True)
+    queue.reverse()  # pop() từ cuối danh sách lấy tác vụ lớn nhất
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        running = {}
+        while queue or running:
+            # Chỉ giữ mỗi tiến trình một tác vụ để thứ tự LPT không bị hàng đợi nội bộ của pool làm lệch
+            while queue and len(running) < max_workers:
+                _, args = queue.pop()
+                running[executor.submit(worker, args)] = args
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield running.pop(future), future.result()
@@ -0,0 +1,439 @@
+import ipaddress
+import re
+
+from config_stanzas import split_stanzas
+from interface_names import canonical_interface_name
+from prefix_trie import PrefixTrie, mask_to_prefix_length
+from secret_classifier import password_fingerprint
+from stanza_cache import memoize_stanza
+
+# Giao thức IGP theo từ khoá sau 'router'
+IGP_PROTOCOLS = {"ospf": "OSPF", "rip": "RIP", "eigrp": "EIGRP", "isis": "ISIS"}
+# Thuật toán xác thực theo độ mạnh (tên viết thường như trong cấu hình)
+STRONG_ALGORITHMS = ("hmac-sha-256", "hmac-sha-384", "hmac-sha-512", "sha-256", "sha-384", "sha-512")
+WEAK_ALGORITHMS = ("md5", "hmac-sha-1", "sha-1", "sha1")
+CLEARTEXT = "text"
+
+# Kết quả xác thực của một interface tham gia IGP
+VERDICT_LABELS = {
+    "strong": "Xác thực mã hóa mạnh",
+    "weak": "Xác thực mã hóa yếu",
+    "cleartext": "Xác thực dạng cleartext",
+    "missing_key": "Bật xác thực nhưng thiếu khoá/key chain",
+    "none": "Không xác thực",
+    "passive": "Passive (không tạo adjacency)",
+}
+AUTHENTICATED_VERDICTS = ("strong", "weak", "cleartext")
+
+ROUTER_KEY_PATTERN = re.compile(r"^router (ospf|rip|eigrp|isis)\b\s*(\S*)", re.IGNORECASE)
+IPV4_PATTERN = r"\d+\.\d+\.\d+\.\d+"
+NETWORK_PATTERN = re.compile(rf"^network ({IPV4_PATTERN})(?: ({IPV4_PATTERN}))?(?: area (\S+))?", re.IGNORECASE)
+INTERFACE_ADDRESS_PATTERN = re.compile(rf"^ip address ({IPV4_PATTERN}) ({IPV4_PATTERN})", re.IGNORECASE)
+# SVI 'interface VlanN' (VLAN của subinterface lấy từ 'encapsulation dot1Q N')
+SVI_HEADER_PATTERN = re.compile(r"^interface\s+vlan\s*(\d+)\s*$", re.IGNORECASE)
+
+_last_parsed = (None, None)
+
+
+def _address_to_int(address):
+    return int(ipaddress.IPv4Address(address))
+
+
+def _classful_mask(address):
+    # Mạng classful của câu lệnh 'network' RIP/EIGRP không có wildcard
+    first_octet = _address_to_int(address) >> 24
+    if first_octet < 128:
+        return 0xFF000000
+    if first_octet < 192:
+        return 0xFFFF0000
+    return 0xFFFFFF00
+
+
+@memoize_stanza("igp-interface", version=3)
+def parse_igp_interface(stanza_text):
+    """
+    Phân tích các lệnh IGP trong một stanza interface. Kết quả được dùng chung qua cache stanza, không sửa trực tiếp.
+    Args:
+        stanza_text (str): Nội dung stanza, dòng đầu là 'interface ...'.
+
+    Returns:
+        dict: {"addresses": [[địa chỉ, mask]] (số nguyên), "shutdown", "description", "switchport_mode",
+               "access_vlan" (VLAN của cổng access), "vlan" (VLAN của SVI/subinterface),
+               "ospf": {"process", "area", "mode", "key_chain", "md5_keys", "simple_key"},
+               "rip": {"mode", "key_chain"}, "isis": {"tag", "mode", "key_chain", "password"},
+               "eigrp": {ASN: {"mode", "key_chain"}}}. Lệnh không được cấu hình có giá trị None.
+    """
+    interface = {
+        "addresses": [], "shutdown": False, "description": None, "switchport_mode": None,
+        "access_vlan": None, "vlan": None,
+        "ospf": {"process": None, "area": None, "mode": None, "key_chain": None, "md5_keys": 0, "simple_key": False},
+        "rip": {"mode": None, "key_chain": None},
+        "isis": {"tag": None, "mode": None, "key_chain": None, "password": False},
+        "eigrp": {},
+    }
+    ospf, rip, isis = interface["ospf"], interface["rip"], interface["isis"]
+    lines = stanza_text.splitlines()
+    svi_match = SVI_HEADER_PATTERN.match(lines[0].strip()) if lines else None
+    if svi_match:
+        interface["vlan"] = int(svi_match.group(1))
+    for raw_line in lines[1:]:
+        line = raw_line.strip()
+        words = line.lower().split()
+        if not words:
+            continue
+        address_match = INTERFACE_ADDRESS_PATTERN.match(line)
+        if address_match:
+            interface["addresses"].append([_address_to_int(address_match.group(1)),
+                                           _address_to_int(address_match.group(2))])
+        elif words == ["shutdown"]:
+            interface["shutdown"] = True
+        elif words[0] == "description":
+            interface["description"] = line.split(None, 1)[1] if len(words) > 1 else ""
+        elif words[:2] == ["switchport", "mode"] and len(words) > 2:
+            interface["switchport_mode"] = words[2]
+        elif words[:3] == ["switchport", "access", "vlan"] and len(words) > 3 and words[3].isdigit():
+            interface["access_vlan"] = int(words[3])
+        elif words[:2] == ["encapsulation", "dot1q"] and len(words) > 2 and words[2].isdigit():
+            interface["vlan"] = int(words[2])
+        elif words[:2] == ["ip", "ospf"] and len(words) >= 5 and words[3] == "area":
+            ospf["process"], ospf["area"] = words[2], words[4]
+        elif words[:3] == ["ip", "ospf", "authentication"]:
+            # 'ip ospf authentication [message-digest | null | key-chain <tên>]'
+            if len(words) == 3:
+                ospf["mode"] = "simple"
+            elif words[3] == "key-chain" and len(words) > 4:
+                ospf["mode"], ospf["key_chain"] = "key-chain", line.split()[4]
+            else:
+                ospf["mode"] = words[3]
+        elif words[:3] == ["ip", "ospf", "authentication-key"]:
+            ospf["simple_key"] = True
+        elif words[:3] == ["ip", "ospf", "message-digest-key"]:
+            ospf["md5_keys"] += 1
+        elif words[:4] == ["ip", "rip", "authentication", "mode"] and len(words) > 4:
+            rip["mode"] = words[4]
+        elif words[:4] == ["ip", "rip", "authentication", "key-chain"] and len(words) > 4:
+            rip["key_chain"] = line.split()[4]
+        elif words[:3] == ["ip", "router", "isis"]:
+            isis["tag"] = line.split()[3] if len(words) > 3 else ""
+        elif words[:3] == ["isis", "authentication", "mode"] and len(words) > 3:
+            isis["mode"] = words[3]
+        elif words[:3] == ["isis", "authentication", "key-chain"] and len(words) > 3:
+            isis["key_chain"] = line.split()[3]
+        elif words[:2] == ["isis", "password"]:
+            isis["password"] = True
+        elif words[:4] == ["ip", "authentication", "mode", "eigrp"] and len(words) > 5:
+            interface["eigrp"].setdefault(words[4], {"mode": None, "key_chain": None})["mode"] = words[5]
+        elif words[:4] == ["ip", "authentication", "key-chain", "eigrp"] and len(words) > 5:
+            interface["eigrp"].setdefault(words[4], {"mode": None, "key_chain": None})["key_chain"] = line.split()[5]
+    return interface
+
+
+def _parse_key_chain(stanza_text):
+    # key chain <tên> / key <id> / key-string [7] <chuỗi> / cryptographic-algorithm <thuật toán>
+    keys = {}
+    current = None
+    for raw_line in stanza_text.splitlines()[1:]:
+        words = raw_line.strip().lower().split()
+        if words[:1] == ["key"] and len(words) > 1:
+            current = keys.setdefault(words[1], {"key_string": None, "algorithm": None})
+        elif current is not None and words[:1] == ["key-string"] and len(words) > 1:
+            # Chỉ giữ dấu vân tay của khoá để đối chiếu giữa các thiết bị
+            current["key_string"] = password_fingerprint(raw_line.strip().split(None, 1)[1])[1]
+        elif current is not None and words[:1] == ["cryptographic-algorithm"] and len(words) > 1:
+            current["algorithm"] = words[1]
+    return keys
+
+
+def _new_process(protocol, process_id):
+    return {
+        "protocol": protocol, "id": process_id, "area_auth": {},
+        # Câu lệnh 'network' có wildcard liên tục nằm trong trie; wildcard không liên tục (hiếm) được so tuần tự
+        "network_trie": PrefixTrie(), "irregular_networks": [],
+        "passive_default": False, "passive": set(), "active": set(),
+        # Bộ lọc route chiều vào: tên interface ("" nếu áp dụng cho cả process) -> cách lọc
+        "distribute_in": {},
+        "authentication": {"mode": None, "key_chain": None},
+        "af_interfaces": {},
+    }
+
+
+def _parse_router(process, stanza_text):
+    af_interface = None
+    for raw_line in stanza_text.splitlines()[1:]:
+        line = raw_line.strip()
+        words = line.lower().split()
+        if not words:
+            continue
+        if words[0] == "af-interface" and len(words) > 1:
+            # EIGRP named mode: thuộc tính xác thực theo interface nằm trong process
+            name = "default" if words[1] == "default" else canonical_interface_name(line.split(None, 1)[1])
+            af_interface = process["af_interfaces"].setdefault(name, {"mode": None, "key_chain": None})
+            continue
+        if words[0] == "exit-af-interface":
+            af_interface = None
+            continue
+        if words[0] == "authentication" and len(words) > 2:
+            target = af_interface if af_interface is not None else process["authentication"]
+            if words[1] == "mode":
+                target["mode"] = words[2]
+            elif words[1] == "key-chain":
+                target["key_chain"] = line.split()[2]
+            continue
+        network_match = NETWORK_PATTERN.match(line)
+        if network_match:
+            address = _address_to_int(network_match.group(1))
+            if network_match.group(2):
+                mask = ~_address_to_int(network_match.group(2)) & 0xFFFFFFFF
+            else:
+                mask = _classful_mask(network_match.group(1))
+            prefix_length = mask_to_prefix_length(mask)
+            if prefix_length is None:
+                process["irregular_networks"].append((address & mask, mask, network_match.group(3)))
+            else:
+                process["network_trie"].insert(address & mask, prefix_length, network_match.group(3))
+        elif words[0] == "area" and len(words) >= 3 and words[2] == "authentication":
+            process["area_auth"][words[1]] = "message-digest" if words[3:4] == ["message-digest"] else "simple"
+        elif words[0] == "distribute-list" and "in" in words[1:]:
+            # distribute-list <acl> | prefix <tên> | route-map <tên> | gateway <tên> in [interface]
+            position = words.index("in", 1)
+            method = "route-map" if words[1] == "route-map" else "prefix-list" if words[1] == "prefix" else "distribute-list"
+            target = line.split(None, position + 1)[position + 1] if len(words) > position + 1 else ""
+            process["distribute_in"][canonical_interface_name(target) if target else ""] = method
+        elif words == ["passive-interface", "default"]:
+            process["passive_default"] = True
+        elif words[0] == "passive-interface" and len(words) > 1:
+            process["passive"].add(canonical_interface_name(line.split(None, 1)[1]))
+        elif words[:2] == ["no", "passive-interface"] and len(words) > 2:
+            process["active"].add(canonical_interface_name(line.split(None, 2)[2]))
+
+
+def parse_igp_model(config_data):
+    """
+    Dựng mô hình IGP của một thiết bị trong một lượt tách stanza: các process định tuyến, interface
+    (lập chỉ mục theo tên chuẩn hoá) và key chain (lập chỉ mục theo tên), để xác định xác thực
+    của từng interface bằng tra cứu dict thay vì quét lại cấu hình.
+    Kết quả của lần gọi gần nhất được giữ lại để 4.1.2 và 4.1.4 chạy liên tiếp trên cùng nội dung log dùng chung.
+    Args:
+        config_data (str): Nội dung log đã chuẩn hoá.
+
+    Returns:
+        dict: {"processes": {(giao thức, id): process}, "interfaces": {tên: kết quả parse_igp_interface},
+               "key_chains": {tên: {key id: {"key_string" (dấu vân tay khoá), "algorithm"}}}}.
+    """
+    global _last_parsed
+    last_data, last_model = _last_parsed
+    if last_data is config_data:
+        return last_model
+
+    model = {"processes": {}, "interfaces": {}, "key_chains": {}}
+    for key, stanza in split_stanzas(config_data).items():
+        if key.startswith("interface "):
+            model["interfaces"][canonical_interface_name(key.split(None, 1)[1])] = parse_igp_interface(stanza.text)
+        elif key.startswith("key chain "):
+            model["key_chains"][key.split()[2]] = _parse_key_chain(stanza.text)
+        else:
+            router_match = ROUTER_KEY_PATTERN.match(key)
+            if router_match:
+                protocol = IGP_PROTOCOLS[router_match.group(1).lower()]
+                process_id = router_match.group(2)
+                process = model["processes"].setdefault((protocol, process_id), _new_process(protocol, process_id))
+                _parse_router(process, stanza.text)
+    _last_parsed = (config_data, model)
+    return model
+
+
+def _network_area(process, addresses):
+    # Câu lệnh 'network' cụ thể nhất chứa một địa chỉ của interface; trả về (khớp, area)
+    for address, _ in addresses:
+        match = process["network_trie"].longest_match(address)
+        if match is not None:
+            return True, match[1]
+        for network, mask, area in process["irregular_networks"]:
+            if address & mask == network:
+                return True, area
+    return False, None
+
+
+def participates(process, name, interface):
+    """
+    Xác định interface có tham gia process IGP hay không.
+    Args:
+        process (dict): Process trong parse_igp_model.
+        name (str): Tên interface đã chuẩn hoá.
+        interface (dict): Kết quả parse_igp_interface.
+
+    Returns:
+        tuple: (tham gia, area OSPF hoặc None).
+    """
+    protocol = process["protocol"]
+    if protocol == "OSPF" and interface["ospf"]["process"] == process["id"]:
+        return True, interface["ospf"]["area"]
+    if protocol == "ISIS":
+        return interface["isis"]["tag"] is not None and interface["isis"]["tag"] in ("", process["id"]), None
+    return _network_area(process, interface["addresses"])
+
+
+def participating_interfaces(model, process):
+    """
+    Liệt kê các interface (không shutdown) tham gia một process IGP.
+    Args:
+        model (dict): Kết quả parse_igp_model.
+        process (dict): Process trong model.
+
+    Returns:
+        list: Các bộ (tên interface, kết quả parse_igp_interface, area OSPF hoặc None).
+    """
+    members = []
+    for name, interface in model["interfaces"].items():
+        if interface["shutdown"]:
+            continue
+        member, area = participates(process, name, interface)
+        if member:
+            members.append((name, interface, area))
+    return members
+
+
+def is_passive(process, name):
+    if process["passive_default"]:
+        return name not in process["active"]
+    return name in process["passive"]
+
+
+def resolve_key_chain(key_chains, name, default_algorithm):
+    """
+    Xác định thuật toán hiệu lực của một key chain.
+    Args:
+        key_chains (dict): Key chain trong parse_igp_model.
+        name (str): Tên key chain được tham chiếu.
+        default_algorithm (str): Thuật toán khi key không khai báo cryptographic-algorithm (theo mode của giao thức).
+
+    Returns:
+        str | None: Thuật toán yếu nhất trong các key có key-string, None nếu key chain không tồn tại hoặc không có khoá.
+    """
+    keys = [key for key in key_chains.get(name, {}).values() if key["key_string"]]
+    if not keys:
+        return None
+    algorithms = {key["algorithm"] or default_algorithm for key in keys}
+    return min(algorithms, key=_algorithm_rank)
+
+
+def key_chain_fingerprint(key_chains, name):
+    """
+    Tính dấu vân tay của toàn bộ khoá trong một key chain để so sánh giữa các thiết bị.
+    Args:
+        key_chains (dict): Key chain trong parse_igp_model.
+        name (str): Tên key chain được tham chiếu.
+
+    Returns:
+        str | None: Dấu vân tay của các cặp (key id, khoá), None nếu key chain không tồn tại hoặc không có khoá.
+    """
+    keys = sorted((key_id, key["key_string"]) for key_id, key in key_chains.get(name, {}).items() if key["key_string"])
+    if not keys:
+        return None
+    return password_fingerprint(";".join(f"{key_id}:{fingerprint}" for key_id, fingerprint in keys))[1]
+
+
+def _algorithm_rank(algorithm):
+    if algorithm == CLEARTEXT:
+        return 0
+    if algorithm in STRONG_ALGORITHMS:
+        return 2
+    return 1
+
+
+def _verdict(algorithm):
+    if algorithm == CLEARTEXT:
+        return "cleartext"
+    return "strong" if algorithm in STRONG_ALGORITHMS else "weak"
+
+
+def _resolve_interface(process, name, interface, area, key_chains):
+    # Trả về (mode, thuật toán hoặc None nếu thiếu khoá, dòng cấu hình mô tả nguồn)
+    protocol = process["protocol"]
+    if protocol == "OSPF":
+        ospf = interface["ospf"]
+        mode, source = ospf["mode"], "interface"
+        if mode is None and area is not None and area in process["area_auth"]:
+            mode, source = process["area_auth"][area], f"area {area}"
+        if mode in (None, "null"):
+            return None, None, source
+        if mode == "key-chain":
+            return mode, resolve_key_chain(key_chains, ospf["key_chain"], "md5"), f"key chain {ospf['key_chain']}"
+        if mode == "message-digest":
+            return mode, "md5" if ospf["md5_keys"] else None, source
+        return mode, CLEARTEXT if ospf["simple_key"] else None, source
+    if protocol == "RIP":
+        rip = interface["rip"]
+        if rip["key_chain"] is None:
+            return None, None, "interface"
+        mode = rip["mode"] or CLEARTEXT
+        algorithm = resolve_key_chain(key_chains, rip["key_chain"], "md5" if mode == "md5" else CLEARTEXT)
+        return mode, algorithm, f"key chain {rip['key_chain']}"
+    if protocol == "ISIS":
+        isis = interface["isis"]
+        if isis["key_chain"] is not None:
+            mode = isis["mode"] or CLEARTEXT
+            algorithm = resolve_key_chain(key_chains, isis["key_chain"], "md5" if mode == "md5" else CLEARTEXT)
+            return mode, algorithm, f"key chain {isis['key_chain']}"
+        if isis["password"]:
+            return CLEARTEXT, CLEARTEXT, "isis password"
+        return (isis["mode"], None, "interface") if isis["mode"] else (None, None, "interface")
+    # EIGRP: cấu hình classic trên interface, hoặc af-interface (named mode) rồi af-interface default
+    settings = interface["eigrp"].get(process["id"])
+    if settings is None:
+        settings = process["af_interfaces"].get(name) or process["af_interfaces"].get("default")
+    if not settings or settings["mode"] is None:
+        return None, None, "interface"
+    if settings["key_chain"] is None:
+        # Named mode cho phép khai báo mật khẩu trực tiếp: 'authentication mode hmac-sha-256 <mật khẩu>'
+        return settings["mode"], settings["mode"] if settings["mode"] in STRONG_ALGORITHMS else None, "af-interface"
+    algorithm = resolve_key_chain(key_chains, settings["key_chain"], settings["mode"])
+    return settings["mode"], algorithm, f"key chain {settings['key_chain']}"
+
+
+def resolve_igp_authentication(config_data):
+    """
+    Xác định xác thực hiệu lực của từng interface tham gia từng process IGP: lệnh trên interface
+    được ưu tiên, sau đó là cấu hình của area/process; key chain được tra để lấy thuật toán.
+    Args:
+        config_data (str): Nội dung log đã chuẩn hoá.
+
+    Returns:
+        dict: (giao thức, id process) -> danh sách {"interface", "area", "mode", "algorithm", "source", "verdict"}
+              (interface đang shutdown được bỏ qua).
+    """
+    model = parse_igp_model(config_data)
+    results = {}
+    for process_key, process in model["processes"].items():
+        entries = results[process_key] = []
+        for name, interface, area in participating_interfaces(model, process):
+            entry = {"interface": name, "area": area, "mode": None, "algorithm": None, "source": None}
+            if is_passive(process, name):
+                entry["verdict"] = "passive"
+            else:
+                entry["mode"], entry["algorithm"], entry["source"] = _resolve_interface(
+                    process, name, interface, area, model["key_chains"])
+                if entry["mode"] is None:
+                    entry["verdict"] = "none"
+                elif entry["algorithm"] is None:
+                    entry["verdict"] = "missing_key"
+                else:
+                    entry["verdict"] = _verdict(entry["algorithm"])
+            entries.append(entry)
+    return results
+
+
+def process_authentication(model, process_key):
+    """
+    Xác thực khai báo ở mức process (area OSPF, 'authentication' của IS-IS/EIGRP), dùng khi không
+    xác định được interface tham gia (ví dụ log chỉ có một phần cấu hình).
+    Args:
+        model (dict): Kết quả parse_igp_model.
+        process_key (tuple): (giao thức, id process).
+
+    Returns:
+        bool: Process có khai báo xác thực.
+    """
+    process = model["processes"][process_key]
+    return bool(process["area_auth"] or process["authentication"]["mode"] or process["authentication"]["key_chain"]
+                or any(settings["mode"] for settings in process["af_interfaces"].values()))
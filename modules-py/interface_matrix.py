@@ -0,0 +1,316 @@
+import argparse
+import os
+import re
+import sys
+
+from archive_reader import iter_logs
+from config_stanzas import split_stanzas
+from fleet_inventory import select_sources
+from fleet_scheduler import split_command_sections
+from interface_names import canonical_interface_name
+from log_normalizer import find_hostname
+from module_3_1_switchport_analysis import parse_switchports
+from module_3_2_2_bpdu_guard_and_portfast import interface_stp_status
+from module_3_2_3_user_isolation import interface_isolation_status
+from module_3_3_dhcp_snooping import analyze_show_dhcp_snooping
+from show_table_parser import INTERFACE_BRIEF_COLUMNS, parse_table
+from vlan_set import VlanSet
+
+try:
+    import numpy  # Tuỳ chọn: chỉ cần khi xuất cột ra mảng NumPy
+except ImportError:
+    numpy = None
+
+# Cột boolean của bảng interface; mỗi cột là một bitmask (bit i bật khi dòng i có thuộc tính đó)
+BOOLEAN_COLUMNS = (
+    "access", "trunk", "shutdown", "up", "down", "portfast", "bpduguard",
+    "port_security", "isolated", "snooping_trusted", "in_snooping_vlan",
+)
+# Cột giá trị rời rạc: mỗi giá trị có bitmask riêng để lọc bằng phép toán bit
+VALUE_COLUMNS = ("access_vlan",)
+
+# Lệnh show dùng để điền bảng (so trên lệnh đã viết thường)
+SWITCHPORT_COMMAND_PATTERN = re.compile(r"^sh(?:ow)?\s+int(?:erfaces?)?\s+switchport")
+INTERFACE_BRIEF_COMMAND_PATTERN = re.compile(r"^sh(?:ow)?\s+ip\s+int(?:erface)?\s+br")
+DHCP_SNOOPING_COMMAND_PATTERN = re.compile(r"^sh(?:ow)?\s+ip\s+dhcp\s+snooping\s*$")
+PORT_SECURITY_PATTERN = re.compile(r"^switchport port-security\b", re.MULTILINE)
+SWITCHPORT_MODE_PATTERN = re.compile(r"^switchport mode (access|trunk)\b", re.MULTILINE)
+ACCESS_VLAN_PATTERN = re.compile(r"^switchport access vlan (\d+)", re.MULTILINE)
+SHUTDOWN_PATTERN = re.compile(r"^shutdown\b", re.MULTILINE)
+
+
+def _stanza_body(stanza_text):
+    # Thân stanza đã bỏ thụt lề, cùng dạng với các hàm phân loại interface trong module 3.2.x (dùng chung cache)
+    return "\n".join(line.strip() for line in stanza_text.splitlines()[1:])
+
+
+def _parse_interface_brief(section_text):
+    return {canonical_interface_name(row["interface"]): row["protocol"] == "up"
+            for row in parse_table(section_text, INTERFACE_BRIEF_COLUMNS)}
+
+
+class InterfaceMatrix:
+    """
+    Bảng interface dạng cột cho toàn bộ fleet. Mỗi dòng là một interface, tên thiết bị và tên interface
+    được intern; cột boolean là bitmask trên số nguyên Python nên luật kết hợp nhiều thuộc tính
+    (ví dụ portfast & ~bpduguard & access) là một phép toán bit trên toàn fleet thay vì vòng lặp theo interface.
+    """
+
+    def __init__(self):
+        self.devices = []
+        self.interfaces = []
+        self.row_devices = []
+        self.device_rows = {}
+        self.columns = {name: 0 for name in BOOLEAN_COLUMNS}
+        self.values = {name: [] for name in VALUE_COLUMNS}
+        self.value_masks = {name: {} for name in VALUE_COLUMNS}
+
+    def __len__(self):
+        return len(self.interfaces)
+
+    @property
+    def all_rows(self):
+        return (1 << len(self.interfaces)) - 1
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def _add_row(self, device_id, interface, facts):
+        row = len(self.interfaces)
+        self.interfaces.append(sys.intern(interface))
+        self.row_devices.append(device_id)
+        bit = 1 << row
+        for name in BOOLEAN_COLUMNS:
+            if facts.get(name):
+                self.columns[name] |= bit
+        for name in VALUE_COLUMNS:
+            value = facts.get(name)
+            self.values[name].append(value)
+            if value is not None:
+                masks = self.value_masks[name]
+                masks[value] = masks.get(value, 0) | bit
+
+    def add_device(self, device, config_data):
+        """
+        Thêm toàn bộ interface của một thiết bị vào bảng trong một lượt duyệt log.
+        Args:
+            device (str): Tên thiết bị.
+            config_data (str): Nội dung log đã chuẩn hoá.
+
+        Returns:
+            int: Số interface đã thêm.
+        """
+        device = sys.intern(device)
+        device_id = len(self.devices)
+        self.devices.append(device)
+
+        # Running-config: một stanza cho mỗi interface
+        interfaces = {}
+        for key, stanza in split_stanzas(config_data).items():
+            if not key.lower().startswith("interface "):
+                continue
+            name = canonical_interface_name(key.split(None, 1)[1])
+            body = _stanza_body(stanza.text)
+            portfast, bpduguard = interface_stp_status(body)
+            mode = SWITCHPORT_MODE_PATTERN.search(body)
+            vlan = ACCESS_VLAN_PATTERN.search(body)
+            interfaces[name] = {
+                "name": name,
+                "access": bool(mode) and mode.group(1) == "access",
+                "trunk": bool(mode) and mode.group(1) == "trunk",
+                "shutdown": bool(SHUTDOWN_PATTERN.search(body)),
+                "portfast": portfast,
+                "bpduguard": bpduguard,
+                "port_security": bool(PORT_SECURITY_PATTERN.search(body)),
+                "isolated": interface_isolation_status(body) == "isolated",
+                "access_vlan": int(vlan.group(1)) if vlan else None,
+            }
+
+        # Output lệnh show: trạng thái thực tế ghi đè giá trị suy ra từ cấu hình
+        snooping_vlans = VlanSet()
+        trusted = set()
+        states = {}
+        for command, text in split_command_sections(config_data):
+            if SWITCHPORT_COMMAND_PATTERN.match(command):
+                for name, switchport in parse_switchports(text).items():
+                    name = canonical_interface_name(name)
+                    facts = interfaces.setdefault(name, {"name": name})
+                    admin_mode = switchport.get("admin_mode", "")
+                    facts["access"] = admin_mode == "static access"
+                    facts["trunk"] = admin_mode == "trunk"
+                    if facts["access"] and switchport.get("access_vlan"):
+                        facts["access_vlan"] = int(switchport["access_vlan"])
+            elif INTERFACE_BRIEF_COMMAND_PATTERN.match(command):
+                states.update(_parse_interface_brief(text))
+            elif DHCP_SNOOPING_COMMAND_PATTERN.match(command):
+                snooping = analyze_show_dhcp_snooping(text)
+                if snooping["enabled"]:
+                    snooping_vlans = snooping["operational_vlans"]
+                    trusted.update(canonical_interface_name(port) for port in snooping["trusted_ports"])
+
+        start = len(self.interfaces)
+        for key, facts in interfaces.items():
+            # Interface không có trong 'show ip interface brief' không được tính là up hay down
+            facts["up"] = states.get(key) is True
+            facts["down"] = states.get(key) is False
+            facts["snooping_trusted"] = key in trusted
+            facts["in_snooping_vlan"] = facts.get("access_vlan") is not None and facts["access_vlan"] in snooping_vlans
+            self._add_row(device_id, facts["name"], facts)
+        rows = ((1 << (len(self.interfaces) - start)) - 1) << start
+        self.device_rows[device] = self.device_rows.get(device, 0) | rows
+        return len(self.interfaces) - start
+
+    def equals(self, column, value):
+        """
+        Bitmask các dòng có giá trị cột bằng value.
+        Args:
+            column (str): Tên cột giá trị (ví dụ "access_vlan").
+            value: Giá trị cần so.
+
+        Returns:
+            int: Bitmask.
+        """
+        return self.value_masks[column].get(value, 0)
+
+    def count(self, mask):
+        return bin(mask & self.all_rows).count("1")
+
+    def rows(self, mask):
+        """
+        Liệt kê các dòng thuộc bitmask.
+        Args:
+            mask (int): Bitmask (có thể là kết quả của phép ~).
+
+        Returns:
+            list: Danh sách (thiết bị, interface).
+        """
+        mask &= self.all_rows
+        result = []
+        while mask:
+            row = (mask & -mask).bit_length() - 1
+            result.append((self.devices[self.row_devices[row]], self.interfaces[row]))
+            mask &= mask - 1
+        return result
+
+    def count_by_device(self, mask):
+        """
+        Tổng hợp số dòng thuộc bitmask theo từng thiết bị.
+        Args:
+            mask (int): Bitmask.
+
+        Returns:
+            dict: Thiết bị -> số interface (chỉ thiết bị có ít nhất một interface).
+        """
+        counts = {}
+        for device, device_mask in self.device_rows.items():
+            count = bin(mask & device_mask).count("1")
+            if count:
+                counts[device] = count
+        return counts
+
+    def to_numpy(self, column):
+        """
+        Xuất một cột boolean ra mảng NumPy (cần cài numpy).
+        Args:
+            column (str): Tên cột boolean.
+
+        Returns:
+            numpy.ndarray: Mảng bool độ dài bằng số dòng.
+
+        Raises:
+            RuntimeError: Chưa cài numpy.
+        """
+        if numpy is None:
+            raise RuntimeError("Cần cài numpy để xuất cột ra mảng (pip install numpy).")
+        size = len(self.interfaces)
+        packed = numpy.frombuffer(self.columns[column].to_bytes((size + 7) // 8, "little"), dtype=numpy.uint8)
+        return numpy.unpackbits(packed, bitorder="little")[:size].astype(bool)
+
+
+# Luật kết hợp thuộc tính trên toàn fleet: mã -> (mô tả, hàm nhận InterfaceMatrix và trả bitmask vi phạm)
+FLEET_RULES = {
+    "portfast-without-bpduguard": (
+        "Cổng PortFast chưa bật BPDU Guard",
+        lambda m: m["portfast"] & ~m["bpduguard"],
+    ),
+    "snooping-access-without-bpduguard": (
+        "Cổng access trong VLAN DHCP Snooping có PortFast nhưng chưa bật BPDU Guard",
+        lambda m: m["access"] & m["in_snooping_vlan"] & m["portfast"] & ~m["bpduguard"],
+    ),
+    "access-vlan-1": (
+        "Cổng access thuộc VLAN 1",
+        lambda m: m["access"] & m.equals("access_vlan", 1),
+    ),
+    "trusted-access-port": (
+        "Cổng access được đặt DHCP Snooping trusted",
+        lambda m: m["access"] & m["snooping_trusted"],
+    ),
+    "down-not-shutdown": (
+        "Cổng down nhưng chưa shutdown",
+        lambda m: m["down"] & ~m["shutdown"],
+    ),
+}
+
+
+def build_fleet_matrix(folder_path, site=None, role=None):
+    """
+    Dựng bảng interface từ bản chụp mới nhất của mỗi thiết bị trong thư mục log (mỗi file một lượt duyệt).
+    Args:
+        folder_path (str): Đường dẫn tới thư mục chứa file log.
+        site (str | None): Chỉ lấy thiết bị thuộc site này.
+        role (str | None): Chỉ lấy thiết bị có vai trò này.
+
+    Returns:
+        InterfaceMatrix: Bảng interface của fleet.
+    """
+    matrix = InterfaceMatrix()
+    for log in iter_logs(select_sources(folder_path, site=site, role=role, latest=True)):
+        try:
+            config_data = log.text
+        except Exception as e:
+            print(f"Lỗi khi đọc file {log.name}: {e}")
+            continue
+        matrix.add_device(find_hostname(config_data) or os.path.basename(log.name), config_data)
+    return matrix
+
+
+def display_fleet_rules(matrix, rules=FLEET_RULES, limit=20):
+    """
+    Hiển thị số interface vi phạm từng luật, tổng hợp theo thiết bị.
+    Args:
+        matrix (InterfaceMatrix): Bảng interface.
+        rules (dict): Luật cần đánh giá.
+        limit (int): Số interface liệt kê tối đa cho mỗi luật.
+    """
+    print(f"\033[1mBảng interface: {len(matrix)} interface trên {len(matrix.devices)} thiết bị\033[0m")
+    for rule_id, (description, rule) in rules.items():
+        mask = rule(matrix)
+        count = matrix.count(mask)
+        if not count:
+            print(f"- {rule_id} ({description}): \033[32mTuân Thủ\033[0m")
+            continue
+        print(f"- {rule_id} ({description}): \033[31mKhông Tuân Thủ\033[0m - {count} interface")
+        for device, device_count in matrix.count_by_device(mask).items():
+            print(f"  {device}: {device_count}")
+        rows = matrix.rows(mask)
+        print(f"  Ví dụ: {', '.join(f'{device} {interface}' for device, interface in rows[:limit])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dựng bảng interface toàn fleet và đánh giá các luật kết hợp thuộc tính.")
+    parser.add_argument("folder", type=str, help="Đường dẫn tới thư mục chứa file log.")
+    parser.add_argument("--site", type=str, help="Chỉ lấy thiết bị thuộc site này (ví dụ HN).")
+    parser.add_argument("--role", type=str, help="Chỉ lấy thiết bị có vai trò này (ví dụ access_switch).")
+    parser.add_argument("--rule", action="append", choices=sorted(FLEET_RULES),
+                        help="Chỉ đánh giá các luật này (có thể lặp lại).")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.folder):
+        print(f"Lỗi: Không tìm thấy thư mục '{args.folder}'.")
+        return
+    rules = {rule_id: FLEET_RULES[rule_id] for rule_id in args.rule} if args.rule else FLEET_RULES
+    display_fleet_rules(build_fleet_matrix(args.folder, args.site, args.role), rules)
+
+
+if __name__ == "__main__":
+    main()
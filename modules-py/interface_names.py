@@ -0,0 +1,103 @@
+import re
+import sys
+from functools import lru_cache
+
+# Tên đầy đủ của các loại interface (IOS, IOS-XE, NX-OS), theo cách viết trong running-config
+INTERFACE_TYPES = (
+    "AppGigabitEthernet", "BDI", "Dialer", "Ethernet", "FastEthernet", "FiftyGigE", "FortyGigabitEthernet",
+    "GigabitEthernet", "HundredGigE", "Loopback", "mgmt", "Multilink", "nve", "Null", "Port-channel",
+    "Serial", "TenGigabitEthernet", "Tunnel", "TwentyFiveGigE", "TwoGigabitEthernet", "Virtual-Access",
+    "Virtual-Template", "Vlan",
+)
+# Viết tắt dùng trong output lệnh show mà không suy ra được bằng tiền tố duy nhất
+ABBREVIATIONS = {
+    "eth": "Ethernet",           # NX-OS: Eth1/1
+    "et": "Ethernet",
+    "gi": "GigabitEthernet",
+    "ge": "GigabitEthernet",
+    "fa": "FastEthernet",
+    "fe": "FastEthernet",
+    "te": "TenGigabitEthernet",
+    "tw": "TwoGigabitEthernet",  # IOS-XE: Tw là 2.5G, Twe là 25G
+    "twe": "TwentyFiveGigE",
+    "fo": "FortyGigabitEthernet",
+    "fi": "FiftyGigE",
+    "hu": "HundredGigE",
+    "ap": "AppGigabitEthernet",
+    "po": "Port-channel",
+    "portchannel": "Port-channel",
+    "lo": "Loopback",
+    "vl": "Vlan",
+    "tu": "Tunnel",
+    "se": "Serial",
+    "mu": "Multilink",
+    "di": "Dialer",
+    "vi": "Virtual-Access",
+    "vt": "Virtual-Template",
+    "nu": "Null",
+    "mgmt": "mgmt",
+}
+# Loại interface + số hiệu (slot/port, subinterface ".n", kênh ":n"); có thể có khoảng trắng ở giữa
+INTERFACE_NAME_PATTERN = re.compile(r"^([a-z][a-z-]*?)\s*(\d[\d/.:]*)$", re.IGNORECASE)
+
+_TYPES_BY_LOWER = {name.lower(): name for name in INTERFACE_TYPES}
+
+
+def _interface_type(prefix):
+    lowered = prefix.lower()
+    if lowered in _TYPES_BY_LOWER:
+        return _TYPES_BY_LOWER[lowered]
+    if lowered in ABBREVIATIONS:
+        return ABBREVIATIONS[lowered]
+    # Viết tắt khác (ví dụ "Gig", "Port-ch"): chỉ nhận khi khớp tiền tố của đúng một loại
+    candidates = [name for name in INTERFACE_TYPES if name.lower().startswith(lowered)]
+    return candidates[0] if len(candidates) == 1 else None
+
+
+@lru_cache(maxsize=1 << 16)
+def canonical_interface_name(name):
+    """
+    Chuẩn hoá tên interface về tên đầy đủ như trong running-config, ví dụ "Gi1/0/1" và
+    "GigabitEthernet 1/0/1" cùng cho "GigabitEthernet1/0/1", "po10" cho "Port-channel10",
+    "Eth1/1.100" cho "Ethernet1/1.100". Kết quả được intern nên có thể dùng trực tiếp làm khoá dict.
+    Args:
+        name (str): Tên interface từ cấu hình hoặc output lệnh show.
+
+    Returns:
+        str: Tên đã chuẩn hoá (tên không nhận dạng được giữ nguyên, chỉ bỏ khoảng trắng thừa).
+    """
+    stripped = name.strip()
+    match = INTERFACE_NAME_PATTERN.match(stripped)
+    interface_type = _interface_type(match.group(1)) if match else None
+    if interface_type is None:
+        return sys.intern(stripped)
+    return sys.intern(interface_type + match.group(2))
+
+
+def parent_interface(name):
+    """
+    Interface cha của một subinterface, ví dụ "GigabitEthernet0/1.100" -> "GigabitEthernet0/1".
+    Args:
+        name (str): Tên interface.
+
+    Returns:
+        str: Tên chuẩn hoá của interface cha (chính nó nếu không phải subinterface).
+    """
+    return canonical_interface_name(canonical_interface_name(name).split(".", 1)[0])
+
+
+def is_port_channel(name):
+    return canonical_interface_name(name).startswith("Port-channel")
+
+
+def index_by_interface(items):
+    """
+    Lập chỉ mục theo tên interface đã chuẩn hoá để ghép dữ liệu giữa các nguồn bằng tra cứu dict.
+    Args:
+        items (dict | iterable): Dict tên interface -> giá trị, hoặc danh sách cặp (tên, giá trị).
+
+    Returns:
+        dict: Tên chuẩn hoá -> giá trị (giá trị sau ghi đè giá trị trước nếu trùng tên).
+    """
+    pairs = items.items() if isinstance(items, dict) else items
+    return {canonical_interface_name(name): value for name, value in pairs}
@@ -0,0 +1,137 @@
+import re
+
+from stanza_cache import memoize_stanza
+
+# Stanza 'line <loại> <số> [<số>]' cùng các dòng thụt lề theo sau
+LINE_STANZA_PATTERN = re.compile(r"^line\s.*(?:\n[ \t].*)*", re.MULTILINE | re.IGNORECASE)
+LINE_HEADER_PATTERN = re.compile(r"^line\s+(?P<kind>[a-z]+)(?:\s+(?P<first>\d+)(?:\s+(?P<last>\d+))?)?", re.IGNORECASE)
+# Tên loại line trong cấu hình -> tên rút gọn IOS hiển thị trong running-config
+LINE_KINDS = {"console": "con", "con": "con", "vty": "vty", "aux": "aux", "tty": "tty"}
+# Các loại line dùng để đăng nhập quản trị
+MANAGEMENT_LINE_KINDS = ("con", "aux", "vty")
+# Giao thức trong 'transport input' cho phép Telnet
+TELNET_TRANSPORTS = ("telnet", "all")
+
+_last_parsed = (None, None)
+
+
+@memoize_stanza("line", version=1)
+def parse_line_stanza(stanza_text):
+    """
+    Phân tích một stanza 'line'. Kết quả được dùng chung qua cache stanza, không sửa trực tiếp.
+    Args:
+        stanza_text (str): Nội dung stanza, dòng đầu là 'line ...'.
+
+    Returns:
+        dict: {"header", "kind", "first", "last", "transport_input", "transport_output",
+               "exec_timeout" (phút), "exec_timeout_seconds", "access_class_in", "access_class_out",
+               "login", "evidence": thuộc tính -> dòng cấu hình}.
+            Thuộc tính không được cấu hình có giá trị None.
+    """
+    lines = stanza_text.splitlines()
+    header = lines[0].strip()
+    match = LINE_HEADER_PATTERN.match(header)
+    kind = match.group("kind").lower() if match else header.split()[-1].lower()
+    first = int(match.group("first")) if match and match.group("first") else None
+    last = int(match.group("last")) if match and match.group("last") else first
+    stanza = {
+        "header": header,
+        "kind": LINE_KINDS.get(kind, kind),
+        "first": first,
+        "last": last,
+        "transport_input": None,
+        "transport_output": None,
+        "exec_timeout": None,
+        "exec_timeout_seconds": None,
+        "access_class_in": None,
+        "access_class_out": None,
+        "login": None,
+        "evidence": {},
+    }
+
+    for raw_line in lines[1:]:
+        line = raw_line.strip()
+        words = line.lower().split()
+        if len(words) >= 3 and words[0] == "transport" and words[1] in ("input", "output"):
+            attribute = f"transport_{words[1]}"
+            stanza[attribute] = words[2:]
+        elif len(words) >= 2 and words[0] == "exec-timeout" and words[1].isdigit():
+            attribute = "exec_timeout"
+            stanza["exec_timeout"] = int(words[1])
+            stanza["exec_timeout_seconds"] = int(words[2]) if len(words) > 2 and words[2].isdigit() else 0
+        elif len(words) >= 3 and words[0] == "access-class" and words[-1] in ("in", "out"):
+            attribute = f"access_class_{words[-1]}"
+            stanza[attribute] = line.split()[1]
+        elif len(words) >= 3 and words[0] == "access-class" and words[2] in ("in", "out"):
+            # access-class <acl> in vrf-also
+            attribute = f"access_class_{words[2]}"
+            stanza[attribute] = line.split()[1]
+        elif words[:1] == ["login"] or words[:2] == ["no", "login"]:
+            attribute = "login"
+            if words[0] == "no":
+                stanza["login"] = "none"
+            elif len(words) == 1:
+                stanza["login"] = "line"
+            elif words[1] == "authentication":
+                stanza["login"] = f"authentication {line.split()[2]}" if len(words) > 2 else "authentication default"
+            else:
+                stanza["login"] = words[1]
+        else:
+            continue
+        stanza["evidence"][attribute] = line
+    return stanza
+
+
+def parse_line_stanzas(config_data):
+    """
+    Tách và phân tích toàn bộ stanza 'line' của một file trong một lượt quét.
+    Stanza giống hệt nhau (log chụp running-config nhiều lần) chỉ được giữ một lần.
+    Kết quả của lần gọi gần nhất được giữ lại để các mục kiểm tra chạy liên tiếp trên cùng nội dung log dùng chung.
+    Args:
+        config_data (str): Nội dung log đã chuẩn hoá.
+
+    Returns:
+        list: Danh sách stanza (xem parse_line_stanza) theo thứ tự xuất hiện.
+    """
+    global _last_parsed
+    last_data, last_stanzas = _last_parsed
+    if last_data is config_data:
+        return last_stanzas
+
+    seen = set()
+    stanzas = []
+    for match in LINE_STANZA_PATTERN.finditer(config_data):
+        stanza_text = match.group(0).rstrip()
+        if stanza_text in seen:
+            continue
+        seen.add(stanza_text)
+        stanzas.append(parse_line_stanza(stanza_text))
+    _last_parsed = (config_data, stanzas)
+    return stanzas
+
+
+def management_lines(stanzas, kinds=MANAGEMENT_LINE_KINDS):
+    """
+    Lọc các stanza line dùng để đăng nhập quản trị.
+    Args:
+        stanzas (list): Kết quả từ parse_line_stanzas.
+        kinds (tuple): Các loại line cần lấy.
+
+    Returns:
+        list: Các stanza thuộc các loại đã chọn.
+    """
+    return [stanza for stanza in stanzas if stanza["kind"] in kinds]
+
+
+def allows_telnet(stanza):
+    """
+    Xác định line có cho phép Telnet hay không.
+    Args:
+        stanza (dict): Stanza line.
+
+    Returns:
+        bool | None: True/False theo 'transport input', None nếu không cấu hình (phụ thuộc mặc định của IOS).
+    """
+    if stanza["transport_input"] is None:
+        return None
+    return any(transport in TELNET_TRANSPORTS for transport in stanza["transport_input"])
@@ -0,0 +1,174 @@
+import hashlib
+import re
+from collections import OrderedDict
+
+from log_scanner import decode_evidence, open_log_buffer
+
+# Escape ANSI (CSI, OSC, chọn bộ ký tự) sinh ra bởi terminal
+ANSI_ESCAPE_PATTERN = re.compile(r"\x1b(?:\[[0-9;?]*[ -/]*[@-~]|\][^\x07\x1b]*(?:\x07|\x1b\\)|[()][0-9A-Za-z]|[=>78])")
+# Dấu nhắc phân trang của Cisco và chuỗi xoá dấu nhắc sau khi nhấn phím (backspace, space, rồi backspace);
+# khoảng trắng sau chuỗi xoá là thụt lề của dòng tiếp theo nên được giữ lại
+MORE_PROMPT_PATTERN = re.compile(r" ?--More-- ?(?:\x08+(?: +\x08+)?)?")
+# Ký tự điều khiển còn sót (trừ \t, \b, \r, \n)
+CONTROL_CHAR_PATTERN = re.compile(r"[\x00-\x07\x0b\x0c\x0e-\x1f\x7f]")
+# Dòng đầu tiên có dạng "<hostname>#..." hoặc "<hostname>>..."
+PROMPT_PATTERN = re.compile(r"^([A-Za-z0-9][\w.\-]*)[#>]", re.MULTILINE)
+# Độ rộng terminal khi thu log: lệnh "terminal width N" hoặc output "show terminal" ("Width: N columns")
+TERMINAL_WIDTH_PATTERNS = (
+    re.compile(r"^[A-Za-z0-9][\w.\-]*[#>]\s*term(?:inal)?\s+width\s+(\d+)\s*$", re.MULTILINE | re.IGNORECASE),
+    re.compile(r"\bWidth:\s*(\d+) columns", re.IGNORECASE),
+)
+# Độ rộng terminal dùng khi log không ghi lại độ rộng (None: không nối dòng)
+DEFAULT_WRAP_WIDTH = None
+
+# Số file đã chuẩn hoá được giữ lại trong bộ nhớ (theo mã băm nội dung)
+CACHE_SIZE = 16
+_normalized_cache = OrderedDict()
+
+
+def find_hostname(text):
+    """
+    Xác định hostname từ dấu nhắc lệnh đầu tiên trong log.
+    Args:
+        text (str): Nội dung log.
+
+    Returns:
+        str | None: Hostname hoặc None nếu không tìm thấy dấu nhắc.
+    """
+    match = PROMPT_PATTERN.search(text)
+    return match.group(1) if match else None
+
+
+def detect_wrap_width(text, default=DEFAULT_WRAP_WIDTH):
+    """
+    Xác định độ rộng terminal khi thu log từ lệnh 'terminal width' hoặc output 'show terminal'.
+    Args:
+        text (str): Nội dung log gốc.
+        default (int | None): Giá trị dùng khi log không ghi lại độ rộng.
+
+    Returns:
+        int | None: Độ rộng terminal; None nếu không ngắt dòng (width 0) hoặc không xác định được.
+    """
+    for pattern in TERMINAL_WIDTH_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            return int(match.group(1)) or None
+    return default
+
+
+def _apply_overstrike(line):
+    # Mô phỏng terminal: \r đưa con trỏ về đầu dòng, \b lùi một ký tự, ký tự mới ghi đè ký tự cũ
+    buffer = []
+    cursor = 0
+    for char in line:
+        if char == "\r":
+            cursor = 0
+        elif char == "\b":
+            cursor = max(cursor - 1, 0)
+        else:
+            if cursor < len(buffer):
+                buffer[cursor] = char
+            else:
+                buffer.append(char)
+            cursor += 1
+    return "".join(buffer)
+
+
+def normalize_capture(text, wrap_width=None):
+    """
+    Làm sạch log thu từ terminal: bỏ escape ANSI, dấu nhắc '--More--', xử lý backspace/CR,
+    chuẩn hoá khoảng trắng trong dòng lệnh và (tuỳ chọn) nối các dòng bị ngắt theo độ rộng terminal.
+    Args:
+        text (str): Nội dung log gốc.
+        wrap_width (int | None): Độ rộng terminal khi thu log; dòng dài đúng bằng giá trị này
+            được coi là bị ngắt và nối với dòng tiếp theo. None để bỏ qua.
+
+    Returns:
+        str: Nội dung log đã chuẩn hoá (dòng kết thúc bằng '\\n', không có khoảng trắng cuối dòng).
+    """
+    text = text.replace("\r\n", "\n")
+    if "\x1b" in text:
+        text = ANSI_ESCAPE_PATTERN.sub("", text)
+    if "--More--" in text:
+        text = MORE_PROMPT_PATTERN.sub("", text)
+    text = CONTROL_CHAR_PATTERN.sub("", text)
+
+    hostname = find_hostname(text)
+    prompts = (f"{hostname}#", f"{hostname}>") if hostname else ()
+
+    lines = []
+    pending = None
+    for line in text.split("\n"):
+        if "\r" in line or "\b" in line:
+            line = _apply_overstrike(line)
+
+        # Dòng bị terminal ngắt: nối vào dòng trước
+        if pending is not None:
+            line = pending + line
+            pending = None
+        if wrap_width and len(line) == wrap_width:
+            pending = line
+            continue
+
+        line = line.rstrip()
+        # Dòng lệnh: gộp khoảng trắng thừa ("show ip interface  brief " -> "show ip interface brief")
+        if prompts and line.startswith(prompts):
+            prefix_length = len(hostname) + 1
+            line = line[:prefix_length] + " ".join(line[prefix_length:].split())
+        lines.append(line)
+
+    if pending is not None:
+        lines.append(pending.rstrip())
+    return "\n".join(lines)
+
+
+def normalize_log_bytes(raw, wrap_width=None):
+    """
+    Giải mã và chuẩn hoá nội dung log, có cache theo mã băm SHA-1 của nội dung gốc.
+    Args:
+        raw (bytes | mmap.mmap): Nội dung file log.
+        wrap_width (int | None): Độ rộng terminal để nối dòng bị ngắt; None để tự xác định
+            (xem detect_wrap_width).
+
+    Returns:
+        tuple: (mã băm hex của nội dung gốc, nội dung đã chuẩn hoá).
+    """
+    digest = hashlib.sha1(raw).hexdigest()
+    cache_key = (digest, wrap_width)
+    if cache_key in _normalized_cache:
+        _normalized_cache.move_to_end(cache_key)
+        return digest, _normalized_cache[cache_key]
+
+    text = decode_evidence(raw)
+    text = normalize_capture(text, wrap_width or detect_wrap_width(text))
+    _normalized_cache[cache_key] = text
+    if len(_normalized_cache) > CACHE_SIZE:
+        _normalized_cache.popitem(last=False)
+    return digest, text
+
+
+def load_log_with_digest(file_path, wrap_width=None):
+    """
+    Đọc và chuẩn hoá file log (một lần cho mỗi nội dung file), trả kèm mã băm.
+    Args:
+        file_path (str): Đường dẫn tới file log.
+        wrap_width (int | None): Độ rộng terminal (None để tự xác định).
+
+    Returns:
+        tuple: (mã băm hex của file, nội dung đã chuẩn hoá).
+    """
+    with open_log_buffer(file_path) as buffer:
+        return normalize_log_bytes(buffer, wrap_width)
+
+
+def load_log(file_path, wrap_width=None):
+    """
+    Đọc và chuẩn hoá file log để các module phân tích trên dữ liệu đã làm sạch.
+    Args:
+        file_path (str): Đường dẫn tới file log.
+        wrap_width (int | None): Độ rộng terminal (None để tự xác định).
+
+    Returns:
+        str: Nội dung file log đã chuẩn hoá.
+    """
+    return load_log_with_digest(file_path, wrap_width)[1]
@@ -0,0 +1,72 @@
+import mmap
+import os
+import re
+from contextlib import contextmanager
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def compile_bytes_pattern(pattern, flags=0):
+    """
+    Biên dịch regex dạng bytes để chạy trực tiếp trên buffer của file log.
+    Args:
+        pattern (str | bytes): Mẫu regex (các mẫu trong module đều là ASCII).
+        flags (int): Cờ của module re (re.IGNORECASE, re.MULTILINE, ...).
+
+    Returns:
+        re.Pattern: Regex bytes đã biên dịch (được cache theo mẫu và cờ).
+    """
+    if isinstance(pattern, str):
+        pattern = pattern.encode("ascii")
+    return re.compile(pattern, flags)
+
+
+def decode_evidence(raw):
+    """
+    Giải mã một đoạn bằng chứng (bytes) sang chuỗi, bỏ qua byte lỗi.
+    Args:
+        raw (bytes | None): Dữ liệu khớp được từ buffer.
+
+    Returns:
+        str | None: Chuỗi đã giải mã (byte không hợp lệ được thay bằng U+FFFD).
+    """
+    if raw is None:
+        return None
+    return str(raw, "utf-8", "replace")
+
+
+@contextmanager
+def open_log_buffer(file_path):
+    """
+    Ánh xạ file log vào bộ nhớ (mmap, chỉ đọc) để quét mà không giải mã toàn bộ file.
+    Args:
+        file_path (str): Đường dẫn tới file log.
+
+    Yields:
+        mmap.mmap | bytes: Buffer của file (b"" nếu file rỗng vì mmap không hỗ trợ file 0 byte).
+    """
+    with open(file_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield b""
+            return
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield buffer
+        finally:
+            buffer.close()
+
+
+def present_patterns(buffer, patterns):
+    """
+    Kiểm tra nhanh sự có mặt của nhiều mẫu trên cùng một buffer (dừng ở lần khớp đầu tiên của mỗi mẫu).
+    Args:
+        buffer (bytes | mmap.mmap): Buffer cần quét.
+        patterns (dict): Tên -> mẫu regex (str | bytes | re.Pattern dạng bytes).
+
+    Returns:
+        frozenset: Tên các mẫu có khớp trong buffer.
+    """
+    return frozenset(
+        name for name, pattern in patterns.items()
+        if (pattern if hasattr(pattern, "search") else compile_bytes_pattern(pattern)).search(buffer)
+    )
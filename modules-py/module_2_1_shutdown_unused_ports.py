@@ -1,76 +1,269 @@
-import os
-
-def extract_interface_brief(config_data):
-
-    print()
-    print("\033[1mMục 2.1: Yêu cầu phải shutdown port không sử dụng.\033[0m")
-    
-    try:
-        if config_data is None:
-            print("\033[31mKhông có dữ liệu để xử lý.\033[0m")
-            return
-
-        # Tách các dòng log
-        config_lines = config_data.splitlines()
-        start_idx = -1
-        hostname = None
-
-        # Tìm dòng lệnh "show ip interface brief"
-        for i, line in enumerate(config_lines):
-            cleaned_line = ' '.join(line.split()).strip()
-            if hostname is None and "#" in cleaned_line:
-                hostname = cleaned_line.split("#")[0].strip()
-
-            if hostname and f"{hostname}#show ip interface brief" in cleaned_line:
-                start_idx = i
-                break  # Ngừng tìm kiếm sau khi tìm thấy lệnh
-
-        if start_idx == -1:
-            print("\033[31mKhông Tìm Thấy Lệnh 'show ip interface brief'.\033[0m")
-            return
-
-        unused_ports = []
-        
-        # Phân tích các dòng sau lệnh "show ip interface brief"
-        for line in config_lines[start_idx + 1:]:
-            if line.strip() == "":
-                continue
-            if "#" in line:
-                break  # Kết thúc khi gặp lệnh khác
-            if "down" in line.lower() and "administratively" not in line.lower():
-                # Lấy tên interface từ dòng
-                interface_name = line.split()[0]
-                unused_ports.append(interface_name)
-
-        # Hiển thị kết quả
-        if unused_ports:
-            print("\033[1mCác port không sử dụng nhưng chưa được shutdown:\033[0m")
-            print(", ".join(unused_ports))  # Hiển thị theo danh sách ngắn gọn
-            print(f"\033[1mTổng số cổng không tuân thủ: {len(unused_ports)}\033[0m")
-        else:
-            print("\033[32mTất cả các port không sử dụng đã được shutdown.\033[0m")
-    except Exception as e:
-        print(f"\033[31mLỗi khi in dữ liệu lệnh 'show ip interface brief': {e}\033[0m")
-
-
-def process_logs_with_interface_brief(folder_path):
-
-
-    # Duyệt qua tất cả file trong folder
-    log_files = [file for file in os.listdir(folder_path) if file.endswith((".log", ".txt"))]
-    for log_file in log_files:
-        file_path = os.path.join(folder_path, log_file)
-        print(f"\nProcessing File: {file_path}")
-
-        try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                log_data = file.read()
-
-            # Gọi hàm phân tích lệnh "show ip interface brief"
-            extract_interface_brief(log_data)
-        except Exception as e:
-            print(f"An error occurred while processing {file_path}: {e}")
-
-if __name__ == "__main__":
-    folder_path = r"D:\automation\Test"  # Thay bằng đường dẫn thư mục chứa file log của bạn
-    process_logs_with_interface_brief(folder_path)
+import re
+from archive_reader import iter_logs, list_log_sources
+from config_stanzas import split_stanzas
+from fleet_scheduler import split_command_sections
+from interface_names import canonical_interface_name
+from log_normalizer import find_hostname
+from show_table_parser import INTERFACE_BRIEF_COLUMNS, INTERFACE_STATUS_COLUMNS, parse_table
+
+# Port không có lưu lượng vào/ra lâu hơn số ngày này được coi là không sử dụng
+UNUSED_DAYS = 30
+# Lệnh show dùng cho kiểm tra port không sử dụng (so trên lệnh đã viết thường)
+SHOW_INTERFACES_COMMAND_PATTERN = re.compile(r"^sh(?:ow)?\s+int(?:erfaces?)?\s*$")
+SHOW_INTERFACES_STATUS_COMMAND_PATTERN = re.compile(r"^sh(?:ow)?\s+int(?:erfaces?)?\s+status\s*$")
+# Dòng đầu của mỗi interface trong 'show interfaces'
+INTERFACE_HEADER_PATTERN = re.compile(r"^(\S+) is (administratively down|up|down|deleted)[^,]*, line protocol is (\w+)")
+# Thời gian trong 'Last input 1d02h, output never': never, hh:mm:ss, 1d02h, 2w3d, 1y2w
+DURATION_PATTERN = re.compile(r"^(?:(\d+):(\d+):(\d+)|(?:(\d+)y)?(?:(\d+)w)?(?:(\d+)d)?(?:(\d+)h)?)$")
+DURATION_UNITS = (365 * 86400, 7 * 86400, 86400, 3600)
+# Interface logic không phải port vật lý
+LOGICAL_INTERFACE_PREFIXES = ("Vlan", "Loopback", "Tunnel", "Null", "Port-channel", "Virtual", "BDI", "nve", "Dialer")
+VERDICT_LABELS = {
+    "in_use": "Đang sử dụng",
+    "shutdown": "Đã shutdown",
+    "unused": "Không sử dụng",
+    "recently_used": "Down nhưng mới có lưu lượng",
+    "unknown": "Down, không rõ thời gian",
+}
+
+def extract_interface_brief(config_data):
+
+    print()
+    print("\033[1mMục 2.1: Yêu cầu phải shutdown port không sử dụng.\033[0m")
+    
+    try:
+        if config_data is None:
+            print("\033[31mKhông có dữ liệu để xử lý.\033[0m")
+            return
+
+        # Tách các dòng log (dòng lệnh đã được log_normalizer gộp khoảng trắng)
+        config_lines = config_data.splitlines()
+        start_idx = -1
+        hostname = find_hostname(config_data)
+
+        # Tìm dòng lệnh "show ip interface brief"
+        for i, line in enumerate(config_lines):
+            if hostname and line.startswith(f"{hostname}#show ip interface brief"):
+                start_idx = i
+                break  # Ngừng tìm kiếm sau khi tìm thấy lệnh
+
+        if start_idx == -1:
+            print("\033[31mKhông Tìm Thấy Lệnh 'show ip interface brief'.\033[0m")
+            return
+
+        # Phân tích bảng sau lệnh "show ip interface brief" (dừng ở dấu nhắc lệnh tiếp theo)
+        unused_ports = []
+        for row in parse_table("\n".join(config_lines[start_idx:]), INTERFACE_BRIEF_COLUMNS):
+            if row["status"] != "administratively down" and "down" in (row["status"], row["protocol"]):
+                unused_ports.append(row["interface"])
+
+        # Hiển thị kết quả
+        if unused_ports:
+            print("\033[1mCác port không sử dụng nhưng chưa được shutdown:\033[0m")
+            print(", ".join(unused_ports))  # Hiển thị theo danh sách ngắn gọn
+            print(f"\033[1mTổng số cổng không tuân thủ: {len(unused_ports)}\033[0m")
+        else:
+            print("\033[32mTất cả các port không sử dụng đã được shutdown.\033[0m")
+        return unused_ports
+    except Exception as e:
+        print(f"\033[31mLỗi khi in dữ liệu lệnh 'show ip interface brief': {e}\033[0m")
+
+
+def parse_duration(text):
+    """
+    Đổi thời gian trong 'show interfaces' ra giây.
+    Args:
+        text (str): Ví dụ "never", "00:01:02", "1d02h", "2w3d", "1y2w".
+
+    Returns:
+        int | None: Số giây, hoặc None nếu là "never" hay không đọc được.
+    """
+    match = DURATION_PATTERN.match(text.strip().rstrip(","))
+    if not match or not any(match.groups()):
+        return None
+    if match.group(1):
+        hours, minutes, seconds = (int(value) for value in match.group(1, 2, 3))
+        return hours * 3600 + minutes * 60 + seconds
+    return sum(int(value) * unit for value, unit in zip(match.group(4, 5, 6, 7), DURATION_UNITS) if value)
+
+
+def parse_show_interfaces(section_text):
+    """
+    Đọc output 'show interfaces' theo luồng, mỗi dòng chỉ được so bằng phép so chuỗi đầu dòng;
+    regex chỉ dùng cho dòng đầu của interface và dòng 'Last input'.
+    Args:
+        section_text (str): Output lệnh 'show interfaces'.
+
+    Returns:
+        dict: Tên interface chuẩn hoá -> {"admin_down", "protocol_up", "last_input", "last_output" (giây hoặc None),
+              "packets_input", "packets_output"}.
+    """
+    interfaces = {}
+    current = None
+    for line in section_text.splitlines():
+        if not line:
+            continue
+        if line[0] not in " \t":
+            match = INTERFACE_HEADER_PATTERN.match(line)
+            if match:
+                current = interfaces[canonical_interface_name(match.group(1))] = {
+                    "admin_down": match.group(2) == "administratively down",
+                    "protocol_up": match.group(3) == "up",
+                    "last_input": None,
+                    "last_output": None,
+                    "packets_input": None,
+                    "packets_output": None,
+                }
+            else:
+                current = None
+            continue
+        if current is None:
+            continue
+        stripped = line.lstrip()
+        if stripped.startswith("Last input"):
+            # Last input 00:00:01, output never, output hang never
+            fields = stripped.split()
+            current["last_input"] = parse_duration(fields[2]) if len(fields) > 2 else None
+            current["last_output"] = parse_duration(fields[4]) if len(fields) > 4 else None
+        elif stripped[:1].isdigit():
+            count, _, rest = stripped.partition(" ")
+            if rest.startswith("packets input"):
+                current["packets_input"] = int(count)
+            elif rest.startswith("packets output"):
+                current["packets_output"] = int(count)
+    return interfaces
+
+
+def parse_interface_status(section_text):
+    """
+    Đọc bảng 'show interfaces status' (cột Name có thể chứa khoảng trắng nên cắt cột theo vị trí tiêu đề).
+    Args:
+        section_text (str): Output lệnh 'show interfaces status'.
+
+    Returns:
+        dict: Tên interface chuẩn hoá -> trạng thái ("connected", "notconnect", "disabled", "err-disabled", ...).
+    """
+    statuses = {}
+    for row in parse_table(section_text, INTERFACE_STATUS_COLUMNS):
+        if row["status"]:
+            statuses[canonical_interface_name(row["port"])] = row["status"]
+    return statuses
+
+
+def _configured_shutdown(config_data):
+    shutdown = {}
+    for key, stanza in split_stanzas(config_data).items():
+        if key.lower().startswith("interface "):
+            name = canonical_interface_name(key.split(None, 1)[1])
+            shutdown[name] = any(line.strip() == "shutdown" for line in stanza.text.splitlines()[1:])
+    return shutdown
+
+
+def analyze_unused_ports(config_data, max_idle_days=UNUSED_DAYS):
+    """
+    Phân loại port vật lý theo mức sử dụng thực tế, dựa trên 'show interfaces' (thời gian last input/output,
+    bộ đếm gói) và 'show interfaces status', ghép với trạng thái shutdown trong running-config.
+    Args:
+        config_data (str): Nội dung log đã chuẩn hoá.
+        max_idle_days (int): Số ngày không có lưu lượng để coi port là không sử dụng.
+
+    Returns:
+        dict: {"ports": tên port -> {"verdict", "idle_days", "status", "shutdown", "packets_input", "packets_output"},
+               "max_idle_days", "has_data"}. verdict là "in_use", "shutdown", "unused", "recently_used" hoặc "unknown".
+    """
+    timers = {}
+    statuses = {}
+    for command, text in split_command_sections(config_data):
+        if SHOW_INTERFACES_COMMAND_PATTERN.match(command):
+            timers.update(parse_show_interfaces(text))
+        elif SHOW_INTERFACES_STATUS_COMMAND_PATTERN.match(command):
+            statuses.update(parse_interface_status(text))
+    configured_shutdown = _configured_shutdown(config_data)
+
+    ports = {}
+    max_idle = max_idle_days * 86400
+    for name in list(timers) + [name for name in statuses if name not in timers]:
+        if name.startswith(LOGICAL_INTERFACE_PREFIXES) or "." in name:
+            continue
+        timer = timers.get(name, {})
+        status = statuses.get(name)
+        shutdown = configured_shutdown.get(name, False) or timer.get("admin_down", False) or status == "disabled"
+        # Thời gian từ lần có lưu lượng gần nhất (None: chưa từng có hoặc không có dữ liệu)
+        activity = [value for value in (timer.get("last_input"), timer.get("last_output")) if value is not None]
+        idle = min(activity) if activity else None
+        if shutdown:
+            verdict = "shutdown"
+        elif timer.get("protocol_up") or status == "connected":
+            verdict = "in_use"
+        elif not timer:
+            verdict = "unknown"
+        elif idle is None or idle > max_idle:
+            verdict = "unused"
+        else:
+            verdict = "recently_used"
+        ports[name] = {
+            "verdict": verdict,
+            "idle_days": idle // 86400 if idle is not None else None,
+            "status": status,
+            "shutdown": shutdown,
+            "packets_input": timer.get("packets_input"),
+            "packets_output": timer.get("packets_output"),
+        }
+    # Chỉ 'show interfaces status' thì không biết thời gian không sử dụng: coi như không có dữ liệu
+    return {"ports": ports, "max_idle_days": max_idle_days, "has_data": bool(timers)}
+
+
+def display_unused_ports(results):
+    """
+    Hiển thị kết quả phân loại port không sử dụng.
+    Args:
+        results (dict): Kết quả từ analyze_unused_ports.
+    """
+    print(f"\033[1mPort không có lưu lượng quá {results['max_idle_days']} ngày (show interfaces):\033[0m")
+    if not results["has_data"]:
+        print("\033[33mKhông Áp Dụng - Không tìm thấy output 'show interfaces'.\033[0m")
+        return
+    ports = results["ports"]
+    unused = [name for name, port in ports.items() if port["verdict"] == "unused"]
+    unknown = [name for name, port in ports.items() if port["verdict"] == "unknown"]
+    counts = {}
+    for port in ports.values():
+        counts[port["verdict"]] = counts.get(port["verdict"], 0) + 1
+    print(", ".join(f"{label}: {counts[verdict]}" for verdict, label in VERDICT_LABELS.items() if verdict in counts))
+    for name in unused:
+        port = ports[name]
+        idle = "chưa từng có lưu lượng" if port["idle_days"] is None else f"{port['idle_days']} ngày không có lưu lượng"
+        print(f"- {name}: {idle} (packets input: {port['packets_input']}, output: {port['packets_output']})")
+    if unknown:
+        print(f"\033[33mPort down không có dữ liệu thời gian: {', '.join(unknown)}\033[0m")
+    if unused:
+        print(f"\033[31mKhông Tuân Thủ - {len(unused)} port không sử dụng nhưng chưa được shutdown.\033[0m")
+    elif unknown:
+        print(f"\033[33mChưa đủ dữ liệu để kết luận cho {len(unknown)} port down.\033[0m")
+    else:
+        print("\033[32mTuân Thủ - Không có port không sử dụng nào chưa được shutdown.\033[0m")
+
+
+def process_logs_with_interface_brief(folder_path):
+
+
+    # Duyệt qua tất cả file log trong folder (kể cả member trong các bundle .gz/.zip/.tar)
+    log_sources = list_log_sources(folder_path)
+    for log in iter_logs(log_sources):
+        file_path = log.name
+        print(f"\nProcessing File: {file_path}")
+
+        try:
+            log_data = log.text
+
+            # Gọi hàm phân tích lệnh "show ip interface brief"
+            extract_interface_brief(log_data)
+
+            # Phân loại port theo thời gian không có lưu lượng
+            display_unused_ports(analyze_unused_ports(log_data))
+        except Exception as e:
+            print(f"An error occurred while processing {file_path}: {e}")
+
+if __name__ == "__main__":
+    folder_path = r"D:\automation\Test"  # Thay bằng đường dẫn thư mục chứa file log của bạn
+    process_logs_with_interface_brief(folder_path)
@@ -0,0 +1,183 @@
+import os
+import re
+from archive_reader import iter_logs, list_log_sources
+from vlan_set import NO_VLANS, VlanSet
+
+# Regex để phân tích lệnh
+INTERFACE_PATTERN = r"^Name:\s+(?P<interface>\S+)"
+ADMIN_MODE_PATTERN = r"Administrative Mode:\s+(?P<admin_mode>.+)"
+ACCESS_VLAN_PATTERN = r"Access Mode VLAN:\s+(?P<access_vlan>\d+)"
+TRUNK_NATIVE_VLAN_PATTERN = r"Trunking Native Mode VLAN:\s+(?P<native_vlan>\d+)"
+TRUNK_ALLOWED_VLANS_PATTERN = r"Trunking VLANs Enabled:\s+(?P<allowed_vlans>.+)"
+# Dòng tiếp theo của danh sách VLAN dài bị xuống dòng
+VLAN_CONTINUATION_PATTERN = r"^[\d,\-]+$"
+
+
+def parse_switchports(config_data):
+    """
+    Phân tích toàn bộ output lệnh 'show interface switchport' thành cấu hình của từng interface.
+    Args:
+        config_data (str): Nội dung lệnh 'show interface switchport'.
+
+    Returns:
+        dict: Interface -> {"admin_mode", "access_vlan", "native_vlan", "allowed_vlans" (VlanSet)}.
+    """
+    interface_configs = {}
+    current_config = None
+    allowed_text = None
+
+    def finish_allowed_vlans():
+        if current_config is not None and allowed_text is not None:
+            try:
+                current_config["allowed_vlans"] = VlanSet.parse(allowed_text)
+            except ValueError:
+                pass
+
+    for line in config_data.splitlines():
+        line = line.strip()
+
+        # Danh sách Allowed VLANs có thể kéo dài nhiều dòng
+        if allowed_text is not None:
+            if re.match(VLAN_CONTINUATION_PATTERN, line):
+                allowed_text += line
+                continue
+            finish_allowed_vlans()
+            allowed_text = None
+
+        # Phát hiện tên interface
+        if match := re.search(INTERFACE_PATTERN, line):
+            # Bắt đầu phân tích interface mới
+            current_config = interface_configs[match.group("interface")] = {}
+            continue
+
+        if current_config is None:
+            continue
+
+        # Phân tích Administrative Mode
+        if match := re.search(ADMIN_MODE_PATTERN, line):
+            current_config["admin_mode"] = match.group("admin_mode").strip()
+
+        # Phân tích VLAN truy cập
+        elif match := re.search(ACCESS_VLAN_PATTERN, line):
+            current_config["access_vlan"] = match.group("access_vlan")
+
+        # Phân tích Native VLAN
+        elif match := re.search(TRUNK_NATIVE_VLAN_PATTERN, line):
+            current_config["native_vlan"] = match.group("native_vlan")
+
+        # Phân tích Allowed VLANs
+        elif match := re.search(TRUNK_ALLOWED_VLANS_PATTERN, line):
+            allowed_text = match.group("allowed_vlans").strip()
+
+    # Xử lý trường hợp cuối cùng
+    finish_allowed_vlans()
+    return interface_configs
+
+
+def _is_vlan1_violation(config):
+    if config.get("admin_mode") == "static access":
+        return config.get("access_vlan") == "1"
+    if config.get("admin_mode") == "trunk":
+        return config.get("native_vlan") == "1" or 1 in config.get("allowed_vlans", NO_VLANS)
+    return False
+
+
+def parse_switchport_info(config_data):
+    """
+    Phân tích thông tin từ lệnh 'show interface switchport' để tìm các interface vi phạm.
+    Args:
+        config_data (str): Nội dung lệnh 'show interface switchport'.
+
+    Returns:
+        dict: Cấu hình của các interface vi phạm liên quan đến VLAN 1.
+    """
+    return vlan1_violations(parse_switchports(config_data))
+
+
+def vlan1_violations(interface_configs):
+    """
+    Lọc các interface vi phạm liên quan đến VLAN 1.
+    Args:
+        interface_configs (dict): Kết quả từ parse_switchports.
+
+    Returns:
+        dict: Cấu hình của các interface vi phạm.
+    """
+    return {interface: config for interface, config in interface_configs.items() if _is_vlan1_violation(config)}
+
+
+def trunks_carrying_vlans(interface_configs, vlans):
+    """
+    Tìm các trunk cho phép ít nhất một VLAN trong tập cho trước (ví dụ: trunk nào mang VLAN 1).
+    Args:
+        interface_configs (dict): Kết quả từ parse_switchports.
+        vlans (VlanSet): Tập VLAN cần tìm.
+
+    Returns:
+        dict: Interface -> các VLAN trong tập được trunk cho phép (VlanSet).
+    """
+    carried = {}
+    for interface, config in interface_configs.items():
+        if config.get("admin_mode") != "trunk":
+            continue
+        common = config.get("allowed_vlans", NO_VLANS) & vlans
+        if common:
+            carried[interface] = common
+    return carried
+
+
+def display_switchport_results(interface_configs):
+    """
+    Hiển thị các interface vi phạm liên quan đến VLAN 1.
+    Args:
+        interface_configs (dict): Kết quả từ parse_switchport_info.
+    """
+    if interface_configs:
+        print("\033[1mCấu hình hiện tại của các interface vi phạm:\033[0m")
+        for interface, config in interface_configs.items():
+            print(f"\nInterface: {interface}")
+            print(config)
+    else:
+        print("\033[33mKhông có interface nào vi phạm liên quan đến VLAN 1.\033[0m")
+    print("-" * 50)
+
+
+def process_switchport_logs(folder_path):
+    """
+    Duyệt qua tất cả các file log trong thư mục và phân tích thông tin từ 'show interface switchport'.
+    Args:
+        folder_path (str): Đường dẫn tới thư mục chứa file log.
+
+    Returns:
+        None: In kết quả cho từng file log.
+    """
+    if not os.path.exists(folder_path):
+        print(f"Folder not found: {folder_path}")
+        return
+
+    # Duyệt qua tất cả file log trong folder (kể cả member trong các bundle .gz/.zip/.tar)
+    log_sources = list_log_sources(folder_path)
+
+    if not log_sources:
+        print(f"No .log/.txt files or log archives found in folder: {folder_path}")
+        return
+
+    for log in iter_logs(log_sources):
+        file_path = log.name
+        print(f"\nProcessing File: {file_path}")
+
+        try:
+            config_data = log.text
+
+            # Gọi hàm phân tích
+            interface_configs = parse_switchport_info(config_data)
+
+            # Hiển thị kết quả
+            display_switchport_results(interface_configs)
+
+        except Exception as e:
+            print(f"An error occurred while processing {file_path}: {e}")
+
+if __name__ == "__main__":
+    folder_path = r"D:\automation\Test"  # Thay bằng đường dẫn thư mục chứa file log của bạn
+    process_switchport_logs(folder_path)
@@ -1,141 +1,186 @@
-import os
-import re
-
-def analyze_bpdu_guard_and_portfast(config_data):
-    """
-    Phân tích trạng thái BPDU Guard và PortFast từ cấu hình và lệnh 'show spanning-tree summary'.
-    Args:
-        config_data (str): Nội dung cấu hình hoặc lệnh 'show spanning-tree summary'.
-
-    Returns:
-        dict: Trạng thái BPDU Guard và danh sách các cổng PortFast.
-    """
-    stp_summary = {
-        "bpdu_guard_default": "unknown",
-        "portfast_default": "unknown",
-        "portfast_interfaces": {}
-    }
-
-    # Phân tích trạng thái BPDU Guard Default từ lệnh 'show spanning-tree summary'
-    bpdu_guard_pattern = r"Portfast BPDU Guard Default\s+is\s+(enabled|disabled)"
-    portfast_pattern = r"Portfast Default\s+is\s+(enabled|disabled)"
-
-    if match := re.search(bpdu_guard_pattern, config_data, re.IGNORECASE):
-        stp_summary["bpdu_guard_default"] = match.group(1).strip()
-
-    if match := re.search(portfast_pattern, config_data, re.IGNORECASE):
-        stp_summary["portfast_default"] = match.group(1).strip()
-
-    # Phân tích cấu hình interface để tìm PortFast và BPDU Guard
-    interface_pattern = r"^interface (\S+)"
-    portfast_enable_pattern = r"spanning-tree portfast(?! disable)"
-    bpdu_guard_enable_pattern = r"spanning-tree bpduguard enable"
-
-    current_interface = None
-    current_config = []
-
-    for line in config_data.splitlines():
-        line = line.strip()
-
-        # Xác định interface
-        if match := re.match(interface_pattern, line):
-            # Xử lý interface trước đó
-            if current_interface:
-                has_portfast = any(re.match(portfast_enable_pattern, config) for config in current_config)
-                has_bpdu_guard = any(re.match(bpdu_guard_enable_pattern, config) for config in current_config)
-                if has_portfast:
-                    stp_summary["portfast_interfaces"][current_interface] = {
-                        "portfast": "enabled",
-                        "bpdu_guard": "enabled" if has_bpdu_guard else "disabled"
-                    }
-
-            # Chuyển sang interface mới
-            current_interface = match.group(1)
-            current_config = []
-
-        # Thu thập cấu hình interface
-        if current_interface:
-            current_config.append(line)
-
-        # Kết thúc cấu hình interface
-        if line.startswith("!") and current_interface:
-            has_portfast = any(re.match(portfast_enable_pattern, config) for config in current_config)
-            has_bpdu_guard = any(re.match(bpdu_guard_enable_pattern, config) for config in current_config)
-            if has_portfast:
-                stp_summary["portfast_interfaces"][current_interface] = {
-                    "portfast": "enabled",
-                    "bpdu_guard": "enabled" if has_bpdu_guard else "disabled"
-                }
-            current_interface = None
-            current_config = []
-
-    # Xử lý interface cuối cùng
-    if current_interface:
-        has_portfast = any(re.match(portfast_enable_pattern, config) for config in current_config)
-        has_bpdu_guard = any(re.match(bpdu_guard_enable_pattern, config) for config in current_config)
-        if has_portfast:
-            stp_summary["portfast_interfaces"][current_interface] = {
-                "portfast": "enabled",
-                "bpdu_guard": "enabled" if has_bpdu_guard else "disabled"
-            }
-
-    return stp_summary
-
-
-def process_stp_and_portfast_logs(folder_path):
-    """
-    Duyệt qua tất cả các file log trong thư mục và kiểm tra trạng thái BPDU Guard và PortFast.
-    Args:
-        folder_path (str): Đường dẫn tới thư mục chứa file log.
-
-    Returns:
-        None: In kết quả cho từng file log.
-    """
-    if not os.path.exists(folder_path):
-        print(f"Folder not found: {folder_path}")
-        return
-
-    # Duyệt qua tất cả file trong folder
-    log_files = [file for file in os.listdir(folder_path) if file.endswith((".log", ".txt"))]
-
-    if not log_files:
-        print(f"No .log or .txt files found in folder: {folder_path}")
-        return
-
-    for log_file in log_files:
-        file_path = os.path.join(folder_path, log_file)
-        print(f"\nProcessing File: {file_path}")
-
-        try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                config_data = file.read()
-
-            # Gọi hàm phân tích
-            stp_summary = analyze_bpdu_guard_and_portfast(config_data)
-
-            # Hiển thị kết quả
-            print("\033[1mKết quả phân tích 'show spanning-tree summary' và PortFast:\033[0m")
-            print(f"BPDU Guard Default: {stp_summary['bpdu_guard_default']}")
-            print(f"Portfast Default: {stp_summary['portfast_default']}")
-
-            if stp_summary["portfast_interfaces"]:
-                print("\033[1mDanh sách cổng PortFast và trạng thái BPDU Guard:\033[0m")
-                all_disabled = True
-                for interface, status in stp_summary["portfast_interfaces"].items():
-                    print(f"Interface: {interface}, PortFast: {status['portfast']}, BPDU Guard: {status['bpdu_guard']}")
-                    if status['bpdu_guard'] == "enabled":
-                        all_disabled = False
-                if all_disabled:
-                    print("\033[33mTất cả các cổng PortFast đều bị disable BPDU Guard.\033[0m")
-            else:
-                print("\033[33mKhông tìm thấy cổng PortFast nào được cấu hình.\033[0m")
-
-            print("-" * 50)
-
-        except Exception as e:
-            print(f"An error occurred while processing {file_path}: {e}")
-
-if __name__ == "__main__":
-    # Gọi tới thư mục chứa file log
-    folder_path = r"D:\automation\Test"  # Thay bằng đường dẫn thư mục chứa file log của bạn
-    process_stp_and_portfast_logs(folder_path)
+import os
+import re
+from archive_reader import iter_logs, list_log_sources
+from stanza_cache import memoize_stanza
+from vlan_set import VlanSet
+
+PORTFAST_ENABLE_PATTERN = r"spanning-tree portfast(?! disable)"
+BPDU_GUARD_ENABLE_PATTERN = r"spanning-tree bpduguard enable"
+# Dòng của từng instance trong bảng 'show spanning-tree summary', ví dụ "VLAN0013   0  0  0  1  1"
+STP_VLAN_ROW_PATTERN = r"^VLAN(\d{4})\s+\d+\s+\d+"
+# Danh sách VLAN thiết bị là root bridge (có thể xuống dòng)
+ROOT_BRIDGE_PATTERN = r"Root bridge for:\s*((?:VLAN\d+[, \t]*(?:\n[ \t]*)?)+)"
+# VLAN bị tắt STP trong cấu hình
+STP_DISABLED_PATTERN = r"^no spanning-tree vlan\s+([\d,\-]+)\s*$"
+
+
+@memoize_stanza("3.2.2", version=1)
+def interface_stp_status(interface_body):
+    """
+    Xác định PortFast và BPDU Guard được bật trên một interface. Kết quả chỉ phụ thuộc vào thân cấu hình
+    interface (không gồm tên) nên dùng chung được cho mọi interface có cùng cấu hình, trên mọi thiết bị.
+    Args:
+        interface_body (str): Các dòng cấu hình của interface, không gồm dòng 'interface ...'.
+
+    Returns:
+        tuple: (có PortFast, có BPDU Guard).
+    """
+    lines = interface_body.splitlines()
+    has_portfast = any(re.match(PORTFAST_ENABLE_PATTERN, line) for line in lines)
+    has_bpdu_guard = any(re.match(BPDU_GUARD_ENABLE_PATTERN, line) for line in lines)
+    return has_portfast, has_bpdu_guard
+
+
+def _record_interface(stp_summary, interface, interface_config):
+    has_portfast, has_bpdu_guard = interface_stp_status("\n".join(interface_config[1:]))
+    if has_portfast:
+        stp_summary["portfast_interfaces"][interface] = {
+            "portfast": "enabled",
+            "bpdu_guard": "enabled" if has_bpdu_guard else "disabled"
+        }
+
+
+def analyze_bpdu_guard_and_portfast(config_data):
+    """
+    Phân tích trạng thái BPDU Guard và PortFast từ cấu hình và lệnh 'show spanning-tree summary'.
+    Args:
+        config_data (str): Nội dung cấu hình hoặc lệnh 'show spanning-tree summary'.
+
+    Returns:
+        dict: Trạng thái BPDU Guard và danh sách các cổng PortFast.
+    """
+    stp_summary = {
+        "bpdu_guard_default": "unknown",
+        "portfast_default": "unknown",
+        "portfast_interfaces": {},
+        "stp_vlans": VlanSet(),
+        "root_bridge_vlans": VlanSet(),
+        "stp_disabled_vlans": VlanSet()
+    }
+
+    # Phân tích trạng thái BPDU Guard Default từ lệnh 'show spanning-tree summary'
+    bpdu_guard_pattern = r"Portfast BPDU Guard Default\s+is\s+(enabled|disabled)"
+    portfast_pattern = r"Portfast Default\s+is\s+(enabled|disabled)"
+
+    if match := re.search(bpdu_guard_pattern, config_data, re.IGNORECASE):
+        stp_summary["bpdu_guard_default"] = match.group(1).strip()
+
+    if match := re.search(portfast_pattern, config_data, re.IGNORECASE):
+        stp_summary["portfast_default"] = match.group(1).strip()
+
+    # Các VLAN có instance STP, VLAN là root bridge và VLAN bị tắt STP
+    stp_summary["stp_vlans"] = VlanSet.from_vlans(
+        match.group(1) for match in re.finditer(STP_VLAN_ROW_PATTERN, config_data, re.MULTILINE))
+    if match := re.search(ROOT_BRIDGE_PATTERN, config_data):
+        # Lấy từng "VLANxxxx" thay vì ghép chuỗi: danh sách xuống dòng có thể thiếu dấu phẩy cuối dòng
+        stp_summary["root_bridge_vlans"] = VlanSet.from_vlans(re.findall(r"VLAN(\d+)", match.group(1)))
+    for match in re.finditer(STP_DISABLED_PATTERN, config_data, re.MULTILINE):
+        stp_summary["stp_disabled_vlans"] |= VlanSet.parse(match.group(1))
+
+    # Phân tích cấu hình interface để tìm PortFast và BPDU Guard
+    interface_pattern = r"^interface (\S+)"
+
+    current_interface = None
+    current_config = []
+
+    for line in config_data.splitlines():
+        line = line.strip()
+
+        # Xác định interface
+        if match := re.match(interface_pattern, line):
+            # Xử lý interface trước đó
+            if current_interface:
+                _record_interface(stp_summary, current_interface, current_config)
+
+            # Chuyển sang interface mới
+            current_interface = match.group(1)
+            current_config = []
+
+        # Thu thập cấu hình interface
+        if current_interface:
+            current_config.append(line)
+
+        # Kết thúc cấu hình interface
+        if line.startswith("!") and current_interface:
+            _record_interface(stp_summary, current_interface, current_config)
+            current_interface = None
+            current_config = []
+
+    # Xử lý interface cuối cùng
+    if current_interface:
+        _record_interface(stp_summary, current_interface, current_config)
+
+    return stp_summary
+
+
+def display_stp_results(stp_summary):
+    """
+    Hiển thị trạng thái BPDU Guard và danh sách cổng PortFast.
+    Args:
+        stp_summary (dict): Kết quả từ analyze_bpdu_guard_and_portfast.
+    """
+    print("\033[1mKết quả phân tích 'show spanning-tree summary' và PortFast:\033[0m")
+    print(f"BPDU Guard Default: {stp_summary['bpdu_guard_default']}")
+    print(f"Portfast Default: {stp_summary['portfast_default']}")
+    if stp_summary["stp_vlans"]:
+        print(f"VLAN có STP hoạt động: {stp_summary['stp_vlans']}")
+    if stp_summary["root_bridge_vlans"]:
+        print(f"Root bridge cho VLAN: {stp_summary['root_bridge_vlans']}")
+    if stp_summary["stp_disabled_vlans"]:
+        print(f"\033[31mVLAN bị tắt STP: {stp_summary['stp_disabled_vlans']}\033[0m")
+
+    if stp_summary["portfast_interfaces"]:
+        print("\033[1mDanh sách cổng PortFast và trạng thái BPDU Guard:\033[0m")
+        all_disabled = True
+        for interface, status in stp_summary["portfast_interfaces"].items():
+            print(f"Interface: {interface}, PortFast: {status['portfast']}, BPDU Guard: {status['bpdu_guard']}")
+            if status['bpdu_guard'] == "enabled":
+                all_disabled = False
+        if all_disabled:
+            print("\033[33mTất cả các cổng PortFast đều bị disable BPDU Guard.\033[0m")
+    else:
+        print("\033[33mKhông tìm thấy cổng PortFast nào được cấu hình.\033[0m")
+
+    print("-" * 50)
+
+
+def process_stp_and_portfast_logs(folder_path):
+    """
+    Duyệt qua tất cả các file log trong thư mục và kiểm tra trạng thái BPDU Guard và PortFast.
+    Args:
+        folder_path (str): Đường dẫn tới thư mục chứa file log.
+
+    Returns:
+        None: In kết quả cho từng file log.
+    """
+    if not os.path.exists(folder_path):
+        print(f"Folder not found: {folder_path}")
+        return
+
+    # Duyệt qua tất cả file log trong folder (kể cả member trong các bundle .gz/.zip/.tar)
+    log_sources = list_log_sources(folder_path)
+
+    if not log_sources:
+        print(f"No .log/.txt files or log archives found in folder: {folder_path}")
+        return
+
+    for log in iter_logs(log_sources):
+        file_path = log.name
+        print(f"\nProcessing File: {file_path}")
+
+        try:
+            config_data = log.text
+
+            # Gọi hàm phân tích
+            stp_summary = analyze_bpdu_guard_and_portfast(config_data)
+
+            # Hiển thị kết quả
+            display_stp_results(stp_summary)
+
+        except Exception as e:
+            print(f"An error occurred while processing {file_path}: {e}")
+
+if __name__ == "__main__":
+    # Gọi tới thư mục chứa file log
+    folder_path = r"D:\automation\Test"  # Thay bằng đường dẫn thư mục chứa file log của bạn
+    process_stp_and_portfast_logs(folder_path)
@@ -1,108 +1,272 @@
-import os
-import re
-
-def analyze_show_dhcp_snooping(config_data):
-    """
-    Phân tích kết quả từ lệnh 'show ip dhcp snooping'.
-    Args:
-        config_data (str): Nội dung lệnh 'show ip dhcp snooping'.
-
-    Returns:
-        dict: Trạng thái DHCP Snooping, VLANs được bật, và danh sách cổng tin cậy.
-    """
-    dhcp_snooping_status = {
-        "enabled": False,
-        "configured_vlans": "",
-        "operational_vlans": "",
-        "trusted_ports": []
-    }
-
-    # Regex để phân tích nội dung
-    snooping_enabled_pattern = r"Switch DHCP snooping is enabled"
-    configured_vlan_pattern = r"DHCP snooping is configured on following VLANs:\s*([\d,\- ]+)"
-    operational_vlan_pattern = r"DHCP snooping is operational on following VLANs:\s*([\d,\- ]+)"
-    trusted_port_pattern = r"^(\S+)\s+yes\s+"
-
-    # Kiểm tra trạng thái DHCP Snooping
-    if re.search(snooping_enabled_pattern, config_data, re.IGNORECASE):
-        dhcp_snooping_status["enabled"] = True
-
-    # Lấy các VLAN được cấu hình
-    configured_vlan_match = re.search(configured_vlan_pattern, config_data, re.IGNORECASE)
-    if configured_vlan_match:
-        dhcp_snooping_status["configured_vlans"] = configured_vlan_match.group(1).strip()
-
-    # Lấy các VLAN đang hoạt động
-    operational_vlan_match = re.search(operational_vlan_pattern, config_data, re.IGNORECASE)
-    if operational_vlan_match:
-        dhcp_snooping_status["operational_vlans"] = operational_vlan_match.group(1).strip()
-
-    # Tìm cổng Trusted
-    trusted_matches = re.finditer(trusted_port_pattern, config_data, re.IGNORECASE | re.MULTILINE)
-    for match in trusted_matches:
-        dhcp_snooping_status["trusted_ports"].append(match.group(1))
-
-    return dhcp_snooping_status
-
-
-def process_show_dhcp_snooping_logs(folder_path):
-    """
-    Duyệt qua tất cả các file log trong thư mục và phân tích lệnh 'show ip dhcp snooping'.
-    Args:
-        folder_path (str): Đường dẫn tới thư mục chứa file log.
-
-    Returns:
-        None: In kết quả cho từng file log.
-    """
-    if not os.path.exists(folder_path):
-        print(f"Folder not found: {folder_path}")
-        return
-
-    # Duyệt qua tất cả file trong folder
-    log_files = [file for file in os.listdir(folder_path) if file.endswith((".log", ".txt"))]
-
-    if not log_files:
-        print(f"No .log or .txt files found in folder: {folder_path}")
-        return
-
-    for log_file in log_files:
-        file_path = os.path.join(folder_path, log_file)
-        print(f"\nProcessing File: {file_path}")
-
-        try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                config_data = file.read()
-
-            # Gọi hàm phân tích
-            dhcp_snooping_status = analyze_show_dhcp_snooping(config_data)
-
-            # Hiển thị kết quả
-            print("\033[1mKết quả phân tích 'show ip dhcp snooping':\033[0m")
-            if dhcp_snooping_status["enabled"]:
-                print("\033[32mDHCP Snooping được bật.\033[0m")
-                if dhcp_snooping_status["configured_vlans"]:
-                    print(f"DHCP snooping is configured on following VLANs: {dhcp_snooping_status['configured_vlans']}")
-                else:
-                    print("\033[33mKhông tìm thấy VLAN nào được cấu hình DHCP Snooping.\033[0m")
-
-                if dhcp_snooping_status["operational_vlans"]:
-                    print(f"DHCP snooping is operational on following VLANs: {dhcp_snooping_status['operational_vlans']}")
-                else:
-                    print("\033[33mKhông có VLAN nào đang hoạt động với DHCP Snooping.\033[0m")
-
-                if dhcp_snooping_status["trusted_ports"]:
-                    print("\033[1mCổng tin cậy (Trusted Ports):\033[0m")
-                    for port in dhcp_snooping_status["trusted_ports"]:
-                        print(f"- {port}")
-                else:
-                    print("\033[33mKhông có cổng tin cậy nào được cấu hình.\033[0m")
-            else:
-                print("\033[31mDHCP Snooping chưa được bật.\033[0m")
-            print("-" * 50)
-
-        except Exception as e:
-            print(f"An error occurred while processing {file_path}: {e}")
-
-if __name__ == "__main__":
-    folder_path = r"D:\automation\Test"  # Thay bằng đường dẫn thư mục chứa file log của bạn
-    process_show_dhcp_snooping_logs(folder_path)
+import os
+import re
+from archive_reader import iter_logs, list_log_sources
+from fleet_scheduler import split_command_sections
+from interface_names import canonical_interface_name
+from module_3_1_switchport_analysis import parse_switchports
+from show_table_parser import DHCP_SNOOPING_TRUST_COLUMNS, DHCP_SNOOPING_TRUST_OPTIONAL, parse_table
+from vlan_set import NO_VLANS, VlanSet
+
+SWITCHPORT_COMMAND_PATTERN = re.compile(r"^sh(?:ow)?\s+int(?:erfaces?)?\s+switchport")
+# Kết luận cho từng port khi đối chiếu DHCP Snooping với chế độ/VLAN của port
+COVERAGE_LABELS = {
+    "covered": "Access trong VLAN có snooping, untrusted",
+    "not_covered": "Access trong VLAN chưa bật snooping",
+    "trusted_access": "Access bị đặt trusted",
+    "trusted_uplink": "Trunk trusted",
+    "untrusted_uplink": "Trunk mang VLAN snooping nhưng untrusted",
+}
+# Kết luận không tuân thủ
+COVERAGE_VIOLATIONS = ("not_covered", "trusted_access", "untrusted_uplink")
+
+def analyze_show_dhcp_snooping(config_data):
+    """
+    Phân tích kết quả từ lệnh 'show ip dhcp snooping'.
+    Args:
+        config_data (str): Nội dung lệnh 'show ip dhcp snooping'.
+
+    Returns:
+        dict: Trạng thái DHCP Snooping, VLANs được bật (VlanSet), danh sách cổng tin cậy
+              và các danh sách VLAN không phân tích được ("invalid_vlan_lists").
+    """
+    dhcp_snooping_status = {
+        "enabled": False,
+        "configured_vlans": VlanSet(),
+        "operational_vlans": VlanSet(),
+        "trusted_ports": [],
+        "invalid_vlan_lists": []
+    }
+
+    # Regex để phân tích nội dung
+    snooping_enabled_pattern = r"Switch DHCP snooping is enabled"
+    # Danh sách VLAN dài bị xuống dòng: lấy mọi dòng chỉ gồm số, dấu phẩy và gạch nối
+    configured_vlan_pattern = r"DHCP snooping is configured on following VLANs:\s*((?:[\d,\-]+[ \t]*\n?)*)"
+    operational_vlan_pattern = r"DHCP snooping is operational on following VLANs:\s*((?:[\d,\-]+[ \t]*\n?)*)"
+
+    # Kiểm tra trạng thái DHCP Snooping
+    if re.search(snooping_enabled_pattern, config_data, re.IGNORECASE):
+        dhcp_snooping_status["enabled"] = True
+
+    # Lấy các VLAN được cấu hình
+    configured_vlan_match = re.search(configured_vlan_pattern, config_data, re.IGNORECASE)
+    if configured_vlan_match:
+        try:
+            dhcp_snooping_status["configured_vlans"] = VlanSet.parse(configured_vlan_match.group(1))
+        except ValueError:
+            dhcp_snooping_status["invalid_vlan_lists"].append(configured_vlan_match.group(1).strip())
+
+    # Lấy các VLAN đang hoạt động
+    operational_vlan_match = re.search(operational_vlan_pattern, config_data, re.IGNORECASE)
+    if operational_vlan_match:
+        try:
+            dhcp_snooping_status["operational_vlans"] = VlanSet.parse(operational_vlan_match.group(1))
+        except ValueError:
+            dhcp_snooping_status["invalid_vlan_lists"].append(operational_vlan_match.group(1).strip())
+
+    # Tìm cổng Trusted trong bảng Interface/Trusted/Allow option/Rate limit
+    for row in parse_table(config_data, DHCP_SNOOPING_TRUST_COLUMNS, optional=DHCP_SNOOPING_TRUST_OPTIONAL):
+        if row["trusted"].lower() == "yes":
+            dhcp_snooping_status["trusted_ports"].append(row["interface"])
+
+    return dhcp_snooping_status
+
+
+def analyze_dhcp_snooping_coverage(config_data, dhcp_snooping_status=None, switchports=None):
+    """
+    Đối chiếu DHCP Snooping (VLAN đang hoạt động, cổng trusted) với chế độ và VLAN của từng port
+    trong 'show interface switchport'. Mỗi port chỉ được xét một lần (tra cứu bằng tên đã chuẩn hoá).
+    Args:
+        config_data (str): Nội dung log.
+        dhcp_snooping_status (dict | None): Kết quả analyze_show_dhcp_snooping đã có (None để tự phân tích).
+        switchports (dict | None): Kết quả parse_switchports đã có (None để tự phân tích).
+
+    Returns:
+        dict: {"ports": port -> {"verdict", "mode", "vlans"}, "uncovered_vlans": VlanSet các VLAN access
+               chưa bật snooping, "has_data": có output 'show interface switchport' hay không}.
+    """
+    if dhcp_snooping_status is None or switchports is None:
+        sections = split_command_sections(config_data)
+        if dhcp_snooping_status is None:
+            snooping_text = "".join(text for command, text in sections if command.startswith("show ip dhcp snooping"))
+            dhcp_snooping_status = analyze_show_dhcp_snooping(snooping_text or config_data)
+        if switchports is None:
+            switchports = {}
+            for command, text in sections:
+                if SWITCHPORT_COMMAND_PATTERN.match(command):
+                    switchports.update(parse_switchports(text))
+
+    snooping_vlans = dhcp_snooping_status["operational_vlans"] if dhcp_snooping_status["enabled"] else NO_VLANS
+    trusted = {canonical_interface_name(port) for port in dhcp_snooping_status["trusted_ports"]}
+    ports = {}
+    uncovered_vlans = VlanSet()
+    for name, switchport in switchports.items():
+        port = canonical_interface_name(name)
+        is_trusted = port in trusted
+        admin_mode = switchport.get("admin_mode")
+        if admin_mode == "static access" and switchport.get("access_vlan"):
+            vlans = VlanSet.parse(switchport["access_vlan"])
+            if is_trusted:
+                verdict = "trusted_access"
+            elif vlans & snooping_vlans:
+                verdict = "covered"
+            else:
+                verdict = "not_covered"
+                uncovered_vlans |= vlans
+        elif admin_mode == "trunk":
+            vlans = switchport.get("allowed_vlans", NO_VLANS)
+            if is_trusted:
+                verdict = "trusted_uplink"
+            elif vlans & snooping_vlans:
+                verdict = "untrusted_uplink"
+            else:
+                continue
+        else:
+            continue
+        ports[port] = {"verdict": verdict, "mode": admin_mode, "vlans": vlans}
+    return {"ports": ports, "uncovered_vlans": uncovered_vlans, "has_data": bool(switchports)}
+
+
+def summarize_coverage(coverages):
+    """
+    Tổng hợp kết quả đối chiếu DHCP Snooping của nhiều thiết bị.
+    Args:
+        coverages (dict): Thiết bị -> kết quả analyze_dhcp_snooping_coverage.
+
+    Returns:
+        dict: {"counts": kết luận -> số port, "devices": kết luận vi phạm -> số thiết bị,
+               "uncovered_vlans": VlanSet hợp các VLAN access chưa bật snooping}.
+    """
+    counts = {verdict: 0 for verdict in COVERAGE_LABELS}
+    devices = {verdict: 0 for verdict in COVERAGE_VIOLATIONS}
+    uncovered_vlans = VlanSet()
+    for coverage in coverages.values():
+        found = set()
+        for port in coverage["ports"].values():
+            counts[port["verdict"]] += 1
+            found.add(port["verdict"])
+        for verdict in found.intersection(COVERAGE_VIOLATIONS):
+            devices[verdict] += 1
+        uncovered_vlans |= coverage["uncovered_vlans"]
+    return {"counts": counts, "devices": devices, "uncovered_vlans": uncovered_vlans}
+
+
+def display_dhcp_snooping_coverage(coverage):
+    """
+    Hiển thị kết quả đối chiếu DHCP Snooping theo port.
+    Args:
+        coverage (dict): Kết quả từ analyze_dhcp_snooping_coverage.
+    """
+    print("\033[1mĐối chiếu DHCP Snooping theo port:\033[0m")
+    if not coverage["has_data"]:
+        print("\033[33mKhông Áp Dụng - Không tìm thấy output 'show interface switchport'.\033[0m")
+        return
+    by_verdict = {}
+    for port, info in coverage["ports"].items():
+        by_verdict.setdefault(info["verdict"], []).append(port)
+    for verdict, label in COVERAGE_LABELS.items():
+        if verdict in by_verdict:
+            print(f"- {label}: {len(by_verdict[verdict])}")
+    for verdict in COVERAGE_VIOLATIONS:
+        for port in by_verdict.get(verdict, []):
+            print(f"  {port}: {COVERAGE_LABELS[verdict]} (VLAN {coverage['ports'][port]['vlans']})")
+    if coverage["uncovered_vlans"]:
+        print(f"VLAN access chưa bật DHCP Snooping: {coverage['uncovered_vlans']}")
+    if any(verdict in by_verdict for verdict in COVERAGE_VIOLATIONS):
+        print("\033[31mKhông Tuân Thủ - Có port chưa được DHCP Snooping bảo vệ đúng.\033[0m")
+    else:
+        print("\033[32mTuân Thủ - Mọi port access/trunk đều được DHCP Snooping bảo vệ đúng.\033[0m")
+
+
+def display_dhcp_snooping_results(dhcp_snooping_status):
+    """
+    Hiển thị kết quả phân tích 'show ip dhcp snooping'.
+    Args:
+        dhcp_snooping_status (dict): Kết quả từ analyze_show_dhcp_snooping.
+    """
+    print("\033[1mKết quả phân tích 'show ip dhcp snooping':\033[0m")
+    if dhcp_snooping_status["enabled"]:
+        print("\033[32mDHCP Snooping được bật.\033[0m")
+        if dhcp_snooping_status["configured_vlans"]:
+            print(f"DHCP snooping is configured on following VLANs: {dhcp_snooping_status['configured_vlans']}")
+        else:
+            print("\033[33mKhông tìm thấy VLAN nào được cấu hình DHCP Snooping.\033[0m")
+
+        if dhcp_snooping_status["operational_vlans"]:
+            print(f"DHCP snooping is operational on following VLANs: {dhcp_snooping_status['operational_vlans']}")
+        else:
+            print("\033[33mKhông có VLAN nào đang hoạt động với DHCP Snooping.\033[0m")
+
+        # VLAN đã cấu hình nhưng chưa hoạt động (thường do VLAN chưa tồn tại hoặc không có cổng up)
+        inactive_vlans = dhcp_snooping_status["configured_vlans"] - dhcp_snooping_status["operational_vlans"]
+        if inactive_vlans:
+            print(f"\033[33mVLAN đã cấu hình nhưng chưa hoạt động DHCP Snooping: {inactive_vlans}\033[0m")
+
+        if dhcp_snooping_status["trusted_ports"]:
+            print("\033[1mCổng tin cậy (Trusted Ports):\033[0m")
+            for port in dhcp_snooping_status["trusted_ports"]:
+                print(f"- {port}")
+        else:
+            print("\033[33mKhông có cổng tin cậy nào được cấu hình.\033[0m")
+    else:
+        print("\033[31mDHCP Snooping chưa được bật.\033[0m")
+    for vlan_list in dhcp_snooping_status["invalid_vlan_lists"]:
+        print(f"\033[33mKhông phân tích được danh sách VLAN:\033[0m {vlan_list}")
+    print("-" * 50)
+
+
+def process_show_dhcp_snooping_logs(folder_path):
+    """
+    Duyệt qua tất cả các file log trong thư mục và phân tích lệnh 'show ip dhcp snooping'.
+    Args:
+        folder_path (str): Đường dẫn tới thư mục chứa file log.
+
+    Returns:
+        None: In kết quả cho từng file log.
+    """
+    if not os.path.exists(folder_path):
+        print(f"Folder not found: {folder_path}")
+        return
+
+    # Duyệt qua tất cả file log trong folder (kể cả member trong các bundle .gz/.zip/.tar)
+    log_sources = list_log_sources(folder_path)
+
+    if not log_sources:
+        print(f"No .log/.txt files or log archives found in folder: {folder_path}")
+        return
+
+    coverages = {}
+    for log in iter_logs(log_sources):
+        file_path = log.name
+        print(f"\nProcessing File: {file_path}")
+
+        try:
+            config_data = log.text
+
+            # Gọi hàm phân tích
+            dhcp_snooping_status = analyze_show_dhcp_snooping(config_data)
+
+            # Hiển thị kết quả
+            display_dhcp_snooping_results(dhcp_snooping_status)
+
+            # Đối chiếu theo port, dùng lại kết quả phân tích ở trên
+            coverage = analyze_dhcp_snooping_coverage(config_data, dhcp_snooping_status)
+            display_dhcp_snooping_coverage(coverage)
+            if coverage["has_data"]:
+                coverages[file_path] = coverage
+
+        except Exception as e:
+            print(f"An error occurred while processing {file_path}: {e}")
+
+    # Tổng hợp toàn fleet
+    if coverages:
+        summary = summarize_coverage(coverages)
+        print(f"\n\033[1mTổng hợp DHCP Snooping trên {len(coverages)} thiết bị:\033[0m")
+        for verdict, label in COVERAGE_LABELS.items():
+            devices = f" trên {summary['devices'][verdict]} thiết bị" if verdict in summary["devices"] else ""
+            print(f"- {label}: {summary['counts'][verdict]} port{devices}")
+        if summary["uncovered_vlans"]:
+            print(f"VLAN access chưa bật DHCP Snooping: {summary['uncovered_vlans']}")
+
+if __name__ == "__main__":
+    folder_path = r"D:\automation\Test"  # Thay bằng đường dẫn thư mục chứa file log của bạn
+    process_show_dhcp_snooping_logs(folder_path)
@@ -1,98 +1,309 @@
-import os
-import re
-
-def analyze_gateway_authentication(config_data):
-    """
-    Phân tích cấu hình xác thực của các giao thức dự phòng gateway.
-    Args:
-        config_data (str): Nội dung cấu hình.
-
-    Returns:
-        dict: Thông tin xác thực của các giao thức VRRP, HSRP, GLBP, và NSRP.
-    """
-    authentication_status = {
-        "VRRP": [],
-        "HSRP": [],
-        "GLBP": [],
-        "NSRP": [],
-        "non_authenticated": [],
-        "configured_protocols": False
-    }
-
-    # Regex cho các giao thức và xác thực
-    vrrp_pattern = r"vrrp \d+ authentication (\S+)"
-    hsrp_pattern = r"standby \d+ authentication (\S+)"
-    glbp_pattern = r"glbp \d+ authentication (\S+)"
-    nsrp_pattern = r"set nsrp vsd-group id \d+.*authentication (\S+)"
-    protocol_patterns = [vrrp_pattern, hsrp_pattern, glbp_pattern, nsrp_pattern]
-
-    # Kiểm tra từng giao thức và xác thực
-    for pattern, protocol in zip(protocol_patterns, ["VRRP", "HSRP", "GLBP", "NSRP"]):
-        matches = re.finditer(pattern, config_data, re.IGNORECASE)
-        for match in matches:
-            authentication_status[protocol].append(match.group(1))
-            authentication_status["configured_protocols"] = True  # Đánh dấu rằng giao thức được cấu hình
-
-    # Xác định giao thức không có cấu hình xác thực
-    for protocol in ["VRRP", "HSRP", "GLBP", "NSRP"]:
-        if not authentication_status[protocol]:
-            authentication_status["non_authenticated"].append(protocol)
-
-    return authentication_status
-
-
-def process_gateway_authentication_logs(folder_path):
-    """
-    Duyệt qua tất cả các file log trong thư mục và kiểm tra xác thực của các giao thức dự phòng gateway.
-    Args:
-        folder_path (str): Đường dẫn tới thư mục chứa file log.
-
-    Returns:
-        None: In kết quả cho từng file log.
-    """
-    if not os.path.exists(folder_path):
-        print(f"Folder not found: {folder_path}")
-        return
-
-    # Duyệt qua tất cả file trong folder
-    log_files = [file for file in os.listdir(folder_path) if file.endswith((".log", ".txt"))]
-
-    if not log_files:
-        print(f"No .log or .txt files found in folder: {folder_path}")
-        return
-
-    for log_file in log_files:
-        file_path = os.path.join(folder_path, log_file)
-        print(f"\nProcessing File: {file_path}")
-
-        try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                config_data = file.read()
-
-            # Gọi hàm phân tích
-            auth_status = analyze_gateway_authentication(config_data)
-
-            # Hiển thị kết quả
-            print("\033[1mKết quả kiểm tra xác thực giao thức dự phòng gateway:\033[0m")
-            if auth_status["configured_protocols"]:
-                for protocol, keys in auth_status.items():
-                    if protocol != "non_authenticated" and protocol != "configured_protocols":
-                        if keys:
-                            print(f"\033[32m{protocol} có xác thực:\033[0m {', '.join(keys)}")
-                        else:
-                            print(f"\033[31m{protocol} không có cấu hình xác thực.\033[0m")
-
-                if auth_status["non_authenticated"]:
-                    print("\033[31mCảnh báo: Các giao thức không có xác thực:\033[0m")
-                    print(", ".join(auth_status["non_authenticated"]))
-            else:
-                print("\033[33mKhông phát hiện giao thức dự phòng nào được cấu hình.\033[0m")
-
-            print("-" * 50)
-
-        except Exception as e:
-            print(f"An error occurred while processing {file_path}: {e}")
-
-if __name__ == "__main__":
-    folder_path = r"D:\automation\Test"  # Thay bằng đường dẫn thư mục chứa file log của bạn
-    process_gateway_authentication_logs(folder_path)
+import ipaddress
+import os
+import re
+from collections import defaultdict
+from archive_reader import iter_logs, list_log_sources
+from config_stanzas import split_stanzas
+from log_normalizer import find_hostname
+from igp_model import key_chain_fingerprint, parse_igp_model
+from secret_classifier import password_fingerprint
+
+# Lệnh FHRP trong interface: 'standby|vrrp|glbp [nhóm] <thuộc tính> ...' (HSRP cho phép bỏ số nhóm, mặc định 0)
+FHRP_LINE_PATTERN = re.compile(r"^(standby|vrrp|glbp)(?:\s+(\d+))?\s+(\S+)(?:\s+(.*))?$", re.IGNORECASE)
+FHRP_PROTOCOLS = {"standby": "HSRP", "vrrp": "VRRP", "glbp": "GLBP"}
+# Thuộc tính của nhóm; các lệnh khác ('standby version 2', 'standby delay ...') không thuộc nhóm nào
+FHRP_GROUP_ATTRIBUTES = ("ip", "priority", "preempt", "authentication", "address-family")
+FHRP_DEFAULT_PRIORITY = 100
+INTERFACE_ADDRESS_PATTERN = re.compile(r"^ip address (\d+\.\d+\.\d+\.\d+) (\d+\.\d+\.\d+\.\d+)\s*$", re.IGNORECASE)
+INTERFACE_VRF_PATTERN = re.compile(r"^(?:ip )?vrf forwarding (\S+)", re.IGNORECASE)
+ENCAPSULATION_VLAN_PATTERN = re.compile(r"^encapsulation dot1q (\d+)", re.IGNORECASE)
+
+# Vấn đề khi đối chiếu các thành viên của cùng một nhóm gateway
+CONSISTENCY_LABELS = {
+    "single_member": "Chỉ có một thành viên trong fleet",
+    "vip_mismatch": "VIP khác nhau giữa các thành viên",
+    "no_auth": "Không thành viên nào cấu hình xác thực",
+    "one_sided_auth": "Chỉ một số thành viên cấu hình xác thực",
+    "auth_mode_mismatch": "Kiểu xác thực khác nhau",
+    "auth_key_mismatch": "Khoá xác thực khác nhau",
+    "priority_tie": "Các thành viên cùng priority",
+}
+
+def analyze_gateway_authentication(config_data):
+    """
+    Phân tích cấu hình xác thực của các giao thức dự phòng gateway.
+    Args:
+        config_data (str): Nội dung cấu hình.
+
+    Returns:
+        dict: Thông tin xác thực của các giao thức VRRP, HSRP, GLBP, và NSRP.
+    """
+    authentication_status = {
+        "VRRP": [],
+        "HSRP": [],
+        "GLBP": [],
+        "NSRP": [],
+        "non_authenticated": [],
+        "configured_protocols": False
+    }
+
+    # Regex cho các giao thức và xác thực
+    vrrp_pattern = r"vrrp \d+ authentication (\S+)"
+    hsrp_pattern = r"standby \d+ authentication (\S+)"
+    glbp_pattern = r"glbp \d+ authentication (\S+)"
+    nsrp_pattern = r"set nsrp vsd-group id \d+.*authentication (\S+)"
+    protocol_patterns = [vrrp_pattern, hsrp_pattern, glbp_pattern, nsrp_pattern]
+
+    # Kiểm tra từng giao thức và xác thực
+    for pattern, protocol in zip(protocol_patterns, ["VRRP", "HSRP", "GLBP", "NSRP"]):
+        matches = re.finditer(pattern, config_data, re.IGNORECASE)
+        for match in matches:
+            authentication_status[protocol].append(match.group(1))
+            authentication_status["configured_protocols"] = True  # Đánh dấu rằng giao thức được cấu hình
+
+    # Xác định giao thức không có cấu hình xác thực
+    for protocol in ["VRRP", "HSRP", "GLBP", "NSRP"]:
+        if not authentication_status[protocol]:
+            authentication_status["non_authenticated"].append(protocol)
+
+    return authentication_status
+
+
+def display_gateway_authentication_results(auth_status):
+    """
+    Hiển thị kết quả kiểm tra xác thực giao thức dự phòng gateway.
+    Args:
+        auth_status (dict): Kết quả từ analyze_gateway_authentication.
+    """
+    print("\033[1mKết quả kiểm tra xác thực giao thức dự phòng gateway:\033[0m")
+    if auth_status["configured_protocols"]:
+        for protocol, keys in auth_status.items():
+            if protocol != "non_authenticated" and protocol != "configured_protocols":
+                if keys:
+                    print(f"\033[32m{protocol} có xác thực:\033[0m {', '.join(keys)}")
+                else:
+                    print(f"\033[31m{protocol} không có cấu hình xác thực.\033[0m")
+
+        if auth_status["non_authenticated"]:
+            print("\033[31mCảnh báo: Các giao thức không có xác thực:\033[0m")
+            print(", ".join(auth_status["non_authenticated"]))
+    else:
+        print("\033[33mKhông phát hiện giao thức dự phòng nào được cấu hình.\033[0m")
+
+    print("-" * 50)
+
+
+def _fhrp_authentication(value, key_chains):
+    # 'text <chuỗi>' | 'md5 key-string [0|7] <chuỗi>' | 'md5 key-chain <tên>' | '<chuỗi>' (HSRP, text)
+    # Key chain được so theo các khoá bên trong (tên key chain có thể khác nhau giữa các thiết bị)
+    words = value.split()
+    if words[:2] == ["md5", "key-chain"] and len(words) > 2:
+        return "key-chain", key_chain_fingerprint(key_chains, words[2])
+    if words[:2] == ["md5", "key-string"] and len(words) > 2:
+        return "md5", password_fingerprint(" ".join(words[2:]))[1]
+    if words[:1] == ["text"] and len(words) > 1:
+        return "text", password_fingerprint(" ".join(words[1:]))[1]
+    return "text", password_fingerprint(value)[1]
+
+
+def parse_fhrp_groups(config_data):
+    """
+    Phân tích các nhóm HSRP/VRRP/GLBP trong các stanza interface của một thiết bị.
+    Args:
+        config_data (str): Nội dung log đã chuẩn hoá.
+
+    Returns:
+        list: Mỗi nhóm một dict {"interface", "vrf", "vlan", "subnet", "protocol", "group", "vips" (tuple),
+              "priority", "auth_mode", "auth_fingerprint"}. Khoá xác thực chỉ được giữ dưới dạng dấu vân tay;
+              với key chain là dấu vân tay của các khoá trong key chain (None nếu key chain không có khoá).
+    """
+    groups = []
+    key_chains = None
+    for key, stanza in split_stanzas(config_data).items():
+        if not key.startswith("interface "):
+            continue
+        interface = key.split(None, 1)[1]
+        vlan_match = re.match(r"^vlan(\d+)$", interface, re.IGNORECASE)
+        interface_info = {"vrf": "", "vlan": vlan_match.group(1) if vlan_match else None, "subnet": None}
+        interface_groups = {}
+        nested_group = None
+        for raw_line in stanza.text.splitlines()[1:]:
+            line = raw_line.strip()
+            indent = len(raw_line) - len(raw_line.lstrip())
+            if nested_group is not None and indent > 1:
+                # Cú pháp VRRPv3: 'vrrp N address-family ipv4' với thuộc tính thụt lề bên dưới
+                words = line.split()
+                if words[:1] == ["address"] and len(words) > 1:
+                    nested_group["vips"].add(words[1])
+                elif words[:1] == ["priority"] and len(words) > 1 and words[1].isdigit():
+                    nested_group["priority"] = int(words[1])
+                continue
+            nested_group = None
+            vrf_match = INTERFACE_VRF_PATTERN.match(line)
+            if vrf_match:
+                interface_info["vrf"] = vrf_match.group(1)
+                continue
+            address_match = INTERFACE_ADDRESS_PATTERN.match(line)
+            if address_match:
+                try:
+                    network = ipaddress.ip_interface(f"{address_match.group(1)}/{address_match.group(2)}").network
+                except ValueError:
+                    # Mask không liên tục (log lỗi/cắt cụt): không xác định được subnet để ghép nhóm
+                    continue
+                interface_info["subnet"] = str(network)
+                continue
+            encapsulation_match = ENCAPSULATION_VLAN_PATTERN.match(line)
+            if encapsulation_match:
+                interface_info["vlan"] = encapsulation_match.group(1)
+                continue
+            match = FHRP_LINE_PATTERN.match(line)
+            if not match or match.group(3).lower() not in FHRP_GROUP_ATTRIBUTES:
+                continue
+            protocol = FHRP_PROTOCOLS[match.group(1).lower()]
+            group_number = int(match.group(2) or 0)
+            attribute, value = match.group(3).lower(), (match.group(4) or "").strip()
+            group = interface_groups.setdefault((protocol, group_number), {
+                "interface": interface, "protocol": protocol, "group": group_number, "vips": set(),
+                "priority": FHRP_DEFAULT_PRIORITY, "auth_mode": None, "auth_fingerprint": None,
+            })
+            if attribute == "ip" and value:
+                group["vips"].add(value.split()[0])
+            elif attribute == "priority" and value.split()[:1] and value.split()[0].isdigit():
+                group["priority"] = int(value.split()[0])
+            elif attribute == "authentication" and value:
+                if key_chains is None and "key-chain" in value:
+                    key_chains = parse_igp_model(config_data)["key_chains"]
+                group["auth_mode"], group["auth_fingerprint"] = _fhrp_authentication(value, key_chains or {})
+            elif attribute == "address-family":
+                nested_group = group
+        for group in interface_groups.values():
+            group.update(interface_info)
+            group["vips"] = tuple(sorted(group["vips"]))
+            groups.append(group)
+    return groups
+
+
+def check_fhrp_consistency(devices):
+    """
+    Đối chiếu các thành viên của từng nhóm gateway trong fleet. Nhóm được lập chỉ mục theo
+    (VRF, subnet hoặc VLAN, giao thức, số nhóm) trong một lượt duyệt nên chi phí tỉ lệ với số SVI.
+    Args:
+        devices (dict): Tên thiết bị -> kết quả từ parse_fhrp_groups.
+
+    Returns:
+        list: Mỗi nhóm một dict {"vrf", "segment", "protocol", "group", "members": [(thiết bị, interface, priority)],
+              "vips", "issues": [khoá trong CONSISTENCY_LABELS]}.
+    """
+    index = defaultdict(list)
+    for device, groups in devices.items():
+        for group in groups:
+            segment = group["subnet"] or (f"vlan {group['vlan']}" if group["vlan"] else f"{device} {group['interface']}")
+            index[(group["vrf"], segment, group["protocol"], group["group"])].append((device, group))
+
+    results = []
+    for (vrf, segment, protocol, group_number), members in index.items():
+        groups = [group for _, group in members]
+        issues = []
+        if len(members) < 2:
+            issues.append("single_member")
+        # Thành viên không khai báo VIP (VRRP/HSRP học VIP từ active) không được tính là khác biệt
+        vips = {tuple(group["vips"]) for group in groups if group["vips"]}
+        if len(vips) > 1:
+            issues.append("vip_mismatch")
+        modes = {group["auth_mode"] for group in groups}
+        if modes == {None}:
+            issues.append("no_auth")
+        elif None in modes:
+            issues.append("one_sided_auth")
+        elif len(modes) > 1:
+            issues.append("auth_mode_mismatch")
+        elif len({group["auth_fingerprint"] for group in groups}) > 1:
+            issues.append("auth_key_mismatch")
+        if len(members) > 1 and len({group["priority"] for group in groups}) == 1:
+            issues.append("priority_tie")
+        results.append({
+            "vrf": vrf, "segment": segment, "protocol": protocol, "group": group_number,
+            "members": [(device, group["interface"], group["priority"]) for device, group in members],
+            "vips": sorted({vip for group in groups for vip in group["vips"]}),
+            "issues": issues,
+        })
+    return results
+
+
+def display_fhrp_consistency(results):
+    """
+    Hiển thị kết quả đối chiếu nhóm gateway toàn fleet (không in khoá xác thực).
+    Args:
+        results (list): Kết quả từ check_fhrp_consistency.
+    """
+    print(f"\n\033[1mĐối chiếu nhóm gateway giữa các thiết bị: {len(results)} nhóm\033[0m")
+    violations = [result for result in results if result["issues"]]
+    if not violations:
+        print("\033[32mTuân Thủ\033[0m")
+        return
+    counts = defaultdict(int)
+    for result in violations:
+        for issue in result["issues"]:
+            counts[issue] += 1
+    for issue, label in CONSISTENCY_LABELS.items():
+        if counts[issue]:
+            print(f"- \033[31m{label}\033[0m: {counts[issue]} nhóm")
+    print("\033[31mKhông Tuân Thủ:\033[0m")
+    for result in violations:
+        vrf = f" vrf {result['vrf']}" if result["vrf"] else ""
+        members = ", ".join(f"{device} {interface} (priority {priority})"
+                            for device, interface, priority in result["members"])
+        print(f"  {result['protocol']} {result['group']} {result['segment']}{vrf} "
+              f"[VIP {', '.join(result['vips']) or '-'}]: {members}")
+        print(f"    {'; '.join(CONSISTENCY_LABELS[issue] for issue in result['issues'])}")
+
+
+def process_gateway_authentication_logs(folder_path):
+    """
+    Duyệt qua tất cả các file log trong thư mục và kiểm tra xác thực của các giao thức dự phòng gateway.
+    Args:
+        folder_path (str): Đường dẫn tới thư mục chứa file log.
+
+    Returns:
+        None: In kết quả cho từng file log.
+    """
+    if not os.path.exists(folder_path):
+        print(f"Folder not found: {folder_path}")
+        return
+
+    # Duyệt qua tất cả file log trong folder (kể cả member trong các bundle .gz/.zip/.tar)
+    log_sources = list_log_sources(folder_path)
+
+    if not log_sources:
+        print(f"No .log/.txt files or log archives found in folder: {folder_path}")
+        return
+
+    devices = {}
+    for log in iter_logs(log_sources):
+        file_path = log.name
+        print(f"\nProcessing File: {file_path}")
+
+        try:
+            config_data = log.text
+
+            # Gọi hàm phân tích
+            auth_status = analyze_gateway_authentication(config_data)
+
+            # Hiển thị kết quả
+            display_gateway_authentication_results(auth_status)
+
+            # Lưu các nhóm gateway để đối chiếu toàn fleet (bản chụp sau của cùng thiết bị ghi đè bản trước)
+            groups = parse_fhrp_groups(config_data)
+            if groups:
+                devices[find_hostname(config_data) or os.path.basename(file_path)] = groups
+
+        except Exception as e:
+            print(f"An error occurred while processing {file_path}: {e}")
+
+    # Đối chiếu các thành viên của cùng nhóm gateway giữa các thiết bị
+    if devices:
+        display_fhrp_consistency(check_fhrp_consistency(devices))
+
+if __name__ == "__main__":
+    folder_path = r"D:\automation\Test"  # Thay bằng đường dẫn thư mục chứa file log của bạn
+    process_gateway_authentication_logs(folder_path)
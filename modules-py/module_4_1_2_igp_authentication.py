@@ -1,97 +1,106 @@
-import os
-import re
-
-def analyze_igp_authentication(config_data):
-    """
-    Phân tích cấu hình của các giao thức định tuyến IGP (RIP, OSPF, ISIS).
-    Args:
-        config_data (str): Nội dung cấu hình.
-
-    Returns:
-        dict: Thông tin về trạng thái cấu hình và xác thực của các giao thức RIP, OSPF, và ISIS.
-    """
-    authentication_status = {
-        "RIP": {"configured": False, "authenticated": False},
-        "OSPF": {"configured": False, "authenticated": False},
-        "ISIS": {"configured": False, "authenticated": False}
-    }
-
-    # Regex kiểm tra cấu hình giao thức
-    rip_config_pattern = r"^router rip$"
-    ospf_config_pattern = r"^router ospf \d+"
-    isis_config_pattern = r"^router isis"
-
-    # Regex kiểm tra xác thực
-    rip_auth_pattern = r"ip rip authentication mode md5"
-    ospf_auth_pattern = r"area \d+ authentication(?: message-digest)?"
-    isis_auth_pattern = r"isis authentication (?:mode md5|key \S+)"
-
-    # Kiểm tra cấu hình giao thức
-    if re.search(rip_config_pattern, config_data, re.MULTILINE | re.IGNORECASE):
-        authentication_status["RIP"]["configured"] = True
-        if re.search(rip_auth_pattern, config_data, re.MULTILINE | re.IGNORECASE):
-            authentication_status["RIP"]["authenticated"] = True
-
-    if re.search(ospf_config_pattern, config_data, re.MULTILINE | re.IGNORECASE):
-        authentication_status["OSPF"]["configured"] = True
-        if re.search(ospf_auth_pattern, config_data, re.MULTILINE | re.IGNORECASE):
-            authentication_status["OSPF"]["authenticated"] = True
-
-    if re.search(isis_config_pattern, config_data, re.MULTILINE | re.IGNORECASE):
-        authentication_status["ISIS"]["configured"] = True
-        if re.search(isis_auth_pattern, config_data, re.MULTILINE | re.IGNORECASE):
-            authentication_status["ISIS"]["authenticated"] = True
-
-    return authentication_status
-
-
-def process_igp_authentication_logs(folder_path):
-    """
-    Duyệt qua tất cả các file log trong thư mục và kiểm tra cấu hình của các giao thức định tuyến IGP.
-    Args:
-        folder_path (str): Đường dẫn tới thư mục chứa file log.
-
-    Returns:
-        None: In kết quả cho từng file log.
-    """
-    if not os.path.exists(folder_path):
-        print(f"Folder not found: {folder_path}")
-        return
-
-    # Duyệt qua tất cả file trong folder
-    log_files = [file for file in os.listdir(folder_path) if file.endswith((".log", ".txt"))]
-
-    if not log_files:
-        print(f"No .log or .txt files found in folder: {folder_path}")
-        return
-
-    for log_file in log_files:
-        file_path = os.path.join(folder_path, log_file)
-        print(f"\nProcessing File: {file_path}")
-
-        try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                config_data = file.read()
-
-            # Gọi hàm phân tích
-            auth_status = analyze_igp_authentication(config_data)
-
-            # Hiển thị kết quả
-            print("\033[1mKết quả kiểm tra cấu hình giao thức IGP:\033[0m")
-            for protocol, status in auth_status.items():
-                if status["configured"]:
-                    if status["authenticated"]:
-                        print(f"\033[32m{protocol} được cấu hình và có xác thực.\033[0m")
-                    else:
-                        print(f"\033[33m{protocol} được cấu hình nhưng không có xác thực.\033[0m")
-                else:
-                    print(f"\033[31m{protocol} không được cấu hình.\033[0m")
-
-            print("-" * 50)
-
-        except Exception as e:
-            print(f"An error occurred while processing {file_path}: {e}")
-
-if __name__ == "__main__":
-    folder_path = r"D:\automation\Test"  # Thay bằng đường dẫn thư mục chứa file log của bạn
-    process_igp_authentication_logs(folder_path)
+import os
+from archive_reader import iter_logs, list_log_sources
+from igp_model import (AUTHENTICATED_VERDICTS, VERDICT_LABELS, parse_igp_model, process_authentication,
+                       resolve_igp_authentication)
+
+def analyze_igp_authentication(config_data):
+    """
+    Phân tích cấu hình xác thực của các giao thức định tuyến IGP (RIP, OSPF, ISIS, EIGRP) theo từng
+    interface tham gia process, dựa trên mô hình IGP (lệnh trên interface, area/process và key chain).
+    Args:
+        config_data (str): Nội dung cấu hình.
+
+    Returns:
+        dict: Giao thức -> {"configured", "authenticated", "interfaces": [...]}; "interfaces" gồm các interface
+              tham gia (xem igp_model.resolve_igp_authentication) kèm id process trong khoá "process".
+    """
+    authentication_status = {
+        protocol: {"configured": False, "authenticated": False, "interfaces": []}
+        for protocol in ("RIP", "OSPF", "ISIS", "EIGRP")
+    }
+
+    model = parse_igp_model(config_data)
+    process_authenticated = {}
+    for (protocol, process_id), entries in resolve_igp_authentication(config_data).items():
+        status = authentication_status[protocol]
+        status["configured"] = True
+        status["interfaces"].extend(dict(entry, process=process_id) for entry in entries)
+        active = [entry for entry in entries if entry["verdict"] != "passive"]
+        if active:
+            authenticated = all(entry["verdict"] in AUTHENTICATED_VERDICTS for entry in active)
+        else:
+            # Không xác định được interface tham gia: dựa vào xác thực khai báo ở mức process
+            authenticated = process_authentication(model, (protocol, process_id))
+        process_authenticated[protocol] = process_authenticated.get(protocol, True) and authenticated
+
+    for protocol, authenticated in process_authenticated.items():
+        authentication_status[protocol]["authenticated"] = authenticated
+
+    return authentication_status
+
+
+def display_igp_authentication_results(auth_status):
+    """
+    Hiển thị kết quả kiểm tra cấu hình giao thức IGP.
+    Args:
+        auth_status (dict): Kết quả từ analyze_igp_authentication.
+    """
+    print("\033[1mKết quả kiểm tra cấu hình giao thức IGP:\033[0m")
+    for protocol, status in auth_status.items():
+        if status["configured"]:
+            if status["authenticated"]:
+                print(f"\033[32m{protocol} được cấu hình và có xác thực.\033[0m")
+            else:
+                print(f"\033[33m{protocol} được cấu hình nhưng không có xác thực.\033[0m")
+            for entry in status["interfaces"]:
+                color = "\033[32m" if entry["verdict"] in AUTHENTICATED_VERDICTS + ("passive",) else "\033[31m"
+                area = f" area {entry['area']}" if entry["area"] is not None else ""
+                process = f" {entry['process']}" if entry["process"] else ""
+                source = f" ({entry['source']})" if entry["source"] and entry["mode"] else ""
+                print(f"  - {protocol}{process}{area} {entry['interface']}: "
+                      f"{color}{VERDICT_LABELS[entry['verdict']]}\033[0m{source}")
+        else:
+            print(f"\033[31m{protocol} không được cấu hình.\033[0m")
+
+    print("-" * 50)
+
+
+def process_igp_authentication_logs(folder_path):
+    """
+    Duyệt qua tất cả các file log trong thư mục và kiểm tra cấu hình của các giao thức định tuyến IGP.
+    Args:
+        folder_path (str): Đường dẫn tới thư mục chứa file log.
+
+    Returns:
+        None: In kết quả cho từng file log.
+    """
+    if not os.path.exists(folder_path):
+        print(f"Folder not found: {folder_path}")
+        return
+
+    # Duyệt qua tất cả file log trong folder (kể cả member trong các bundle .gz/.zip/.tar)
+    log_sources = list_log_sources(folder_path)
+
+    if not log_sources:
+        print(f"No .log/.txt files or log archives found in folder: {folder_path}")
+        return
+
+    for log in iter_logs(log_sources):
+        file_path = log.name
+        print(f"\nProcessing File: {file_path}")
+
+        try:
+            config_data = log.text
+
+            # Gọi hàm phân tích
+            auth_status = analyze_igp_authentication(config_data)
+
+            # Hiển thị kết quả
+            display_igp_authentication_results(auth_status)
+
+        except Exception as e:
+            print(f"An error occurred while processing {file_path}: {e}")
+
+if __name__ == "__main__":
+    folder_path = r"D:\automation\Test"  # Thay bằng đường dẫn thư mục chứa file log của bạn
+    process_igp_authentication_logs(folder_path)
@@ -1,101 +1,342 @@
-import os
-import re
-
-def analyze_bgp_authentication(config_data):
-    """
-    Phân tích cấu hình xác thực của BGP giữa các peer.
-    Args:
-        config_data (str): Nội dung cấu hình.
-
-    Returns:
-        dict: Thông tin về trạng thái cấu hình và xác thực của BGP.
-    """
-    bgp_status = {
-        "configured": False,
-        "peers": [],
-        "authenticated_peers": [],
-        "non_authenticated_peers": []
-    }
-
-    # Regex kiểm tra cấu hình BGP
-    bgp_config_pattern = r"^router bgp \d+"
-    peer_pattern = r"neighbor (\S+)"
-    auth_pattern = r"neighbor (\S+) password \S+"
-
-    # Kiểm tra cấu hình BGP
-    if re.search(bgp_config_pattern, config_data, re.MULTILINE | re.IGNORECASE):
-        bgp_status["configured"] = True
-
-        # Tìm tất cả các peer
-        peers = re.findall(peer_pattern, config_data, re.MULTILINE | re.IGNORECASE)
-        bgp_status["peers"].extend(peers)
-
-        # Tìm các peer được cấu hình xác thực
-        authenticated_peers = re.findall(auth_pattern, config_data, re.MULTILINE | re.IGNORECASE)
-        bgp_status["authenticated_peers"].extend(authenticated_peers)
-
-        # Xác định các peer không được cấu hình xác thực
-        for peer in peers:
-            if peer not in authenticated_peers:
-                bgp_status["non_authenticated_peers"].append(peer)
-
-    return bgp_status
-
-def process_bgp_authentication_logs(folder_path):
-    """
-    Duyệt qua tất cả các file log trong thư mục và kiểm tra xác thực của BGP.
-    Args:
-        folder_path (str): Đường dẫn tới thư mục chứa file log.
-
-    Returns:
-        None: In kết quả cho từng file log.
-    """
-    if not os.path.exists(folder_path):
-        print(f"Folder not found: {folder_path}")
-        return
-
-    # Duyệt qua tất cả file trong folder
-    log_files = [file for file in os.listdir(folder_path) if file.endswith((".log", ".txt"))]
-
-    if not log_files:
-        print(f"No .log or .txt files found in folder: {folder_path}")
-        return
-
-    for log_file in log_files:
-        file_path = os.path.join(folder_path, log_file)
-        print(f"\nProcessing File: {file_path}")
-
-        try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                config_data = file.read()
-
-            # Gọi hàm phân tích
-            bgp_status = analyze_bgp_authentication(config_data)
-
-            # Hiển thị kết quả
-            print("\033[1mKết quả kiểm tra cấu hình BGP:\033[0m")
-            if bgp_status["configured"]:
-                print("\033[32mBGP được cấu hình.\033[0m")
-                if bgp_status["peers"]:
-                    print(f"Tổng số peer: {len(bgp_status['peers'])}")
-                    if bgp_status["authenticated_peers"]:
-                        print("\033[32mPeer có xác thực:\033[0m")
-                        for peer in bgp_status["authenticated_peers"]:
-                            print(f"- {peer}")
-                    if bgp_status["non_authenticated_peers"]:
-                        print("\033[31mPeer không có xác thực:\033[0m")
-                        for peer in bgp_status["non_authenticated_peers"]:
-                            print(f"- {peer}")
-                else:
-                    print("\033[33mKhông phát hiện peer nào trong cấu hình BGP.\033[0m")
-            else:
-                print("\033[31mBGP không được cấu hình.\033[0m")
-
-            print("-" * 50)
-
-        except Exception as e:
-            print(f"An error occurred while processing {file_path}: {e}")
-
-if __name__ == "__main__":
-    folder_path = r"D:\\automation\\Test"  # Thay bằng đường dẫn thư mục chứa file log của bạn
-    process_bgp_authentication_logs(folder_path)
+import ipaddress
+import os
+import re
+from collections import defaultdict
+from archive_reader import iter_logs, list_log_sources
+from config_stanzas import split_stanzas
+from log_normalizer import find_hostname
+from secret_classifier import password_fingerprint
+
+# Dòng 'neighbor <địa chỉ|peer-group> <thuộc tính> [giá trị]' trong stanza 'router bgp'
+NEIGHBOR_LINE_PATTERN = re.compile(r"^neighbor\s+(\S+)\s+(\S+)(?:\s+(.*))?$", re.IGNORECASE)
+ADDRESS_FAMILY_VRF_PATTERN = re.compile(r"^address-family\s+\S+(?:\s+\S+)?\s+vrf\s+(\S+)", re.IGNORECASE)
+INTERFACE_ADDRESS_PATTERN = re.compile(r"^ip address (\d+\.\d+\.\d+\.\d+)\s+(\d+\.\d+\.\d+\.\d+)", re.IGNORECASE)
+INTERFACE_VRF_PATTERN = re.compile(r"^(?:ip )?vrf forwarding (\S+)", re.IGNORECASE)
+
+# Kết quả ghép phiên BGP giữa hai đầu
+PAIRING_LABELS = {
+    "authenticated": "Hai đầu cùng mật khẩu",
+    "password_mismatch": "Mật khẩu hai đầu khác nhau",
+    "one_sided_auth": "Chỉ một đầu cấu hình mật khẩu",
+    "no_auth": "Cả hai đầu không xác thực",
+    "unpaired": "Đầu kia không khai báo neighbor ngược lại",
+    "external_auth": "Peer ngoài fleet, có mật khẩu",
+    "external_no_auth": "Peer ngoài fleet, không có mật khẩu",
+}
+PAIRING_VIOLATIONS = ("password_mismatch", "one_sided_auth", "no_auth", "unpaired", "external_no_auth")
+
+def analyze_bgp_authentication(config_data):
+    """
+    Phân tích cấu hình xác thực của BGP giữa các peer.
+    Args:
+        config_data (str): Nội dung cấu hình.
+
+    Returns:
+        dict: Thông tin về trạng thái cấu hình và xác thực của BGP.
+    """
+    bgp_status = {
+        "configured": False,
+        "peers": [],
+        "authenticated_peers": [],
+        "non_authenticated_peers": []
+    }
+
+    # Regex kiểm tra cấu hình BGP
+    bgp_config_pattern = r"^router bgp \d+"
+    peer_pattern = r"neighbor (\S+)"
+    auth_pattern = r"neighbor (\S+) password \S+"
+
+    # Kiểm tra cấu hình BGP
+    if re.search(bgp_config_pattern, config_data, re.MULTILINE | re.IGNORECASE):
+        bgp_status["configured"] = True
+
+        # Tìm tất cả các peer
+        peers = re.findall(peer_pattern, config_data, re.MULTILINE | re.IGNORECASE)
+        bgp_status["peers"].extend(peers)
+
+        # Tìm các peer được cấu hình xác thực
+        authenticated_peers = re.findall(auth_pattern, config_data, re.MULTILINE | re.IGNORECASE)
+        bgp_status["authenticated_peers"].extend(authenticated_peers)
+
+        # Xác định các peer không được cấu hình xác thực
+        for peer in peers:
+            if peer not in authenticated_peers:
+                bgp_status["non_authenticated_peers"].append(peer)
+
+    return bgp_status
+
+def display_bgp_authentication_results(bgp_status):
+    """
+    Hiển thị kết quả kiểm tra cấu hình BGP.
+    Args:
+        bgp_status (dict): Kết quả từ analyze_bgp_authentication.
+    """
+    print("\033[1mKết quả kiểm tra cấu hình BGP:\033[0m")
+    if bgp_status["configured"]:
+        print("\033[32mBGP được cấu hình.\033[0m")
+        if bgp_status["peers"]:
+            print(f"Tổng số peer: {len(bgp_status['peers'])}")
+            if bgp_status["authenticated_peers"]:
+                print("\033[32mPeer có xác thực:\033[0m")
+                for peer in bgp_status["authenticated_peers"]:
+                    print(f"- {peer}")
+            if bgp_status["non_authenticated_peers"]:
+                print("\033[31mPeer không có xác thực:\033[0m")
+                for peer in bgp_status["non_authenticated_peers"]:
+                    print(f"- {peer}")
+        else:
+            print("\033[33mKhông phát hiện peer nào trong cấu hình BGP.\033[0m")
+    else:
+        print("\033[31mBGP không được cấu hình.\033[0m")
+
+    print("-" * 50)
+
+
+def _is_address(value):
+    try:
+        ipaddress.ip_address(value)
+    except ValueError:
+        return False
+    return True
+
+
+def parse_bgp_config(config_data):
+    """
+    Phân tích stanza 'router bgp' và địa chỉ interface của một thiết bị để ghép phiên với thiết bị khác.
+    Thuộc tính remote-as và password khai báo trên peer-group được áp dụng cho các neighbor thành viên.
+    Kết quả chỉ gồm list/dict khoá chuỗi nên ghi được vào nhật ký lần chạy.
+    Args:
+        config_data (str): Nội dung log đã chuẩn hoá.
+
+    Returns:
+        dict: {"local_as": str | None,
+               "addresses": [{"vrf", "address", "prefixlen", "interface"}],
+               "neighbors": [{"vrf", "address", "remote_as", "password_type", "fingerprint", "peer_group"}]}.
+            VRF mặc định là "".
+    """
+    bgp = {"local_as": None, "addresses": [], "neighbors": []}
+    neighbors = {}
+    groups = defaultdict(dict)
+    for key, stanza in split_stanzas(config_data).items():
+        lines = [line.strip() for line in stanza.text.splitlines()[1:]]
+        if key.startswith("interface "):
+            vrf = ""
+            for line in lines:
+                vrf_match = INTERFACE_VRF_PATTERN.match(line)
+                if vrf_match:
+                    vrf = vrf_match.group(1)
+                address_match = INTERFACE_ADDRESS_PATTERN.match(line)
+                if address_match:
+                    try:
+                        prefixlen = ipaddress.ip_network(f"0.0.0.0/{address_match.group(2)}").prefixlen
+                    except ValueError:
+                        prefixlen = 32
+                    bgp["addresses"].append({"vrf": vrf, "address": address_match.group(1),
+                                             "prefixlen": prefixlen, "interface": key.split(None, 1)[1]})
+            continue
+        if not key.startswith("router bgp ") or bgp["local_as"] is not None:
+            continue
+        bgp["local_as"] = key.split()[2]
+        vrf = ""
+        for line in lines:
+            lowered = line.lower()
+            if lowered.startswith("address-family"):
+                vrf_match = ADDRESS_FAMILY_VRF_PATTERN.match(line)
+                vrf = vrf_match.group(1) if vrf_match else ""
+                continue
+            if lowered.startswith("exit-address-family"):
+                vrf = ""
+                continue
+            match = NEIGHBOR_LINE_PATTERN.match(line)
+            if not match:
+                continue
+            name, attribute, value = match.group(1), match.group(2).lower(), match.group(3) or ""
+            if _is_address(name):
+                attributes = neighbors.get((vrf, name))
+                if attributes is None:
+                    attributes = neighbors[(vrf, name)] = {
+                        "vrf": vrf, "address": name,
+                        "remote_as": None, "password_type": None, "fingerprint": None, "peer_group": None,
+                    }
+                    bgp["neighbors"].append(attributes)
+            else:
+                attributes = groups[name]
+            if attribute == "remote-as" and value:
+                attributes["remote_as"] = value.split()[0]
+            elif attribute == "password" and value:
+                attributes["password_type"], attributes["fingerprint"] = password_fingerprint(value)
+            elif attribute == "peer-group" and value:
+                attributes["peer_group"] = value.split()[0]
+
+    # Kế thừa thuộc tính từ peer-group
+    for attributes in bgp["neighbors"]:
+        group = groups.get(attributes["peer_group"], {})
+        for attribute in ("remote_as", "password_type", "fingerprint"):
+            if attributes[attribute] is None:
+                attributes[attribute] = group.get(attribute)
+    return bgp
+
+
+def _local_address(bgp, vrf, neighbor):
+    # Địa chỉ interface của thiết bị nằm cùng subnet kết nối trực tiếp với neighbor (None nếu peer qua loopback)
+    neighbor = ipaddress.ip_address(neighbor)
+    for entry in bgp["addresses"]:
+        if entry["vrf"] == vrf and entry["prefixlen"] < 32 and neighbor != ipaddress.ip_address(entry["address"]):
+            if neighbor in ipaddress.ip_network(f"{entry['address']}/{entry['prefixlen']}", strict=False):
+                return entry["address"]
+    return None
+
+
+def pair_bgp_sessions(devices):
+    """
+    Ghép các phiên BGP giữa các thiết bị trong fleet: địa chỉ neighbor được tra trong chỉ mục
+    địa chỉ interface -> thiết bị, và chiều ngược lại được tra trong chỉ mục neighbor theo thiết bị sở hữu,
+    nên chi phí tỉ lệ với số phiên thay vì số cặp thiết bị.
+    Khi hai thiết bị có nhiều phiên song song, neighbor ngược lại được chọn là địa chỉ interface của thiết bị
+    nằm cùng subnet với neighbor; neighbor đã được ghép không được dùng lại.
+    Args:
+        devices (dict): Tên thiết bị -> kết quả từ parse_bgp_config.
+
+    Returns:
+        list: Mỗi phiên một dict {"device", "neighbor", "vrf", "peer_device", "peer_neighbor",
+              "verdict", "remote_as_mismatch"}; phiên giữa hai thiết bị trong fleet chỉ xuất hiện một lần.
+    """
+    owners = {}
+    for device, bgp in devices.items():
+        for entry in bgp["addresses"]:
+            owners.setdefault((entry["vrf"], entry["address"]), device)
+
+    # Thiết bị -> (thiết bị sở hữu địa chỉ neighbor, VRF) -> các neighbor trỏ tới thiết bị đó trong VRF đó
+    neighbors_by_owner = {}
+    for device, bgp in devices.items():
+        by_owner = neighbors_by_owner[device] = defaultdict(list)
+        for attributes in bgp["neighbors"]:
+            vrf = attributes["vrf"]
+            by_owner[(owners.get((vrf, attributes["address"])), vrf)].append(attributes)
+
+    sessions = []
+    paired = set()
+    for device, bgp in devices.items():
+        for attributes in bgp["neighbors"]:
+            vrf, address = attributes["vrf"], attributes["address"]
+            if (device, vrf, address) in paired:
+                continue
+            paired.add((device, vrf, address))
+            owner = owners.get((vrf, address))
+            session = {
+                "device": device, "neighbor": address, "vrf": vrf,
+                "peer_device": owner if owner != device else None, "peer_neighbor": None,
+                "remote_as_mismatch": False,
+            }
+            sessions.append(session)
+            if session["peer_device"] is None:
+                session["verdict"] = "external_auth" if attributes["fingerprint"] else "external_no_auth"
+                continue
+
+            peer = devices[owner]
+            session["remote_as_mismatch"] = attributes["remote_as"] != peer["local_as"]
+            candidates = [candidate for candidate in neighbors_by_owner[owner].get((device, vrf), ())
+                          if (owner, vrf, candidate["address"]) not in paired]
+            if not candidates:
+                session["verdict"] = "unpaired"
+                continue
+            # Ưu tiên neighbor ngược lại là địa chỉ của thiết bị trên subnet kết nối với neighbor này
+            local_address = _local_address(bgp, vrf, address)
+            peer_attributes = next((candidate for candidate in candidates if candidate["address"] == local_address),
+                                   candidates[0])
+            paired.add((owner, vrf, peer_attributes["address"]))
+            session["peer_neighbor"] = peer_attributes["address"]
+            session["remote_as_mismatch"] |= peer_attributes["remote_as"] != bgp["local_as"]
+            local_fingerprint, peer_fingerprint = attributes["fingerprint"], peer_attributes["fingerprint"]
+            if local_fingerprint and peer_fingerprint:
+                session["verdict"] = "authenticated" if local_fingerprint == peer_fingerprint else "password_mismatch"
+            elif local_fingerprint or peer_fingerprint:
+                session["verdict"] = "one_sided_auth"
+            else:
+                session["verdict"] = "no_auth"
+    return sessions
+
+
+def display_bgp_session_pairing(sessions):
+    """
+    Hiển thị kết quả ghép phiên BGP toàn fleet (không in mật khẩu hay dấu vân tay).
+    Args:
+        sessions (list): Kết quả từ pair_bgp_sessions.
+    """
+    print(f"\n\033[1mGhép phiên BGP giữa các thiết bị: {len(sessions)} phiên\033[0m")
+    if not sessions:
+        print("\033[33mKhông phát hiện neighbor BGP nào.\033[0m")
+        return
+    counts = defaultdict(int)
+    for session in sessions:
+        counts[session["verdict"]] += 1
+    for verdict, label in PAIRING_LABELS.items():
+        if counts[verdict]:
+            color = "\033[31m" if verdict in PAIRING_VIOLATIONS else "\033[32m"
+            print(f"- {color}{label}\033[0m: {counts[verdict]}")
+
+    violations = [session for session in sessions
+                  if session["verdict"] in PAIRING_VIOLATIONS or session["remote_as_mismatch"]]
+    if not violations:
+        print("\033[32mTuân Thủ\033[0m")
+        return
+    print("\033[31mKhông Tuân Thủ:\033[0m")
+    for session in violations:
+        vrf = f" (vrf {session['vrf']})" if session["vrf"] else ""
+        peer = session["peer_device"] or "ngoài fleet"
+        if session["peer_neighbor"]:
+            peer = f"{peer} -> {session['peer_neighbor']}"
+        issues = [PAIRING_LABELS[session["verdict"]]] if session["verdict"] in PAIRING_VIOLATIONS else []
+        if session["remote_as_mismatch"]:
+            issues.append("remote-as không khớp AS của đầu kia")
+        print(f"  {session['device']} -> {session['neighbor']}{vrf} [{peer}]: {'; '.join(issues)}")
+
+
+def process_bgp_authentication_logs(folder_path):
+    """
+    Duyệt qua tất cả các file log trong thư mục và kiểm tra xác thực của BGP.
+    Args:
+        folder_path (str): Đường dẫn tới thư mục chứa file log.
+
+    Returns:
+        None: In kết quả cho từng file log.
+    """
+    if not os.path.exists(folder_path):
+        print(f"Folder not found: {folder_path}")
+        return
+
+    # Duyệt qua tất cả file log trong folder (kể cả member trong các bundle .gz/.zip/.tar)
+    log_sources = list_log_sources(folder_path)
+
+    if not log_sources:
+        print(f"No .log/.txt files or log archives found in folder: {folder_path}")
+        return
+
+    devices = {}
+    for log in iter_logs(log_sources):
+        file_path = log.name
+        print(f"\nProcessing File: {file_path}")
+
+        try:
+            config_data = log.text
+
+            # Gọi hàm phân tích
+            bgp_status = analyze_bgp_authentication(config_data)
+
+            # Hiển thị kết quả
+            display_bgp_authentication_results(bgp_status)
+
+            # Lưu neighbor và địa chỉ interface để ghép phiên toàn fleet (bản chụp sau của cùng thiết bị ghi đè bản trước)
+            if bgp_status["configured"]:
+                devices[find_hostname(config_data) or os.path.basename(file_path)] = parse_bgp_config(config_data)
+
+        except Exception as e:
+            print(f"An error occurred while processing {file_path}: {e}")
+
+    # Ghép phiên giữa các thiết bị (peer trong fleet luôn có cấu hình BGP nên chỉ cần thiết bị có BGP)
+    if devices:
+        display_bgp_session_pairing(pair_bgp_sessions(devices))
+
+if __name__ == "__main__":
+    folder_path = r"D:\\automation\\Test"  # Thay bằng đường dẫn thư mục chứa file log của bạn
+    process_bgp_authentication_logs(folder_path)
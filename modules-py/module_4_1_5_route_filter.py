@@ -1,125 +1,166 @@
-import os
-import re
-
-def analyze_route_filters(config_data):
-    results = {
-        "interfaces": [],
-        "routing_protocols": set(),
-        "filter_status": {
-            "compliant": [],
-            "non_compliant": []
-        },
-        "has_routing": False
-    }
-    
-    # Tìm các giao thức định tuyến đang chạy
-    routing_patterns = {
-        "OSPF": r"router ospf \d+",
-        "EIGRP": r"router eigrp \d+",
-        "RIP": r"router rip",
-        "BGP": r"router bgp \d+"
-    }
-    
-    for protocol, pattern in routing_patterns.items():
-        if re.search(pattern, config_data, re.IGNORECASE):
-            results["routing_protocols"].add(protocol)
-            results["has_routing"] = True
-    
-    # Nếu không có giao thức định tuyến, trả về kết quả sớm
-    if not results["has_routing"]:
-        return results
-        
-    # Tìm các interface end-user
-    interface_pattern = r"interface (.+?)\n(?:.*?\n)*?(?=!)"
-    for match in re.finditer(interface_pattern, config_data, re.MULTILINE):
-        interface_config = match.group(0)
-        interface_name = match.group(1)
-        
-        if (re.search(r"switchport mode access", interface_config, re.IGNORECASE) or 
-            re.search(r"description.*?(client|end-user|customer)", interface_config, re.IGNORECASE)):
-            results["interfaces"].append(interface_name)
-    
-    # Kiểm tra passive-interface và distribute-list
-    for interface in results["interfaces"]:
-        is_secure = False
-        
-        if any(re.search(rf"passive-interface {interface}", config_data, re.IGNORECASE) for _ in results["routing_protocols"]):
-            results["filter_status"]["compliant"].append({
-                "interface": interface,
-                "method": "passive-interface",
-                "details": "Interface được cấu hình passive"
-            })
-            is_secure = True
-            
-        if any(re.search(rf"distribute-list.*in.*{interface}", config_data, re.IGNORECASE) for _ in results["routing_protocols"]):
-            results["filter_status"]["compliant"].append({
-                "interface": interface,
-                "method": "distribute-list",
-                "details": "Có áp dụng distribute-list để lọc"
-            })
-            is_secure = True
-            
-        if any(re.search(rf"route-map.*in.*{interface}", config_data, re.IGNORECASE) for _ in results["routing_protocols"]):
-            results["filter_status"]["compliant"].append({
-                "interface": interface,
-                "method": "route-map",
-                "details": "Có áp dụng route-map để lọc"
-            })
-            is_secure = True
-        
-        if not is_secure:
-            results["filter_status"]["non_compliant"].append({
-                "interface": interface,
-                "details": "Không có cấu hình lọc route"
-            })
-    
-    return results
-
-def process_config_files(folder_path):
-    log_files = [f for f in os.listdir(folder_path) if f.endswith('.log')]
-    
-    for file_name in log_files:
-        file_path = os.path.join(folder_path, file_name)
-        print(f"\nĐang phân tích file: {file_path}")
-        
-        try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                config_data = file.read()
-            
-            results = analyze_route_filters(config_data)
-            
-            if not results["has_routing"]:
-                print("\033[33mThiết bị không chạy giao thức định tuyến động\033[0m")
-                print("-" * 50)
-                continue
-                
-            print("\033[1mKết quả kiểm tra lọc route trên port end-user:\033[0m")
-            print(f"\nThiết bị: {file_name}")
-                
-            print("\nGiao thức định tuyến đang chạy:")
-            for protocol in results["routing_protocols"]:
-                print(f"  - {protocol}")
-            
-            if results["interfaces"]:
-                print("\nPort end-user được phát hiện:")
-                for interface in results["interfaces"]:
-                    print(f"  - {interface}")
-                
-                print("\n\033[32mPort đã cấu hình lọc route:\033[0m")
-                for entry in results["filter_status"]["compliant"]:
-                    print(f"  - {entry['interface']}: {entry['details']} ({entry['method']})")
-                
-                print("\n\033[31mPort chưa cấu hình lọc route:\033[0m")
-                for entry in results["filter_status"]["non_compliant"]:
-                    print(f"  - {entry['interface']}: {entry['details']}")
-            else:
-                print("\n\033[33mKhông phát hiện port end-user\033[0m")
-            
-            print("-" * 50)
-            
-        except Exception as e:
-            print(f"Lỗi khi xử lý {file_path}: {e}")
-
-# Chạy phân tích
-folder_path = r"D:\automation\Test"
-process_config_files(folder_path)
\ No newline at end of file
+import os
+import re
+from archive_reader import iter_logs, list_log_sources
+from igp_model import is_passive, parse_igp_model, participating_interfaces
+
+# Interface hướng người dùng: SVI/subinterface của VLAN có cổng access, hoặc mô tả là của khách hàng/người dùng cuối
+END_USER_DESCRIPTION_PATTERN = re.compile(r"client|end-user|customer", re.IGNORECASE)
+BGP_PATTERN = re.compile(r"^router bgp \d+", re.MULTILINE | re.IGNORECASE)
+# Kết quả lọc route của một interface tham gia process IGP
+FILTER_LABELS = {
+    "passive": "Interface được cấu hình passive",
+    "distribute-list": "Có áp dụng distribute-list để lọc",
+    "prefix-list": "Có áp dụng distribute-list prefix để lọc",
+    "route-map": "Có áp dụng route-map để lọc",
+    "unfiltered": "Không có cấu hình lọc route",
+    "transit": "Interface trung chuyển, tạo adjacency bình thường",
+}
+
+
+def _access_vlans(model):
+    # VLAN có ít nhất một cổng access đang bật (cổng 'switchport mode access' không khai báo VLAN thuộc VLAN 1)
+    vlans = set()
+    for interface in model["interfaces"].values():
+        if interface["shutdown"] or interface["switchport_mode"] not in ("access", None):
+            continue
+        if interface["access_vlan"] is not None:
+            vlans.add(interface["access_vlan"])
+        elif interface["switchport_mode"] == "access":
+            vlans.add(1)
+    return vlans
+
+
+def _is_end_user(interface, access_vlans):
+    # Cổng access không có địa chỉ IP nên không tự tham gia IGP; interface định tuyến cho VLAN của chúng thì có
+    if interface["vlan"] is not None and interface["vlan"] in access_vlans:
+        return True
+    return bool(END_USER_DESCRIPTION_PATTERN.search(interface["description"] or ""))
+
+
+def analyze_route_filters(config_data):
+    """
+    Kiểm tra lọc route trên các interface hướng người dùng. Interface tham gia từng process IGP được
+    xác định từ địa chỉ interface và câu lệnh 'network' (tra bằng prefix trie) hoặc lệnh trên interface,
+    có tính 'passive-interface default'. SVI/subinterface của VLAN có cổng access được coi là hướng người dùng.
+    Args:
+        config_data (str): Nội dung cấu hình.
+
+    Returns:
+        dict: {"interfaces": interface hướng người dùng có tham gia IGP, "routing_protocols", "has_routing",
+               "participation": [{"protocol", "process", "interface", "area", "end_user", "verdict"}],
+               "filter_status": {"compliant": [...], "non_compliant": [...]}}.
+    """
+    results = {
+        "interfaces": [],
+        "routing_protocols": set(),
+        "participation": [],
+        "filter_status": {
+            "compliant": [],
+            "non_compliant": []
+        },
+        "has_routing": False
+    }
+
+    model = parse_igp_model(config_data)
+    results["routing_protocols"].update(protocol for protocol, _ in model["processes"])
+    if BGP_PATTERN.search(config_data):
+        results["routing_protocols"].add("BGP")
+    results["has_routing"] = bool(results["routing_protocols"])
+
+    # Nếu không có giao thức định tuyến, trả về kết quả sớm
+    if not results["has_routing"]:
+        return results
+
+    access_vlans = _access_vlans(model)
+    for (protocol, process_id), process in model["processes"].items():
+        for name, interface, area in participating_interfaces(model, process):
+            end_user = _is_end_user(interface, access_vlans)
+            if is_passive(process, name):
+                verdict = "passive"
+            else:
+                verdict = process["distribute_in"].get(name) or process["distribute_in"].get("")
+                verdict = verdict or ("unfiltered" if end_user else "transit")
+            results["participation"].append({
+                "protocol": protocol, "process": process_id, "interface": name, "area": area,
+                "end_user": end_user, "verdict": verdict,
+            })
+            if not end_user:
+                continue
+            if name not in results["interfaces"]:
+                results["interfaces"].append(name)
+            entry = {"interface": name, "protocol": protocol, "details": FILTER_LABELS[verdict]}
+            if verdict == "unfiltered":
+                results["filter_status"]["non_compliant"].append(entry)
+            else:
+                entry["method"] = "passive-interface" if verdict == "passive" else verdict
+                results["filter_status"]["compliant"].append(entry)
+
+    return results
+
+def display_route_filter_results(results, file_name):
+    """
+    Hiển thị kết quả kiểm tra lọc route trên port end-user.
+    Args:
+        results (dict): Kết quả từ analyze_route_filters.
+        file_name (str): Tên file log (dùng làm tên thiết bị).
+    """
+    if not results["has_routing"]:
+        print("\033[33mThiết bị không chạy giao thức định tuyến động\033[0m")
+        print("-" * 50)
+        return
+
+    print("\033[1mKết quả kiểm tra lọc route trên port end-user:\033[0m")
+    print(f"\nThiết bị: {file_name}")
+
+    print("\nGiao thức định tuyến đang chạy:")
+    for protocol in sorted(results["routing_protocols"]):
+        print(f"  - {protocol}")
+
+    transit = [entry for entry in results["participation"] if entry["verdict"] == "transit"]
+    if transit:
+        print(f"\nInterface trung chuyển tham gia IGP: {len(transit)}")
+        for entry in transit:
+            process = f" {entry['process']}" if entry["process"] else ""
+            area = f" area {entry['area']}" if entry["area"] is not None else ""
+            print(f"  - {entry['protocol']}{process}{area}: {entry['interface']}")
+
+    if results["interfaces"]:
+        print("\nPort end-user được phát hiện:")
+        for interface in results["interfaces"]:
+            print(f"  - {interface}")
+
+        print("\n\033[32mPort đã cấu hình lọc route:\033[0m")
+        for entry in results["filter_status"]["compliant"]:
+            print(f"  - {entry['interface']} [{entry['protocol']}]: {entry['details']} ({entry['method']})")
+
+        print("\n\033[31mPort chưa cấu hình lọc route:\033[0m")
+        for entry in results["filter_status"]["non_compliant"]:
+            print(f"  - {entry['interface']} [{entry['protocol']}]: {entry['details']}")
+    else:
+        print("\n\033[33mKhông phát hiện port end-user\033[0m")
+
+    print("-" * 50)
+
+
+def process_config_files(folder_path):
+    log_sources = list_log_sources(folder_path)
+    
+    for log in iter_logs(log_sources):
+        file_path = log.name
+        file_name = os.path.basename(file_path)
+        print(f"\nĐang phân tích file: {file_path}")
+        
+        try:
+            config_data = log.text
+            
+            results = analyze_route_filters(config_data)
+            
+            display_route_filter_results(results, file_name)
+
+        except Exception as e:
+            print(f"Lỗi khi xử lý {file_path}: {e}")
+
+if __name__ == "__main__":
+    # Chạy phân tích
+    folder_path = r"D:\automation\Test"
+    process_config_files(folder_path)
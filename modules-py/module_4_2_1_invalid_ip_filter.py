@@ -1,47 +1,66 @@
-import os
-import re
-
-def check_invalid_ip_ranges(config_data):
-    if not re.search(r"router bgp \d+", config_data, re.IGNORECASE):
-        print("\033[33mKhông Áp Dụng:\033[0m Thiết bị không cấu hình BGP.")
-        return
-
-    invalid_ip_patterns = [
-        r"10\.0\.0\.0/8",
-        r"172\.16\.0\.0/12",
-        r"192\.168\.0\.0/16",
-        r"fc00::/7",
-        r"0\.0\.0\.0/0 ge 25 le 32",
-        r"::/0 ge 49 le 128"
-    ]
-
-    violations = []
-    for pattern in invalid_ip_patterns:
-        if not re.search(pattern, config_data, re.IGNORECASE):
-            violations.append(pattern)
-
-    if violations:
-        print("\033[31mKhông Tuân Thủ:\033[0m Không chặn việc quảng bá/nhận quảng bá các dải IP không hợp lệ. Các dải IP chưa được cấu hình chặn:")
-        for ip in violations:
-            print(f"  - {ip}")
-    else:
-        print("\033[32mTuân Thủ:\033[0m Đã chặn việc quảng bá/nhận quảng bá các dải IP không hợp lệ.")
-
-# Hàm gọi kiểm tra file log
-def run_module(folder_path):
-    log_files = [f for f in os.listdir(folder_path) if f.endswith('.log') or f.endswith('.txt')]
-
-    if not log_files:
-        print("Không tìm thấy file log nào.")
-        return
-
-    for log_file in log_files:
-        print(f"\nĐang kiểm tra file: {log_file}")
-        with open(os.path.join(folder_path, log_file), "r", encoding="utf-8") as file:
-            config_data = file.read()
-            check_invalid_ip_ranges(config_data)
-
-# Chạy module
-if __name__ == "__main__":
-    folder_path = r"C:\Users\admin\Desktop\automation\Test"  # Thay đường dẫn tới thư mục file log của bạn
-    run_module(folder_path)
+import os
+import re
+from archive_reader import iter_logs, list_log_sources
+from log_scanner import compile_bytes_pattern
+
+# Tiền lọc log theo dữ liệu thô, dùng chung cho các mục 4.2.x và fleet_runner
+BGP_PRESENCE_PATTERN = compile_bytes_pattern(r"router bgp \d+", re.IGNORECASE)
+
+def check_invalid_ip_ranges(config_data):
+    """
+    Kiểm tra cấu hình chặn quảng bá/nhận quảng bá các dải IP không hợp lệ trên thiết bị chạy BGP.
+    Args:
+        config_data (str): Nội dung cấu hình.
+
+    Returns:
+        dict: {"bgp_configured": bool, "missing_filters": [các dải chưa được cấu hình chặn]}.
+    """
+    if not re.search(r"router bgp \d+", config_data, re.IGNORECASE):
+        print("\033[33mKhông Áp Dụng:\033[0m Thiết bị không cấu hình BGP.")
+        return {"bgp_configured": False, "missing_filters": []}
+
+    invalid_ip_patterns = [
+        r"10\.0\.0\.0/8",
+        r"172\.16\.0\.0/12",
+        r"192\.168\.0\.0/16",
+        r"fc00::/7",
+        r"0\.0\.0\.0/0 ge 25 le 32",
+        r"::/0 ge 49 le 128"
+    ]
+
+    violations = []
+    for pattern in invalid_ip_patterns:
+        if not re.search(pattern, config_data, re.IGNORECASE):
+            violations.append(pattern)
+
+    if violations:
+        print("\033[31mKhông Tuân Thủ:\033[0m Không chặn việc quảng bá/nhận quảng bá các dải IP không hợp lệ. Các dải IP chưa được cấu hình chặn:")
+        for ip in violations:
+            print(f"  - {ip}")
+    else:
+        print("\033[32mTuân Thủ:\033[0m Đã chặn việc quảng bá/nhận quảng bá các dải IP không hợp lệ.")
+    return {"bgp_configured": True, "missing_filters": violations}
+
+# Hàm gọi kiểm tra file log
+def run_module(folder_path):
+    log_sources = list_log_sources(folder_path)
+
+    if not log_sources:
+        print("Không tìm thấy file log nào.")
+        return
+
+    # Kiểm tra "router bgp" trên dữ liệu thô, chỉ giải mã log của thiết bị có BGP
+    for log in iter_logs(log_sources, require=BGP_PRESENCE_PATTERN):
+        print(f"\nĐang kiểm tra file: {os.path.basename(log.name)}")
+        if not log.matched:
+            print("\033[33mKhông Áp Dụng:\033[0m Thiết bị không cấu hình BGP.")
+            continue
+        try:
+            check_invalid_ip_ranges(log.text)
+        except Exception as e:
+            print(f"Lỗi khi xử lý file {log.name}: {e}")
+
+# Chạy module
+if __name__ == "__main__":
+    folder_path = r"C:\Users\admin\Desktop\automation\Test"  # Thay đường dẫn tới thư mục file log của bạn
+    run_module(folder_path)
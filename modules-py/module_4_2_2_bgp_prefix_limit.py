@@ -1,38 +1,55 @@
-import os
-import re
-
-def check_bgp_prefix_limit(config_data, limit=100):
-    if not re.search(r"router bgp \d+", config_data, re.IGNORECASE):
-        print("\033[33mKhông Áp Dụng:\033[0m Thiết bị không cấu hình BGP.")
-        return
-
-    matches = re.findall(r"neighbor \S+ maximum-prefix (\d+)", config_data)
-    issues = [int(m) for m in matches if int(m) > limit]
-
-    if issues:
-        print("\033[31mKhông Tuân Thủ:\033[0m Không giới hạn số lượng các BGP prefix nhận quảng bá. Tìm thấy các cấu hình vượt giới hạn:")
-        for issue in issues:
-            print(f"  - {issue} prefix")
-    elif matches:
-        print("\033[32mTuân Thủ:\033[0m Đã giới hạn số lượng các BGP prefix nhận quảng bá trong giới hạn.")
-    else:
-        print("\033[31mKhông Tuân Thủ:\033[0m Không tìm thấy cấu hình giới hạn số lượng các BGP prefix nhận quảng bá.")
-
-# Hàm gọi kiểm tra file log
-def run_module(folder_path):
-    log_files = [f for f in os.listdir(folder_path) if f.endswith('.log') or f.endswith('.txt')]
-
-    if not log_files:
-        print("Không tìm thấy file log nào.")
-        return
-
-    for log_file in log_files:
-        print(f"\nĐang kiểm tra file: {log_file}")
-        with open(os.path.join(folder_path, log_file), "r", encoding="utf-8") as file:
-            config_data = file.read()
-            check_bgp_prefix_limit(config_data)
-
-# Chạy module
-if __name__ == "__main__":
-    folder_path = r"C:\Users\admin\Desktop\automation\Test"  # Thay đường dẫn tới thư mục file log của bạn
-    run_module(folder_path)
+import os
+import re
+from archive_reader import iter_logs, list_log_sources
+from module_4_2_1_invalid_ip_filter import BGP_PRESENCE_PATTERN
+
+def check_bgp_prefix_limit(config_data, limit=100):
+    """
+    Kiểm tra giới hạn số lượng BGP prefix nhận quảng bá (neighbor ... maximum-prefix).
+    Args:
+        config_data (str): Nội dung cấu hình.
+        limit (int): Giới hạn tối đa cho phép.
+
+    Returns:
+        dict: {"bgp_configured": bool, "limits": [giá trị maximum-prefix], "over_limit": [giá trị vượt giới hạn]}.
+    """
+    if not re.search(r"router bgp \d+", config_data, re.IGNORECASE):
+        print("\033[33mKhông Áp Dụng:\033[0m Thiết bị không cấu hình BGP.")
+        return {"bgp_configured": False, "limits": [], "over_limit": []}
+
+    matches = re.findall(r"neighbor \S+ maximum-prefix (\d+)", config_data)
+    issues = [int(m) for m in matches if int(m) > limit]
+
+    if issues:
+        print("\033[31mKhông Tuân Thủ:\033[0m Không giới hạn số lượng các BGP prefix nhận quảng bá. Tìm thấy các cấu hình vượt giới hạn:")
+        for issue in issues:
+            print(f"  - {issue} prefix")
+    elif matches:
+        print("\033[32mTuân Thủ:\033[0m Đã giới hạn số lượng các BGP prefix nhận quảng bá trong giới hạn.")
+    else:
+        print("\033[31mKhông Tuân Thủ:\033[0m Không tìm thấy cấu hình giới hạn số lượng các BGP prefix nhận quảng bá.")
+    return {"bgp_configured": True, "limits": [int(m) for m in matches], "over_limit": issues}
+
+# Hàm gọi kiểm tra file log
+def run_module(folder_path):
+    log_sources = list_log_sources(folder_path)
+
+    if not log_sources:
+        print("Không tìm thấy file log nào.")
+        return
+
+    # Kiểm tra "router bgp" trên dữ liệu thô, chỉ giải mã log của thiết bị có BGP
+    for log in iter_logs(log_sources, require=BGP_PRESENCE_PATTERN):
+        print(f"\nĐang kiểm tra file: {os.path.basename(log.name)}")
+        if not log.matched:
+            print("\033[33mKhông Áp Dụng:\033[0m Thiết bị không cấu hình BGP.")
+            continue
+        try:
+            check_bgp_prefix_limit(log.text)
+        except Exception as e:
+            print(f"Lỗi khi xử lý file {log.name}: {e}")
+
+# Chạy module
+if __name__ == "__main__":
+    folder_path = r"C:\Users\admin\Desktop\automation\Test"  # Thay đường dẫn tới thư mục file log của bạn
+    run_module(folder_path)
@@ -1,38 +1,54 @@
-import os
-import re
-
-def check_tcp_port_filter(config_data):
-    if not re.search(r"router bgp \d+", config_data, re.IGNORECASE):
-        print("\033[33mKhông Áp Dụng:\033[0m Thiết bị không cấu hình BGP.")
-        return
-
-    acl_patterns = [
-        r"access-list .* permit tcp \S+ \S+ eq 179",
-        r"access-list .* deny tcp any any eq 179"
-    ]
-
-    compliance = [pattern for pattern in acl_patterns if re.search(pattern, config_data, re.IGNORECASE)]
-
-    if compliance:
-        print("\033[32mTuân Thủ:\033[0m Đã cấu hình filter cho TCP port 179 trên các interface đấu nối eBGP.")
-    else:
-        print("\033[31mKhông Tuân Thủ:\033[0m Không cấu hình filter cho TCP port 179 trên các interface đấu nối eBGP.")
-
-# Hàm gọi kiểm tra file log
-def run_module(folder_path):
-    log_files = [f for f in os.listdir(folder_path) if f.endswith('.log') or f.endswith('.txt')]
-
-    if not log_files:
-        print("Không tìm thấy file log nào.")
-        return
-
-    for log_file in log_files:
-        print(f"\nĐang kiểm tra file: {log_file}")
-        with open(os.path.join(folder_path, log_file), "r", encoding="utf-8") as file:
-            config_data = file.read()
-            check_tcp_port_filter(config_data)
-
-# Chạy module
-if __name__ == "__main__":
-    folder_path = r"C:\Users\admin\Desktop\automation\Test"  # Thay đường dẫn tới thư mục file log của bạn
-    run_module(folder_path)
+import os
+import re
+from archive_reader import iter_logs, list_log_sources
+from module_4_2_1_invalid_ip_filter import BGP_PRESENCE_PATTERN
+
+def check_tcp_port_filter(config_data):
+    """
+    Kiểm tra filter TCP port 179 cho các phiên eBGP.
+    Args:
+        config_data (str): Nội dung cấu hình.
+
+    Returns:
+        dict: {"bgp_configured": bool, "filters": [mẫu access-list tìm thấy]}.
+    """
+    if not re.search(r"router bgp \d+", config_data, re.IGNORECASE):
+        print("\033[33mKhông Áp Dụng:\033[0m Thiết bị không cấu hình BGP.")
+        return {"bgp_configured": False, "filters": []}
+
+    acl_patterns = [
+        r"access-list .* permit tcp \S+ \S+ eq 179",
+        r"access-list .* deny tcp any any eq 179"
+    ]
+
+    compliance = [pattern for pattern in acl_patterns if re.search(pattern, config_data, re.IGNORECASE)]
+
+    if compliance:
+        print("\033[32mTuân Thủ:\033[0m Đã cấu hình filter cho TCP port 179 trên các interface đấu nối eBGP.")
+    else:
+        print("\033[31mKhông Tuân Thủ:\033[0m Không cấu hình filter cho TCP port 179 trên các interface đấu nối eBGP.")
+    return {"bgp_configured": True, "filters": compliance}
+
+# Hàm gọi kiểm tra file log
+def run_module(folder_path):
+    log_sources = list_log_sources(folder_path)
+
+    if not log_sources:
+        print("Không tìm thấy file log nào.")
+        return
+
+    # Kiểm tra "router bgp" trên dữ liệu thô, chỉ giải mã log của thiết bị có BGP
+    for log in iter_logs(log_sources, require=BGP_PRESENCE_PATTERN):
+        print(f"\nĐang kiểm tra file: {os.path.basename(log.name)}")
+        if not log.matched:
+            print("\033[33mKhông Áp Dụng:\033[0m Thiết bị không cấu hình BGP.")
+            continue
+        try:
+            check_tcp_port_filter(log.text)
+        except Exception as e:
+            print(f"Lỗi khi xử lý file {log.name}: {e}")
+
+# Chạy module
+if __name__ == "__main__":
+    folder_path = r"C:\Users\admin\Desktop\automation\Test"  # Thay đường dẫn tới thư mục file log của bạn
+    run_module(folder_path)
@@ -1,144 +1,360 @@
-import os
-import re
-from ipaddress import ip_address, ip_network
-
-def is_public_ip(ip):
-    """
-    Kiểm tra xem một IP có phải là public hay không.
-    Args:
-        ip (str): Địa chỉ IP cần kiểm tra.
-
-    Returns:
-        bool: True nếu IP là public, ngược lại False.
-    """
-    private_networks = [
-        ip_network("10.0.0.0/8"),
-        ip_network("172.16.0.0/12"),
-        ip_network("192.168.0.0/16"),
-        ip_network("127.0.0.0/8"),
-        ip_network("169.254.0.0/16"),  # APIPA
-        ip_network("0.0.0.0/8"),
-    ]
-    try:
-        ip_obj = ip_address(ip)
-        return not any(ip_obj in network for network in private_networks)
-    except ValueError:
-        return False
-
-def parse_interfaces_and_vrf(log_content):
-    """
-    Phân tích interface public, MGMT và kiểm tra VRF.
-    Args:
-        log_content (str): Nội dung log chứa kết quả cấu hình.
-
-    Returns:
-        dict: Thông tin interface public, MGMT và VRF.
-    """
-    public_interfaces = set()
-    mgmt_interfaces = set()
-    vrf_definitions = set()
-    vrf_mapping = {}
-
-    # Tìm các định nghĩa VRF
-    vrf_pattern = r"vrf definition (\S+)"
-    vrf_matches = re.findall(vrf_pattern, log_content)
-    vrf_definitions.update(vrf_matches)
-
-    # Tìm các interface gắn VRF
-    interface_vrf_pattern = r"interface (\S+)\n(?:.*?\n)*? vrf forwarding (\S+)"
-    vrf_interface_matches = re.findall(interface_vrf_pattern, log_content, re.IGNORECASE)
-
-    for interface, vrf in vrf_interface_matches:
-        vrf_mapping[interface] = vrf
-
-    # Tìm các interface có IP public và phân loại MGMT
-    interface_ip_pattern = r"interface (\S+)\n(?:.*?\n)*? ip address (\d+\.\d+\.\d+\.\d+)"
-    ip_matches = re.findall(interface_ip_pattern, log_content, re.IGNORECASE)
-
-    for interface, ip_address in ip_matches:
-        if ip_address != "unassigned" and is_public_ip(ip_address):
-            if "mgmt" in interface.lower():
-                mgmt_interfaces.add(interface)
-            else:
-                public_interfaces.add(interface)
-
-    return {
-        "public_interfaces": list(public_interfaces),
-        "mgmt_interfaces": list(mgmt_interfaces),
-        "vrf_definitions": list(vrf_definitions),
-        "vrf_mapping": vrf_mapping,
-    }
-
-def check_vrf_separation(log_content, results):
-    """
-    Kiểm tra các interface public có gắn VRF hay không.
-    Args:
-        log_content (str): Nội dung log chứa cấu hình.
-        results (dict): Thông tin phân tích interface và VRF.
-
-    Returns:
-        str: Kết quả kiểm tra VRF.
-    """
-    if not results["vrf_definitions"]:
-        return "\033[31mKhông Tuân Thủ:\033[0m Không tìm thấy VRF nào được cấu hình."
-
-    public_interfaces_with_vrf = [
-        interface for interface in results["public_interfaces"]
-        if interface in results["vrf_mapping"]
-    ]
-
-    if not public_interfaces_with_vrf:
-        return "\033[31mKhông Tuân Thủ:\033[0m Các interface public không được gắn VRF."
-
-    # Kiểm tra sự tồn tại của ít nhất 2 VRF riêng biệt (SERVICE và OAM)
-    if len(results["vrf_definitions"]) < 2:
-        return "\033[31mKhông Tuân Thủ:\033[0m Không có đủ VRF để tách lớp dịch vụ và lớp giám sát."
-
-    return f"\033[32mTuân Thủ:\033[0m Các interface public được gắn VRF và VRF đã được tách riêng."
-
-def check_interfaces_and_vrf_from_logs(folder_path):
-    """
-    Kiểm tra các interface public, MGMT và VRF từ các file log.
-    Args:
-        folder_path (str): Đường dẫn tới thư mục chứa file log.
-
-    Returns:
-        None
-    """
-    log_files = [f for f in os.listdir(folder_path) if f.endswith(".log") or f.endswith(".txt")]
-
-    if not log_files:
-        print("Không tìm thấy file log nào trong thư mục.")
-        return
-
-    for log_file in log_files:
-        file_path = os.path.join(folder_path, log_file)
-        print(f"\nĐang kiểm tra file: {file_path}")
-        try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                log_content = file.read()
-
-            # Phân tích interface và VRF
-            results = parse_interfaces_and_vrf(log_content)
-
-            # Kiểm tra thiết bị có interface public hoặc MGMT
-            if not results["public_interfaces"] and not results["mgmt_interfaces"]:
-                print("\033[33mKhông Áp Dụng:\033[0m Thiết bị không có các interface public hoặc MGMT.")
-                continue
-
-            # Kiểm tra VRF
-            vrf_check_result = check_vrf_separation(log_content, results)
-
-            # Hiển thị kết quả
-            if results["public_interfaces"]:
-                print("\033[32mInterface public:\033[0m", ", ".join(results["public_interfaces"]))
-            if results["mgmt_interfaces"]:
-                print("\033[34mInterface MGMT:\033[0m", ", ".join(results["mgmt_interfaces"]))
-            print(vrf_check_result)
-
-        except Exception as e:
-            print(f"Lỗi khi xử lý file {file_path}: {e}")
-
-if __name__ == "__main__":
-    folder_path = r"C:\Users\admin\Desktop\automation\Test"  # Thay đường dẫn tới thư mục file log
-    check_interfaces_and_vrf_from_logs(folder_path)
+import os
+import re
+import socket
+import sys
+from ipaddress import IPv4Address, IPv4Network, ip_address, ip_network
+from archive_reader import iter_logs, list_log_sources
+from config_stanzas import split_stanzas
+from log_normalizer import find_hostname
+
+try:
+    import numpy  # Tuỳ chọn: sắp xếp khoảng địa chỉ bằng NumPy khi fleet lớn
+except ImportError:
+    numpy = None
+
+INTERFACE_ADDRESS_PATTERN = re.compile(r"^ip address (\d+\.\d+\.\d+\.\d+) (\d+\.\d+\.\d+\.\d+)", re.IGNORECASE)
+INTERFACE_VRF_PATTERN = re.compile(r"^(?:ip )?vrf forwarding (\S+)", re.IGNORECASE)
+# Số bit dành cho địa chỉ IPv4 khi ghép (VRF, địa chỉ) thành một khoá số nguyên
+ADDRESS_BITS = 32
+
+def is_public_ip(ip):
+    """
+    Kiểm tra xem một IP có phải là public hay không.
+    Args:
+        ip (str): Địa chỉ IP cần kiểm tra.
+
+    Returns:
+        bool: True nếu IP là public, ngược lại False.
+    """
+    private_networks = [
+        ip_network("10.0.0.0/8"),
+        ip_network("172.16.0.0/12"),
+        ip_network("192.168.0.0/16"),
+        ip_network("127.0.0.0/8"),
+        ip_network("169.254.0.0/16"),  # APIPA
+        ip_network("0.0.0.0/8"),
+    ]
+    try:
+        ip_obj = ip_address(ip)
+        return not any(ip_obj in network for network in private_networks)
+    except ValueError:
+        return False
+
+def parse_interfaces_and_vrf(log_content):
+    """
+    Phân tích interface public, MGMT và kiểm tra VRF.
+    Args:
+        log_content (str): Nội dung log chứa kết quả cấu hình.
+
+    Returns:
+        dict: Thông tin interface public, MGMT và VRF.
+    """
+    public_interfaces = set()
+    mgmt_interfaces = set()
+    vrf_definitions = set()
+    vrf_mapping = {}
+
+    # Tìm các định nghĩa VRF
+    vrf_pattern = r"vrf definition (\S+)"
+    vrf_matches = re.findall(vrf_pattern, log_content)
+    vrf_definitions.update(vrf_matches)
+
+    # Tìm các interface gắn VRF
+    interface_vrf_pattern = r"interface (\S+)\n(?:.*?\n)*? vrf forwarding (\S+)"
+    vrf_interface_matches = re.findall(interface_vrf_pattern, log_content, re.IGNORECASE)
+
+    for interface, vrf in vrf_interface_matches:
+        vrf_mapping[interface] = vrf
+
+    # Tìm các interface có IP public và phân loại MGMT
+    interface_ip_pattern = r"interface (\S+)\n(?:.*?\n)*? ip address (\d+\.\d+\.\d+\.\d+)"
+    ip_matches = re.findall(interface_ip_pattern, log_content, re.IGNORECASE)
+
+    for interface, ip_address in ip_matches:
+        if ip_address != "unassigned" and is_public_ip(ip_address):
+            if "mgmt" in interface.lower():
+                mgmt_interfaces.add(interface)
+            else:
+                public_interfaces.add(interface)
+
+    return {
+        "public_interfaces": list(public_interfaces),
+        "mgmt_interfaces": list(mgmt_interfaces),
+        "vrf_definitions": list(vrf_definitions),
+        "vrf_mapping": vrf_mapping,
+    }
+
+def vrf_separation_issue(results):
+    """
+    Tìm vấn đề tách VRF của các interface public.
+    Args:
+        results (dict): Thông tin phân tích interface và VRF.
+
+    Returns:
+        str | None: Mô tả vấn đề, hoặc None nếu VRF đã được tách đúng.
+    """
+    if not results["vrf_definitions"]:
+        return "Không tìm thấy VRF nào được cấu hình."
+
+    public_interfaces_with_vrf = [
+        interface for interface in results["public_interfaces"]
+        if interface in results["vrf_mapping"]
+    ]
+
+    if not public_interfaces_with_vrf:
+        return "Các interface public không được gắn VRF."
+
+    # Kiểm tra sự tồn tại của ít nhất 2 VRF riêng biệt (SERVICE và OAM)
+    if len(results["vrf_definitions"]) < 2:
+        return "Không có đủ VRF để tách lớp dịch vụ và lớp giám sát."
+
+    return None
+
+def check_vrf_separation(log_content, results):
+    """
+    Kiểm tra các interface public có gắn VRF hay không.
+    Args:
+        log_content (str): Nội dung log chứa cấu hình.
+        results (dict): Thông tin phân tích interface và VRF.
+
+    Returns:
+        str: Kết quả kiểm tra VRF.
+    """
+    issue = vrf_separation_issue(results)
+    if issue:
+        return f"\033[31mKhông Tuân Thủ:\033[0m {issue}"
+    return "\033[32mTuân Thủ:\033[0m Các interface public được gắn VRF và VRF đã được tách riêng."
+
+def display_vrf_and_interfaces_results(results):
+    """
+    Hiển thị interface public, MGMT và kết quả kiểm tra tách VRF.
+    Args:
+        results (dict): Kết quả từ parse_interfaces_and_vrf.
+    """
+    # Kiểm tra thiết bị có interface public hoặc MGMT
+    if not results["public_interfaces"] and not results["mgmt_interfaces"]:
+        print("\033[33mKhông Áp Dụng:\033[0m Thiết bị không có các interface public hoặc MGMT.")
+        return
+
+    # Kiểm tra VRF
+    vrf_check_result = check_vrf_separation(None, results)
+
+    if results["public_interfaces"]:
+        print("\033[32mInterface public:\033[0m", ", ".join(results["public_interfaces"]))
+    if results["mgmt_interfaces"]:
+        print("\033[34mInterface MGMT:\033[0m", ", ".join(results["mgmt_interfaces"]))
+    print(vrf_check_result)
+
+def check_interfaces_and_vrf_from_logs(folder_path):
+    """
+    Kiểm tra các interface public, MGMT và VRF từ các file log.
+    Args:
+        folder_path (str): Đường dẫn tới thư mục chứa file log.
+
+    Returns:
+        None
+    """
+    log_sources = list_log_sources(folder_path)
+
+    if not log_sources:
+        print("Không tìm thấy file log nào trong thư mục.")
+        return
+
+    devices = {}
+    for log in iter_logs(log_sources):
+        file_path = log.name
+        print(f"\nĐang kiểm tra file: {file_path}")
+        try:
+            log_content = log.text
+
+            # Phân tích interface và VRF
+            results = parse_interfaces_and_vrf(log_content)
+
+            # Hiển thị kết quả
+            display_vrf_and_interfaces_results(results)
+
+            # Lưu địa chỉ interface để đối chiếu toàn fleet (bản chụp sau của cùng thiết bị ghi đè bản trước)
+            devices[find_hostname(log_content) or os.path.basename(file_path)] = collect_interface_prefixes(log_content)
+
+        except Exception as e:
+            print(f"Lỗi khi xử lý file {file_path}: {e}")
+
+    # Tìm địa chỉ trùng và subnet chồng lấn giữa các thiết bị
+    if devices:
+        display_address_conflicts(find_address_conflicts(devices))
+
+def collect_interface_prefixes(log_content):
+    """
+    Thu thập địa chỉ IPv4 (kể cả secondary) của các interface trong running-config.
+    Args:
+        log_content (str): Nội dung log chứa kết quả cấu hình.
+
+    Returns:
+        list: Các bộ (VRF, interface, địa chỉ, độ dài prefix); địa chỉ là số nguyên, VRF mặc định là "".
+    """
+    prefixes = []
+    for key, stanza in split_stanzas(log_content).items():
+        if not key.startswith("interface "):
+            continue
+        interface = sys.intern(key.split(None, 1)[1])
+        vrf = ""
+        addresses = []
+        for raw_line in stanza.text.splitlines()[1:]:
+            line = raw_line.strip()
+            vrf_match = INTERFACE_VRF_PATTERN.match(line)
+            if vrf_match:
+                vrf = sys.intern(vrf_match.group(1))
+                continue
+            address_match = INTERFACE_ADDRESS_PATTERN.match(line)
+            if address_match:
+                network = IPv4Network(f"0.0.0.0/{address_match.group(2)}")
+                addresses.append((int(IPv4Address(address_match.group(1))), network.prefixlen))
+        prefixes.extend((vrf, interface, address, prefix_length) for address, prefix_length in addresses)
+    return prefixes
+
+
+def _nested_pairs_numpy(vrfs, starts, ends):
+    # Prefix CIDR chỉ lồng nhau hoặc tách rời, nên prefix bao gần nhất của một dòng là prefix dài nhất
+    # (ngắn hơn prefix của dòng) có cùng VRF và cùng đầu khoảng sau khi cắt theo độ dài đó: với mỗi độ dài
+    # có trong fleet, tra khoá (VRF, độ dài, đầu khoảng) trong mảng khoá đã sắp xếp, từ dài đến ngắn
+    lengths = ADDRESS_BITS - numpy.log2(ends - starts + 1).astype(numpy.int64)
+    keys = (((vrfs * (ADDRESS_BITS + 1)) + lengths) << ADDRESS_BITS) | starts
+    key_order = numpy.argsort(keys, kind="stable")
+    sorted_keys = keys[key_order]
+    full = (1 << ADDRESS_BITS) - 1
+    containers = numpy.full(len(starts), -1, dtype=numpy.int64)
+    for length in numpy.unique(lengths)[::-1].tolist():
+        pending = numpy.flatnonzero((containers < 0) & (lengths > length))
+        if not len(pending):
+            continue
+        host_mask = (1 << (ADDRESS_BITS - length)) - 1
+        candidates = (((vrfs[pending] * (ADDRESS_BITS + 1)) + length) << ADDRESS_BITS) | (starts[pending] & (full ^ host_mask))
+        positions = numpy.minimum(numpy.searchsorted(sorted_keys, candidates), len(sorted_keys) - 1)
+        found = sorted_keys[positions] == candidates
+        containers[pending[found]] = key_order[positions[found]]
+    order = numpy.lexsort((-ends, starts, vrfs))
+    inner = order[containers[order] >= 0]
+    return list(zip(containers[inner].tolist(), inner.tolist()))
+
+
+def _nested_pairs_python(vrfs, starts, ends):
+    # Duyệt theo (VRF, đầu khoảng, cuối khoảng giảm dần) với ngăn xếp các prefix bao đang mở:
+    # đỉnh ngăn xếp là prefix bao gần nhất; subnet giống hệt đỉnh được ghép với prefix bao bên dưới
+    pairs = []
+    stack = []
+    for index in sorted(range(len(starts)), key=lambda i: (vrfs[i], starts[i], -ends[i])):
+        while stack and (vrfs[stack[-1]] != vrfs[index] or ends[stack[-1]] < starts[index]):
+            stack.pop()
+        if stack and (starts[stack[-1]], ends[stack[-1]]) == (starts[index], ends[index]):
+            if len(stack) > 1:
+                pairs.append((stack[-2], index))
+            continue
+        if stack:
+            pairs.append((stack[-1], index))
+        stack.append(index)
+    return pairs
+
+
+def _duplicate_groups(address_keys):
+    # Các nhóm chỉ số có cùng khoá (VRF, địa chỉ), dựa trên thứ tự sắp xếp (mảng NumPy hoặc list)
+    if numpy is not None:
+        keys = address_keys
+        order = numpy.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        same = numpy.flatnonzero(sorted_keys[1:] == sorted_keys[:-1])
+        order = order.tolist()
+    else:
+        order = sorted(range(len(address_keys)), key=address_keys.__getitem__)
+        same = [i for i in range(len(order) - 1) if address_keys[order[i]] == address_keys[order[i + 1]]]
+    groups = []
+    for i in same:
+        if groups and groups[-1][-1] == order[i]:
+            groups[-1].append(order[i + 1])
+        else:
+            groups.append([order[i], order[i + 1]])
+    return groups
+
+
+def find_address_conflicts(devices):
+    """
+    Tìm địa chỉ IP trùng và subnet chồng lấn giữa các interface trong fleet (mỗi VRF xét riêng).
+    Mỗi prefix được mã hoá thành khoảng số nguyên [đầu, cuối]; trùng địa chỉ và chồng lấn được tìm bằng
+    sắp xếp rồi quét một lượt, thay vì so từng cặp bằng ip_network.overlaps. Dùng NumPy nếu có cài.
+    Subnet giống hệt nhau (hai đầu một link, các thành viên một VLAN) không bị coi là chồng lấn.
+    Mỗi prefix nằm trong prefix khác được ghép với prefix bao gần nhất, nên mọi cấp lồng nhau đều được báo cáo.
+    Args:
+        devices (dict): Tên thiết bị -> kết quả từ collect_interface_prefixes.
+
+    Returns:
+        dict: {"duplicates": [[bản ghi, ...]], "overlaps": [(bản ghi prefix bao gần nhất, bản ghi prefix bên trong)],
+               "total": số địa chỉ}; bản ghi là dict {"device", "vrf", "interface", "prefix"}.
+    """
+    vrf_ids = {}
+    owners, vrfs, addresses, prefix_lengths = [], [], [], []
+    for device, prefixes in devices.items():
+        for vrf, interface, address, prefix_length in prefixes:
+            owners.append((device, vrf, interface))
+            vrfs.append(vrf_ids.setdefault(vrf, len(vrf_ids)))
+            addresses.append(address)
+            prefix_lengths.append(prefix_length)
+
+    records = {}
+
+    def record(index):
+        # Mỗi bản ghi chỉ định dạng một lần dù xuất hiện trong nhiều cặp chồng lấn
+        if index not in records:
+            device, vrf, interface = owners[index]
+            address = socket.inet_ntoa(addresses[index].to_bytes(4, "big"))
+            records[index] = {"device": device, "vrf": vrf, "interface": interface,
+                              "prefix": f"{address}/{prefix_lengths[index]}"}
+        return records[index]
+
+    full = (1 << ADDRESS_BITS) - 1
+    if numpy is not None and owners:
+        vrf_array = numpy.asarray(vrfs, dtype=numpy.int64)
+        address_array = numpy.asarray(addresses, dtype=numpy.int64)
+        host_masks = (numpy.int64(1) << (ADDRESS_BITS - numpy.asarray(prefix_lengths, dtype=numpy.int64))) - 1
+        starts = address_array & (full ^ host_masks)
+        pairs = _nested_pairs_numpy(vrf_array, starts, starts | host_masks)
+        address_keys = (vrf_array << ADDRESS_BITS) | address_array
+    else:
+        host_masks = [(1 << (ADDRESS_BITS - prefix_length)) - 1 for prefix_length in prefix_lengths]
+        starts = [address & (full ^ host_mask) for address, host_mask in zip(addresses, host_masks)]
+        pairs = _nested_pairs_python(vrfs, starts, [start | host_mask for start, host_mask in zip(starts, host_masks)])
+        address_keys = [(vrf << ADDRESS_BITS) | address for vrf, address in zip(vrfs, addresses)]
+    return {
+        "duplicates": [[record(index) for index in group] for group in _duplicate_groups(address_keys)],
+        "overlaps": [(record(outer), record(inner)) for outer, inner in pairs],
+        "total": len(owners),
+    }
+
+
+def display_address_conflicts(conflicts, limit=50):
+    """
+    Hiển thị địa chỉ trùng và subnet chồng lấn toàn fleet.
+    Args:
+        conflicts (dict): Kết quả từ find_address_conflicts.
+        limit (int): Số dòng tối đa in cho mỗi loại.
+    """
+    print(f"\n\033[1mKiểm tra trùng địa chỉ/chồng lấn subnet trên {conflicts['total']} địa chỉ interface:\033[0m")
+    if not conflicts["duplicates"] and not conflicts["overlaps"]:
+        print("\033[32mTuân Thủ:\033[0m Không có địa chỉ trùng hoặc subnet chồng lấn.")
+        return
+
+    def describe(item):
+        vrf = f" vrf {item['vrf']}" if item["vrf"] else ""
+        return f"{item['device']} {item['interface']} {item['prefix']}{vrf}"
+
+    if conflicts["duplicates"]:
+        print(f"\033[31mKhông Tuân Thủ:\033[0m {len(conflicts['duplicates'])} địa chỉ bị trùng")
+        for group in conflicts["duplicates"][:limit]:
+            print(f"  - {'; '.join(describe(item) for item in group)}")
+    if conflicts["overlaps"]:
+        print(f"\033[31mKhông Tuân Thủ:\033[0m {len(conflicts['overlaps'])} subnet chồng lấn")
+        for outer, inner in conflicts["overlaps"][:limit]:
+            print(f"  - {describe(inner)} nằm trong {describe(outer)}")
+
+
+if __name__ == "__main__":
+    folder_path = r"C:\Users\admin\Desktop\automation\Test"  # Thay đường dẫn tới thư mục file log
+    check_interfaces_and_vrf_from_logs(folder_path)
@@ -1,86 +1,124 @@
-import os
-import re
-
-def analyze_password_policies(log_content):
-    results = {
-        "policy_enabled": False,
-        "policies": [],
-        "issues": [],
-        "evidence": [],
-        "passwords":[]
-    }
-
-    # Tìm kiếm các cấu hình liên quan đến chính sách mật khẩu
-    policies = {
-        "service password-encryption": r"service password-encryption",
-        "minimum password length": r"security passwords min-length (\d+)",
-        "password complexity (AAA)": r"aaa password policy enable",
-        "AAA password policy rules": r"aaa password policy (.*)",
-        "sensitive keywords": r"\b(key|secret|password)\b"
-    }
-
-    lines = log_content.splitlines()
-    
-    for policy_name, pattern in policies.items():
-        found = False
-        for line in lines:
-            match = re.search(pattern, line, re.IGNORECASE)
-            if match:
-                results["policy_enabled"] = True
-                found = True
-                policy_entry = f"{policy_name}: {line.strip()}"
-                evidence_entry = f"Tìm thấy cấu hình: {policy_name}. Dòng: {line.strip()}"
-                
-                if policy_entry not in results["policies"]:
-                    results["policies"].append(policy_entry)
-                if evidence_entry not in results["evidence"]:
-                    results["evidence"].append(evidence_entry)
-        if not found:
-            results["issues"].append(f"Không tìm thấy cấu hình: {policy_name}")
-
-
-    return results
-
-def process_logs_for_password_policies(folder_path):
- 
-    log_files = [f for f in os.listdir(folder_path) if f.endswith(".log") or f.endswith(".txt")]
-
-    if not log_files:
-        print("Không tìm thấy file log nào trong thư mục.")
-        return
-
-    for log_file in log_files:
-        file_path = os.path.join(folder_path, log_file)
-        print(f"\nĐang kiểm tra file: {file_path}")
-        try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                log_content = file.read()
-
-            results = analyze_password_policies(log_content)
-
-            # In kết quả
-            if results["policy_enabled"]:
-                print("- Chính sách mật khẩu mạnh đã được bật với các cấu hình sau:")
-                for policy in results["policies"]:
-                    print(f"  + {policy}")
-            else:
-                print("- Không Tuân Thủ: Chính sách mật khẩu mạnh chưa được bật.")
-
-            # Hiển thị vấn đề
-            if results["issues"]:
-                print("\nCác vấn đề phát hiện:")
-                for issue in results["issues"]:
-                    print(f"  - {issue}")
-
-            # Hiển thị bằng chứng
-            if results["evidence"]:
-                print("\nBằng chứng cấu hình:")
-                for evidence in results["evidence"]:
-                    print(f"  - {evidence}")
-
-        except Exception as e:
-            print(f"Lỗi khi xử lý file {file_path}: {e}")
-
-if __name__ == "__main__":
-    folder_path = r"test"  # Thay bằng đường dẫn tới thư mục file log
-    process_logs_for_password_policies(folder_path)
+import re
+from archive_reader import iter_logs, list_log_sources
+from secret_classifier import CREDENTIAL_KINDS, SECRET_TYPES, classify_credentials
+
+# Cấu hình chính sách mật khẩu: tên -> biểu thức (chỉ so trên dòng có chữ "password")
+POLICY_PATTERNS = {
+    "service password-encryption": re.compile(r"service password-encryption", re.IGNORECASE),
+    "minimum password length": re.compile(r"security passwords min-length (\d+)", re.IGNORECASE),
+    "password complexity (AAA)": re.compile(r"aaa password policy enable", re.IGNORECASE),
+    "AAA password policy rules": re.compile(r"aaa password policy (.*)", re.IGNORECASE),
+}
+
+
+def analyze_password_policies(log_content):
+    """
+    Kiểm tra chính sách mật khẩu và phân loại các dòng chứa thông tin xác thực theo kiểu mật khẩu.
+    Giá trị bí mật không được giữ trong kết quả: chỉ có số lượng theo loại/kiểu và bằng chứng đã ẩn bí mật.
+    Args:
+        log_content (str): Nội dung file log.
+
+    Returns:
+        dict: {"policy_enabled", "policies", "issues", "evidence",
+               "credentials": kết quả từ secret_classifier.classify_credentials}.
+    """
+    results = {
+        "policy_enabled": False,
+        "policies": [],
+        "issues": [],
+        "evidence": [],
+        "credentials": {},
+    }
+
+    found = set()
+    for line in log_content.splitlines():
+        if "password" not in line.lower():
+            continue
+        for policy_name, pattern in POLICY_PATTERNS.items():
+            if not pattern.search(line):
+                continue
+            results["policy_enabled"] = True
+            found.add(policy_name)
+            policy_entry = f"{policy_name}: {line.strip()}"
+            evidence_entry = f"Tìm thấy cấu hình: {policy_name}. Dòng: {line.strip()}"
+            if policy_entry not in results["policies"]:
+                results["policies"].append(policy_entry)
+            if evidence_entry not in results["evidence"]:
+                results["evidence"].append(evidence_entry)
+
+    for policy_name in POLICY_PATTERNS:
+        if policy_name not in found:
+            results["issues"].append(f"Không tìm thấy cấu hình: {policy_name}")
+
+    # Thông tin xác thực: chỉ đếm theo loại và kiểu, bằng chứng đã ẩn bí mật
+    credentials = classify_credentials(log_content)
+    results["credentials"] = credentials
+    for line in credentials["evidence"]:
+        results["evidence"].append(f"Tìm thấy thông tin xác thực. Dòng: {line}")
+    if credentials["weak"]:
+        results["issues"].append(f"{credentials['weak']} dòng lưu thông tin xác thực dạng cleartext hoặc type 7.")
+
+    return results
+
+def display_password_policy_results(results):
+    """
+    Hiển thị kết quả kiểm tra chính sách mật khẩu.
+    Args:
+        results (dict): Kết quả từ analyze_password_policies.
+    """
+    if results["policy_enabled"]:
+        print("- Chính sách mật khẩu mạnh đã được bật với các cấu hình sau:")
+        for policy in results["policies"]:
+            print(f"  + {policy}")
+    else:
+        print("- Không Tuân Thủ: Chính sách mật khẩu mạnh chưa được bật.")
+
+    # Thống kê thông tin xác thực theo kiểu lưu
+    credentials = results["credentials"]
+    if credentials.get("total"):
+        print(f"\nThông tin xác thực trong cấu hình: {credentials['total']} dòng")
+        colors = {"weak": "\033[31m", "medium": "\033[33m", "strong": "\033[32m"}
+        for kind, types in credentials["counts"].items():
+            summary = ", ".join(
+                f"{colors[SECRET_TYPES[secret_type][1]]}{SECRET_TYPES[secret_type][0]}: {count}\033[0m"
+                for secret_type, count in sorted(types.items()))
+            print(f"  + {CREDENTIAL_KINDS[kind][0]}: {summary}")
+
+    # Hiển thị vấn đề
+    if results["issues"]:
+        print("\nCác vấn đề phát hiện:")
+        for issue in results["issues"]:
+            print(f"  - {issue}")
+
+    # Hiển thị bằng chứng
+    if results["evidence"]:
+        print("\nBằng chứng cấu hình:")
+        for evidence in results["evidence"]:
+            print(f"  - {evidence}")
+
+
+def process_logs_for_password_policies(folder_path):
+ 
+    log_sources = list_log_sources(folder_path)
+
+    if not log_sources:
+        print("Không tìm thấy file log nào trong thư mục.")
+        return
+
+    for log in iter_logs(log_sources):
+        file_path = log.name
+        print(f"\nĐang kiểm tra file: {file_path}")
+        try:
+            log_content = log.text
+
+            results = analyze_password_policies(log_content)
+
+            # In kết quả
+            display_password_policy_results(results)
+
+        except Exception as e:
+            print(f"Lỗi khi xử lý file {file_path}: {e}")
+
+if __name__ == "__main__":
+    folder_path = r"test"  # Thay bằng đường dẫn tới thư mục file log
+    process_logs_for_password_policies(folder_path)
@@ -1,108 +1,120 @@
-# modules/module_5_3_3.py
-
-import re
-import argparse
-from pathlib import Path
-
-def check_disable_insecure_protocols(log_data):
-    """
-    Phân tích dữ liệu log để xác định việc vô hiệu hóa các giao thức quản trị không an toàn.
-
-    Args:
-        log_data (str): Nội dung của file log.
-
-    Returns:
-        dict: Từ điển chứa thông tin về việc vô hiệu hóa các giao thức không an toàn.
-    """
-    results = {}
-    
-    # Các mẫu regex để kiểm tra việc vô hiệu hóa các giao thức không an toàn
-    patterns = {
-        'Disable Telnet': r'^\s*transport\s+input\s+(?!telnet\b).*',
-        'Disable HTTP': r'^\s*no\s+ip\s+http\s+server\b.*'
-    }
-    
-    # Tách log_data thành các dòng để dễ dàng xử lý
-    log_lines = log_data.splitlines()
-    
-    for desc, pattern in patterns.items():
-        match = False
-        evidence = ""
-        disable_pattern = re.compile(pattern, re.IGNORECASE)
-        for line in log_lines:
-            if disable_pattern.match(line.strip()):
-                match = True
-                evidence = line.strip()
-                break
-        if desc == 'Disable Telnet':
-            results[desc] = {
-                'Disabled': match,
-                'Evidence': evidence if match else "Telnet vẫn được cấu hình hoặc không có cấu hình rõ ràng."
-            }
-        elif desc == 'Disable HTTP':
-            results[desc] = {
-                'Disabled': match,
-                'Evidence': evidence if match else "HTTP vẫn được cấu hình hoặc không có cấu hình rõ ràng."
-            }
-    
-    # Đánh giá tuân thủ
-    compliance = True
-    insecure_protocols = []
-    
-    if not results.get('Disable Telnet', {}).get('Disabled', False):
-        compliance = False
-        insecure_protocols.append('Telnet')
-    
-    if not results.get('Disable HTTP', {}).get('Disabled', False):
-        compliance = False
-        insecure_protocols.append('HTTP')
-    
-    if compliance:
-        results['Compliance'] = "Compliant - Các giao thức không an toàn đã được vô hiệu hóa."
-    else:
-        results['Compliance'] = f"Non-Compliant - Các giao thức không an toàn chưa được vô hiệu hóa: {', '.join(insecure_protocols)}."
-    
-    return results
-
-def display_results(disable_protocols):
-    """
-    Hiển thị kết quả kiểm tra việc vô hiệu hóa các giao thức không an toàn.
-
-    Args:
-        disable_protocols (dict): Thông tin về việc vô hiệu hóa các giao thức không an toàn.
-    """
-    print("\nVô Hiệu Hóa Giao Thức Không An Toàn:")
-    for key, info in disable_protocols.items():
-        if key == 'Compliance':
-            continue  # Bỏ qua khóa 'Compliance' trong vòng lặp
-        status = 'Đã vô hiệu hóa' if info['Disabled'] else 'Chưa vô hiệu hóa'
-        print(f"- {key}: {status}")
-        print(f"  Bằng chứng: {info['Evidence']}")
-    print(f"- Tuân Thủ Vô Hiệu Hóa Giao Thức: {disable_protocols['Compliance']}\n")
-
-def main():
-    parser = argparse.ArgumentParser(description="Kiểm tra việc vô hiệu hóa các giao thức không an toàn (Telnet, HTTP).")
-    parser.add_argument("logfile", type=str, help="Đường dẫn tới file log cấu hình thiết bị Cisco.")
-    args = parser.parse_args()
-    
-    log_path = Path(args.logfile)
-    
-    if not log_path.is_file():
-        print(f"Lỗi: Không tìm thấy file '{log_path}'.")
-        return
-    
-    try:
-        with log_path.open("r", encoding="utf-8") as file_handle:
-            log_data = file_handle.read()
-    except IOError as e:
-        print(f"Lỗi IO khi đọc file '{log_path}': {e}")
-        return
-    
-    # Kiểm tra việc vô hiệu hóa các giao thức không an toàn
-    disable_protocols = check_disable_insecure_protocols(log_data)
-    
-    # Hiển thị kết quả
-    display_results(disable_protocols)
-
-if __name__ == "__main__":
-    main()
+# modules/module_5_3_3.py
+
+import argparse
+from pathlib import Path
+from log_normalizer import load_log
+from line_stanzas import allows_telnet, management_lines, parse_line_stanzas
+from rule_engine import evaluate_registered, register_rules
+
+# Luật vô hiệu hóa các giao thức không an toàn (đánh giá chung một lượt quét với các module dùng rule_engine).
+# Telnet được đánh giá theo từng dải line vty (line_stanzas).
+DISABLE_PROTOCOL_RULES = [
+    {'id': '5.3.3/http', 'description': 'Disable HTTP', 'pattern': r'no\s+ip\s+http\s+server\b.*'},
+]
+# Bằng chứng khi không tìm thấy cấu hình vô hiệu hóa
+MISSING_EVIDENCE = {
+    'Disable Telnet': "Telnet vẫn được cấu hình hoặc không có cấu hình rõ ràng.",
+    'Disable HTTP': "HTTP vẫn được cấu hình hoặc không có cấu hình rõ ràng.",
+}
+register_rules(DISABLE_PROTOCOL_RULES)
+
+def check_disable_insecure_protocols(log_data):
+    """
+    Phân tích dữ liệu log để xác định việc vô hiệu hóa các giao thức quản trị không an toàn.
+
+    Args:
+        log_data (str): Nội dung của file log.
+
+    Returns:
+        dict: Từ điển chứa thông tin về việc vô hiệu hóa các giao thức không an toàn.
+    """
+    results = {'Lines': {}}
+    
+    # Telnet: mọi dải line vty phải có 'transport input' không gồm telnet/all
+    for stanza in management_lines(parse_line_stanzas(log_data), kinds=("vty",)):
+        telnet = allows_telnet(stanza)
+        results['Lines'][stanza['header']] = {
+            'Disabled': telnet is False,
+            'Evidence': stanza['evidence'].get('transport_input', "Không cấu hình transport input (mặc định có thể cho phép Telnet)")
+        }
+    lines = results['Lines']
+    telnet_disabled = bool(lines) and all(info['Disabled'] for info in lines.values())
+    results['Disable Telnet'] = {
+        'Disabled': telnet_disabled,
+        'Evidence': "; ".join(f"{header}: {info['Evidence']}" for header, info in lines.items()) or MISSING_EVIDENCE['Disable Telnet']
+    }
+    
+    rule_results = evaluate_registered(log_data)
+    for rule in DISABLE_PROTOCOL_RULES:
+        desc = rule['description']
+        rule_result = rule_results[rule['id']]
+        results[desc] = {
+            'Disabled': rule_result['passed'],
+            'Evidence': rule_result['evidence'] if rule_result['passed'] else MISSING_EVIDENCE[desc]
+        }
+    
+    # Đánh giá tuân thủ
+    compliance = True
+    insecure_protocols = []
+    
+    if not results.get('Disable Telnet', {}).get('Disabled', False):
+        compliance = False
+        insecure_protocols.append('Telnet')
+    
+    if not results.get('Disable HTTP', {}).get('Disabled', False):
+        compliance = False
+        insecure_protocols.append('HTTP')
+    
+    if compliance:
+        results['Compliance'] = "Compliant - Các giao thức không an toàn đã được vô hiệu hóa."
+    else:
+        results['Compliance'] = f"Non-Compliant - Các giao thức không an toàn chưa được vô hiệu hóa: {', '.join(insecure_protocols)}."
+    
+    return results
+
+def display_results(disable_protocols):
+    """
+    Hiển thị kết quả kiểm tra việc vô hiệu hóa các giao thức không an toàn.
+
+    Args:
+        disable_protocols (dict): Thông tin về việc vô hiệu hóa các giao thức không an toàn.
+    """
+    print("\nVô Hiệu Hóa Giao Thức Không An Toàn:")
+    for key, info in disable_protocols.items():
+        if key in ('Compliance', 'Lines'):
+            continue  # Bỏ qua khóa 'Compliance' và chi tiết từng line trong vòng lặp
+        status = 'Đã vô hiệu hóa' if info['Disabled'] else 'Chưa vô hiệu hóa'
+        print(f"- {key}: {status}")
+        if key == 'Disable Telnet' and disable_protocols.get('Lines'):
+            for header, line_info in disable_protocols['Lines'].items():
+                line_status = 'Đã vô hiệu hóa' if line_info['Disabled'] else 'Chưa vô hiệu hóa'
+                print(f"  + {header}: {line_status} - {line_info['Evidence']}")
+        else:
+            print(f"  Bằng chứng: {info['Evidence']}")
+    print(f"- Tuân Thủ Vô Hiệu Hóa Giao Thức: {disable_protocols['Compliance']}\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Kiểm tra việc vô hiệu hóa các giao thức không an toàn (Telnet, HTTP).")
+    parser.add_argument("logfile", type=str, help="Đường dẫn tới file log cấu hình thiết bị Cisco.")
+    args = parser.parse_args()
+    
+    log_path = Path(args.logfile)
+    
+    if not log_path.is_file():
+        print(f"Lỗi: Không tìm thấy file '{log_path}'.")
+        return
+    
+    try:
+        log_data = load_log(log_path)
+    except IOError as e:
+        print(f"Lỗi IO khi đọc file '{log_path}': {e}")
+        return
+    
+    # Kiểm tra việc vô hiệu hóa các giao thức không an toàn
+    disable_protocols = check_disable_insecure_protocols(log_data)
+    
+    # Hiển thị kết quả
+    display_results(disable_protocols)
+
+if __name__ == "__main__":
+    main()
@@ -1,121 +1,144 @@
-# modules/module_5_3_5.py
-
-import re
-import argparse
-from pathlib import Path
-
-def check_management_ip_restriction(log_data):
-    """
-    Phân tích dữ liệu log để xác định giới hạn quản trị theo địa chỉ IP và liệt kê các IP được phép.
-    
-    Args:
-        log_data (str): Nội dung của file log.
-        
-    Returns:
-        dict: Từ điển chứa thông tin về giới hạn quản trị theo địa chỉ IP và danh sách các IP được phép.
-    """
-    results = {}
-    
-    # Mẫu regex để tìm các lệnh access-class trên VTY lines
-    access_class_pattern = r'^\s*access-class\s+(\d+)\s+in'
-    
-    # Mẫu regex để tìm các định nghĩa access-list
-    access_list_pattern = r'^\s*access-list\s+(\d+)\s+permit\s+(\d+\.\d+\.\d+\.\d+)\s+(\d+\.\d+\.\d+\.\d+)'
-    
-    # Tách log_data thành các dòng để dễ dàng xử lý
-    log_lines = log_data.splitlines()
-    
-    access_class_ids = []
-    access_lists = {}
-    
-    # Tìm các access-class được áp dụng trên VTY lines
-    for line in log_lines:
-        match = re.match(access_class_pattern, line.strip(), re.IGNORECASE)
-        if match:
-            acl_id = match.group(1)
-            access_class_ids.append(acl_id)
-    
-    # Tìm các định nghĩa access-list
-    for line in log_lines:
-        match = re.match(access_list_pattern, line.strip(), re.IGNORECASE)
-        if match:
-            acl_id = match.group(1)
-            permit_ip = f"{match.group(2)} {match.group(3)}"
-            if acl_id not in access_lists:
-                access_lists[acl_id] = []
-            access_lists[acl_id].append(permit_ip)
-    
-    # Thu thập tất cả các IP được phép từ các access-class
-    allowed_ips = []
-    evidence = []
-    for acl_id in access_class_ids:
-        permitted_ips = access_lists.get(acl_id, [])
-        allowed_ips.extend(permitted_ips)
-        if permitted_ips:
-            evidence.append(f"access-class {acl_id} in - Permitted IPs: {', '.join(permitted_ips)}")
-        else:
-            evidence.append(f"access-class {acl_id} in - Không có IP nào được phép.")
-    
-    if access_class_ids and allowed_ips:
-        results['Management IP Restriction'] = {
-            'Configured': True,
-            'Allowed_IPs': allowed_ips,
-            'Evidence': "; ".join(evidence)
-        }
-        results['Compliance'] = "Configured - Giới hạn quản trị theo địa chỉ IP đã được cấu hình."
-    else:
-        results['Management IP Restriction'] = {
-            'Configured': False,
-            'Allowed_IPs': [],
-            'Evidence': "Không tìm thấy cấu hình giới hạn quản trị theo địa chỉ IP."
-        }
-        results['Compliance'] = "Not Configured - Giới hạn quản trị theo địa chỉ IP chưa được cấu hình."
-    
-    return results
-
-def display_results(ip_restriction):
-    """
-    Hiển thị kết quả kiểm tra giới hạn quản trị theo địa chỉ IP.
-    
-    Args:
-        ip_restriction (dict): Thông tin về giới hạn quản trị theo địa chỉ IP.
-    """
-    print("\nGiới Hạn Quản Trị Theo Địa Chỉ IP:")
-    ip_info = ip_restriction.get('Management IP Restriction', {})
-    if ip_info.get('Configured'):
-        print(f"- Giới Hạn Quản Trị: Đã được cấu hình.")
-        print(f"  Bằng chứng: {ip_info.get('Evidence')}")
-        print(f"- Các Địa Chỉ IP Được Phép Quản Trị: {', '.join(ip_info.get('Allowed_IPs'))}")
-        print(f"- Tuân Thủ Giới Hạn Quản Trị: {ip_restriction['Compliance']}")
-    else:
-        print(f"- Giới Hạn Quản Trị: Không được cấu hình đúng.")
-        print(f"  Bằng chứng: {ip_info.get('Evidence')}")
-        print(f"- Tuân Thủ Giới Hạn Quản Trị: {ip_restriction['Compliance']}")
-    print()
-
-def main():
-    parser = argparse.ArgumentParser(description="Kiểm tra giới hạn quản trị chỉ cho phép từ các địa chỉ IP cụ thể và liệt kê các IP được phép.")
-    parser.add_argument("logfile", type=str, help="Đường dẫn tới file log cấu hình thiết bị Cisco.")
-    args = parser.parse_args()
-    
-    log_path = Path(args.logfile)
-    
-    if not log_path.is_file():
-        print(f"Lỗi: Không tìm thấy file '{log_path}'.")
-        return
-    
-    try:
-        with log_path.open("r", encoding="utf-8") as file_handle:
-            log_data = file_handle.read()
-    except IOError as e:
-        print(f"Lỗi IO khi đọc file '{log_path}': {e}")
-        return
-    
-    # Kiểm tra giới hạn quản trị theo địa chỉ IP
-    ip_restriction = check_management_ip_restriction(log_data)
-    
-    # Hiển thị kết quả
-    display_results(ip_restriction)
-
-if __name__ == "__main__":
-    main()
+# modules/module_5_3_5.py
+
+import argparse
+from pathlib import Path
+from log_normalizer import load_log
+from line_stanzas import management_lines, parse_line_stanzas
+from rule_engine import evaluate_registered, register_rules
+
+# Access-list chuẩn cho phép dải IP quản trị: dạng đánh số và dạng đặt tên (ip access-list standard <tên>).
+# access-class trên từng line được lấy từ mô hình line (line_stanzas).
+IP_RESTRICTION_RULES = [
+    {'id': '5.3.5/access-list', 'description': 'access-list cho phép IP quản trị',
+     'pattern': r'access-list\s+(\d+)\s+permit\s+(?:host\s+)?(\d+\.\d+\.\d+\.\d+)(?:\s+(\d+\.\d+\.\d+\.\d+))?'},
+    {'id': '5.3.5/named-access-list', 'description': 'access-list đặt tên cho phép IP quản trị',
+     'stanza': r'ip\s+access-list\s+standard\s+\S+',
+     'pattern': r'(?:\d+\s+)?permit\s+(?:host\s+)?(\d+\.\d+\.\d+\.\d+)(?:\s+(\d+\.\d+\.\d+\.\d+))?'},
+]
+register_rules(IP_RESTRICTION_RULES)
+
+def _permitted_networks(rule_results):
+    """
+    Gom các dải IP được phép theo tên/số access-list.
+    
+    Args:
+        rule_results (dict): Kết quả từ evaluate_registered.
+        
+    Returns:
+        dict: Tên access-list -> danh sách "IP [wildcard]" (không trùng lặp).
+    """
+    access_lists = {}
+    entries = [(match['groups'][0], match['groups'][1:]) for match in rule_results['5.3.5/access-list']['matches']]
+    entries += [(match['stanza'].split()[-1], match['groups']) for match in rule_results['5.3.5/named-access-list']['matches']]
+    for acl_id, (network, wildcard) in entries:
+        permitted = f"{network} {wildcard}" if wildcard else network
+        networks = access_lists.setdefault(acl_id, [])
+        # Log chụp running-config nhiều lần: bỏ dòng trùng
+        if permitted not in networks:
+            networks.append(permitted)
+    return access_lists
+
+def check_management_ip_restriction(log_data):
+    """
+    Phân tích dữ liệu log để xác định giới hạn quản trị theo địa chỉ IP và liệt kê các IP được phép,
+    đánh giá riêng từng dải line vty.
+    
+    Args:
+        log_data (str): Nội dung của file log.
+        
+    Returns:
+        dict: Từ điển chứa thông tin về giới hạn quản trị theo địa chỉ IP và danh sách các IP được phép.
+    """
+    results = {'Lines': {}}
+    
+    access_lists = _permitted_networks(evaluate_registered(log_data))
+    
+    # Access-class được áp dụng trên từng dải VTY line
+    allowed_ips = []
+    for stanza in management_lines(parse_line_stanzas(log_data), kinds=("vty",)):
+        acl_id = stanza['access_class_in']
+        permitted_ips = access_lists.get(acl_id, []) if acl_id else []
+        if not acl_id:
+            evidence = "Không cấu hình access-class in."
+        elif permitted_ips:
+            evidence = f"access-class {acl_id} in - Permitted IPs: {', '.join(permitted_ips)}"
+        else:
+            evidence = f"access-class {acl_id} in - Không có IP nào được phép."
+        results['Lines'][stanza['header']] = {
+            'Restricted': bool(permitted_ips),
+            'Allowed_IPs': permitted_ips,
+            'Evidence': evidence
+        }
+        allowed_ips.extend(ip for ip in permitted_ips if ip not in allowed_ips)
+    
+    lines = results['Lines']
+    if lines and all(info['Restricted'] for info in lines.values()):
+        results['Management IP Restriction'] = {
+            'Configured': True,
+            'Allowed_IPs': allowed_ips,
+            'Evidence': "; ".join(f"{header}: {info['Evidence']}" for header, info in lines.items())
+        }
+        results['Compliance'] = "Configured - Giới hạn quản trị theo địa chỉ IP đã được cấu hình."
+    elif any(info['Restricted'] for info in lines.values()):
+        unrestricted = [header for header, info in lines.items() if not info['Restricted']]
+        results['Management IP Restriction'] = {
+            'Configured': False,
+            'Allowed_IPs': allowed_ips,
+            'Evidence': "; ".join(f"{header}: {info['Evidence']}" for header, info in lines.items())
+        }
+        results['Compliance'] = f"Not Configured - Các line chưa giới hạn quản trị theo địa chỉ IP: {', '.join(unrestricted)}."
+    else:
+        results['Management IP Restriction'] = {
+            'Configured': False,
+            'Allowed_IPs': [],
+            'Evidence': "Không tìm thấy cấu hình giới hạn quản trị theo địa chỉ IP."
+        }
+        results['Compliance'] = "Not Configured - Giới hạn quản trị theo địa chỉ IP chưa được cấu hình."
+    
+    return results
+
+def display_results(ip_restriction):
+    """
+    Hiển thị kết quả kiểm tra giới hạn quản trị theo địa chỉ IP.
+    
+    Args:
+        ip_restriction (dict): Thông tin về giới hạn quản trị theo địa chỉ IP.
+    """
+    print("\nGiới Hạn Quản Trị Theo Địa Chỉ IP:")
+    ip_info = ip_restriction.get('Management IP Restriction', {})
+    if ip_info.get('Configured'):
+        print(f"- Giới Hạn Quản Trị: Đã được cấu hình.")
+        print(f"  Bằng chứng: {ip_info.get('Evidence')}")
+        print(f"- Các Địa Chỉ IP Được Phép Quản Trị: {', '.join(ip_info.get('Allowed_IPs'))}")
+        print(f"- Tuân Thủ Giới Hạn Quản Trị: {ip_restriction['Compliance']}")
+    else:
+        print(f"- Giới Hạn Quản Trị: Không được cấu hình đúng.")
+        print(f"  Bằng chứng: {ip_info.get('Evidence')}")
+        print(f"- Tuân Thủ Giới Hạn Quản Trị: {ip_restriction['Compliance']}")
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(description="Kiểm tra giới hạn quản trị chỉ cho phép từ các địa chỉ IP cụ thể và liệt kê các IP được phép.")
+    parser.add_argument("logfile", type=str, help="Đường dẫn tới file log cấu hình thiết bị Cisco.")
+    args = parser.parse_args()
+    
+    log_path = Path(args.logfile)
+    
+    if not log_path.is_file():
+        print(f"Lỗi: Không tìm thấy file '{log_path}'.")
+        return
+    
+    try:
+        log_data = load_log(log_path)
+    except IOError as e:
+        print(f"Lỗi IO khi đọc file '{log_path}': {e}")
+        return
+    
+    # Kiểm tra giới hạn quản trị theo địa chỉ IP
+    ip_restriction = check_management_ip_restriction(log_data)
+    
+    # Hiển thị kết quả
+    display_results(ip_restriction)
+
+if __name__ == "__main__":
+    main()
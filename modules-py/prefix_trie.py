@@ -0,0 +1,120 @@
+import ipaddress
+
+# Độ dài địa chỉ (bit) mặc định: IPv4
+IPV4_BITS = 32
+
+
+def mask_to_prefix_length(mask, width=IPV4_BITS):
+    """
+    Đổi netmask (số nguyên) thành độ dài prefix.
+    Args:
+        mask (int): Netmask, ví dụ 0xFFFFFF00.
+        width (int): Độ dài địa chỉ (bit).
+
+    Returns:
+        int | None: Độ dài prefix, hoặc None nếu mask không liên tục (wildcard kiểu 0.0.255.0).
+    """
+    inverted = ~mask & ((1 << width) - 1)
+    if inverted & (inverted + 1):
+        return None
+    return width - inverted.bit_length()
+
+
+class PrefixTrie:
+    """
+    Cây nhị phân theo bit của prefix: tra cứu một địa chỉ đi tối đa `width` nút,
+    không phụ thuộc số prefix đã thêm (thay cho việc so địa chỉ với từng câu lệnh 'network').
+    Mỗi nút là list [nhánh 0, nhánh 1, giá trị, có giá trị].
+    """
+
+    __slots__ = ("width", "_root", "_size")
+
+    def __init__(self, width=IPV4_BITS):
+        self.width = width
+        self._root = [None, None, None, False]
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def insert(self, network, prefix_length, value=None, replace=False):
+        """
+        Thêm một prefix.
+        Args:
+            network (int): Địa chỉ mạng (các bit sau prefix được bỏ qua).
+            prefix_length (int): Độ dài prefix.
+            value: Giá trị gắn với prefix.
+            replace (bool): Ghi đè giá trị nếu prefix đã có (mặc định giữ giá trị thêm trước).
+        """
+        node = self._root
+        for position in range(self.width - 1, self.width - 1 - prefix_length, -1):
+            bit = network >> position & 1
+            if node[bit] is None:
+                node[bit] = [None, None, None, False]
+            node = node[bit]
+        if not node[3]:
+            self._size += 1
+        elif not replace:
+            return
+        node[2], node[3] = value, True
+
+    def matches(self, address):
+        """
+        Liệt kê các prefix chứa địa chỉ.
+        Args:
+            address (int): Địa chỉ cần tra.
+
+        Returns:
+            list: Các cặp (độ dài prefix, giá trị), từ prefix ngắn nhất đến dài nhất.
+        """
+        found = []
+        node = self._root
+        length = 0
+        while node is not None:
+            if node[3]:
+                found.append((length, node[2]))
+            if length == self.width:
+                break
+            node = node[address >> (self.width - 1 - length) & 1]
+            length += 1
+        return found
+
+    def longest_match(self, address):
+        """
+        Tra prefix dài nhất chứa địa chỉ.
+        Args:
+            address (int): Địa chỉ cần tra.
+
+        Returns:
+            tuple | None: (độ dài prefix, giá trị), hoặc None nếu không prefix nào chứa địa chỉ.
+        """
+        best = None
+        node = self._root
+        length = 0
+        while node is not None:
+            if node[3]:
+                best = (length, node[2])
+            if length == self.width:
+                break
+            node = node[address >> (self.width - 1 - length) & 1]
+            length += 1
+        return best
+
+    def __contains__(self, address):
+        return self.longest_match(address) is not None
+
+    @classmethod
+    def from_networks(cls, networks):
+        """
+        Dựng trie từ danh sách mạng dạng chuỗi.
+        Args:
+            networks (iterable): Các cặp (mạng, giá trị), mạng dạng "10.0.0.0/8".
+
+        Returns:
+            PrefixTrie: Trie IPv4 chứa các mạng.
+        """
+        trie = cls()
+        for network, value in networks:
+            parsed = ipaddress.IPv4Network(network, strict=False)
+            trie.insert(int(parsed.network_address), parsed.prefixlen, value)
+        return trie
@@ -0,0 +1,267 @@
+import argparse
+import os
+import re
+import sqlite3
+from datetime import datetime
+
+# File cơ sở dữ liệu kết quả mặc định
+RESULTS_DB = "audit_results.db"
+# Số dòng kết quả gom lại trước mỗi lần ghi (một transaction cho mỗi lô)
+BATCH_SIZE = 5000
+# Độ dài tối đa của đoạn bằng chứng lưu kèm mỗi kết quả
+EVIDENCE_LENGTH = 300
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started TEXT NOT NULL,
+    finished TEXT,
+    folder TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id TEXT NOT NULL,
+    device TEXT NOT NULL,
+    check_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    site TEXT,
+    role TEXT,
+    snapshot_date TEXT,
+    source TEXT,
+    input_hash TEXT,
+    evidence TEXT,
+    seconds REAL,
+    PRIMARY KEY (run_id, device, check_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_results_device ON results (device, check_id, snapshot_date);
+CREATE INDEX IF NOT EXISTS idx_results_check_status ON results (check_id, status);
+CREATE INDEX IF NOT EXISTS idx_results_status ON results (status);
+CREATE INDEX IF NOT EXISTS idx_results_date ON results (snapshot_date);
+CREATE TABLE IF NOT EXISTS run_rollups (
+    run_id TEXT NOT NULL,
+    site TEXT NOT NULL,
+    check_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    devices INTEGER NOT NULL,
+    PRIMARY KEY (run_id, site, check_id, status)
+) WITHOUT ROWID;
+"""
+
+# Trạng thái tuân thủ của một mục kiểm tra trên một thiết bị
+STATUS_COMPLIANT = "compliant"
+STATUS_NON_COMPLIANT = "non_compliant"
+STATUS_NOT_APPLICABLE = "not_applicable"
+STATUS_ERROR = "error"
+STATUS_UNKNOWN = "unknown"
+
+# Có đủ dữ liệu nhưng công cụ không tự kết luận được (ví dụ đối chiếu phiên bản firmware với danh sách CVE)
+STATUS_MANUAL_REVIEW = "manual_review"
+
+ANSI_PATTERN = re.compile(r"\x1b\[[0-9;]*m")
+
+
+class ResultsStore:
+    """
+    Kho kết quả kiểm tra trên SQLite (chế độ WAL): mỗi dòng là một mục kiểm tra trên một thiết bị
+    trong một lần chạy. Dòng được gom theo lô BATCH_SIZE rồi ghi trong một transaction,
+    nên lần chạy không phải chờ ghi đĩa sau từng thiết bị.
+    """
+
+    def __init__(self, path=RESULTS_DB, batch_size=BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self._pending = []
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        # Trong chế độ WAL, NORMAL vẫn an toàn khi tiến trình bị ngắt (chỉ mất transaction cuối khi mất điện)
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.connection is not None:
+            self.flush()
+            self.connection.close()
+            self.connection = None
+
+    def start_run(self, run_id, folder=None):
+        """
+        Ghi nhận lần chạy (giữ nguyên thời điểm bắt đầu nếu đang tiếp tục lần chạy cũ).
+        Args:
+            run_id (str): Run-id.
+            folder (str | None): Thư mục log của lần chạy.
+        """
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO runs (run_id, started, folder) VALUES (?, ?, ?)",
+                (run_id, datetime.now().isoformat(timespec="seconds"), folder),
+            )
+
+    def add_device_results(self, run_id, device, device_results, site=None, role=None,
+                           snapshot_date=None, source=None, input_hash=None):
+        """
+        Thêm kết quả của một thiết bị vào lô chờ ghi.
+        Args:
+            run_id (str): Run-id.
+            device (str): Tên thiết bị (hostname, hoặc tên file nếu không có hostname).
+            device_results (dict): Mã mục kiểm tra -> outcome (xem fleet_runner.run_device_checks).
+            site, role: Site và vai trò của thiết bị.
+            snapshot_date (date | str | None): Ngày chụp cấu hình.
+            source (str | None): Tên file log (tham chiếu tới bằng chứng đầy đủ).
+            input_hash (str | None): Mã băm nội dung log.
+        """
+        if hasattr(snapshot_date, "isoformat"):
+            snapshot_date = snapshot_date.isoformat()
+        for check_id, outcome in device_results.items():
+            self._pending.append((
+                run_id, device, check_id, outcome.get("compliance") or outcome["status"],
+                site, role, snapshot_date, source, input_hash, (outcome.get("evidence") or "")[:EVIDENCE_LENGTH] or None,
+                outcome.get("seconds"),
+            ))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Ghi các dòng đang chờ trong một transaction.
+        """
+        if not self._pending:
+            return
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO results (run_id, device, check_id, status, site, role, snapshot_date,"
+                " source, input_hash, evidence, seconds) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._pending,
+            )
+        self._pending = []
+
+    def finish_run(self, run_id):
+        """
+        Kết thúc lần chạy: ghi nốt lô cuối và tính trước bảng tổng hợp theo site/mục kiểm tra/trạng thái.
+        Args:
+            run_id (str): Run-id.
+        """
+        self.flush()
+        with self.connection:
+            self.connection.execute("DELETE FROM run_rollups WHERE run_id = ?", (run_id,))
+            self.connection.execute(
+                "INSERT INTO run_rollups (run_id, site, check_id, status, devices)"
+                " SELECT run_id, COALESCE(site, ''), check_id, status, COUNT(*) FROM results"
+                " WHERE run_id = ? GROUP BY run_id, COALESCE(site, ''), check_id, status",
+                (run_id,),
+            )
+            self.connection.execute(
+                "UPDATE runs SET finished = ? WHERE run_id = ?",
+                (datetime.now().isoformat(timespec="seconds"), run_id),
+            )
+
+    def check_history(self, device, check_id):
+        """
+        Lịch sử trạng thái của một mục kiểm tra trên một thiết bị qua các lần chạy.
+        Args:
+            device (str): Tên thiết bị.
+            check_id (str): Mã mục kiểm tra.
+
+        Returns:
+            list: Các dict {run_id, snapshot_date, status, evidence, source}, cũ trước mới sau.
+        """
+        rows = self.connection.execute(
+            "SELECT results.run_id, snapshot_date, status, evidence, source FROM results"
+            " JOIN runs ON runs.run_id = results.run_id"
+            " WHERE device = ? AND check_id = ? ORDER BY snapshot_date, runs.started",
+            (device, check_id),
+        )
+        return [
+            {"run_id": run_id, "snapshot_date": snapshot_date, "status": status, "evidence": evidence, "source": source}
+            for run_id, snapshot_date, status, evidence, source in rows
+        ]
+
+    def status_changes(self, device, check_id):
+        """
+        Các lần trạng thái thay đổi (ví dụ thiết bị mất cấu hình NTP từ lần chạy nào).
+        Args:
+            device (str): Tên thiết bị.
+            check_id (str): Mã mục kiểm tra.
+
+        Returns:
+            list: Các dict của check_history tại đó trạng thái khác lần trước.
+        """
+        changes = []
+        previous_status = None
+        for row in self.check_history(device, check_id):
+            if row["status"] != previous_status:
+                changes.append(row)
+                previous_status = row["status"]
+        return changes
+
+    def compliance_trend(self, site=None, check_id=None):
+        """
+        Xu hướng tuân thủ theo từng lần chạy, tính từ bảng tổng hợp (không quét bảng kết quả).
+        Args:
+            site (str | None): Chỉ tính site này.
+            check_id (str | None): Chỉ tính mục kiểm tra này.
+
+        Returns:
+            list: Các dict {run_id, started, compliant, non_compliant, ratio}, theo thứ tự thời gian.
+        """
+        conditions, params = [], []
+        if site:
+            conditions.append("site = ?")
+            params.append(site.upper())
+        if check_id:
+            conditions.append("check_id = ?")
+            params.append(check_id)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.connection.execute(
+            "SELECT run_rollups.run_id, runs.started,"
+            f" SUM(CASE WHEN status = '{STATUS_COMPLIANT}' THEN devices ELSE 0 END),"
+            f" SUM(CASE WHEN status = '{STATUS_NON_COMPLIANT}' THEN devices ELSE 0 END)"
+            f" FROM run_rollups JOIN runs ON runs.run_id = run_rollups.run_id {where}"
+            " GROUP BY run_rollups.run_id ORDER BY runs.started",
+            params,
+        )
+        trend = []
+        for run_id, started, compliant, non_compliant in rows:
+            evaluated = compliant + non_compliant
+            trend.append({
+                "run_id": run_id, "started": started, "compliant": compliant, "non_compliant": non_compliant,
+                "ratio": compliant / evaluated if evaluated else None,
+            })
+        return trend
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Truy vấn lịch sử kết quả kiểm tra.")
+    parser.add_argument("--db", type=str, default=RESULTS_DB, help="File cơ sở dữ liệu kết quả.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    history_parser = subparsers.add_parser("history", help="Lịch sử một mục kiểm tra trên một thiết bị.")
+    history_parser.add_argument("device", type=str, help="Tên thiết bị (hostname).")
+    history_parser.add_argument("check", type=str, help="Mã mục kiểm tra, ví dụ 6.1.")
+    history_parser.add_argument("--changes", action="store_true", help="Chỉ hiển thị các lần trạng thái thay đổi.")
+    trend_parser = subparsers.add_parser("trend", help="Xu hướng tuân thủ theo lần chạy.")
+    trend_parser.add_argument("--site", type=str, help="Lọc theo site (ví dụ HN).")
+    trend_parser.add_argument("--check", type=str, help="Lọc theo mục kiểm tra.")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.db):
+        print(f"Lỗi: Không tìm thấy cơ sở dữ liệu '{args.db}'.")
+        return
+
+    with ResultsStore(args.db) as store:
+        if args.command == "history":
+            rows = store.status_changes(args.device, args.check) if args.changes else store.check_history(args.device, args.check)
+            for row in rows:
+                print(f"{row['snapshot_date'] or '-':<10} {row['run_id']:<22} {row['status']:<15} {row['evidence'] or ''}")
+        else:
+            for row in store.compliance_trend(args.site, args.check):
+                ratio = f"{row['ratio']:.1%}" if row["ratio"] is not None else "-"
+                print(f"{row['started']:<20} {row['run_id']:<22} Tuân Thủ: {row['compliant']:<6} "
+                      f"Không Tuân Thủ: {row['non_compliant']:<6} ({ratio})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+import argparse
+import json
+import os
+import re
+
+from archive_reader import iter_logs, list_log_sources
+from check_profiles import infer_device_role
+from secret_classifier import redact_line
+
+try:
+    import yaml  # Tuỳ chọn: chỉ cần khi file luật viết bằng YAML
+except ImportError:
+    yaml = None
+
+# Một luật là dict (viết trực tiếp trong Python hoặc nạp từ file JSON/YAML):
+#   id       (bắt buộc) mã luật, ví dụ "5.3.3/telnet"
+#   pattern  (bắt buộc) regex khớp từ đầu dòng (đã bỏ khoảng trắng đầu dòng), không dùng named group
+#   must     "contain" (mặc định): phải có ít nhất một dòng khớp; "not_contain": không được có dòng nào khớp
+#   stanza   regex khớp dòng đầu của stanza chứa dòng cần tìm, ví dụ "line vty" (bỏ trống: khớp ở mọi nơi)
+#   min, max ngưỡng cho giá trị số ở group 1 (chỉ tính các dòng có giá trị nằm trong ngưỡng)
+#   roles    danh sách vai trò thiết bị áp dụng (bỏ trống: mọi vai trò)
+#   description  mô tả hiển thị
+MUST_VALUES = ("contain", "not_contain")
+
+
+def _compile_rule(rule):
+    if not rule.get("id") or not rule.get("pattern"):
+        raise ValueError(f"Luật thiếu 'id' hoặc 'pattern': {rule}")
+    must = rule.get("must", "contain")
+    if must not in MUST_VALUES:
+        raise ValueError(f"Luật '{rule['id']}': 'must' phải là một trong {MUST_VALUES}.")
+    return {
+        "id": rule["id"],
+        "description": rule.get("description", rule["id"]),
+        "pattern": rule["pattern"],
+        "regex": re.compile(rule["pattern"], re.IGNORECASE),
+        "must": must,
+        "stanza": re.compile(rule["stanza"], re.IGNORECASE) if rule.get("stanza") else None,
+        "min": rule.get("min"),
+        "max": rule.get("max"),
+        "roles": tuple(rule["roles"]) if rule.get("roles") else None,
+    }
+
+
+def _stanza_header(text, line_start, known_start=0, known_header=None):
+    # Dòng thụt lề thuộc stanza mở bởi dòng không thụt lề gần nhất phía trên; known_start là đầu một dòng
+    # thụt lề phía trên đã biết stanza (known_header): chỉ lùi tới dòng đó thay vì về đầu file
+    position = line_start
+    while position > known_start:
+        previous_start = text.rfind("\n", 0, position - 1) + 1
+        if text[previous_start:previous_start + 1] not in (" ", "\t"):
+            header = text[previous_start:position - 1].strip()
+            return header if header and not header.startswith("!") else None
+        position = previous_start
+    return known_header if known_start else None
+
+
+def _within_threshold(rule, match):
+    if rule["min"] is None and rule["max"] is None:
+        return True
+    try:
+        value = int(match.group(1))
+    except (IndexError, TypeError, ValueError):
+        return False
+    if rule["min"] is not None and value < rule["min"]:
+        return False
+    if rule["max"] is not None and value > rule["max"]:
+        return False
+    return True
+
+
+class RuleSet:
+    """
+    Tập luật được gộp thành một regex duy nhất: mỗi file chỉ được quét một lần để tìm các dòng
+    khớp với ít nhất một luật, sau đó từng luật chỉ được thử trên các dòng ứng viên đó.
+    Thêm luật không làm tăng số lần quét toàn bộ file.
+    """
+
+    def __init__(self, rules):
+        self.rules = [_compile_rule(rule) for rule in rules]
+        ids = [rule["id"] for rule in self.rules]
+        if len(ids) != len(set(ids)):
+            raise ValueError("Mã luật bị trùng trong tập luật.")
+        self._needs_stanza = any(rule["stanza"] is not None for rule in self.rules)
+        alternatives = "|".join(f"(?:{rule['pattern']})" for rule in self.rules) or "(?!)"
+        self._combined = re.compile(rf"^[ \t]*(?:{alternatives})", re.MULTILINE | re.IGNORECASE)
+
+    def evaluate(self, config_data, role=None):
+        """
+        Đánh giá toàn bộ tập luật trên một file trong một lượt quét.
+        Args:
+            config_data (str): Nội dung log đã chuẩn hoá.
+            role (str | None): Vai trò thiết bị (None để áp dụng mọi luật).
+
+        Returns:
+            dict: Mã luật -> {"applicable": bool, "passed": bool | None,
+                  "matches": [{"line", "text", "groups", "stanza", "in_threshold"}], "evidence": dòng đầu tiên hoặc None}.
+                  "line", "text" và "evidence" đã ẩn giá trị bí mật (community, mật khẩu, khoá); "groups" giữ nguyên.
+        """
+        results = {}
+        for rule in self.rules:
+            applicable = role is None or rule["roles"] is None or role in rule["roles"]
+            results[rule["id"]] = {"applicable": applicable, "passed": None, "matches": [], "evidence": None}
+
+        # Các dòng ứng viên đi theo thứ tự trong file: nhớ stanza của dòng thụt lề gần nhất để lần tìm sau
+        # chỉ lùi tới dòng đó (tổng số dòng phải duyệt lại tuyến tính theo kích thước file, kể cả ACL rất dài)
+        known_start, known_header = 0, None
+        for candidate in self._combined.finditer(config_data):
+            line_start = candidate.start()
+            line_end = config_data.find("\n", line_start)
+            raw_line = config_data[line_start:line_end if line_end != -1 else len(config_data)]
+            line = raw_line.strip()
+            indented = raw_line[:1] in (" ", "\t")
+            context = ""
+            if indented:
+                known_header = _stanza_header(config_data, line_start, known_start, known_header)
+                known_start = line_start
+                context = known_header or ""
+            header = known_header if self._needs_stanza and indented else None
+            redacted = None
+            for rule in self.rules:
+                match = rule["regex"].match(line)
+                if not match:
+                    continue
+                if rule["stanza"] is not None and not (header and rule["stanza"].match(header)):
+                    continue
+                if redacted is None:
+                    # Dòng khớp được in và ghi vào nhật ký lần chạy nên không giữ giá trị bí mật
+                    redacted = redact_line(line, context)
+                results[rule["id"]]["matches"].append({
+                    "line": redacted,
+                    "text": redact_line(match.group(0), context),
+                    "groups": match.groups(),
+                    "stanza": header,
+                    "in_threshold": _within_threshold(rule, match),
+                })
+
+        for rule in self.rules:
+            result = results[rule["id"]]
+            if not result["applicable"]:
+                continue
+            counted = [match for match in result["matches"] if match["in_threshold"]]
+            if rule["must"] == "contain":
+                result["passed"] = bool(counted)
+                # Không có dòng đạt ngưỡng: dòng khớp nhưng vượt ngưỡng là bằng chứng vi phạm
+                evidence = counted or result["matches"]
+            else:
+                result["passed"] = not counted
+                evidence = counted
+            result["evidence"] = evidence[0]["line"] if evidence else None
+        return results
+
+
+# Luật do các module đăng ký: được gộp chung để các module chạy trên cùng một file chia sẻ một lượt quét
+_registered_rules = {}
+_registered_set = None
+_last_evaluation = (None, None, None)
+
+
+def register_rules(rules):
+    """
+    Đăng ký luật của một module vào tập luật dùng chung (luật trùng mã được thay thế).
+    Args:
+        rules (list): Danh sách luật (dict).
+    """
+    global _registered_set, _last_evaluation
+    for rule in rules:
+        _compile_rule(rule)
+        _registered_rules[rule["id"]] = rule
+    _registered_set = None
+    _last_evaluation = (None, None, None)
+
+
+def evaluate_registered(config_data, role=None):
+    """
+    Đánh giá mọi luật đã đăng ký trên một file. Kết quả của lần gọi gần nhất được giữ lại,
+    nên các module gọi liên tiếp trên cùng nội dung log chỉ tốn một lượt quét.
+    Args:
+        config_data (str): Nội dung log đã chuẩn hoá.
+        role (str | None): Vai trò thiết bị.
+
+    Returns:
+        dict: Như RuleSet.evaluate.
+    """
+    global _registered_set, _last_evaluation
+    if _registered_set is None:
+        _registered_set = RuleSet(list(_registered_rules.values()))
+    last_data, last_role, last_results = _last_evaluation
+    # So sánh theo đối tượng (không so nội dung) để không phải duyệt lại chuỗi lớn
+    if last_data is config_data and last_role == role:
+        return last_results
+    results = _registered_set.evaluate(config_data, role)
+    _last_evaluation = (config_data, role, results)
+    return results
+
+
+def load_rules(path):
+    """
+    Nạp danh sách luật từ file JSON hoặc YAML (YAML cần cài PyYAML).
+    Args:
+        path (str): Đường dẫn file luật (danh sách luật, hoặc dict có khoá "rules").
+
+    Returns:
+        list: Danh sách luật.
+
+    Raises:
+        RuntimeError: File YAML nhưng chưa cài PyYAML.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        if path.lower().endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise RuntimeError("Cần cài PyYAML để đọc file luật YAML (pip install pyyaml).")
+            data = yaml.safe_load(file)
+        else:
+            data = json.load(file)
+    return data["rules"] if isinstance(data, dict) else data
+
+
+def display_rule_results(rule_set, results):
+    """
+    Hiển thị kết quả đánh giá tập luật trên một file.
+    Args:
+        rule_set (RuleSet): Tập luật đã đánh giá.
+        results (dict): Kết quả từ RuleSet.evaluate.
+    """
+    for rule in rule_set.rules:
+        result = results[rule["id"]]
+        if not result["applicable"]:
+            print(f"- {rule['id']} ({rule['description']}): \033[33mKhông Áp Dụng\033[0m")
+        elif result["passed"]:
+            print(f"- {rule['id']} ({rule['description']}): \033[32mTuân Thủ\033[0m")
+        else:
+            print(f"- {rule['id']} ({rule['description']}): \033[31mKhông Tuân Thủ\033[0m")
+        if result["evidence"]:
+            print(f"  Bằng chứng: {result['evidence']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Đánh giá các luật khai báo (JSON/YAML) trên toàn bộ thư mục log.")
+    parser.add_argument("rules", type=str, help="File luật (.json, .yaml).")
+    parser.add_argument("folder", type=str, help="Đường dẫn tới thư mục chứa file log.")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.folder):
+        print(f"Lỗi: Không tìm thấy thư mục '{args.folder}'.")
+        return
+    try:
+        rule_set = RuleSet(load_rules(args.rules))
+    except (OSError, ValueError, RuntimeError, re.error) as e:
+        print(f"Lỗi khi nạp file luật '{args.rules}': {e}")
+        return
+
+    for log in iter_logs(list_log_sources(args.folder)):
+        print(f"\n{'=' * 50}\nĐang kiểm tra file: {log.name}")
+        try:
+            config_data = log.text
+        except Exception as e:
+            print(f"Lỗi khi đọc file {log.name}: {e}")
+            continue
+        role = infer_device_role(None, config_data)
+        print(f"Vai trò thiết bị: \033[1m{role}\033[0m")
+        display_rule_results(rule_set, rule_set.evaluate(config_data, role))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import json
+import os
+import secrets
+import tempfile
+from datetime import date, datetime
+
+# Thư mục chứa nhật ký của các lần chạy (mỗi lần chạy một thư mục con theo run-id)
+RUNS_DIR = "runs"
+JOURNAL_FILE = "journal.jsonl"
+RUN_INFO_FILE = "run.json"
+
+
+def _to_json(value):
+    # Kết quả của các module có thể chứa set/tuple/date: chuyển về kiểu JSON tương ứng
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def new_run_id():
+    """
+    Tạo run-id theo thời điểm bắt đầu, kèm chuỗi ngẫu nhiên ngắn để không trùng.
+    Returns:
+        str: Ví dụ "20250106-153000-3fa2".
+    """
+    return f"{datetime.now():%Y%m%d-%H%M%S}-{secrets.token_hex(2)}"
+
+
+def _write_atomic(path, text):
+    # Ghi file tạm cùng thư mục, fsync rồi đổi tên: file đích luôn là bản cũ hoặc bản mới hoàn chỉnh
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class RunJournal:
+    """
+    Nhật ký của một lần chạy: mỗi mục kiểm tra đã xong trên một thiết bị được ghi thành một dòng JSON
+    (device, check, input_hash, kết quả) và fsync ngay, để lần chạy bị ngắt có thể tiếp tục bằng --resume.
+    Dòng cuối bị ghi dở khi máy dừng đột ngột sẽ bị bỏ qua khi đọc lại.
+    """
+
+    def __init__(self, run_id, runs_dir=RUNS_DIR):
+        self.run_id = run_id
+        self.path = os.path.join(runs_dir, run_id)
+        self.journal_path = os.path.join(self.path, JOURNAL_FILE)
+        self.completed = {}
+        self._fd = None
+
+    @classmethod
+    def create(cls, params, runs_dir=RUNS_DIR):
+        """
+        Tạo nhật ký cho lần chạy mới và lưu tham số chạy (để --resume dùng lại).
+        Args:
+            params (dict): Tham số của lần chạy (thư mục, bộ lọc, mục kiểm tra).
+            runs_dir (str): Thư mục chứa nhật ký các lần chạy.
+
+        Returns:
+            RunJournal: Nhật ký đã mở để ghi.
+        """
+        journal = cls(new_run_id(), runs_dir)
+        os.makedirs(journal.path)
+        info = {"run_id": journal.run_id, "started": datetime.now().isoformat(timespec="seconds"), "params": params}
+        _write_atomic(os.path.join(journal.path, RUN_INFO_FILE), json.dumps(info, default=_to_json, indent=2))
+        journal.open()
+        return journal
+
+    @classmethod
+    def resume(cls, run_id, runs_dir=RUNS_DIR):
+        """
+        Mở lại nhật ký của một lần chạy trước và nạp các mục kiểm tra đã hoàn thành.
+        Args:
+            run_id (str): Run-id cần tiếp tục.
+            runs_dir (str): Thư mục chứa nhật ký các lần chạy.
+
+        Returns:
+            RunJournal: Nhật ký đã mở để ghi tiếp.
+
+        Raises:
+            FileNotFoundError: Không tìm thấy lần chạy với run-id này.
+        """
+        journal = cls(run_id, runs_dir)
+        if not os.path.isfile(os.path.join(journal.path, RUN_INFO_FILE)):
+            raise FileNotFoundError(f"Không tìm thấy lần chạy '{run_id}' trong '{runs_dir}'.")
+        journal.load()
+        journal.open()
+        return journal
+
+    @property
+    def params(self):
+        with open(os.path.join(self.path, RUN_INFO_FILE), "r", encoding="utf-8") as file:
+            return json.load(file)["params"]
+
+    def load(self):
+        """
+        Nạp các dòng nhật ký hợp lệ vào self.completed: device -> {check: (input_hash, outcome)}.
+        Phần dòng cuối bị ghi dở (máy dừng giữa lúc ghi) được cắt bỏ để các dòng ghi tiếp không bị dính vào nó.
+        """
+        self.completed = {}
+        if not os.path.isfile(self.journal_path):
+            return
+        with open(self.journal_path, "rb+") as file:
+            valid_length = 0
+            for raw_line in file:
+                if not raw_line.endswith(b"\n"):
+                    break
+                valid_length += len(raw_line)
+                try:
+                    record = json.loads(raw_line)
+                except ValueError:
+                    continue
+                self.completed.setdefault(record["device"], {})[record["check"]] = (record["input_hash"], record["outcome"])
+            file.truncate(valid_length)
+
+    def open(self):
+        # O_APPEND: mỗi lần ghi một dòng hoàn chỉnh được nối vào cuối file
+        self._fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record(self, device, input_hash, outcomes):
+        """
+        Ghi nhận các mục kiểm tra đã hoàn thành trên một thiết bị: các dòng được ghi trong một lần
+        write và fsync trước khi trả về.
+        Args:
+            device (str): Tên file log của thiết bị.
+            input_hash (str): Mã băm nội dung log đã phân tích.
+            outcomes (dict): Mã mục kiểm tra -> kết quả.
+        """
+        if not outcomes:
+            return
+        lines = [
+            json.dumps({"device": device, "check": check_id, "input_hash": input_hash, "outcome": outcome},
+                       default=_to_json, ensure_ascii=False) + "\n"
+            for check_id, outcome in outcomes.items()
+        ]
+        os.write(self._fd, "".join(lines).encode("utf-8"))
+        os.fsync(self._fd)
+        # Giữ bản đã qua JSON để kết quả tiếp tục và kết quả mới có cùng dạng
+        for line in lines:
+            record = json.loads(line)
+            self.completed.setdefault(device, {})[record["check"]] = (input_hash, record["outcome"])
+
+    def previous_outcomes(self, device):
+        """
+        Lấy các mục kiểm tra đã hoàn thành của một thiết bị.
+        Args:
+            device (str): Tên file log của thiết bị.
+
+        Returns:
+            dict: Mã mục kiểm tra -> (input_hash, outcome).
+        """
+        return dict(self.completed.get(device, {}))
@@ -0,0 +1,191 @@
+import hashlib
+import re
+from collections import defaultdict
+
+# Loại dòng chứa thông tin xác thực: mã -> (mô tả, phần lệnh đứng trước [kiểu] <giá trị>)
+CREDENTIAL_KINDS = {
+    "username": ("Mật khẩu tài khoản local", r"username\s+\S+(?:\s+\S+)*?\s+(?:secret|password)"),
+    "enable": ("Mật khẩu enable", r"enable\s+(?:secret|password)(?:\s+level\s+\d+)?"),
+    "line_password": ("Mật khẩu line", r"password"),
+    "bgp_password": ("Mật khẩu neighbor BGP", r"neighbor\s+\S+\s+password"),
+    "key_string": ("Key-string (key chain, HSRP, ...)", r"(?:\S+\s+)*?key-string"),
+    "ospf_key": ("Khoá xác thực OSPF trên interface",
+                 r"ip\s+ospf\s+(?:authentication-key|message-digest-key\s+\d+\s+md5)"),
+    "fhrp_text": ("Mật khẩu HSRP/VRRP/GLBP dạng text", r"(?:standby|vrrp|glbp)\s+\d+\s+authentication(?:\s+text)?(?!\s+md5\b)"),
+    "snmp_community": ("SNMP community", r"snmp-server\s+community"),
+    # 'snmp-server host <địa chỉ> [vrf <tên>] [traps|informs] [version 1|2c] <community>'
+    # (với version 3 là tên user, không ẩn)
+    "snmp_host_community": ("SNMP community trong snmp-server host",
+                            r"snmp-server\s+host\s+\S+(?!(?:\s+vrf\s+\S+)?(?:\s+(?:traps|informs))?\s+version\s+3\b)"
+                            r"(?:\s+vrf\s+\S+)?"
+                            r"(?:\s+(?:traps|informs))?(?:\s+version\s+(?:1|2c))?"),
+    # 'ntp authentication-key <số> md5 <khoá> [7]': kiểu mật khẩu đứng sau khoá
+    "ntp_key": ("Khoá xác thực NTP",
+                r"ntp\s+authentication-key\s+\d+\s+md5(?=\s+\S+(?:\s+(?P<ntp_type>[07]))?\s*$)"),
+    "tacacs_key": ("Khoá TACACS+", r"tacacs-server\s+(?:host\s+\S+\s+(?:\S+\s+)*?)?key"),
+    "radius_key": ("Khoá RADIUS", r"radius-server\s+(?:host\s+\S+\s+(?:\S+\s+)*?)?key"),
+    # 'key ...' trong stanza 'tacacs server'/'radius server'/'aaa group server': loại được xác định theo stanza
+    "server_key": ("Khoá server AAA", r"(?:server-private\s+\S+\s+(?:\S+\s+)*?)?key"),
+    "isakmp_key": ("Pre-shared key ISAKMP", r"crypto\s+isakmp\s+key"),
+    "wpa_psk": ("WPA pre-shared key", r"wpa-psk\s+(?:ascii|hex)"),
+    "ppp_password": ("Mật khẩu PPP", r"ppp\s+(?:chap|pap)\s+(?:password|sent-username\s+\S+\s+password)"),
+}
+# Kiểu lưu mật khẩu của Cisco: mã -> (mô tả, mức độ: "weak" | "medium" | "strong")
+SECRET_TYPES = {
+    "0": ("Cleartext", "weak"),
+    "7": ("Type 7 (giải mã được)", "weak"),
+    "5": ("MD5", "medium"),
+    "6": ("AES (type 6)", "strong"),
+    "8": ("PBKDF2-SHA256", "strong"),
+    "9": ("Scrypt", "strong"),
+}
+# Giá trị băm không ghi kiểu (ví dụ 'username x algorithm-type scrypt secret $9$...')
+HASH_PREFIXES = {"$1$": "5", "$8$": "8", "$9$": "9"}
+REDACTED = "<đã ẩn>"
+# Bảng khoá dùng để giải mã mật khẩu type 7 của Cisco
+TYPE7_KEY = "dsfd;kfoA,.iyewrkldJKDHSUBsgvca69834ncxv9873254k;fg87"
+
+# Mỗi dòng chỉ được so một lần với biểu thức gộp mọi loại (mỗi loại là một nhóm có tên)
+CREDENTIAL_PATTERN = re.compile(
+    r"^\s*(?:" + "|".join(f"(?P<{kind}>{prefix})" for kind, (_, prefix) in CREDENTIAL_KINDS.items()) + r")"
+    r"\s+(?:(?P<type>[056789])\s+(?=\S))?(?P<secret>\S+)",
+    re.IGNORECASE,
+)
+_KIND_GROUPS = [(CREDENTIAL_PATTERN.groupindex[kind], kind) for kind in CREDENTIAL_KINDS]
+
+
+def _match_kind(match, context):
+    kind = next(kind for index, kind in _KIND_GROUPS if match.start(index) != -1)
+    if kind == "server_key":
+        header = context.lower()
+        if "radius" in header:
+            return "radius_key"
+        if "tacacs" in header:
+            return "tacacs_key"
+        # 'key 1' trong key chain, 'key config-key ...' không phải khoá server
+        return None
+    if kind == "line_password" and not context.lower().startswith("line "):
+        return None
+    return kind
+
+
+def _secret_type(match, kind):
+    if match.group("type"):
+        return match.group("type")
+    if kind == "ntp_key" and match.group("ntp_type"):
+        return match.group("ntp_type")
+    secret = match.group("secret")
+    for prefix, secret_type in HASH_PREFIXES.items():
+        if secret.startswith(prefix):
+            return secret_type
+    # 'username/enable ... secret <chuỗi>' trong running-config luôn là giá trị đã băm MD5
+    if kind in ("username", "enable") and "secret" in match.group(kind).lower():
+        return "5"
+    return "0"
+
+
+def classify_line(line, context=""):
+    """
+    Xác định dòng cấu hình có chứa thông tin xác thực hay không.
+    Args:
+        line (str): Dòng cấu hình.
+        context (str): Dòng đầu của stanza chứa dòng này ("" nếu là dòng không thụt lề).
+
+    Returns:
+        tuple | None: (loại, kiểu mật khẩu, vị trí bắt đầu và kết thúc của giá trị bí mật), hoặc None.
+    """
+    match = CREDENTIAL_PATTERN.match(line)
+    if not match:
+        return None
+    kind = _match_kind(match, context)
+    if kind is None:
+        return None
+    return kind, _secret_type(match, kind), match.span("secret")
+
+
+def redact_line(line, context=""):
+    """
+    Thay giá trị bí mật trong một dòng cấu hình bằng REDACTED.
+    Args:
+        line (str): Dòng cấu hình.
+        context (str): Dòng đầu của stanza chứa dòng này.
+
+    Returns:
+        str: Dòng đã ẩn bí mật (giữ nguyên nếu không chứa thông tin xác thực).
+    """
+    classified = classify_line(line, context)
+    if classified is None:
+        return line
+    start, end = classified[2]
+    return line[:start] + REDACTED + line[end:]
+
+
+def _decode_type7(encoded):
+    # Mật khẩu type 7: 2 chữ số đầu là vị trí bắt đầu trong TYPE7_KEY, sau đó là các byte hex đã XOR
+    try:
+        offset = int(encoded[:2])
+        data = bytes.fromhex(encoded[2:])
+    except ValueError:
+        return None
+    return "".join(chr(byte ^ ord(TYPE7_KEY[(offset + i) % len(TYPE7_KEY)])) for i, byte in enumerate(data))
+
+
+def password_fingerprint(value):
+    """
+    Tính dấu vân tay của mật khẩu/khoá để so sánh giữa các thiết bị mà không giữ lại giá trị bí mật.
+    Args:
+        value (str): Phần sau từ khoá mật khẩu, ví dụ "7 0822455D0A16" hoặc "Secret123".
+
+    Returns:
+        tuple: (kiểu mật khẩu, dấu vân tay); mật khẩu type 7 được giải mã trước khi băm
+            để hai đầu cấu hình type 0 và type 7 của cùng mật khẩu vẫn khớp.
+    """
+    words = value.split(None, 1)
+    password_type, secret = "0", value
+    if len(words) == 2 and words[0] in ("0", "7"):
+        password_type, secret = words
+        if password_type == "7":
+            secret = _decode_type7(secret) or secret
+    return password_type, hashlib.sha256(secret.encode("utf-8")).hexdigest()[:16]
+
+
+def classify_credentials(config_data):
+    """
+    Phân loại mọi dòng chứa thông tin xác thực trong log theo loại và kiểu mật khẩu, trong một lượt duyệt.
+    Chỉ đếm, không giữ giá trị bí mật; dòng giống hệt nhau trong cùng stanza (log chụp cấu hình nhiều lần) được đếm một lần.
+    Args:
+        config_data (str): Nội dung log đã chuẩn hoá.
+
+    Returns:
+        dict: {"counts": {loại: {kiểu: số dòng}}, "total": tổng số dòng, "weak": số dòng kiểu 0/7,
+               "evidence": [dòng đã ẩn bí mật]}.
+    """
+    counts = defaultdict(lambda: defaultdict(int))
+    evidence = []
+    seen = set()
+    context = ""
+    for line in config_data.splitlines():
+        if line and line[0] not in " \t":
+            context = line.strip()
+            owner = ""
+        else:
+            owner = context
+        classified = classify_line(line, owner)
+        if classified is None:
+            continue
+        key = (owner, line.strip())
+        if key in seen:
+            continue
+        seen.add(key)
+        kind, secret_type, (start, end) = classified
+        counts[kind][secret_type] += 1
+        evidence.append((line[:start] + REDACTED + line[end:]).strip())
+    total = sum(sum(types.values()) for types in counts.values())
+    weak = sum(count for types in counts.values() for secret_type, count in types.items()
+               if SECRET_TYPES[secret_type][1] == "weak")
+    return {
+        "counts": {kind: dict(types) for kind, types in counts.items()},
+        "total": total,
+        "weak": weak,
+        "evidence": evidence,
+    }
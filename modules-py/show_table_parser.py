@@ -0,0 +1,121 @@
+import re
+from functools import lru_cache
+
+# Bảng cột của các lệnh show hay dùng: khoá cột -> tiêu đề cột như in trên thiết bị
+INTERFACE_BRIEF_COLUMNS = {
+    "interface": "Interface", "ip_address": "IP-Address", "ok": "OK?",
+    "method": "Method", "status": "Status", "protocol": "Protocol",
+}
+INTERFACE_STATUS_COLUMNS = {
+    "port": "Port", "name": "Name", "status": "Status", "vlan": "Vlan",
+    "duplex": "Duplex", "speed": "Speed", "type": "Type",
+}
+DHCP_SNOOPING_TRUST_COLUMNS = {
+    "interface": "Interface", "trusted": "Trusted", "allow_option": "Allow option", "rate_limit": "Rate limit (pps)",
+}
+# IOS cũ không in cột "Allow option" ("Interface  Trusted  Rate limit (pps)")
+DHCP_SNOOPING_TRUST_OPTIONAL = ("allow_option",)
+VLAN_BRIEF_COLUMNS = {"vlan": "VLAN", "name": "Name", "status": "Status", "ports": "Ports"}
+# Dấu nhắc lệnh tiếp theo ('<hostname>#' hoặc '<hostname>>') kết thúc bảng
+PROMPT_PATTERN = re.compile(r"^[\w.-]+[#>]")
+
+
+@lru_cache(maxsize=256)
+def column_offsets(header, labels, optional=()):
+    """
+    Tính vị trí bắt đầu của từng cột từ dòng tiêu đề (tính một lần cho mỗi dạng tiêu đề).
+    Args:
+        header (str): Dòng tiêu đề.
+        labels (tuple): Tiêu đề các cột theo thứ tự.
+        optional (tuple): Tiêu đề các cột có thể không có trên một số phiên bản phần mềm.
+
+    Returns:
+        tuple | None: Vị trí bắt đầu của từng cột (None với cột tuỳ chọn không có trong tiêu đề),
+            hoặc None nếu dòng không phải tiêu đề của bảng.
+    """
+    offsets = []
+    position = 0
+    for label in labels:
+        found = header.find(label, position)
+        if found == -1:
+            if label in optional and offsets:
+                offsets.append(None)
+                continue
+            return None
+        offsets.append(found)
+        position = found + len(label)
+    if header[:offsets[0]].strip():
+        return None
+    return tuple(offsets)
+
+
+def _cut(line, offsets):
+    # Cột căn phải (ví dụ Speed "a-1000") có thể bắt đầu trước tiêu đề: ranh giới cắt ngang một từ
+    # được lùi về đầu từ đó, từ thuộc về cột bên phải
+    bounds = [0]
+    for offset in offsets[1:]:
+        bound = min(offset, len(line))
+        while bound > bounds[-1] and 0 < bound < len(line) and line[bound - 1] != " " and line[bound] != " ":
+            bound -= 1
+        bounds.append(bound)
+    bounds.append(len(line))
+    return [line[bounds[i]:bounds[i + 1]].strip() for i in range(len(offsets))]
+
+
+def parse_table(text, columns, types=None, wrap_columns=None, stop_at_blank=True, optional=()):
+    """
+    Phân tích bảng cột cố định trong output lệnh show: ranh giới cột lấy từ dòng tiêu đề,
+    mỗi dòng dữ liệu được cắt theo vị trí thay vì dùng regex hay split() (giá trị có khoảng trắng vẫn đúng cột).
+    Args:
+        text (str): Output lệnh show (có thể gồm dòng lệnh và nội dung khác trước bảng).
+        columns (dict): Khoá cột -> tiêu đề cột, theo thứ tự trên thiết bị.
+        types (dict | None): Khoá cột -> hàm chuyển kiểu (giá trị không chuyển được thành None).
+        wrap_columns (tuple | None): Các cột nhận nội dung của dòng tiếp nối (dòng bắt đầu bằng khoảng trắng);
+            mặc định là cột cuối.
+        stop_at_blank (bool): Dừng ở dòng trống đầu tiên sau khi đã có dữ liệu (luôn dừng ở dấu nhắc lệnh).
+        optional (tuple): Khoá các cột có thể vắng trong tiêu đề; khi vắng, giá trị của cột là "".
+
+    Returns:
+        list: Danh sách dict khoá cột -> giá trị (chuỗi hoặc kiểu đã chuyển), theo thứ tự trong bảng.
+    """
+    labels = tuple(columns.values())
+    optional_labels = tuple(columns[key] for key in optional)
+    wrap_columns = set(wrap_columns if wrap_columns is not None else tuple(columns)[-1:])
+    types = types or {}
+    keys = offsets = None
+    rows = []
+    for line in text.splitlines():
+        line = line.rstrip()
+        if offsets is None:
+            if labels[0] in line:
+                header_offsets = column_offsets(line, labels, optional_labels)
+                if header_offsets is not None:
+                    # Chỉ cắt theo các cột có trong tiêu đề
+                    keys = tuple(key for key, offset in zip(columns, header_offsets) if offset is not None)
+                    offsets = tuple(offset for offset in header_offsets if offset is not None)
+            continue
+        if not line:
+            if rows and stop_at_blank:
+                break
+            continue
+        if PROMPT_PATTERN.match(line):
+            break
+        if line[0] == "%" or set(line.strip()) <= {"-", " "}:
+            continue
+        values = _cut(line, offsets)
+        if line[0] == " " and rows:
+            # Dòng tiếp nối của dòng trước (danh sách port dài, ...)
+            for key, value in zip(keys, values):
+                if value and key in wrap_columns:
+                    rows[-1][key] = f"{rows[-1][key]} {value}".strip()
+            continue
+        row = dict.fromkeys(columns, "")
+        row.update(zip(keys, values))
+        rows.append(row)
+    for row in rows:
+        for key, convert in types.items():
+            try:
+                row[key] = convert(row[key]) if row[key] != "" else None
+            except ValueError:
+                row[key] = None
+    return rows
@@ -0,0 +1,275 @@
+import argparse
+import io
+import os
+from contextlib import redirect_stdout
+
+from archive_reader import iter_logs
+from check_profiles import ALL_CHECKS, applicable_checks, infer_device_role
+from config_stanzas import diff_stanzas, split_stanzas
+from fleet_inventory import build_inventory, filter_inventory
+from fleet_runner import run_check
+from log_normalizer import load_log
+from results_store import (
+    ANSI_PATTERN, STATUS_COMPLIANT, STATUS_MANUAL_REVIEW, STATUS_NON_COMPLIANT, STATUS_NOT_APPLICABLE,
+)
+
+# Mục kiểm tra -> tiền tố khoá các stanza mà mục đó đọc (không phân biệt hoa thường).
+# Mục không có trong bảng (ví dụ 5.2.4 quét từ khoá trên toàn bộ log) chạy lại khi có bất kỳ thay đổi nào.
+CHECK_DEPENDENCIES = {
+    "1.1": ("#show version",),
+    "2.1": ("#show ip interface brief", "#show interface", "interface "),
+    "3.1": ("#show interface switchport", "#show interfaces switchport"),
+    "3.2.1": ("ip source binding", "ip arp inspection", "interface ", "dot1x"),
+    "3.2.2": ("#show spanning-tree", "interface ", "no spanning-tree", "spanning-tree "),
+    "3.2.3": ("interface ",),
+    "3.3": ("#show ip dhcp snooping", "#show interface switchport", "#show interfaces switchport"),
+    "4.1.1": ("interface ", "set nsrp", "key chain"),
+    "4.1.2": ("router ", "interface ", "key chain"),
+    "4.1.3": ("router bgp", "interface "),
+    "4.1.4": ("router ", "interface ", "key chain"),
+    "4.1.5": ("router ", "interface "),
+    "4.2.1": ("router bgp", "ip prefix-list", "ipv6 prefix-list"),
+    "4.2.2": ("router bgp",),
+    "4.2.3": ("router bgp", "ip as-path"),
+    "4.2.4": ("router bgp", "access-list", "ip access-list"),
+    "4.3": ("vrf definition", "interface "),
+    "5.1": ("archive",),
+    "5.2.1": ("aaa ", "tacacs server", "radius server", "username "),
+    "5.2.2": ("username ",),
+    "5.2.5": ("login block-for",),
+    "5.3.1": ("interface ",),
+    "5.3.2": ("#show version", "line ", "ip ssh", "no ip ssh", "ip http", "no ip http"),
+    "5.3.3": ("line ", "ip http", "no ip http"),
+    "5.3.4": ("line ",),
+    "5.3.5": ("line ", "access-list ", "ip access-list "),
+    "6.1": ("ntp ", "logging ", "snmp-server "),
+}
+
+STATUS_LABELS = {
+    STATUS_COMPLIANT: "\033[32mTuân Thủ\033[0m",
+    STATUS_NON_COMPLIANT: "\033[31mKhông Tuân Thủ\033[0m",
+    STATUS_NOT_APPLICABLE: "\033[33mKhông Áp Dụng\033[0m",
+    STATUS_MANUAL_REVIEW: "\033[36mCần Kiểm Tra Thủ Công\033[0m",
+}
+
+
+def affected_checks(changed_keys, checks):
+    """
+    Chọn các mục kiểm tra đọc ít nhất một stanza đã thay đổi.
+    Args:
+        changed_keys (iterable): Khoá các stanza được thêm, bị xoá hoặc thay đổi.
+        checks (iterable): Các mục kiểm tra cần xét.
+
+    Returns:
+        list: Mã các mục kiểm tra cần chạy lại (giữ thứ tự của checks).
+    """
+    changed_keys = [key.lower() for key in changed_keys]
+    if not changed_keys:
+        return []
+    selected = []
+    for check_id in checks:
+        prefixes = CHECK_DEPENDENCIES.get(check_id)
+        if prefixes is None or any(key.startswith(prefixes) for key in changed_keys):
+            selected.append(check_id)
+    return selected
+
+
+def _finding_lines(output, file_name):
+    # Các dòng output đã bỏ màu; tên file được thay bằng nhãn chung để hai bản chụp so sánh được với nhau
+    lines = set()
+    for line in ANSI_PATTERN.sub("", output).replace(os.path.basename(file_name), "<file>").splitlines():
+        line = line.strip()
+        if line and line.strip("-="):
+            lines.add(line)
+    return lines
+
+
+def _run_quietly(check_id, config_data, file_name):
+    output = io.StringIO()
+    with redirect_stdout(output):
+        outcome = run_check(check_id, config_data, file_name)
+    return outcome["compliance"], _finding_lines(output.getvalue(), file_name)
+
+
+def diff_snapshots(old_name, old_data, new_name, new_data, role=None, checks=None):
+    """
+    So sánh hai bản chụp của cùng một thiết bị ở mức stanza và chỉ chạy lại các mục kiểm tra
+    đọc stanza đã thay đổi (trên cả hai bản chụp) để tìm phát hiện mới và phát hiện đã được khắc phục.
+    Args:
+        old_name (str): Tên file bản chụp cũ.
+        old_data (str): Nội dung bản chụp cũ.
+        new_name (str): Tên file bản chụp mới.
+        new_data (str): Nội dung bản chụp mới.
+        role (str | None): Vai trò thiết bị (None để suy ra từ bản chụp mới).
+        checks (list | None): Chỉ xét các mục này (None để xét tất cả).
+
+    Returns:
+        dict: {"stanzas": kết quả của diff_stanzas, "checks": các mục đã chạy lại,
+               "findings": mã mục -> {"old_status", "new_status", "new": [...], "resolved": [...]}}.
+    """
+    stanza_diff = diff_stanzas(split_stanzas(old_data), split_stanzas(new_data))
+    changed_keys = stanza_diff["added"] + stanza_diff["removed"] + stanza_diff["changed"]
+
+    role = role if role and role != "unknown" else infer_device_role(None, new_data)
+    profile = applicable_checks(role)
+    candidates = [check_id for check_id in ALL_CHECKS if check_id in profile and (checks is None or check_id in checks)]
+    rerun = affected_checks(changed_keys, candidates)
+
+    findings = {}
+    for check_id in rerun:
+        old_status, old_lines = _run_quietly(check_id, old_data, old_name)
+        new_status, new_lines = _run_quietly(check_id, new_data, new_name)
+        if old_status == new_status and old_lines == new_lines:
+            continue
+        findings[check_id] = {
+            "old_status": old_status,
+            "new_status": new_status,
+            "new": sorted(new_lines - old_lines),
+            "resolved": sorted(old_lines - new_lines),
+        }
+    return {"stanzas": stanza_diff, "checks": rerun, "findings": findings}
+
+
+def display_snapshot_diff(old_name, new_name, diff):
+    """
+    Hiển thị kết quả so sánh hai bản chụp.
+    Args:
+        old_name (str): Tên file bản chụp cũ.
+        new_name (str): Tên file bản chụp mới.
+        diff (dict): Kết quả từ diff_snapshots.
+    """
+    stanza_diff = diff["stanzas"]
+    print(f"\n{'=' * 50}\nSo sánh: {old_name} -> {new_name}")
+    print(f"Stanza: {len(stanza_diff['added'])} thêm, {len(stanza_diff['removed'])} xoá, {len(stanza_diff['changed'])} thay đổi")
+    for label, keys in (("+", stanza_diff["added"]), ("-", stanza_diff["removed"]), ("~", stanza_diff["changed"])):
+        for key in keys:
+            print(f"  {label} {key}")
+    if not diff["checks"]:
+        print("\033[32mKhông có mục kiểm tra nào bị ảnh hưởng.\033[0m")
+        return
+
+    print(f"Mục kiểm tra chạy lại: {', '.join(diff['checks'])}")
+    if not diff["findings"]:
+        print("\033[32mKết quả các mục kiểm tra không thay đổi.\033[0m")
+    for check_id, finding in diff["findings"].items():
+        old_status, new_status = finding["old_status"], finding["new_status"]
+        if new_status == STATUS_NON_COMPLIANT and old_status != STATUS_NON_COMPLIANT:
+            summary = "\033[31mPhát hiện mới\033[0m"
+        elif old_status == STATUS_NON_COMPLIANT and new_status != STATUS_NON_COMPLIANT:
+            summary = "\033[32mĐã khắc phục\033[0m"
+        else:
+            summary = "\033[33mThay đổi chi tiết\033[0m"
+        print(f"\n\033[1m[{check_id}]\033[0m {STATUS_LABELS.get(old_status, old_status)} -> "
+              f"{STATUS_LABELS.get(new_status, new_status)}: {summary}")
+        for line in finding["new"]:
+            print(f"  \033[31m+ {line}\033[0m")
+        for line in finding["resolved"]:
+            print(f"  \033[32m- {line}\033[0m")
+
+
+def snapshot_pairs(inventory):
+    """
+    Ghép hai bản chụp gần nhất (có ngày trong tên file) của mỗi thiết bị.
+    Args:
+        inventory (list): Danh mục thiết bị (xem fleet_inventory.build_inventory).
+
+    Returns:
+        list: Danh sách (entry bản cũ, entry bản mới), sắp theo tên file bản mới.
+    """
+    snapshots = {}
+    for entry in inventory:
+        if entry["date"] is None:
+            continue
+        device_key = entry["ip"] or entry["hostname"]
+        snapshots.setdefault(device_key, []).append(entry)
+
+    pairs = []
+    for entries in snapshots.values():
+        if len(entries) < 2:
+            continue
+        entries.sort(key=lambda entry: (entry["date"], entry["source"].name))
+        pairs.append((entries[-2], entries[-1]))
+    return sorted(pairs, key=lambda pair: pair[1]["source"].name)
+
+
+def diff_fleet(folder_path, site=None, role=None, checks=None):
+    """
+    So sánh hai bản chụp gần nhất của mọi thiết bị trong thư mục.
+    Args:
+        folder_path (str): Đường dẫn tới thư mục chứa file log hoặc bundle nén.
+        site, role: Điều kiện lọc danh mục (xem fleet_inventory.filter_inventory).
+        checks (list | None): Chỉ xét các mục này.
+
+    Returns:
+        dict: Tên file bản mới -> kết quả của diff_snapshots.
+    """
+    pairs = snapshot_pairs(filter_inventory(build_inventory(folder_path), site=site, role=role))
+    if not pairs:
+        print(f"Không tìm thấy thiết bị nào có ít nhất hai bản chụp trong thư mục: {folder_path}")
+        return {}
+
+    # Mỗi bản chụp được giữ trong bộ nhớ đến khi bản còn lại của cặp được đọc xong
+    partner = {}
+    for old_entry, new_entry in pairs:
+        partner[old_entry["source"].name] = (old_entry, new_entry)
+        partner[new_entry["source"].name] = (old_entry, new_entry)
+    loaded = {}
+    fleet_diffs = {}
+    for log in iter_logs([entry["source"] for pair in pairs for entry in pair]):
+        try:
+            loaded[log.name] = log.text
+        except Exception as e:
+            print(f"Lỗi khi đọc file {log.name}: {e}")
+            continue
+        old_entry, new_entry = partner[log.name]
+        old_name, new_name = old_entry["source"].name, new_entry["source"].name
+        if old_name not in loaded or new_name not in loaded:
+            continue
+        diff = diff_snapshots(old_name, loaded.pop(old_name), new_name, loaded.pop(new_name),
+                              role=new_entry["role"], checks=checks)
+        display_snapshot_diff(old_name, new_name, diff)
+        fleet_diffs[new_name] = diff
+
+    new_findings = sum(
+        finding["new_status"] == STATUS_NON_COMPLIANT and finding["old_status"] != STATUS_NON_COMPLIANT
+        for diff in fleet_diffs.values() for finding in diff["findings"].values()
+    )
+    resolved = sum(
+        finding["old_status"] == STATUS_NON_COMPLIANT and finding["new_status"] != STATUS_NON_COMPLIANT
+        for diff in fleet_diffs.values() for finding in diff["findings"].values()
+    )
+    rerun = sum(len(diff["checks"]) for diff in fleet_diffs.values())
+    print(f"\n\033[1mĐã so sánh {len(fleet_diffs)} thiết bị: {rerun} mục chạy lại, "
+          f"{new_findings} phát hiện mới, {resolved} đã khắc phục.\033[0m")
+    return fleet_diffs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="So sánh hai bản chụp cấu hình và chỉ chạy lại các mục kiểm tra bị ảnh hưởng.")
+    parser.add_argument("paths", type=str, nargs="+",
+                        help="Thư mục log (so sánh hai bản chụp gần nhất của mỗi thiết bị) hoặc hai file: bản cũ và bản mới.")
+    parser.add_argument("--site", type=str, help="Lọc theo site (ví dụ HN).")
+    parser.add_argument("--role", type=str, action="append", help="Lọc theo vai trò (ví dụ access_switch), có thể lặp lại.")
+    parser.add_argument("--check", type=str, action="append", choices=ALL_CHECKS, help="Chỉ xét mục kiểm tra này, có thể lặp lại.")
+    args = parser.parse_args()
+
+    if len(args.paths) == 1:
+        if not os.path.isdir(args.paths[0]):
+            print(f"Lỗi: Không tìm thấy thư mục '{args.paths[0]}'.")
+            return
+        diff_fleet(args.paths[0], site=args.site, role=args.role, checks=args.check)
+        return
+    if len(args.paths) != 2:
+        parser.error("Cần một thư mục hoặc đúng hai file log.")
+
+    old_path, new_path = args.paths
+    for path in (old_path, new_path):
+        if not os.path.isfile(path):
+            print(f"Lỗi: Không tìm thấy file '{path}'.")
+            return
+    diff = diff_snapshots(old_path, load_log(old_path), new_path, load_log(new_path), checks=args.check)
+    display_snapshot_diff(old_path, new_path, diff)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from functools import wraps
+
+# Số kết quả stanza tối đa giữ trong bộ nhớ (bỏ kết quả ít dùng nhất khi đầy)
+CACHE_SIZE = 1 << 16
+# File lưu cache giữa các lần chạy
+CACHE_FILE = "stanza_cache.json"
+
+
+class StanzaCache:
+    """
+    Cache LRU kết quả của các hàm chỉ phụ thuộc vào nội dung một stanza (một interface, một line vty, ...).
+    Khoá là (mã mục kiểm tra, phiên bản logic, mã băm nội dung stanza), nên các stanza giống hệt nhau
+    trên các thiết bị dựng từ cùng template chỉ được đánh giá một lần.
+    Giá trị phải là kiểu JSON (bool, số, chuỗi, list, dict) để có thể ghi ra file.
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(check_id, version, stanza_text):
+        digest = hashlib.sha1(stanza_text.encode("utf-8")).hexdigest()
+        return f"{check_id}|{version}|{digest}"
+
+    def get_or_compute(self, check_id, version, stanza_text, compute):
+        """
+        Lấy kết quả đã lưu của stanza, hoặc tính bằng compute(stanza_text) rồi lưu lại.
+        Args:
+            check_id (str): Mã mục kiểm tra.
+            version (int): Phiên bản logic của hàm (tăng khi đổi logic để bỏ kết quả cũ).
+            stanza_text (str): Nội dung stanza.
+            compute (callable): Hàm tính kết quả từ nội dung stanza.
+
+        Returns:
+            Kết quả của compute(stanza_text).
+        """
+        key = self.make_key(check_id, version, stanza_text)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        value = compute(stanza_text)
+        self._entries[key] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def load(self, path=CACHE_FILE):
+        """
+        Nạp kết quả đã lưu từ file (bỏ qua nếu chưa có file hoặc file hỏng).
+        Args:
+            path (str): Đường dẫn file cache.
+
+        Returns:
+            int: Số kết quả đã nạp.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                entries = json.load(file)
+        except (OSError, ValueError):
+            return 0
+        for key, value in list(entries.items())[-self.maxsize:]:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return len(entries)
+
+    def save(self, path=CACHE_FILE):
+        """
+        Ghi cache ra file theo thứ tự từ ít dùng đến dùng gần nhất (ghi file tạm rồi đổi tên).
+        Args:
+            path (str): Đường dẫn file cache.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".stanza-cache-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(self._entries, file, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+# Cache dùng chung trong tiến trình
+STANZA_CACHE = StanzaCache()
+
+
+def memoize_stanza(check_id, version):
+    """
+    Decorator cho hàm nhận nội dung một stanza và trả kết quả chỉ phụ thuộc vào nội dung đó.
+    Args:
+        check_id (str): Mã mục kiểm tra.
+        version (int): Phiên bản logic của hàm.
+
+    Returns:
+        callable: Decorator.
+    """
+    def decorator(function):
+        @wraps(function)
+        def wrapper(stanza_text):
+            return STANZA_CACHE.get_or_compute(check_id, version, stanza_text, function)
+        return wrapper
+    return decorator
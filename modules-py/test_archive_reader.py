@@ -0,0 +1,111 @@
+import gzip
+import io
+import random
+import tarfile
+import zipfile
+
+import pytest
+
+from archive_reader import (TAR_STREAM_ERRORS, iter_logs, list_log_sources, list_tar_members, read_log_source,
+                            unreadable_archive)
+
+CONFIG = b"hostname SW%d\n!\ninterface GigabitEthernet1/0/1\n switchport mode access\n"
+
+
+def _write_tar(path, count):
+    # Thêm dòng description ngẫu nhiên để dữ liệu nén không quá nhỏ: cắt đôi archive sẽ rơi vào giữa các member
+    with tarfile.open(path, "w:gz") as archive:
+        for index in range(count):
+            data = CONFIG % index + b"".join(
+                b" description %s\n" % random.Random(index * 1000 + line).randbytes(32).hex().encode()
+                for line in range(200))
+            info = tarfile.TarInfo(f"SW{index}.log")
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+
+def _outcome(log):
+    # Tên nguồn (bỏ thư mục) -> dòng đầu hoặc loại lỗi
+    try:
+        return log.name.rsplit("/", 1)[-1], log.text.splitlines()[0]
+    except Exception as e:
+        return log.name.rsplit("/", 1)[-1], type(e).__name__
+
+
+@pytest.fixture
+def bundle(tmp_path):
+    (tmp_path / "SW0.log").write_bytes(CONFIG % 0)
+    (tmp_path / "SW1.log.gz").write_bytes(gzip.compress(CONFIG % 1))
+    with zipfile.ZipFile(tmp_path / "site.zip", "w") as archive:
+        archive.writestr("SW2.txt", CONFIG % 2)
+        archive.writestr("notes.md", b"khong phai log")
+    _write_tar(tmp_path / "site.tar.gz", 2)
+    return tmp_path
+
+
+def test_sources_of_each_kind(bundle):
+    sources = list_log_sources(str(bundle))
+    assert [(source.kind, source.member) for source in sources] == [
+        ("file", None), ("gzip", None), ("tar", None), ("zip", "SW2.txt")]
+    tar_source = next(source for source in sources if source.kind == "tar")
+    assert [member.member for member in list_tar_members(tar_source)] == ["SW0.log", "SW1.log"]
+
+
+def test_iter_logs_keeps_source_order(bundle):
+    assert [_outcome(log) for log in iter_logs(str(bundle))] == [
+        ("SW0.log", "hostname SW0"),
+        ("SW1.log", "hostname SW1"),
+        ("site.tar.gz!SW0.log", "hostname SW0"),
+        ("site.tar.gz!SW1.log", "hostname SW1"),
+        ("site.zip!SW2.txt", "hostname SW2"),
+    ]
+
+
+def test_require_skips_decoding(bundle):
+    logs = list(iter_logs(str(bundle), require=rb"hostname SW1\b"))
+    assert [log.matched for log in logs] == [False, True, False, True, False]
+
+
+def test_corrupt_zip_is_reported_when_read(tmp_path):
+    (tmp_path / "bad.zip").write_bytes(b"PK\x03\x04 khong phai zip")
+    (tmp_path / "ok.log").write_bytes(CONFIG % 0)
+    assert [_outcome(log) for log in iter_logs(str(tmp_path))] == [
+        ("bad.zip", "BadZipFile"), ("ok.log", "hostname SW0")]
+
+
+def test_truncated_tar_reports_error_instead_of_raising(tmp_path):
+    _write_tar(tmp_path / "full.tar.gz", 3)
+    data = (tmp_path / "full.tar.gz").read_bytes()
+    (tmp_path / "full.tar.gz").unlink()
+    (tmp_path / "bad.tar.gz").write_bytes(data[:len(data) // 2])
+    (tmp_path / "ok.log").write_bytes(CONFIG % 9)
+
+    outcomes = [_outcome(log) for log in iter_logs(str(tmp_path))]
+    # Member đọc được trước chỗ hỏng vẫn được trả về, sau đó là một lỗi cho archive, rồi tới file tiếp theo
+    assert outcomes[0] == ("bad.tar.gz!SW0.log", "hostname SW0")
+    assert outcomes[-2][0] == "bad.tar.gz" and outcomes[-2][1] != "hostname SW1"
+    assert outcomes[-1] == ("ok.log", "hostname SW9")
+
+
+def test_truncated_tar_reports_each_requested_member(tmp_path):
+    _write_tar(tmp_path / "site.tar.gz", 3)
+    source = list_log_sources(str(tmp_path))[0]
+    members = list_tar_members(source)
+    data = (tmp_path / "site.tar.gz").read_bytes()
+    # Cắt trong phần dữ liệu của member cuối
+    (tmp_path / "site.tar.gz").write_bytes(data[:len(data) * 5 // 6])
+
+    outcomes = dict(_outcome(log) for log in iter_logs(members[1:]))
+    assert set(outcomes) == {"site.tar.gz!SW1.log", "site.tar.gz!SW2.log"}
+    assert outcomes["site.tar.gz!SW1.log"] == "hostname SW1"
+    assert outcomes["site.tar.gz!SW2.log"] in ("EOFError", "ReadError")
+
+
+def test_unreadable_archive_raises_the_archive_error(tmp_path):
+    (tmp_path / "bad.tar.gz").write_bytes(b"\x1f\x8b khong phai gzip")
+    source = list_log_sources(str(tmp_path))[0]
+    with pytest.raises(TAR_STREAM_ERRORS):
+        list_tar_members(source)
+    with pytest.raises(TAR_STREAM_ERRORS):
+        read_log_source(unreadable_archive(source))
+    assert [_outcome(log) for log in iter_logs([unreadable_archive(source)])] == [("bad.tar.gz", "ReadError")]
@@ -0,0 +1,48 @@
+from igp_model import key_chain_fingerprint, parse_igp_model, resolve_key_chain
+
+KEY_CHAINS = """hostname R1
+!
+key chain OSPF-KEYS
+ key 1
+  key-string 7 0822455D0A16
+  cryptographic-algorithm hmac-sha-256
+ key 2
+  key-string cisco2
+!
+key chain STRONG
+ key 1
+  key-string 0 cisco
+  cryptographic-algorithm hmac-sha-512
+!
+key chain EMPTY
+ key 1
+!
+"""
+
+
+def test_key_chains_keep_only_fingerprints():
+    key_chains = parse_igp_model(KEY_CHAINS)["key_chains"]
+    assert set(key_chains) == {"OSPF-KEYS", "STRONG", "EMPTY"}
+    assert set(key_chains["OSPF-KEYS"]) == {"1", "2"}
+    assert key_chains["OSPF-KEYS"]["1"]["algorithm"] == "hmac-sha-256"
+    assert "0822455D0A16" not in repr(key_chains) and "cisco2" not in repr(key_chains)
+
+
+def test_resolve_key_chain_reports_weakest_key():
+    key_chains = parse_igp_model(KEY_CHAINS)["key_chains"]
+    # Key 2 không khai báo thuật toán: dùng thuật toán mặc định của giao thức
+    assert resolve_key_chain(key_chains, "OSPF-KEYS", "md5") == "md5"
+    assert resolve_key_chain(key_chains, "STRONG", "md5") == "hmac-sha-512"
+    assert resolve_key_chain(key_chains, "EMPTY", "md5") is None
+    assert resolve_key_chain(key_chains, "MISSING", "md5") is None
+
+
+def test_key_chain_fingerprint_ignores_name_and_type7_encoding():
+    other = parse_igp_model("key chain FHRP\n key 1\n  key-string cisco\n!\n")["key_chains"]
+    key_chains = parse_igp_model(KEY_CHAINS)["key_chains"]
+    # Cùng khoá "cisco" (type 0 và type 7) dưới tên key chain khác nhau
+    type7 = parse_igp_model("key chain A\n key 1\n  key-string 7 0822455D0A16\n!\n")["key_chains"]
+    assert key_chain_fingerprint(other, "FHRP") == key_chain_fingerprint(type7, "A")
+    assert key_chain_fingerprint(other, "FHRP") == key_chain_fingerprint(key_chains, "STRONG")
+    assert key_chain_fingerprint(key_chains, "OSPF-KEYS") != key_chain_fingerprint(key_chains, "STRONG")
+    assert key_chain_fingerprint(key_chains, "EMPTY") is None
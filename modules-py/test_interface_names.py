@@ -0,0 +1,33 @@
+import pytest
+
+from interface_names import canonical_interface_name, index_by_interface, is_port_channel, parent_interface
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("Gi1/0/1", "GigabitEthernet1/0/1"),
+    ("GigabitEthernet 1/0/1", "GigabitEthernet1/0/1"),
+    ("po10", "Port-channel10"),
+    ("Eth1/1.100", "Ethernet1/1.100"),
+    ("Tw1/0/1", "TwoGigabitEthernet1/0/1"),
+    ("Twe1/0/1", "TwentyFiveGigE1/0/1"),
+    ("Vlan10", "Vlan10"),
+])
+def test_canonical_names(name, expected):
+    assert canonical_interface_name(name) == expected
+
+
+def test_unknown_names_are_kept():
+    # Tiền tố khớp nhiều loại ("T...") hoặc không có số hiệu: giữ nguyên
+    assert canonical_interface_name(" T1/0 ") == "T1/0"
+    assert canonical_interface_name("CPU") == "CPU"
+
+
+def test_parent_and_port_channel():
+    assert parent_interface("Gi0/1.100") == "GigabitEthernet0/1"
+    assert parent_interface("Gi0/1") == "GigabitEthernet0/1"
+    assert is_port_channel("Po1") and not is_port_channel("Gi0/1")
+
+
+def test_index_by_interface_merges_spellings():
+    index = index_by_interface([("Gi0/1", "show"), ("GigabitEthernet0/1", "config")])
+    assert index == {"GigabitEthernet0/1": "config"}
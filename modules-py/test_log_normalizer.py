@@ -0,0 +1,43 @@
+from log_normalizer import detect_wrap_width, find_hostname, normalize_capture, normalize_log_bytes
+
+# Chuỗi xoá dấu nhắc '--More--' của IOS: 9 backspace, 9 khoảng trắng, 9 backspace
+MORE_ERASE = " --More-- " + "\b" * 9 + " " * 9 + "\b" * 9
+
+
+def test_more_prompt_keeps_indentation_of_next_line():
+    text = f"interface GigabitEthernet1/0/1\n{MORE_ERASE} switchport mode access\n no shutdown\n"
+    assert normalize_capture(text).splitlines() == [
+        "interface GigabitEthernet1/0/1",
+        " switchport mode access",
+        " no shutdown",
+    ]
+
+
+def test_more_prompt_without_erase_sequence():
+    assert normalize_capture("line vty 0 4\n --More-- \n transport input ssh\n").splitlines()[1:] == [
+        "", " transport input ssh"]
+
+
+def test_overstrike_and_ansi_escapes():
+    # Backspace ghi đè ký tự trước, CR đưa con trỏ về đầu dòng, escape ANSI bị bỏ
+    assert normalize_capture("hostnamx\be SW1\n") == "hostname SW1\n"
+    assert normalize_capture("xxxxxxxxxx\rhostname R1\n") == "hostname R1\n"
+    assert normalize_capture("\x1b[1mhostname\x1b[0m R2\n") == "hostname R2\n"
+
+
+def test_command_lines_are_compacted():
+    text = "SW1#show ip  interface   brief  \nInterface  IP-Address\n"
+    assert find_hostname(text) == "SW1"
+    assert normalize_capture(text).splitlines()[0] == "SW1#show ip interface brief"
+
+
+def test_wrapped_lines_are_joined_at_terminal_width():
+    text = "SW1#terminal width 20\ndescription 12345678\n9 end of text\n"
+    assert detect_wrap_width(text) == 20
+    assert normalize_capture(text, 20).splitlines()[1] == "description 123456789 end of text"
+
+
+def test_normalize_log_bytes_tolerates_invalid_utf8():
+    digest, text = normalize_log_bytes(b"hostname R\xff1\n")
+    assert len(digest) == 40
+    assert text == "hostname R�1\n"
@@ -0,0 +1,83 @@
+import module_4_1_1_gateway_authentication as module_4_1_1
+
+DS_1 = """hostname DS-1
+!
+key chain HSRP-A
+ key 1
+  key-string cisco
+!
+interface Vlan10
+ ip address 10.1.10.2 255.255.255.0
+ standby 10 ip 10.1.10.1
+ standby 10 priority 110
+ standby 10 authentication md5 key-chain HSRP-A
+!
+interface Vlan20
+ ip address 10.1.20.2 255.255.255.0
+ vrrp 20 ip 10.1.20.1
+ vrrp 20 authentication text secret1
+!
+interface Vlan30
+ ip address 10.1.30.2 255.255.255.0
+ vrrp 30 address-family ipv4
+  address 10.1.30.1 primary
+  priority 120
+!
+"""
+DS_2 = """hostname DS-2
+!
+key chain OTHER-NAME
+ key 1
+  key-string 7 0822455D0A16
+!
+interface Vlan10
+ ip address 10.1.10.3 255.255.255.0
+ standby 10 ip 10.1.10.1
+ standby 10 authentication md5 key-chain OTHER-NAME
+!
+interface Vlan20
+ ip address 10.1.20.3 255.255.255.0
+ vrrp 20 ip 10.1.20.254
+ vrrp 20 authentication text secret2
+!
+interface Vlan30
+ ip address 10.1.30.3 255.255.255.0
+ vrrp 30 address-family ipv4
+  address 10.1.30.1 primary
+  priority 120
+!
+interface Vlan40
+ ip address 10.1.40.3 255.0.255.0
+ standby 40 ip 10.1.40.1
+!
+"""
+
+
+def _issues(first=DS_1, second=DS_2):
+    results = module_4_1_1.check_fhrp_consistency({"DS-1": module_4_1_1.parse_fhrp_groups(first),
+                                                    "DS-2": module_4_1_1.parse_fhrp_groups(second)})
+    return {(result["protocol"], result["group"], result["segment"]): result["issues"] for result in results}
+
+
+def test_vrrpv3_nested_attributes():
+    group = next(group for group in module_4_1_1.parse_fhrp_groups(DS_1) if group["group"] == 30)
+    assert (group["protocol"], group["vips"], group["priority"], group["subnet"]) == (
+        "VRRP", ("10.1.30.1",), 120, "10.1.30.0/24")
+
+
+def test_groups_are_paired_by_subnet():
+    assert _issues() == {
+        # Key chain khác tên nhưng cùng khoá "cisco" (type 0 và type 7): không phải khác biệt
+        ("HSRP", 10, "10.1.10.0/24"): [],
+        ("VRRP", 20, "10.1.20.0/24"): ["vip_mismatch", "auth_key_mismatch", "priority_tie"],
+        ("VRRP", 30, "10.1.30.0/24"): ["no_auth", "priority_tie"],
+        # Mask không liên tục: không xác định được subnet, nhóm được ghép theo VLAN
+        ("HSRP", 40, "vlan 40"): ["single_member", "no_auth"],
+    }
+
+
+def test_one_sided_and_mode_mismatch():
+    ds_2 = DS_2.replace(" standby 10 authentication md5 key-chain OTHER-NAME\n", "")
+    assert _issues(second=ds_2)[("HSRP", 10, "10.1.10.0/24")] == ["one_sided_auth"]
+    ds_2 = DS_2.replace("vrrp 20 authentication text secret2", "vrrp 20 authentication md5 key-string secret1")
+    assert "auth_mode_mismatch" in _issues(second=ds_2)[("VRRP", 20, "10.1.20.0/24")]
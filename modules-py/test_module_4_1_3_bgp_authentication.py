@@ -0,0 +1,73 @@
+import module_4_1_3_bgp_authentication as module_4_1_3
+
+RT_A = """hostname RT-A
+!
+interface GigabitEthernet0/0
+ ip address 10.0.0.1 255.255.255.252
+!
+interface GigabitEthernet0/1
+ ip address 10.0.0.5 255.255.255.252
+!
+router bgp 65001
+ neighbor 10.0.0.2 remote-as 65002
+ neighbor 10.0.0.2 password cisco
+ neighbor 10.0.0.6 remote-as 65002
+ neighbor 10.0.0.6 password cisco
+ neighbor 192.0.2.1 remote-as 64999
+!
+"""
+RT_B = """hostname RT-B
+!
+interface GigabitEthernet0/0
+ ip address 10.0.0.2 255.255.255.252
+!
+interface GigabitEthernet0/1
+ ip address 10.0.0.6 255.255.255.252
+!
+router bgp 65002
+ neighbor CORE peer-group
+ neighbor CORE remote-as 65001
+ neighbor CORE password 7 0822455D0A16
+ neighbor 10.0.0.5 remote-as 65001
+ neighbor 10.0.0.5 password other
+ neighbor 10.0.0.1 peer-group CORE
+!
+"""
+
+
+def _sessions(devices):
+    sessions = module_4_1_3.pair_bgp_sessions({name: module_4_1_3.parse_bgp_config(config)
+                                               for name, config in devices.items()})
+    return {(s["device"], s["neighbor"]): (s["peer_device"], s["peer_neighbor"], s["verdict"]) for s in sessions}
+
+
+def test_peer_group_attributes_are_inherited():
+    bgp = module_4_1_3.parse_bgp_config(RT_B)
+    neighbor = next(item for item in bgp["neighbors"] if item["address"] == "10.0.0.1")
+    assert (bgp["local_as"], neighbor["remote_as"], neighbor["password_type"]) == ("65002", "65001", "7")
+
+
+def test_parallel_sessions_pair_by_connected_subnet():
+    assert _sessions({"RT-A": RT_A, "RT-B": RT_B}) == {
+        # Type 7 của "cisco" trên RT-B khớp mật khẩu cleartext trên RT-A
+        ("RT-A", "10.0.0.2"): ("RT-B", "10.0.0.1", "authenticated"),
+        ("RT-A", "10.0.0.6"): ("RT-B", "10.0.0.5", "password_mismatch"),
+        ("RT-A", "192.0.2.1"): (None, None, "external_no_auth"),
+    }
+
+
+def test_missing_reverse_neighbor_is_unpaired():
+    rt_b = RT_B.replace(" neighbor 10.0.0.5 remote-as 65001\n neighbor 10.0.0.5 password other\n", "")
+    sessions = _sessions({"RT-A": RT_A, "RT-B": rt_b})
+    assert sessions[("RT-A", "10.0.0.2")][2] == "authenticated"
+    assert sessions[("RT-A", "10.0.0.6")] == ("RT-B", None, "unpaired")
+
+
+def test_remote_as_mismatch_is_flagged():
+    sessions = module_4_1_3.pair_bgp_sessions({
+        "RT-A": module_4_1_3.parse_bgp_config(RT_A.replace("neighbor 10.0.0.2 remote-as 65002",
+                                                           "neighbor 10.0.0.2 remote-as 65009")),
+        "RT-B": module_4_1_3.parse_bgp_config(RT_B),
+    })
+    flagged = {(s["device"], s["neighbor"]) for s in sessions if s["remote_as_mismatch"]}
+    assert flagged == {("RT-A", "10.0.0.2")}
@@ -0,0 +1,54 @@
+from ipaddress import IPv4Address
+
+import pytest
+
+import module_4_3_vrf_and_interfaces_analysis as module_4_3
+
+
+def _prefix(vrf, interface, address, prefix_length):
+    # Cùng dạng với kết quả của collect_interface_prefixes
+    return vrf, interface, int(IPv4Address(address)), prefix_length
+
+
+NESTED_DEVICES = {
+    "C": [_prefix("", "Vlan1", "10.0.255.254", 16)],
+    "A": [_prefix("", "GigabitEthernet0/0", "10.0.0.1", 24), _prefix("", "Loopback0", "10.0.0.200", 32)],
+    "B": [_prefix("", "GigabitEthernet0/1", "10.0.0.1", 25), _prefix("CUST", "GigabitEthernet0/2", "10.0.0.9", 30)],
+}
+
+
+def _overlaps(conflicts):
+    return [(f"{outer['device']} {outer['prefix']}", f"{inner['device']} {inner['prefix']}")
+            for outer, inner in conflicts["overlaps"]]
+
+
+@pytest.fixture(params=["python", "numpy"])
+def sweep(request, monkeypatch):
+    # Chạy cả nhánh thuần Python và nhánh NumPy (bỏ qua nếu chưa cài NumPy)
+    if request.param == "python":
+        monkeypatch.setattr(module_4_3, "numpy", None)
+    elif module_4_3.numpy is None:
+        pytest.skip("NumPy chưa được cài")
+    return request.param
+
+
+def test_three_nested_levels_pair_with_innermost_container(sweep):
+    conflicts = module_4_3.find_address_conflicts(NESTED_DEVICES)
+    assert _overlaps(conflicts) == [
+        ("C 10.0.255.254/16", "A 10.0.0.1/24"),
+        ("A 10.0.0.1/24", "B 10.0.0.1/25"),
+        ("A 10.0.0.1/24", "A 10.0.0.200/32"),
+    ]
+    assert [[item["device"] for item in group] for group in conflicts["duplicates"]] == [["A", "B"]]
+    assert conflicts["total"] == 5
+
+
+def test_identical_subnets_pair_with_enclosing_prefix(sweep):
+    devices = {
+        "C": [_prefix("", "Vlan1", "10.0.0.1", 16)],
+        "A": [_prefix("", "Vlan10", "10.0.1.2", 24)],
+        "B": [_prefix("", "Vlan10", "10.0.1.3", 24)],
+    }
+    conflicts = module_4_3.find_address_conflicts(devices)
+    assert _overlaps(conflicts) == [("C 10.0.0.1/16", "A 10.0.1.2/24"), ("C 10.0.0.1/16", "B 10.0.1.3/24")]
+    assert conflicts["duplicates"] == []
@@ -0,0 +1,43 @@
+from ipaddress import IPv4Address
+
+import pytest
+
+from prefix_trie import PrefixTrie, mask_to_prefix_length
+
+
+def _address(text):
+    return int(IPv4Address(text))
+
+
+@pytest.mark.parametrize("mask, expected", [
+    ("255.255.255.0", 24),
+    ("255.255.255.255", 32),
+    ("0.0.0.0", 0),
+    ("255.0.255.0", None),
+])
+def test_mask_to_prefix_length(mask, expected):
+    assert mask_to_prefix_length(_address(mask)) == expected
+
+
+def test_matches_are_ordered_from_shortest_prefix():
+    trie = PrefixTrie.from_networks([("10.0.0.0/8", "a"), ("10.1.0.0/16", "b"), ("10.1.2.0/24", "c")])
+    assert len(trie) == 3
+    assert trie.matches(_address("10.1.2.3")) == [(8, "a"), (16, "b"), (24, "c")]
+    assert trie.longest_match(_address("10.1.9.9")) == (16, "b")
+    assert _address("11.0.0.1") not in trie
+
+
+def test_insert_keeps_first_value_unless_replaced():
+    trie = PrefixTrie()
+    trie.insert(_address("192.168.1.0"), 24, "first")
+    trie.insert(_address("192.168.1.77"), 24, "second")
+    assert trie.longest_match(_address("192.168.1.1")) == (24, "first")
+    trie.insert(_address("192.168.1.0"), 24, "second", replace=True)
+    assert trie.longest_match(_address("192.168.1.1")) == (24, "second")
+    assert len(trie) == 1
+
+
+def test_default_route_and_host_route():
+    trie = PrefixTrie.from_networks([("0.0.0.0/0", "default"), ("10.0.0.1/32", "host")])
+    assert trie.matches(_address("10.0.0.1")) == [(0, "default"), (32, "host")]
+    assert trie.longest_match(_address("10.0.0.2")) == (0, "default")
@@ -0,0 +1,61 @@
+import pytest
+
+from secret_classifier import REDACTED, classify_credentials, classify_line, password_fingerprint, redact_line
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("username admin privilege 15 secret 9 $9$abc", "username admin privilege 15 secret 9 " + REDACTED),
+    ("enable password Cisco123", "enable password " + REDACTED),
+    ("snmp-server community public RO", "snmp-server community " + REDACTED + " RO"),
+    ("snmp-server host 10.1.1.1 version 2c public", "snmp-server host 10.1.1.1 version 2c " + REDACTED),
+    ("snmp-server host 10.1.1.1 vrf MGMT version 2c public", "snmp-server host 10.1.1.1 vrf MGMT version 2c " + REDACTED),
+    ("snmp-server host 10.1.1.1 vrf MGMT traps public", "snmp-server host 10.1.1.1 vrf MGMT traps " + REDACTED),
+    ("ntp authentication-key 1 md5 104D000A0618 7", "ntp authentication-key 1 md5 " + REDACTED + " 7"),
+    (" ip ospf message-digest-key 1 md5 7 0822455D0A16", " ip ospf message-digest-key 1 md5 7 " + REDACTED),
+    ("tacacs-server host 10.0.0.5 key 7 0822455D0A16", "tacacs-server host 10.0.0.5 key 7 " + REDACTED),
+])
+def test_redact_line(line, expected):
+    assert redact_line(line) == expected
+
+
+@pytest.mark.parametrize("line", [
+    "snmp-server host 10.1.1.1 version 3 priv v3user",
+    "snmp-server host 10.1.1.1 vrf MGMT version 3 auth v3user",
+    "ntp authenticate",
+    "ntp trusted-key 1",
+])
+def test_lines_without_secret_are_kept(line):
+    assert redact_line(line) == line
+
+
+def test_stanza_context_decides_kind():
+    assert classify_line(" password 7 0822455D0A16", "line vty 0 4")[:2] == ("line_password", "7")
+    assert classify_line(" password 7 0822455D0A16", "interface Vlan1") is None
+    assert classify_line(" key 7 0822455D0A16", "radius server ISE")[0] == "radius_key"
+    # 'key 1' trong key chain không phải khoá server
+    assert classify_line(" key 1", "key chain OSPF") is None
+
+
+def test_secret_types():
+    assert classify_line("ntp authentication-key 1 md5 104D000A0618 7")[1] == "7"
+    assert classify_line("ntp authentication-key 2 md5 Secret")[1] == "0"
+    assert classify_line("username bob secret $1$salt$hash")[1] == "5"
+    assert classify_line("username bob algorithm-type scrypt secret $9$salt$hash")[1] == "9"
+
+
+def test_classify_credentials_counts_without_keeping_secrets():
+    config = ("enable secret 5 $1$abc$def\n"
+              "line vty 0 4\n password Cisco123\n"
+              "line vty 5 15\n password Cisco123\n"
+              "snmp-server community public RO\n"
+              "snmp-server community public RO\n")
+    result = classify_credentials(config)
+    assert result["counts"] == {"enable": {"5": 1}, "line_password": {"0": 2}, "snmp_community": {"0": 1}}
+    assert result["total"] == 4 and result["weak"] == 3
+    assert not any("Cisco123" in line or "public" in line for line in result["evidence"])
+
+
+def test_type7_password_matches_cleartext():
+    # "0822455D0A16" là "cisco" ở dạng type 7
+    assert password_fingerprint("7 0822455D0A16")[1] == password_fingerprint("cisco")[1]
+    assert password_fingerprint("7 0822455D0A16")[0] == "7"
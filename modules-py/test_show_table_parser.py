@@ -0,0 +1,52 @@
+from show_table_parser import (DHCP_SNOOPING_TRUST_COLUMNS, DHCP_SNOOPING_TRUST_OPTIONAL, INTERFACE_BRIEF_COLUMNS,
+                               INTERFACE_STATUS_COLUMNS, VLAN_BRIEF_COLUMNS, parse_table)
+
+INTERFACE_BRIEF = """SW1#show ip interface brief
+Interface              IP-Address      OK? Method Status                Protocol
+Vlan1                  unassigned      YES NVRAM  administratively down down
+GigabitEthernet1/0/1   10.0.0.1        YES manual up                    up
+SW1#show version
+"""
+
+
+def test_columns_are_cut_by_header_position():
+    rows = parse_table(INTERFACE_BRIEF, INTERFACE_BRIEF_COLUMNS)
+    assert [row["interface"] for row in rows] == ["Vlan1", "GigabitEthernet1/0/1"]
+    # Giá trị có khoảng trắng vẫn nằm đúng cột
+    assert rows[0]["status"] == "administratively down"
+    assert rows[1]["ip_address"] == "10.0.0.1"
+
+
+def test_right_aligned_value_starting_before_header():
+    text = """Port      Name               Status       Vlan       Duplex  Speed Type
+Gi1/0/1   uplink to core     connected    trunk      a-full a-1000 10/100/1000BaseTX
+"""
+    row = parse_table(text, INTERFACE_STATUS_COLUMNS)[0]
+    assert row["name"] == "uplink to core"
+    assert (row["duplex"], row["speed"], row["type"]) == ("a-full", "a-1000", "10/100/1000BaseTX")
+
+
+def test_continuation_lines_extend_last_column():
+    text = """VLAN Name                             Status    Ports
+---- -------------------------------- --------- -------------------------------
+1    default                          active    Gi1/0/1, Gi1/0/2
+                                                Gi1/0/3
+10   USERS                            active
+"""
+    rows = parse_table(text, VLAN_BRIEF_COLUMNS, types={"vlan": int})
+    assert [row["vlan"] for row in rows] == [1, 10]
+    assert rows[0]["ports"] == "Gi1/0/1, Gi1/0/2 Gi1/0/3"
+
+
+def test_optional_column_missing_on_old_software():
+    text = """Interface                  Trusted    Rate limit (pps)
+-----------------------    -------    ----------------
+GigabitEthernet1/0/24      yes        unlimited
+"""
+    rows = parse_table(text, DHCP_SNOOPING_TRUST_COLUMNS, optional=DHCP_SNOOPING_TRUST_OPTIONAL)
+    assert rows == [{"interface": "GigabitEthernet1/0/24", "trusted": "yes",
+                     "allow_option": "", "rate_limit": "unlimited"}]
+
+
+def test_no_header_returns_no_rows():
+    assert parse_table("SW1#show ip interface brief\n% Invalid input\n", INTERFACE_BRIEF_COLUMNS) == []
@@ -0,0 +1,42 @@
+import pytest
+
+from vlan_set import ALL_VLANS, NO_VLANS, VlanSet, apply_allowed_vlan_command
+
+
+def test_parse_and_format_round_trip():
+    vlans = VlanSet.parse("1,10-12,30")
+    assert vlans.ranges() == [(1, 1), (10, 12), (30, 30)]
+    assert vlans.format() == "1,10-12,30"
+    assert len(vlans) == 5
+    assert 11 in vlans and 13 not in vlans
+
+
+def test_parse_wrapped_show_output():
+    # Danh sách bị xuống dòng trong output lệnh show
+    assert VlanSet.parse("1-5,7,\n                     9-10") == VlanSet.parse("1-5,7,9-10")
+
+
+def test_parse_keywords():
+    assert VlanSet.parse("ALL") == ALL_VLANS
+    assert VlanSet.parse("none") == NO_VLANS
+    # VLAN 0 không thuộc tập VLAN hợp lệ
+    assert 0 not in ALL_VLANS and 4094 in ALL_VLANS
+
+
+@pytest.mark.parametrize("text", ["10-5", "1,abc", "4095"])
+def test_parse_rejects_invalid_lists(text):
+    with pytest.raises(ValueError):
+        VlanSet.parse(text)
+
+
+def test_from_vlans_accepts_padded_numbers():
+    assert VlanSet.from_vlans(["0003", "0004", "10"]).format() == "3-4,10"
+
+
+def test_allowed_vlan_commands():
+    allowed = ALL_VLANS
+    allowed = apply_allowed_vlan_command(allowed, "10,20")
+    allowed = apply_allowed_vlan_command(allowed, "add 30-32")
+    allowed = apply_allowed_vlan_command(allowed, "remove 31")
+    assert allowed.format() == "10,20,30,32"
+    assert apply_allowed_vlan_command(allowed, "except 1") == ALL_VLANS - VlanSet.parse("1")
@@ -0,0 +1,154 @@
+import re
+
+# VLAN hợp lệ: 1-4094 (0 và 4095 dành riêng); mỗi VLAN là một bit trong số nguyên 4096 bit
+MAX_VLAN = 4094
+_ALL_BITS = ((1 << (MAX_VLAN + 1)) - 1) & ~1
+# Phần tử trong danh sách VLAN kiểu Cisco: "10", "20-30", "VLAN0013"
+_VLAN_TOKEN_PATTERN = re.compile(r"^(?:vlan)?(\d+)(?:-(?:vlan)?(\d+))?$", re.IGNORECASE)
+
+
+class VlanSet:
+    """
+    Tập VLAN biểu diễn bằng bitmask 4096 bit (bit i bật khi VLAN i thuộc tập).
+    Hợp, giao, hiệu và kiểm tra phần tử là phép toán bit trên số nguyên nên so sánh VLAN
+    giữa các cổng/thiết bị không phụ thuộc vào độ dài danh sách.
+    """
+
+    __slots__ = ("bits",)
+
+    def __init__(self, bits=0):
+        self.bits = bits & _ALL_BITS
+
+    @classmethod
+    def parse(cls, text):
+        """
+        Phân tích danh sách VLAN theo cú pháp Cisco, ví dụ "1,10-20,30", "ALL", "none",
+        kể cả danh sách bị xuống dòng trong output lệnh show.
+        Args:
+            text (str): Danh sách VLAN.
+
+        Returns:
+            VlanSet: Tập VLAN tương ứng.
+
+        Raises:
+            ValueError: Danh sách có phần tử không hợp lệ.
+        """
+        compact = re.sub(r"\s+", "", text or "")
+        if compact.lower() == "all":
+            return cls(_ALL_BITS)
+        bits = 0
+        if compact.lower() == "none":
+            return cls(bits)
+        for token in compact.split(","):
+            if not token:
+                continue
+            match = _VLAN_TOKEN_PATTERN.match(token)
+            if not match:
+                raise ValueError(f"Danh sách VLAN không hợp lệ: '{text}'")
+            first = int(match.group(1))
+            last = int(match.group(2)) if match.group(2) else first
+            if first > last or last > MAX_VLAN:
+                raise ValueError(f"Dải VLAN không hợp lệ: '{token}'")
+            bits |= ((1 << (last - first + 1)) - 1) << first
+        return cls(bits)
+
+    @classmethod
+    def from_vlans(cls, vlans):
+        bits = 0
+        for vlan in vlans:
+            bits |= 1 << int(vlan)
+        return cls(bits)
+
+    def ranges(self):
+        """
+        Liệt kê các dải VLAN liên tiếp.
+        Returns:
+            list: Danh sách (VLAN đầu, VLAN cuối) theo thứ tự tăng dần.
+        """
+        ranges = []
+        bits = self.bits
+        while bits:
+            first = (bits & -bits).bit_length() - 1
+            shifted = bits >> first
+            # Số bit 1 liên tiếp từ bit thấp nhất
+            length = (~shifted & (shifted + 1)).bit_length() - 1
+            ranges.append((first, first + length - 1))
+            bits &= ~(((1 << length) - 1) << first)
+        return ranges
+
+    def format(self):
+        """
+        Định dạng tập VLAN theo cú pháp Cisco, ví dụ "1,10-20".
+        Returns:
+            str: Danh sách VLAN ("" nếu tập rỗng).
+        """
+        return ",".join(str(first) if first == last else f"{first}-{last}" for first, last in self.ranges())
+
+    def union(self, other):
+        return VlanSet(self.bits | other.bits)
+
+    def intersection(self, other):
+        return VlanSet(self.bits & other.bits)
+
+    def difference(self, other):
+        return VlanSet(self.bits & ~other.bits)
+
+    def complement(self):
+        return VlanSet(~self.bits)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+    __invert__ = complement
+
+    def __contains__(self, vlan):
+        vlan = int(vlan)
+        return 0 < vlan <= MAX_VLAN and bool(self.bits >> vlan & 1)
+
+    def __iter__(self):
+        for first, last in self.ranges():
+            yield from range(first, last + 1)
+
+    def __len__(self):
+        return bin(self.bits).count("1")
+
+    def __bool__(self):
+        return bool(self.bits)
+
+    def __eq__(self, other):
+        return isinstance(other, VlanSet) and self.bits == other.bits
+
+    def __hash__(self):
+        return hash(self.bits)
+
+    def __str__(self):
+        return self.format()
+
+    def __repr__(self):
+        return f"VlanSet('{self.format()}')"
+
+
+ALL_VLANS = VlanSet(_ALL_BITS)
+NO_VLANS = VlanSet()
+
+
+def apply_allowed_vlan_command(allowed, command):
+    """
+    Áp dụng lệnh 'switchport trunk allowed vlan ...' lên tập VLAN hiện tại của trunk.
+    Args:
+        allowed (VlanSet): Tập VLAN trước lệnh (mặc định của trunk là ALL_VLANS).
+        command (str): Phần sau 'switchport trunk allowed vlan', ví dụ "add 30-40", "except 1", "10,20".
+
+    Returns:
+        VlanSet: Tập VLAN sau lệnh.
+    """
+    words = command.split(None, 1)
+    action = words[0].lower() if words else ""
+    argument = words[1] if len(words) > 1 else ""
+    if action == "add":
+        return allowed | VlanSet.parse(argument)
+    if action == "remove":
+        return allowed - VlanSet.parse(argument)
+    if action == "except":
+        return ALL_VLANS - VlanSet.parse(argument)
+    return VlanSet.parse(command)